@@ -0,0 +1,173 @@
+"""
+Import time of the mtTools, and what each import drags in.
+
+Runs outside of Maya: maya, pymel, PySide6 and shiboken6 are replaced by stub modules, so the measure is the cost
+of the tools' own imports, and the report lists the heavy modules (PyMEL, Qt, the type tool) an import loaded.
+Importing a package, or the core module of a tool, should load none of them.
+Each import runs in a fresh interpreter, so nothing is cached from the previous one.
+
+Usage, from the repository root:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 20 --heavy-cost 800  # simulate 800ms per heavy module loaded
+    python benchmarks/import_time.py --check  # exit code 1 when an import fails or loads a heavy module
+
+Stubs are plain modules answering every attribute with a stub class: enough to import, not to run anything.
+"""
+
+import argparse
+import importlib.abc
+import importlib.machinery
+import os
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STUB_ROOTS = ("maya", "pymel", "PySide6", "shiboken6")
+# read with "from PySide6 import QtWidgets", imported as modules rather than answered with a stub class
+STUB_SUBMODULES = {"PySide6": ("QtCore", "QtGui", "QtWidgets")}
+# loaded by a tool import, these are what costs seconds on the first hotkey press
+HEAVY_MODULES = ("pymel.core", "PySide6.QtWidgets", "PySide6.QtGui", "maya.OpenMayaUI", "maya.app.type.typeToolSetup")
+
+TARGETS = (
+    "mt_core",
+    "mt_anim_to_path",
+    "mt_anim_to_path.mt_anim_to_path",
+    "mt_cam_labels",
+    "mt_cam_labels.mtLabelCreator",
+    "mt_ikfk_fast",
+    "mt_ikfk_fast.ik_fk_fast",
+    "mt_keyframe_randomizer",
+    "mt_keyframe_randomizer.mt_keyframe_randomizer",
+    "mt_local_constraint_manager",
+    "mt_local_constraint_manager.constraint_toolkit",
+    "mt_renamer",
+    "mt_renamer.mt_renamer",
+    "mt_reset_attributes",
+    "mt_reset_attributes.mt_reset_attributes",
+    "mt_snap_to_ground",
+    "mt_snap_to_ground.mt_snap_to_ground",
+)
+
+
+class _StubType(type):
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _StubType(name, (Stub,), {})
+
+
+class Stub(metaclass=_StubType):
+    """Any attribute, call, or base class: the module level code of the tools only needs to run."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Stub()
+
+    def __call__(self, *args, **kwargs):
+        return Stub()
+
+    def __iter__(self):
+        return iter(())
+
+    def __bool__(self):
+        return False
+
+
+class StubModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name in STUB_SUBMODULES.get(self.__name__, ()):
+            return importlib.import_module(f"{self.__name__}.{name}")
+        value = _StubType(name, (Stub,), {})
+        setattr(self, name, value)
+        return value
+
+
+class StubFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Serves a stub for every module under STUB_ROOTS, and records the loads."""
+
+    def __init__(self, heavy_cost=0.0):
+        self.heavy_cost = heavy_cost
+        self.loaded = []
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname.split(".")[0] not in STUB_ROOTS:
+            return None
+        return importlib.machinery.ModuleSpec(fullname, self, is_package=True)
+
+    def create_module(self, spec):
+        return StubModule(spec.name)
+
+    def exec_module(self, module):
+        module.__path__ = []
+        self.loaded.append(module.__name__)
+        if module.__name__ in HEAVY_MODULES and self.heavy_cost:
+            time.sleep(self.heavy_cost)
+
+
+def measure(target, heavy_cost=0.0) -> tuple:
+    """(seconds, heavy modules loaded) of importing target, in this interpreter."""
+    finder = StubFinder(heavy_cost)
+    sys.meta_path.insert(0, finder)
+    sys.path.insert(0, ROOT)
+    start = time.perf_counter()
+    importlib.import_module(target)
+    elapsed = time.perf_counter() - start
+    return elapsed, [name for name in finder.loaded if name in HEAVY_MODULES]
+
+
+def run_child(target, heavy_cost) -> tuple:
+    """measure() in a fresh interpreter. Raises ImportError with the child's last error line when the import fails."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", target, "--heavy-cost", str(heavy_cost * 1000)],
+        capture_output=True, text=True,
+    )
+    if result.returncode:
+        lines = result.stderr.strip().splitlines()
+        raise ImportError(lines[-1] if lines else f"exit code {result.returncode}")
+    output = result.stdout.split()
+    return float(output[0]), output[1:]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("targets", nargs="*", default=TARGETS, help="modules to import, all the tools by default")
+    parser.add_argument("--repeat", type=int, default=5, help="imports per target, the best one is reported")
+    parser.add_argument("--heavy-cost", type=float, default=0.0, help="simulated cost of a heavy module, in ms")
+    parser.add_argument("--check", action="store_true", help="fail when an import fails or loads a heavy module")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    heavy_cost = args.heavy_cost / 1000.0
+
+    if args.child:
+        elapsed, heavy = measure(args.child, heavy_cost)
+        print(elapsed, *heavy)
+        return 0
+
+    width = max(len(t) for t in args.targets)
+    print(f"{'module':<{width}}  {'best ms':>8}  heavy modules loaded")
+    failed = False
+    for target in args.targets:
+        try:
+            runs = [run_child(target, heavy_cost) for _ in range(args.repeat)]
+        except ImportError as e:
+            failed = True
+            print(f"{target:<{width}}  {'failed':>8}  {e}")  # headless imports must not touch the UI
+            continue
+        best = min(elapsed for elapsed, _ in runs)
+        heavy = runs[0][1]
+        failed = failed or bool(heavy)
+        print(f"{target:<{width}}  {best * 1000:>8.2f}  {', '.join(heavy) or '-'}")
+    return 1 if args.check and failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Scene builders of the tool benchmarks, on the fake Maya of mt_testing.
+
+Every builder starts from an empty scene, makes the scene a tool runs on at size n, and returns what the tool needs
+to be called (names, a GUI...). They use the fake cmds like a user would, the calls they make are not measured.
+"""
+
+import maya.cmds as cm
+
+from mt_testing import fake_maya
+
+NAMESPACE = "chr"
+KEYS_PER_CURVE = 24
+TERRAIN_SUBDIVISIONS = 20  # 20 x 20 quads, 800 triangles
+
+_CONTROL_SHAPE = [(-1, 0, -1), (1, 0, -1), (1, 0, 1), (-1, 0, 1), (-1, 0, -1)]
+
+
+def _new():
+    fake_maya.new_scene()
+    cm.playbackOptions(min=1, max=120)
+
+
+def controls(n) -> list:
+    """n rig controls in a namespace: a curve shape, translated, rotated, a keyable user attribute off its default."""
+    _new()
+    cm.namespace(add=NAMESPACE)
+    names = []
+    for i in range(n):
+        name = cm.curve(p=_CONTROL_SHAPE, d=1, n=f"{NAMESPACE}:ctl{i:05d}_CTL")
+        cm.addAttr(name, ln="blend", at="double", dv=0.0, min=0.0, max=1.0, k=True)
+        cm.setAttr(f"{name}.translate", i % 7, 1.0, -(i % 5), type="double3")
+        cm.setAttr(f"{name}.rotateY", (i * 13) % 360)
+        cm.setAttr(f"{name}.blend", 1.0)
+        names.append(name)
+    cm.select(names)
+    return names
+
+
+def locators(n) -> list:
+    """n locators under groups, all with the same short name, for the renamer."""
+    _new()
+    names = []
+    for i in range(n // 10 + 1):
+        group = cm.group(em=True, n=f"set{i:04d}_GRP")
+        for _ in range(min(10, n - len(names))):
+            locator = cm.spaceLocator(n="prop")[0]
+            names.append(cm.parent(locator, group)[0])
+    names = cm.ls(names, long=True)
+    cm.select(names)
+    return names
+
+
+def keyed_curves(n, keys=KEYS_PER_CURVE) -> list:
+    """n anim curves of keys keys, six per control (translate and rotate), the controls selected."""
+    _new()
+    attributes = ("tx", "ty", "tz", "rx", "ry", "rz")
+    names = []
+    for i in range((n + len(attributes) - 1) // len(attributes)):
+        name = cm.group(em=True, n=f"anim{i:05d}_CTL")
+        for a, attr in enumerate(attributes[:n - i * len(attributes)]):
+            for k in range(keys):
+                cm.setKeyframe(name, at=attr, t=1 + k * 5, v=(k * (a + 1)) % 11)
+        names.append(name)
+    cm.select(names)
+    return names
+
+
+def constraints(n) -> list:
+    """n parent constraints between locator pairs, one in four made referenced, a few chained."""
+    _new()
+    scene = fake_maya.get_scene()
+    names = []
+    for i in range(n):
+        target = cm.spaceLocator(n=f"target{i:05d}")[0]
+        driven = cm.group(em=True, n=f"driven{i:05d}")
+        if i % 10 == 9:  # chains: the previous driven node drives this target
+            names.append(cm.pointConstraint(f"driven{i - 1:05d}", target)[0])
+        constraint = cm.parentConstraint(target, driven, mo=True)[0]
+        if i % 4 == 3:
+            scene.find(constraint).referenced = True
+        names.append(constraint)
+    return names
+
+
+def terrain_and_props(n, subdivisions=TERRAIN_SUBDIVISIONS) -> tuple:
+    """A tilted terrain of 2 * subdivisions^2 triangles and n props above it. Returns (terrain, props)."""
+    _new()
+    terrain = cm.polyPlane(n="terrain", w=200, h=200, sx=subdivisions, sy=subdivisions)[0]
+    cm.setAttr(f"{terrain}.rotateX", 8)
+    cm.setAttr(f"{terrain}.rotateZ", -5)
+    props = []
+    for i in range(n):
+        prop = cm.polyCube(n=f"prop{i:05d}", w=2, h=2, d=2)[0]
+        cm.xform(prop, t=((i * 37) % 180 - 90, 50, (i * 53) % 180 - 90))
+        cm.setAttr(f"{prop}.rotateY", (i * 29) % 360)
+        props.append(prop)
+    cm.select(props)
+    return terrain, props
+
+
+def animated_control(n_frames) -> str:
+    """A control keyed over n_frames frames, the playback range set to them, selected."""
+    _new()
+    control = cm.group(em=True, n="vehicle_CTL")
+    last = n_frames + 1
+    cm.playbackOptions(min=1, max=last)
+    for attr, values in (("tx", (0, 40, 100)), ("tz", (0, 30, 0)), ("ty", (0, 5, 0))):
+        for time, value in zip((1, 1 + n_frames // 2, last), values):
+            cm.setKeyframe(control, at=attr, t=time, v=value)
+    cm.select(control)
+    return control
+
+
+def ik_fk_limb(n_frames) -> str:
+    """The arm of _config.ARM_SETUP in the chr namespace, its FK chain keyed over n_frames. Returns the switch control."""
+    _new()
+    cm.namespace(add=NAMESPACE)
+    prefix = f"{NAMESPACE}:l_"
+    for name in ("shoulderFk_000_CTL", "elbowFk_000_CTL", "handFk_000_CTL", "handIk_000_CTL",
+                 "armPoleVector_000_CTL", "armIkFk_000_CTL"):
+        cm.group(em=True, n=prefix + name)
+    cm.parent(prefix + "elbowFk_000_CTL", prefix + "shoulderFk_000_CTL")
+    cm.parent(prefix + "handFk_000_CTL", prefix + "elbowFk_000_CTL")
+    cm.setAttr(prefix + "elbowFk_000_CTL.translateX", 10)
+    cm.setAttr(prefix + "handFk_000_CTL.translateX", 10)
+    cm.setKeyframe(prefix + "elbowFk_000_CTL", at="rotateY", t=1, v=-10)
+    cm.setKeyframe(prefix + "elbowFk_000_CTL", at="rotateY", t=n_frames, v=-80)
+    joints = ("shoulderIk_000_JNT", "elbowIk_000_JNT", "handIk_000_JNT")
+    for name in joints:
+        cm.createNode("joint", n=prefix + name)
+    cm.parent(prefix + joints[1], prefix + joints[0])
+    cm.parent(prefix + joints[2], prefix + joints[1])
+    cm.setAttr(prefix + joints[1] + ".translateX", 10)
+    cm.setAttr(prefix + joints[2] + ".translateX", 10)
+    cm.addAttr(prefix + "armIkFk_000_CTL", ln="Ik", at="double", min=0, max=1, k=True)
+    cm.addAttr(prefix + "armPoleVector_000_CTL", ln="Lock", at="double", k=True)
+    cm.playbackOptions(min=1, max=n_frames)
+    switch = prefix + "armIkFk_000_CTL"
+    cm.select(switch)
+    return switch
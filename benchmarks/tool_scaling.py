@@ -0,0 +1,328 @@
+"""
+Scaling of the mtTools with the size of the scene: wall time, peak memory and Maya commands issued, per tool.
+
+Runs outside of Maya, on the in-memory Maya of mt_testing.fake_maya: every tool runs on generated scenes of
+growing size (N controls, N curves of 24 keys, N constraints, N props on an 800 triangles terrain, N frames...),
+and the report gives, per scale, the best wall time, the peak memory the tool allocated, and the commands it issued
+(cmds, OpenMaya objects, PyMEL methods, mel.eval). Between two scales the growth exponent of each measure is
+computed: 1.0 is linear, 2.0 quadratic. A tool going above QUADRATIC_EXPONENT is flagged.
+The times are the fake's times, not Maya's. The command counts and the exponents are what carries over to Maya.
+
+Usage, from the repository root:
+    python benchmarks/tool_scaling.py
+    python benchmarks/tool_scaling.py reset snapper --scales 10 100 1000 10000
+    python benchmarks/tool_scaling.py --update-baselines  # store the results in baselines/tool_scaling.json
+    python benchmarks/tool_scaling.py --check  # exit code 1 on a regression against the baselines, or a quadratic tool
+
+A regression is more commands than the baseline (COMMANDS_TOLERANCE), or a time or peak memory over the baseline
+times TIME_TOLERANCE / MEMORY_TOLERANCE: the times vary between machines, the counts don't.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mt_testing import fake_maya  # noqa: E402
+
+fake_maya.install()  # before the tools import maya
+
+import maya.cmds as cm  # noqa: E402
+
+import scenes  # noqa: E402
+
+BASELINES = os.path.join(ROOT, "benchmarks", "baselines", "tool_scaling.json")
+SCALES = (10, 100, 1000)
+QUADRATIC_EXPONENT = 1.5  # a measure growing faster than n^1.5 between two scales
+MIN_SECONDS = 0.01  # shorter runs are noise, their time exponent is not judged
+COMMANDS_TOLERANCE = 1.1
+TIME_TOLERANCE = 2.5
+MEMORY_TOLERANCE = 1.5
+SEED = 1  # the randomizers move the same keys on every run, their command counts don't vary
+
+
+class Case:
+    """
+    A tool run: build(n) makes the scene of size n, run() is what is measured, on a scene built anew for every run.
+    run() asserts the tool succeeded: a tool stopping early would only show as fewer commands.
+    """
+    name = ""
+    description = ""
+
+    def build(self, n):
+        raise NotImplementedError
+
+    def run(self):
+        raise NotImplementedError
+
+
+class Reset(Case):
+    name = "reset"
+    description = "reset_attributes.main on N selected controls"
+
+    def build(self, n):
+        from mt_reset_attributes import mt_reset_attributes
+        self.tool = mt_reset_attributes
+        scenes.controls(n)
+
+    def run(self):
+        self.tool.main()
+
+
+class ResetCharacter(Case):
+    name = "reset_character"
+    description = "reset_attributes.reset_character on a namespace of N controls"
+
+    def build(self, n):
+        from mt_reset_attributes import mt_reset_attributes
+        self.tool = mt_reset_attributes
+        scenes.controls(n)
+        cm.select(clear=True)
+
+    def run(self):
+        assert self.tool.reset_character(scenes.NAMESPACE)
+
+
+class Rename(Case):
+    name = "rename"
+    description = "renamer.process_rename of N locators, numbered"
+
+    def build(self, n):
+        from mt_renamer import mt_renamer
+        self.tool = mt_renamer
+        self.objects = scenes.locators(n)
+
+    def run(self):
+        self.tool.process_rename(self.objects, "prop_####")
+
+
+class RandomValue(Case):
+    name = "random_value"
+    description = f"keyframe_randomizer.random_value on N curves of {scenes.KEYS_PER_CURVE} keys"
+
+    def build(self, n):
+        import mt_keyframe_randomizer
+        self.tool = mt_keyframe_randomizer
+        scenes.keyed_curves(n)
+        random.seed(SEED)
+
+    def run(self):
+        assert self.tool.random_value(-0.5, 0.5, selected_only=False, verbose=False)["curves"]
+
+
+class RandomTime(Case):
+    name = "random_time"
+    description = f"keyframe_randomizer.random_time on N curves of {scenes.KEYS_PER_CURVE} keys"
+
+    def build(self, n):
+        import mt_keyframe_randomizer
+        self.tool = mt_keyframe_randomizer
+        scenes.keyed_curves(n)
+        random.seed(SEED)
+
+    def run(self):
+        assert self.tool.random_time(-2, 2, selected_only=False, verbose=False)["curves"]
+
+
+class Constraints(Case):
+    name = "constraints"
+    description = "constraint_toolkit.get_all_constraints, index rebuilt, on N constraints"
+
+    def build(self, n):
+        from mt_local_constraint_manager import constraint_toolkit
+        self.tool = constraint_toolkit
+        scenes.constraints(n)
+
+    def run(self):
+        self.tool.get_all_constraints()
+
+
+class Snapper(Case):
+    name = "snapper"
+    description = f"GroundSnapper.do_it of N props on a terrain of {2 * scenes.TERRAIN_SUBDIVISIONS ** 2} triangles"
+
+    def build(self, n):
+        from mt_snap_to_ground import mt_snap_to_ground
+        terrain, _ = scenes.terrain_and_props(n)
+        self.snapper = mt_snap_to_ground.GroundSnapper()
+        self.snapper.set_ground(terrain)
+
+    def run(self):
+        self.snapper.do_it()
+
+
+class AnimToPath(Case):
+    name = "anim_to_path"
+    description = "AnimToPathGUI.anim_to_path sampling every frame of N frames"
+
+    def build(self, n):
+        from mt_anim_to_path import mt_anim_to_path
+        scenes.animated_control(n)
+        self.gui = mt_anim_to_path.AnimToPathGUI()
+        self.gui.show()
+        cm.intSliderGrp(self.gui.sample_ui, e=True, v=n)
+
+    def run(self):
+        with contextlib.redirect_stdout(io.StringIO()):  # its success message
+            assert self.gui.anim_to_path()
+
+
+class IkFk(Case):
+    name = "ik_fk"
+    description = "ik_fk_fast.main on every frame of N frames"
+
+    def build(self, n):
+        from mt_ikfk_fast import ik_fk_fast
+        self.tool = ik_fk_fast
+        self.switch = scenes.ik_fk_limb(n)
+        self.frames = n
+
+    def run(self):
+        for frame in range(1, self.frames + 1):
+            cm.currentTime(frame)
+            cm.select(self.switch)
+            self.tool.main()
+
+
+CASES = {case.name: case for case in (Reset, ResetCharacter, Rename, RandomValue, RandomTime, Constraints, Snapper,
+                                      AnimToPath, IkFk)}
+
+
+def measure(case_type, n, repeat=3) -> dict:
+    """{"seconds", "peak_kb", "commands", "calls"} of a case at scale n, the best time of repeat runs."""
+    case = case_type()
+    best = None
+    calls = {}
+    for i in range(repeat + 1):  # one more run, traced, for the memory
+        case.build(n)
+        gc.collect()
+        fake_maya.reset_counters()
+        traced = i == repeat
+        if traced:
+            tracemalloc.start()
+        start = time.perf_counter()
+        case.run()
+        elapsed = time.perf_counter() - start
+        if traced:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            best = elapsed if best is None else min(best, elapsed)
+            calls = fake_maya.counters()
+    fake_maya.new_scene()
+    return {
+        "seconds": round(best, 6),
+        "peak_kb": round(peak / 1024.0, 1),
+        "commands": sum(calls.values()),
+        "calls": dict(sorted(calls.items())),
+    }
+
+
+def exponent(small, large, n_small, n_large) -> float:
+    """Growth exponent of a measure between two scales, log(large / small) / log(n_large / n_small)."""
+    if small <= 0 or large <= 0:
+        return 0.0
+    return math.log(large / small) / math.log(n_large / n_small)
+
+
+def scaling(results) -> dict:
+    """{"commands": exponent, "seconds": exponent} of the two largest scales, the time only when it is measurable."""
+    scales = sorted(results, key=int)
+    if len(scales) < 2:
+        return {}
+    small, large = scales[-2], scales[-1]
+    growth = {"commands": exponent(results[small]["commands"], results[large]["commands"], int(small), int(large))}
+    if results[large]["seconds"] >= MIN_SECONDS:
+        growth["seconds"] = exponent(results[small]["seconds"], results[large]["seconds"], int(small), int(large))
+    return growth
+
+
+def regressions(result, baseline) -> list:
+    """What got worse than the baseline of the same case and scale, as readable lines."""
+    found = []
+    if result["commands"] > baseline["commands"] * COMMANDS_TOLERANCE:
+        found.append(f"commands {baseline['commands']} -> {result['commands']}")
+    if result["seconds"] >= MIN_SECONDS and result["seconds"] > baseline["seconds"] * TIME_TOLERANCE:
+        found.append(f"time {baseline['seconds'] * 1000:.1f}ms -> {result['seconds'] * 1000:.1f}ms")
+    if result["peak_kb"] > baseline["peak_kb"] * MEMORY_TOLERANCE:
+        found.append(f"peak memory {baseline['peak_kb']:.0f}KB -> {result['peak_kb']:.0f}KB")
+    return found
+
+
+def load_baselines(path=BASELINES) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baselines(results, path=BASELINES):
+    """Merge results in the baselines file, cases and scales not measured this time are kept."""
+    baselines = load_baselines(path)
+    for name, scales in results.items():
+        baselines.setdefault(name, {}).update(scales)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0], formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="cases:\n" + "\n".join(f"  {name:<16}  {case.description}" for name, case in CASES.items()),
+    )
+    parser.add_argument("cases", nargs="*", default=list(CASES), metavar="case",
+                        help="tools to measure, all by default")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES, help="scene sizes, 10 100 1000 by default")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scale, the best time is reported")
+    parser.add_argument("--terrain", type=int, default=scenes.TERRAIN_SUBDIVISIONS,
+                        help="subdivisions of the snapper terrain, 2 * subdivisions^2 triangles")
+    parser.add_argument("--baselines", default=BASELINES, help="baselines file, benchmarks/baselines/ by default")
+    parser.add_argument("--update-baselines", action="store_true", help="store the results as the new baselines")
+    parser.add_argument("--check", action="store_true", help="fail on a regression or a quadratic tool")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case: {', '.join(unknown)}")
+    scenes.TERRAIN_SUBDIVISIONS = args.terrain
+    scales = sorted(set(args.scales))
+
+    baselines = load_baselines(args.baselines)
+    results = {}
+    failed = False
+    print(f"{'tool':<16}  {'n':>6}  {'best ms':>9}  {'peak KB':>9}  {'commands':>9}  regressions")
+    for name in args.cases:
+        results[name] = {}
+        for n in scales:
+            result = measure(CASES[name], n, args.repeat)
+            results[name][str(n)] = result
+            found = regressions(result, baselines[name][str(n)]) if str(n) in baselines.get(name, {}) else []
+            failed = failed or bool(found)
+            print(f"{name:<16}  {n:>6}  {result['seconds'] * 1000:>9.2f}  {result['peak_kb']:>9.0f}  "
+                  f"{result['commands']:>9}  {', '.join(found) or '-'}")
+        growth = scaling(results[name])
+        quadratic = [measure_name for measure_name, value in growth.items() if value > QUADRATIC_EXPONENT]
+        failed = failed or bool(quadratic)
+        if growth:
+            report = ", ".join(f"{measure_name} n^{value:.2f}" for measure_name, value in growth.items())
+            print(f"{'':<16}  {'':>6}  scaling: {report}{'  QUADRATIC' if quadratic else ''}")
+
+    if args.update_baselines:
+        save_baselines(results, args.baselines)
+        print(f"baselines written to {os.path.relpath(args.baselines, ROOT)}")
+    return 1 if args.check and failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
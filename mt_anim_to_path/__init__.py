@@ -1,3 +1,14 @@
 __version__ = "1.0.0"
 __author__ = "LFR"
 __all__ = ["mt_anim_to_path"]
+
+try:
+    from ..mt_core import lazy
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import lazy
+
+__getattr__, __dir__ = lazy.attach(
+    __name__,
+    ["mt_anim_to_path"],
+    {"mt_anim_to_path": ["AnimToPathGUI", "show_gui"]},
+)
@@ -18,25 +18,15 @@ Usage:
 Author: LostFocusRemedies
 """
 
-from functools import wraps
+import maya.api.OpenMaya as om2
 import maya.cmds as cm
-import pymel.core as pm
 
+try:
+    from ..mt_core import edit_session, lazy, sampler, trace
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import edit_session, lazy, sampler, trace
 
-def undo_chunk(func):
-    """
-    Decorator to wrap a function in an undo chunk.
-    This allows the entire operation to be undone with a single undo command.
-    """
-    @wraps(func)
-    def inner(*args, **kwargs):
-        cm.undoInfo(openChunk=True)
-        try:
-            result = func(*args, **kwargs)
-            return result
-        finally:
-            cm.undoInfo(closeChunk=True)
-    return inner
+pm = lazy.load("pymel.core")  # imported on first use, not with the tool
 
 
 class AnimToPathGUI:
@@ -102,7 +92,8 @@ class AnimToPathGUI:
         self.get_control()
         cm.textFieldButtonGrp(self.control_ui, e=True, text=self.control)
 
-    @undo_chunk
+    @trace.span()
+    @edit_session.session("mt_anim_to_path")
     def anim_to_path(self, *args):
         """
         Convert keyframe animation to motion path animation.
@@ -122,25 +113,17 @@ class AnimToPathGUI:
             self.start_frame = cm.floatFieldGrp(self.start_frame_ui, q=True, v1=True)
             self.end_frame = cm.floatFieldGrp(self.end_frame_ui, q=True, v1=True)
             
-            frame_increment = (self.end_frame - self.start_frame) // self.sample
-            locators = []
+            frame_increment = max((self.end_frame - self.start_frame) // self.sample, 1)
+            frames = []
             cur_frame = self.start_frame
-            cm.currentTime(self.start_frame)
-
-            # Sample animation by creating locators at intervals
             while cur_frame <= (self.end_frame + frame_increment):
-                loc = cm.spaceLocator(n=self.control + "_mtPathLoc_" + str(int(cur_frame)))
-                cm.matchTransform(loc[0], self.control)
-                locators.append(loc[0])
+                frames.append(cur_frame)
                 cur_frame += frame_increment
-                cm.currentTime(cur_frame)
 
-            # Collect world positions from locators
-            curve_points = []
-            for l in locators:
-                each_shape = cm.listRelatives(l, shapes=True, path=True)[0]
-                loc_linear_position = cm.getAttr("{}.worldPosition".format(each_shape))[0]
-                curve_points.append(loc_linear_position)
+            # Sample the world positions at intervals, without scrubbing the timeline
+            to_ui = om2.MDistance(1.0, om2.MDistance.internalUnit()).asUnits(om2.MDistance.uiUnit())
+            positions = sampler.world_positions(sampler.sample([self.control], frames))[:, 0] * to_ui
+            curve_points = [tuple(p) for p in positions.tolist()]
 
             # Create curve through points
             curve_path = cm.curve(p=curve_points,
@@ -165,30 +148,21 @@ class AnimToPathGUI:
                             endTimeU=self.end_frame
                             )
                             
-            # Clean up locators
-            cm.delete(locators)
-
             # Select control and return to start frame
             cm.select(self.control, replace=True)
             cm.currentTime(self.start_frame)
 
-            # Reset control transformations
+            # Reset the control transformations the motion path doesn't drive
             ctl = pm.PyNode(self.control)
-            ctl.tx.set(0)
-            ctl.ty.set(0)
-            ctl.tz.set(0)
-            ctl.rx.set(0)
-            ctl.ry.set(0)
-            ctl.rz.set(0)
+            for attr in (ctl.tx, ctl.ty, ctl.tz, ctl.rx, ctl.ry, ctl.rz):
+                if not attr.isConnected() and not attr.isLocked():
+                    attr.set(0)
             
             print(f"Successfully converted animation to path for {self.control}")
             return True
             
         except Exception as e:
             cm.warning(f"Error in anim_to_path: {str(e)}")
-            # Clean up if needed
-            if 'locators' in locals() and locators:
-                cm.delete(locators)
             return False
 
 
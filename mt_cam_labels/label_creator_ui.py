@@ -0,0 +1,339 @@
+"""
+Label creator UI, kept apart from mtLabelCreator so Qt and PyMEL are only imported when the dialog is shown.
+mtLabelCreator still exposes LabelCreatorUI, loading this module on first access:
+
+from mtLabelCreator import LabelCreatorUI
+LabelCreatorUI.show_dialog()
+"""
+
+#----------------------------------------------------------------------------------------------------------- UI
+# UI
+# updated to use PySide6 and Shiboken6 for Maya 2022 and later
+#----------------------------------------------------------------------------------------------------------- UI 
+from PySide6 import QtCore, QtWidgets, QtGui
+from shiboken6 import wrapInstance
+
+import maya.cmds as cm
+import maya.OpenMayaUI as omui
+import pymel.core as pm
+import os
+
+try:
+    from . import label_files
+    from .mtLabelCreator import LabelCreator
+except ImportError:  # tools installed flat in the scripts folder
+    import label_files
+    from mtLabelCreator import LabelCreator
+
+def getMayaMainWindow():
+
+    mayaMainWindow = omui.MQtUtil.mainWindow()
+    ptr = wrapInstance(int(mayaMainWindow), QtWidgets.QWidget)
+    return ptr
+
+
+class MyLineEdit(QtWidgets.QLineEdit):
+
+    enter_pressed = QtCore.Signal(str)
+
+    def keyPressEvent(self, e):
+        super(MyLineEdit, self).keyPressEvent(e)
+
+        if e.key() == QtCore.Qt.Key_Enter or e.key()==QtCore.Qt.Key_Return:
+            self.enter_pressed.emit("Enter Key Pressed")
+        
+
+class LabelCreatorUI(QtWidgets.QDialog):
+
+    dlg_instance = None # maintain a single instance of the dialog in Production
+
+    @classmethod
+    def show_dialog(cls):
+        if not cls.dlg_instance:
+            cls.dlg_instance = LabelCreatorUI()
+
+        if cls.dlg_instance.isHidden():
+            cls.dlg_instance.show()
+        else:
+            cls.dlg_instance.raise_()
+            cls.dlg_instance.activateWindow()
+
+
+    def __init__(self, parent=None):
+        self.labelCreator = LabelCreator()        
+        self.fileLabels = None  # labels loaded from a file, used instead of the text field
+        self.creation = None    # running chunked creation
+
+        if parent is None:  # looked up when the dialog is built, not when the module is imported
+            parent = getMayaMainWindow()
+        super(LabelCreatorUI, self).__init__(parent)
+        self.setWindowTitle("mt Label Creator UI 1.0.0")
+        self.setMinimumWidth(500)
+        self.setMinimumHeight(100)
+        self.setMaximumWidth(500)
+        self.setWindowFlags(self.windowFlags() ^ QtCore.Qt.WindowContextHelpButtonHint)
+        
+        self.create_widgets()
+        self.create_layouts()
+        self.create_connections()
+
+
+    def create_widgets(self):
+        instruction_text_string = "To create labels, each label must be one word separated by an empty space, you can create as many labels as you want! Then select the camera, and it will be parented to it! Cheers"
+        self.instructions_text = QtWidgets.QLabel(instruction_text_string)
+        self.instructions_text.setWordWrap(True)
+
+        self.listNames_text = QtWidgets.QLabel("Labels:")
+        # self.listNames_plainTextEdit = MyLineEdit("type all names separated by one space")
+        self.listNames_plainTextEdit = QtWidgets.QPlainTextEdit("type all names separated by one space")
+        self.listNames_plainTextEdit.selectAll()
+        self.loadFile_btn = QtWidgets.QPushButton("Load File...")
+        self.loadFile_btn.setMaximumWidth(80)
+        self.clearFile_btn = QtWidgets.QPushButton("Clear File")
+        self.clearFile_btn.setMaximumWidth(80)
+        self.clearFile_btn.setEnabled(False)
+        self.file_text = QtWidgets.QLabel("")
+
+        self.cameraName_text = QtWidgets.QLabel("Camera:")
+        self.cameraName_lineEdit = MyLineEdit("cam:icare_animCam")
+        self.cameraName_lineEdit.setReadOnly(True)
+        self.cameraName_lineEdit.setMaximumWidth(150)
+        self.setColortoLocked(self.cameraName_lineEdit)
+        self.cameraNamefromSel_btn = QtWidgets.QPushButton("From Selection")
+        self.cameraNamefromSel_btn.setMaximumWidth(80)
+        self.cameraNamefromView_btn = QtWidgets.QPushButton("From Viewport")
+        self.cameraNamefromView_btn.setMaximumWidth(80)
+
+        self.frameOffset_text = QtWidgets.QLabel("Frames Offset:")
+        self.frameOffset_lineEdit = MyLineEdit("5")
+        self.frameOffset_lineEdit.setMaximumWidth(150)
+
+        self.overwrite_label = QtWidgets.QLabel("overwrite existing labels:")
+        self.overwrite_checkbox = QtWidgets.QCheckBox()
+        self.overwrite_checkbox.setChecked(True)
+        self.preserveType_label = QtWidgets.QLabel("preserve History:")
+        self.preserveType_checkbox = QtWidgets.QCheckBox()
+        self.preserveType_checkbox.setChecked(True)
+        self.setTimeRange_label = QtWidgets.QLabel("Set Time Range")
+        self.setTimeRange_checkbox = QtWidgets.QCheckBox()
+        self.setTimeRange_checkbox.setChecked(True)
+        self.backend_label = QtWidgets.QLabel("Labels as:")
+        self.backend_comboBox = QtWidgets.QComboBox()
+        self.backend_comboBox.addItem("Type geometry", "type")
+        self.backend_comboBox.addItem("Image sequence", "imagePlane")
+        self.backend_comboBox.addItem("Viewport text", "viewport")
+        self.backend_comboBox.setMaximumWidth(150)
+
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setVisible(False)
+        self.cancel_btn = QtWidgets.QPushButton("Cancel")
+        self.cancel_btn.setVisible(False)
+
+        self.create_btn = QtWidgets.QPushButton("Create")
+        self.deleteHistory_btn = QtWidgets.QPushButton("Delete History")
+        self.close_btn = QtWidgets.QPushButton("Close")
+
+
+        self.listNames_plainTextEdit.setToolTip("Write all your Labels separated by one single blank space :\" \" ")
+        self.frameOffset_lineEdit.setToolTip("set the duration of in frames of each label. Will start form the current frame.")
+        self.overwrite_checkbox.setToolTip("Delete previously created Label Group")
+        self.preserveType_checkbox.setToolTip("if checked you will preserve the \"Type\" node, and be able to modify the text later")
+        self.setTimeRange_checkbox.setToolTip("will set the time range to the actual lenght of the labels animation")
+        self.deleteHistory_btn.setToolTip("Will delete the history of all labels, increasing performance, but the text will not be editable anymore.")
+        self.loadFile_btn.setToolTip("Load labels from a csv, json or text file: name, optional duration in frames, optional group. Labels may contain spaces.")
+        self.backend_comboBox.setToolTip("Image sequence renders the labels to png files played by a single camera image plane, "
+                                         "Viewport text draws them with a single locator in Viewport 2.0, no geometry is created.")
+
+    def create_layouts(self):
+        grid_layout = QtWidgets.QGridLayout()
+        grid_layout.addWidget(self.instructions_text, 0,0,1,4)
+        grid_layout.addWidget(self.listNames_text, 1,0, QtCore.Qt.AlignRight)
+        grid_layout.addWidget(self.listNames_plainTextEdit, 1,1,1,3)
+        grid_layout.addWidget(self.file_text, 3,1)
+        grid_layout.addWidget(self.loadFile_btn, 3,2)
+        grid_layout.addWidget(self.clearFile_btn, 3,3)
+        grid_layout.addWidget(self.cameraName_text, 2,0, QtCore.Qt.AlignRight)
+        grid_layout.addWidget(self.cameraName_lineEdit, 2,1)
+        grid_layout.addWidget(self.cameraNamefromSel_btn, 2,2)
+        grid_layout.addWidget(self.cameraNamefromView_btn, 2,3)
+        grid_layout.addWidget(self.frameOffset_text, 4,0, QtCore.Qt.AlignRight)
+        grid_layout.addWidget(self.frameOffset_lineEdit, 4,1)
+        
+        grid_layout.addWidget(self.overwrite_label, 5,0, QtCore.Qt.AlignRight)
+        grid_layout.addWidget(self.overwrite_checkbox, 5,1)
+        # grid_layout.addWidget(self.preserveType_label, 5,0)
+        # grid_layout.addWidget(self.preserveType_checkbox, 5,1)
+        grid_layout.addWidget(self.setTimeRange_label, 6,0, QtCore.Qt.AlignRight)
+        grid_layout.addWidget(self.setTimeRange_checkbox, 6,1)
+        grid_layout.addWidget(self.backend_label, 7,0, QtCore.Qt.AlignRight)
+        grid_layout.addWidget(self.backend_comboBox, 7,1)
+        
+        # form_layout = QtWidgets.QFormLayout()
+        # form_layout.addRow("List of names: ", self.listNames_plainTextEdit)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        # button_layout.addStretch()
+        button_layout.addWidget(self.create_btn)
+        button_layout.addWidget(self.deleteHistory_btn)
+        button_layout.addWidget(self.close_btn)
+
+        progress_layout = QtWidgets.QHBoxLayout()
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.cancel_btn)
+
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addLayout(grid_layout)
+        main_layout.addLayout(progress_layout)
+        main_layout.addLayout(button_layout)
+
+    def create_connections(self):
+        self.cameraNamefromSel_btn.clicked.connect(self.getSelectedCamera)
+        self.cameraNamefromView_btn.clicked.connect(self.getActiveCamera)
+        self.create_btn.clicked.connect(self.callLabelCreator)
+        self.loadFile_btn.clicked.connect(self.loadLabelFile)
+        self.clearFile_btn.clicked.connect(self.clearLabelFile)
+        self.cancel_btn.clicked.connect(self.cancelLabelCreation)
+        self.deleteHistory_btn.clicked.connect(self.labelCreator.deleteHistory)
+        self.close_btn.clicked.connect(self.close)
+
+    
+    #############################################################
+    # METHODS NOT RELATED TO BUILD UI
+
+    def selectText(self):
+        cursor = self.listNames_plainTextEdit.textCursor()
+        cursor.setPosition(0)
+        cursor.setPosition(500, QtGui.QTextCursor.KeepAnchor)
+
+
+    def on_enter_pressed(self, text):
+        print("TODO")
+
+    
+    def raiseErrorRed(self, lineEdit):
+        self.cameraName_lineEdit.setStyleSheet
+        
+        # set to red
+        lineEdit.setStyleSheet("""
+                    QLineEdit{
+                        background-color: rgb(255,100,100);
+                        color: rgb(0,0,0)
+                    }""")
+
+        lineEdit.setText("You must select something!")
+        raise Warning("You must select something!")
+        return
+    
+    
+    def getSelectedCamera(self):
+        cam = cm.ls(sl=True)
+        if not cam:
+            self.raiseErrorRed(self.cameraName_lineEdit)
+            return None
+        
+        self.setColortoLocked(self.cameraName_lineEdit)
+        
+        cam = cam[0]
+        self.cameraName_lineEdit.setText(cam)
+        return cam
+
+    def getActiveCamera(self):
+        pan = pm.getPanel(withFocus=True)
+        cam = pm.windows.modelPanel(pan,q=True,camera=True)
+        
+        self.setColortoLocked(self.cameraName_lineEdit)
+
+        self.cameraName_lineEdit.setText(cam)
+        return cam
+
+    def setColortoLocked(self, lineEdit):
+        lineEdit.setStyleSheet("""
+        QLineEdit{
+            background-color: rgb(100,100,100);
+            color: rgb(40,40,40)}""")
+        return
+
+    def callLabelCreator(self):
+        names        = self.listNames_plainTextEdit.toPlainText()
+        frameOffset  = int(self.frameOffset_lineEdit.text())
+        cam          = self.cameraName_lineEdit.text()
+        overwrite    = self.overwrite_checkbox.isChecked()
+        preserve     = self.preserveType_checkbox.isChecked()
+        setTimeRange = self.setTimeRange_checkbox.isChecked()
+        backend      = self.backend_comboBox.currentData()
+
+        if self.fileLabels is not None and backend == "type":
+            self.startLabelCreation(self.fileLabels, cam, frameOffset, overwrite, preserve, setTimeRange)
+            return
+
+        self.labelCreator.labelCreator( self.fileLabels if self.fileLabels is not None else names, 
+                                        cam,
+                                        frameOffset=frameOffset, 
+                                        overwrite=overwrite, 
+                                        preserve=preserve, 
+                                        setTimeRange=setTimeRange,
+                                        backend=backend
+                                        )
+
+
+    def loadLabelFile(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Load Labels", "", label_files.FILE_FILTER)
+        if not path:
+            return
+        self.fileLabels = list(label_files.readLabelFile(path))
+        self.file_text.setText("%s labels from %s" % (len(self.fileLabels), os.path.basename(path)))
+        self.listNames_plainTextEdit.setEnabled(False)
+        self.clearFile_btn.setEnabled(True)
+
+
+    def clearLabelFile(self):
+        self.fileLabels = None
+        self.file_text.setText("")
+        self.listNames_plainTextEdit.setEnabled(True)
+        self.clearFile_btn.setEnabled(False)
+
+
+    # chunked creation: one chunk per event loop iteration, so Maya keeps redrawing the UI in between
+
+    def startLabelCreation(self, labels, cam, frameOffset, overwrite, preserve, setTimeRange):
+        self.creation = self.labelCreator.iterLabelCreation(labels,
+                                                            cam,
+                                                            frameOffset=frameOffset,
+                                                            overwrite=overwrite,
+                                                            preserve=preserve,
+                                                            setTimeRange=setTimeRange
+                                                            )
+        self.progress_bar.setRange(0, len(labels))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.cancel_btn.setVisible(True)
+        self.create_btn.setEnabled(False)
+        QtCore.QTimer.singleShot(0, self.stepLabelCreation)
+
+
+    def stepLabelCreation(self):
+        if self.creation is None:
+            return
+        try:
+            created, total = next(self.creation)
+        except StopIteration:
+            self.finishLabelCreation()
+            return
+        except Exception:
+            self.finishLabelCreation()
+            raise
+        self.progress_bar.setValue(created)
+        QtCore.QTimer.singleShot(0, self.stepLabelCreation)
+
+
+    def cancelLabelCreation(self):
+        if self.creation is not None:
+            self.creation.close()  # keeps and finalizes the labels created so far
+        self.finishLabelCreation()
+
+
+    def finishLabelCreation(self):
+        self.creation = None
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.create_btn.setEnabled(True)
@@ -0,0 +1,81 @@
+"""
+Label list readers for mtLabelCreator.
+
+Labels can come from csv, json or plain text exports, each label being a name,
+an optional duration in frames (defaults to the creator frameOffset) and an optional group.
+The readers are generators and don't need Maya, so huge exports are streamed.
+
+csv:  name,duration,group       (header optional, columns after name optional)
+json: ["walk", {"name": "run cycle", "duration": 12, "group": "locomotion"}, ...]
+      or {"labels": [...]}
+text: one label per line, spaces allowed, lines starting with # are ignored
+"""
+
+import csv
+import json
+import os
+from collections import namedtuple
+
+LabelSpec = namedtuple("LabelSpec", ["name", "duration", "group"])
+
+FILE_FILTER = "Label lists (*.csv *.json *.txt);;All files (*)"
+
+
+def parseDuration(value):
+    if value in (None, ""):
+        return None
+    duration = int(round(float(value)))
+    if duration < 1:
+        raise ValueError("label duration must be at least one frame, got %s" % value)
+    return duration
+
+
+def asLabelSpec(item):
+    """Accept a LabelSpec, a plain string, a (name, duration, group) sequence or a dict."""
+    if isinstance(item, LabelSpec):
+        return item
+    if isinstance(item, str):
+        return LabelSpec(item, None, None)
+    if isinstance(item, dict):
+        return LabelSpec(str(item["name"]), parseDuration(item.get("duration")), item.get("group") or None)
+    values = list(item) + [None, None]
+    return LabelSpec(str(values[0]), parseDuration(values[1]), values[2] or None)
+
+
+def iterCsvLabels(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = csv.reader(f)
+        for num, row in enumerate(rows):
+            row = [cell.strip() for cell in row]
+            if not row or not row[0]:
+                continue
+            if num == 0 and row[0].lower() == "name":
+                continue  # header
+            yield asLabelSpec(row[:3])
+
+
+def iterJsonLabels(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("labels", [])
+    for item in data:
+        yield asLabelSpec(item)
+
+
+def iterTextLabels(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield LabelSpec(line, None, None)
+
+
+def readLabelFile(path):
+    """Return a generator of LabelSpec, the format is picked from the file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return iterCsvLabels(path)
+    if extension == ".json":
+        return iterJsonLabels(path)
+    return iterTextLabels(path)
@@ -0,0 +1,99 @@
+"""
+Offscreen label image rendering for mtLabelCreator.
+
+Renders every label string into a numbered PNG sequence (label.0001.png, label.0002.png, ...)
+using QImage/QPainter only, so it has no Maya dependency and can run headless:
+
+QT_QPA_PLATFORM=offscreen python -c "
+from mt_cam_labels import label_images
+print(label_images.renderLabelSequence(['walk', 'run cycle'], '/tmp/labels'))
+"
+
+The images are written in parallel with a thread pool: QImage is a plain memory buffer,
+so painting into it is safe outside of the GUI thread.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6 import QtCore, QtGui
+
+SEQUENCE_PREFIX = "label"
+SEQUENCE_PADDING = 4
+
+
+def ensureGuiApplication():
+    """QFont needs a QGuiApplication, Maya already has one, a headless session may not."""
+    app = QtGui.QGuiApplication.instance()
+    if app is None:
+        app = QtGui.QGuiApplication([])
+    return app
+
+
+def sequenceFileName(outputDir, index, prefix=SEQUENCE_PREFIX):
+    """Return the path of the image for the label at 1-based index."""
+    return os.path.join(outputDir, "%s.%s.png" % (prefix, str(index).zfill(SEQUENCE_PADDING)))
+
+
+def renderLabelImage(text, filePath, width=1920, height=1080, fontSize=64, margin=48):
+    """Paint a single label on a transparent image, bottom left corner, and save it as png."""
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.transparent)
+
+    painter = QtGui.QPainter(image)
+    try:
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.TextAntialiasing)
+        font = QtGui.QFont()
+        font.setPixelSize(fontSize)
+        font.setBold(True)
+        painter.setFont(font)
+
+        rect = QtCore.QRect(margin, margin, width - 2 * margin, height - 2 * margin)
+        alignment = QtCore.Qt.AlignLeft | QtCore.Qt.AlignBottom
+
+        # a dark drop shadow keeps the text readable over any background
+        painter.setPen(QtGui.QColor(0, 0, 0, 200))
+        painter.drawText(rect.translated(3, 3), alignment, text)
+        painter.setPen(QtGui.QColor(255, 255, 255))
+        painter.drawText(rect, alignment, text)
+    finally:
+        painter.end()
+
+    if not image.save(filePath, "PNG"):
+        raise IOError("could not write label image: %s" % filePath)
+    return filePath
+
+
+def renderLabelSequence(names, outputDir, prefix=SEQUENCE_PREFIX, width=1920, height=1080, fontSize=64, workers=None):
+    """Render all the labels into a numbered png sequence, starting at 1.
+
+    Args:
+        names (list): label strings, one image per label.
+        outputDir (str): folder receiving the sequence, created if missing.
+        prefix (str): sequence file prefix.
+        width (int), height (int): image resolution, should match the camera film gate ratio.
+        fontSize (int): text height in pixels.
+        workers (int): number of threads, defaults to the ThreadPoolExecutor default.
+
+    Returns:
+        list: the written file paths, in label order.
+    """
+    ensureGuiApplication()
+    if not os.path.isdir(outputDir):
+        os.makedirs(outputDir)
+
+    # remove leftovers of a previous, longer, sequence so Maya doesn't pick them up
+    stale = [f for f in os.listdir(outputDir) if f.startswith(prefix + ".") and f.endswith(".png")]
+    for f in stale:
+        os.remove(os.path.join(outputDir, f))
+
+    paths = [sequenceFileName(outputDir, i, prefix) for i in range(1, len(names) + 1)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(renderLabelImage, text, path, width, height, fontSize)
+            for text, path in zip(names, paths)
+        ]
+        for future in futures:
+            future.result()  # re-raise the first failure, if any
+    return paths
@@ -2,92 +2,129 @@
 Label creator, created for Studio library and charcater study 
 in early stages of production, to better present poses and animations
 
+The tool is made of mtLabelCreator.py, label_creator_ui.py, label_files.py, label_images.py, mtLabelNode.py
+and the shared mt_core folder, all placed side by side in the scripts folder (or used as the mt_cam_labels package).
+
 import mtLabelCreator as mtlc
 reload(mtlc)
 
 names = "some sample labels separated by a space"
-mtlc.labelCreator(names = names, frameOffset = 5)
-
-or for the UI
+mtlc.LabelCreator().labelCreator(names = names, frameOffset = 5)
 
-#import mtLabelCreator as mtlc
-#reload(mtlc)
+or for the UI, which lives in label_creator_ui (mtLabelCreator.LabelCreatorUI still loads it on first access)
 
 -- while developing:
+import label_creator_ui
+reload(label_creator_ui)
+
 try:
    LabelCreatorUI.close() # pylint: disable=E0601
    LabelCreatorUI.deleteLater()
 except:
    pass
 
-LabelCreatorUI = mtlc.LabelCreatorUI()
+LabelCreatorUI = label_creator_ui.LabelCreatorUI()
 LabelCreatorUI.show()
 
 -- deployed:
 
-from mtLabelCreator import LabelCreatorUI
+from label_creator_ui import LabelCreatorUI
 LabelCreatorUI.show_dialog()
 
 """
 
 import maya.cmds as cm
-import pymel.core as pm
-import maya.app.type.typeToolSetup as mtype
-import maya.mel as mel
+import json
+import os
 import pprint
+import re
 import time
 
+try:
+    from . import label_files
+except ImportError:  # tools installed flat in the scripts folder
+    import label_files
+
+try:
+    from ..mt_core import edit_session, lazy, trace
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import edit_session, lazy, trace
+
+pm = lazy.load("pymel.core")  # imported on first use, not with the tool
+
 class LabelCreator(object):
     def __init__(self):
         self.USER_BUFFER_NAME = "labels_user_buffer"
         self.TRANSFORM_BUFFER_NAME = "labels_transforms_buffer"
         self.PARENT_BUFFER_NAME = "labels_parent_buffer"
+        self.IMAGE_PLANE_NAME = "labels_imagePlane"
+        self.MANIFEST_ATTR = "mtLabelManifest"
+        self.VISIBILITY_ATTR = "labelsVisibility"
+        self.DISPLAY_NODE_NAME = "labels_display"
+        self.BACKENDS = ("type", "imagePlane", "viewport")
+        self.CHUNK_SIZE = 100
+        self.durations = []  # per label duration in frames, None meaning frameOffset
+        self.groups = []
         # self.FIRST_FRAME = pm.playbackOptions(q=True, animationStartTime=True)
         self.FIRST_FRAME = pm.currentTime(q=True)
 
 
-    def labelCreator(self, names, cam="cam", frameOffset=5, overwrite=True, preserve=False, setTimeRange=True, legacyKeyframes=False):
+    @trace.span()
+    @edit_session.session("mtLabelCreator")
+    def labelCreator(self, names, cam="cam", frameOffset=5, overwrite=True, preserve=False, setTimeRange=True, legacyKeyframes=False, backend="type", imageDir=None):
         
         if not cm.objExists(cam):
             raise cm.error("camera is not existent!")
 
+        if backend not in self.BACKENDS:
+            raise ValueError("unknown backend %s, expected one of %s" % (backend, self.BACKENDS))
+
+        self.frameOffset = frameOffset
+        names = self.readLabels(names)
+
+        # an existing label set is diffed against the new names instead of being rebuilt
+        if overwrite and backend == "type" and not legacyKeyframes and self.readManifest() is not None:
+            self.followCamera(cam)
+            self.updateLabels(names, preserve=preserve)
+            if setTimeRange:
+                self.setTimeRange()
+            return
+
         if overwrite == True:
             self.deleteLabels()
 
-        self.frameOffset = frameOffset
-        names = self.parseStringIntoList(names)
-        frame = self.FIRST_FRAME
-        cam = pm.PyNode(cam)
+        if backend in ("imagePlane", "viewport"):
+            if backend == "imagePlane":
+                self.imagePlaneLabels(names, cam, imageDir)
+            else:
+                self.viewportLabels(names, cam)
+            if setTimeRange:
+                self.setTimeRange()
+            return
 
-        self.allTexts = []
+        frames = self.labelStartFrames(len(names))
 
-        for each in names:
-            mtype.createTypeTool(text=each)
-            
-            currentTextShapeNode = pm.ls(sl=True)[0]
-            typeNode = currentTextShapeNode.listConnections()[0]
-            # typeNode.alignmentMode.set(2)
+        self.allTexts = []
 
-            currentTextTransformNode = currentTextShapeNode.getTransform() 
-            currentTextTransformNode.rename(each)
+        for num, each in enumerate(names):
+            currentTextTransformNode = pm.PyNode(self.createTypeLabel(each))
 
-            currentTextTransformNode.visibility.setKey(value=0, time=frame-1)
+            currentTextTransformNode.visibility.setKey(value=0, time=frames[num]-1)
             if legacyKeyframes:
-                currentTextTransformNode.visibility.setKey(value=1, time=frame)
-                currentTextTransformNode.visibility.setKey(value=0, time=frame + self.frameOffset)
+                currentTextTransformNode.visibility.setKey(value=1, time=frames[num])
+                currentTextTransformNode.visibility.setKey(value=0, time=frames[num + 1])
 
-            frame += self.frameOffset
             self.allTexts.append(currentTextTransformNode)
 
 
-        pm.select(self.allTexts, r=True)
-        user_buffer = pm.group(name = self.USER_BUFFER_NAME)
-        transforms_buffer = pm.group(name = self.TRANSFORM_BUFFER_NAME)
-        parent_buffer = pm.group(name = self.PARENT_BUFFER_NAME)
+        user_buffer = self.createBuffers(cam)
+        self.allTexts = pm.parent(self.allTexts, user_buffer, relative=True)
 
         # !!!!!!!!!!!!!!!
         if not legacyKeyframes:
             self.createCtlWithConditions(self.allTexts, user_buffer)
+            self.writeManifest(self.allTexts, user_buffer, texts=names, groups=self.groups)
+            self.groupLabels(self.allTexts, self.groups)
         else:
             self.updateScreen()
 
@@ -97,6 +134,18 @@ class LabelCreator(object):
         if setTimeRange:
             self.setTimeRange()
 
+
+        #TODO utils function for this
+        #pprint.pprint( cm.listAttr(typeTool))
+
+
+    def createBuffers(self, cam):
+        """Create the empty buffer hierarchy following the camera. Returns the user buffer, receiving the labels."""
+        cam = pm.PyNode(cam)
+        parent_buffer = pm.group(empty=True, name = self.PARENT_BUFFER_NAME)
+        transforms_buffer = pm.group(empty=True, name = self.TRANSFORM_BUFFER_NAME, parent=parent_buffer)
+        user_buffer = pm.group(empty=True, name = self.USER_BUFFER_NAME, parent=transforms_buffer)
+
         transforms_buffer.translateX.set(-0.652)
         transforms_buffer.translateY.set(-0.35)
         transforms_buffer.translateZ.set(-2.70)
@@ -114,291 +163,460 @@ class LabelCreator(object):
         transforms_buffer.scaleZ.lock(True)
 
         # pm.parentConstraint(cam, parent_buffer)
-        cam.translateX >> parent_buffer.translateX
-        cam.translateY >> parent_buffer.translateY
-        cam.translateZ >> parent_buffer.translateZ
-        cam.rotateX >> parent_buffer.rotateX
-        cam.rotateY >> parent_buffer.rotateY
-        cam.rotateZ >> parent_buffer.rotateZ
+        self.followCamera(str(cam), str(parent_buffer))
 
+        return user_buffer
 
-        #TODO utils function for this
-        #pprint.pprint( cm.listAttr(typeTool))
 
+    def followCamera(self, cam, parent_buffer=None):
+        """Drive the parent buffer translate and rotate by cam, replacing the camera it followed before."""
+        parent_buffer = parent_buffer or self.PARENT_BUFFER_NAME
+        for attr in ("translateX", "translateY", "translateZ", "rotateX", "rotateY", "rotateZ"):
+            source = "%s.%s" % (cam, attr)
+            destination = "%s.%s" % (parent_buffer, attr)
+            if not cm.isConnected(source, destination):
+                cm.connectAttr(source, destination, force=True)
 
-    def createCtlWithConditions(self, labelList, parent):
-        time=self.FIRST_FRAME
-        
-        parent_attribute_name = "labelsVisibility"
-        parent.addAttr(parent_attribute_name, at="short", k=True, min=0, max=len(labelList), defaultValue=1)
-        
-        for num, label in enumerate(labelList, start=1):
-            condition_node_string = cm.shadingNode("condition", asUtility=True, name=("condition_%s" % num))
-            condition_node = pm.PyNode(condition_node_string)
 
-            parent.labelsVisibility >> condition_node.firstTerm
+    def iterLabelCreation(self, labels, cam="cam", frameOffset=5, overwrite=True, preserve=False, setTimeRange=True, chunkSize=None):
+        """
+        Generator version of labelCreator for thousands of labels, meant to be driven from an event loop:
+        every step creates one chunk of labels with the viewport refresh suspended, in its own undo chunk,
+        then yields (created, total) so the caller can update a progress bar and stay responsive.
+        An existing label set is diffed first, like labelCreator does, and only the missing labels are created.
+        Closing the generator cancels the creation, the labels created so far are kept and finalized.
 
-            condition_node.secondTerm.set(num)
-            condition_node.colorIfTrueR.set(1)
-            condition_node.colorIfFalseR.set(0)
+        Args:
+            labels: a label string, a list of strings or LabelSpec, or a label_files reader.
+        """
+        if not cm.objExists(cam):
+            raise cm.error("camera is not existent!")
 
-            condition_node.outColorR >> label.visibility
+        chunkSize = chunkSize or self.CHUNK_SIZE
+        self.frameOffset = frameOffset
+        names = self.readLabels(labels)
+        total = len(names)
+
+        if overwrite and self.readManifest() is not None:
+            user_buffer = self.USER_BUFFER_NAME
+            with edit_session.session("mtLabelCreator"):
+                self.followCamera(cam)
+                ordered = self.diffLabels(names)
+        else:
+            if overwrite:
+                self.deleteLabels()
+            user_buffer = str(self.createBuffers(cam))
+            self.addVisibilityAttr(user_buffer, total)
+            ordered = [None] * total
+
+        missing = [index for index, entry in enumerate(ordered) if entry is None]
+        done = total - len(missing)
+        self.allTexts = []
 
-            parent.labelsVisibility.setKey(value=num, time=time)
-            time += self.frameOffset
+        try:
+            for start in range(0, len(missing), chunkSize):
+                with edit_session.session("mtLabelCreator"):
+                    created = []
+                    for index in missing[start:start + chunkSize]:
+                        ordered[index] = self.createIndexedLabel(names[index], user_buffer, index + 1)
+                        created.append(ordered[index]["node"])
+                    if created and not preserve:
+                        cm.delete(created, constructionHistory=True)
+                done += len(created)
+
+                yield done, total
+        finally:
+            # also reached on cancel, so the labels created so far are consistent
+            self.finishLabels(ordered, user_buffer, self.groups)
+            if setTimeRange and self.allTexts:
+                self.setTimeRange()
+
+
+    def readLabels(self, labels):
+        """
+        Normalize any label input to a list of names, storing the durations and groups on the creator.
+        A string is split on spaces, like the UI, anything else is read as LabelSpec items.
+        """
+        if isinstance(labels, str):
+            labels = self.parseStringIntoList(labels)
+        specs = [label_files.asLabelSpec(label) for label in labels]
+        self.durations = [spec.duration for spec in specs]
+        self.groups = [spec.group for spec in specs]
+        return [spec.name for spec in specs]
+
+
+    def labelStartFrames(self, count):
+        """
+        Returns count + 1 frames: the first frame of every label, followed by the frame right after the last label.
+        """
+        frames = [self.FIRST_FRAME]
+        for num in range(count):
+            duration = self.durations[num] if num < len(self.durations) else None
+            frames.append(frames[-1] + (duration or self.frameOffset))
+        return frames
+
+
+    def groupLabels(self, labelList, groups):
+        """Add the labels sharing a group to a <group>_labels set."""
+        members = {}
+        for label, group in zip(labelList, groups):
+            if group:
+                members.setdefault(group, []).append(str(label))
+        for group, labels in members.items():
+            setName = "%s_labels" % self.nodeName(group)
+            if cm.objExists(setName):
+                cm.sets(labels, addElement=setName)
+            else:
+                cm.sets(labels, name=setName)
+
+
+    def imagePlaneLabels(self, names, cam, imageDir=None, width=1920):
+        """
+        Alternative to the type geometry: every label is rendered offscreen into a numbered png sequence,
+        played back by a single image plane on the camera. The scene cost is one image plane,
+        whatever the amount of labels.
+        """
+        if imageDir is None:
+            imageDir = self.defaultImageDir()
+
+        # match the film gate ratio, so the text isn't stretched
+        camShape = cam
+        if cm.nodeType(cam) != "camera":
+            camShape = cm.listRelatives(cam, shapes=True, type="camera", fullPath=True)[0]
+        aspect = cm.getAttr(camShape + ".horizontalFilmAperture") / cm.getAttr(camShape + ".verticalFilmAperture")
+        height = int(round(width / aspect))
+
+        # Qt is only loaded for the image plane backend
+        try:
+            from . import label_images
+        except ImportError:  # tools installed flat in the scripts folder
+            import label_images
+
+        paths = label_images.renderLabelSequence(names, imageDir, width=width, height=height)
+        self.allTexts = list(names)
+
+        planeTransform, planeShape = cm.imagePlane(camera=cam, fileName=paths[0], name=self.IMAGE_PLANE_NAME)
+        cm.setAttr(planeShape + ".useFrameExtension", 1)
+        cm.setAttr(planeShape + ".displayOnlyIfCurrent", 1)
+
+        # image N is held for its duration, starting from the first frame
+        frames = self.labelStartFrames(len(paths))
+        for index in range(1, len(paths) + 1):
+            cm.setKeyframe(planeShape, attribute="frameExtension", value=index, time=frames[index - 1], outTangentType="step")
+
+        return planeTransform
+
+
+    def viewportLabels(self, names, cam):
+        """
+        Lightest backend: a single mtLabelDisplay locator holding the label table,
+        drawing the current label as screen space text in the camera view. No geometry, no per label node.
+        """
+        pluginPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mtLabelNode.py")
+        if not cm.pluginInfo(pluginPath, q=True, loaded=True):
+            cm.loadPlugin(pluginPath, quiet=True)
+
+        frames = self.labelStartFrames(len(names))[:-1]
+        self.allTexts = list(names)
+
+        shape = cm.createNode("mtLabelDisplay", name=self.DISPLAY_NODE_NAME + "Shape")
+        transform = cm.rename(cm.listRelatives(shape, parent=True)[0], self.DISPLAY_NODE_NAME)
+        shape = cm.listRelatives(transform, shapes=True, fullPath=True)[0]
 
+        cm.setAttr(shape + ".labels", len(names), *names, type="stringArray")
+        cm.setAttr(shape + ".startFrames", frames, type="doubleArray")
+        cm.setAttr(shape + ".firstFrame", self.FIRST_FRAME)
+        cm.setAttr(shape + ".frameOffset", self.frameOffset)
+        cm.connectAttr("time1.outTime", shape + ".time")
 
-    def wait(self):
-        time.sleep(1 * len(self.allTexts))
+        camShape = cam
+        if cm.nodeType(cam) != "camera":
+            camShape = cm.listRelatives(cam, shapes=True, type="camera", fullPath=True)[0]
+        cm.connectAttr(camShape + ".message", shape + ".camera")
+        return transform
 
 
-    def parseStringIntoList(self, namesString):
-        namesList = [w for w in namesString.split(" ")]
-        return namesList
+    def defaultImageDir(self):
+        root = cm.workspace(q=True, rootDirectory=True)
+        images = cm.workspace(fileRuleEntry="images") or "images"
+        return os.path.join(root, images, "mtLabels")
 
 
-    def deleteLabels(self):
-        if pm.objExists(self.PARENT_BUFFER_NAME):
-            try: 
-                mel.eval("MLdeleteUnused")
-                pm.delete(self.PARENT_BUFFER_NAME, hi="below")
-            except : 
-                raise Warning
+    def createTypeLabel(self, text):
+        """Create one type tool text, renamed after its text. Returns the transform name."""
+        import maya.app.type.typeToolSetup as mtype  # loads the type tool, slow, only when a label is made
 
-    def updateScreen(self):
-        pm.currentTime( self.FIRST_FRAME + 1, edit=True)
-        pm.currentTime( self.FIRST_FRAME, edit=True)
+        mtype.createTypeTool(text=text)
 
+        currentTextShapeNode = cm.ls(sl=True)[0]
+        # typeNode.alignmentMode.set(2)
 
-    def deleteHistory(self):
-        pm.delete(self.allTexts, constructionHistory=True)
+        currentTextTransformNode = cm.listRelatives(currentTextShapeNode, parent=True)[0]
+        return cm.rename(currentTextTransformNode, self.nodeName(text))
 
-    
-    def setTimeRange(self):
-        print("setting time range")
-        last_frame = self.FIRST_FRAME + (len(self.allTexts) * self.frameOffset) -1
 
-        pm.playbackOptions( min = self.FIRST_FRAME,
-                            max = last_frame)
+    def nodeName(self, text):
+        """Labels may contain spaces and punctuation, node names can't."""
+        name = re.sub(r"\W", "_", text.strip())
+        if not name or name[0].isdigit():
+            name = "_" + name
+        return name
 
 
+    def createCondition(self, label, parent, num):
+        """Create the condition node showing label when parent.labelsVisibility == num."""
+        condition_node = cm.shadingNode("condition", asUtility=True, name=("condition_%s" % num))
 
-#----------------------------------------------------------------------------------------------------------- UI
-# UI
-# updated to use PySide6 and Shiboken6 for Maya 2022 and later
-#----------------------------------------------------------------------------------------------------------- UI 
-from PySide6 import QtCore, QtWidgets, QtGui
-from shiboken6 import wrapInstance
+        cm.connectAttr("%s.%s" % (parent, self.VISIBILITY_ATTR), condition_node + ".firstTerm")
 
-import maya.OpenMaya as om
-import maya.OpenMayaUI as omui
+        cm.setAttr(condition_node + ".secondTerm", num)
+        cm.setAttr(condition_node + ".colorIfTrueR", 1)
+        cm.setAttr(condition_node + ".colorIfFalseR", 0)
 
-def getMayaMainWindow():
+        cm.connectAttr(condition_node + ".outColorR", "%s.visibility" % label, force=True)
+        return condition_node
 
-    mayaMainWindow = omui.MQtUtil.mainWindow()
-    ptr = wrapInstance(int(mayaMainWindow), QtWidgets.QWidget)
-    return ptr
 
+    def addVisibilityAttr(self, parent, count):
+        cm.addAttr(str(parent), longName=self.VISIBILITY_ATTR, at="short", k=True, min=0, max=max(count, 1), defaultValue=1)
 
-class MyLineEdit(QtWidgets.QLineEdit):
 
-    enter_pressed = QtCore.Signal(str)
+    def createCtlWithConditions(self, labelList, parent):
+        self.addVisibilityAttr(parent, len(labelList))
+        
+        for num, label in enumerate(labelList, start=1):
+            self.createCondition(label, parent, num)
 
-    def keyPressEvent(self, e):
-        super(MyLineEdit, self).keyPressEvent(e)
+        self.writeVisibilityKeys(parent, len(labelList))
 
-        if e.key() == QtCore.Qt.Key_Enter or e.key()==QtCore.Qt.Key_Return:
-            self.enter_pressed.emit("Enter Key Pressed")
-        
 
-class LabelCreatorUI(QtWidgets.QDialog):
+    def writeVisibilityKeys(self, parent, count):
+        """
+        Key parent.labelsVisibility to 1, 2, ... count every frameOffset frames, stepped.
+        All the keys are written at once in the keyTimeValue multi of a fresh curve,
+        so it stays a handful of undoable commands whatever the amount of labels.
+        """
+        plug = "%s.%s" % (parent, self.VISIBILITY_ATTR)
+        cm.cutKey(str(parent), attribute=self.VISIBILITY_ATTR, clear=True)
+        if not count:
+            return None
 
-    dlg_instance = None # maintain a single instance of the dialog in Production
+        frames = self.labelStartFrames(count)
+        keys = []
+        for num in range(1, count + 1):
+            keys.extend((frames[num - 1], num))
 
-    @classmethod
-    def show_dialog(cls):
-        if not cls.dlg_instance:
-            cls.dlg_instance = LabelCreatorUI()
+        curve = cm.createNode("animCurveTU", name="%s_%s" % (str(parent).split("|")[-1], self.VISIBILITY_ATTR))
+        cm.setAttr("%s.ktv[0:%d]" % (curve, count - 1), *keys)
+        cm.keyTangent(curve, itt="step", ott="step")
+        cm.connectAttr(curve + ".output", plug)
+        return curve
 
-        if cls.dlg_instance.isHidden():
-            cls.dlg_instance.show()
-        else:
-            cls.dlg_instance.raise_()
-            cls.dlg_instance.activateWindow()
 
+    #----------------------------------------------------------------------- incremental update
+    # The user buffer holds a manifest of the labels it contains, in order, by uuid:
+    # the next call diffs the new names against it and only touches what changed.
 
-    def __init__(self, parent=getMayaMainWindow()):
-        self.labelCreator = LabelCreator()        
+    def readManifest(self):
+        plug = "%s.%s" % (self.USER_BUFFER_NAME, self.MANIFEST_ATTR)
+        if not cm.objExists(plug):
+            return None
+        try:
+            return json.loads(cm.getAttr(plug) or "")
+        except ValueError:
+            return None
 
-        super(LabelCreatorUI, self).__init__(parent)
-        self.setWindowTitle("mt Label Creator UI 1.0.0")
-        self.setMinimumWidth(500)
-        self.setMinimumHeight(100)
-        self.setMaximumWidth(500)
-        self.setWindowFlags(self.windowFlags() ^ QtCore.Qt.WindowContextHelpButtonHint)
-        
-        self.create_widgets()
-        self.create_layouts()
-        self.create_connections()
-
-
-    def create_widgets(self):
-        instruction_text_string = "To create labels, each label must be one word separated by an empty space, you can create as many labels as you want! Then select the camera, and it will be parented to it! Cheers"
-        self.instructions_text = QtWidgets.QLabel(instruction_text_string)
-        self.instructions_text.setWordWrap(True)
-
-        self.listNames_text = QtWidgets.QLabel("Labels:")
-        # self.listNames_plainTextEdit = MyLineEdit("type all names separated by one space")
-        self.listNames_plainTextEdit = QtWidgets.QPlainTextEdit("type all names separated by one space")
-        self.listNames_plainTextEdit.selectAll()
-
-        self.cameraName_text = QtWidgets.QLabel("Camera:")
-        self.cameraName_lineEdit = MyLineEdit("cam:icare_animCam")
-        self.cameraName_lineEdit.setReadOnly(True)
-        self.cameraName_lineEdit.setMaximumWidth(150)
-        self.setColortoLocked(self.cameraName_lineEdit)
-        self.cameraNamefromSel_btn = QtWidgets.QPushButton("From Selection")
-        self.cameraNamefromSel_btn.setMaximumWidth(80)
-        self.cameraNamefromView_btn = QtWidgets.QPushButton("From Viewport")
-        self.cameraNamefromView_btn.setMaximumWidth(80)
-
-        self.frameOffset_text = QtWidgets.QLabel("Frames Offset:")
-        self.frameOffset_lineEdit = MyLineEdit("5")
-        self.frameOffset_lineEdit.setMaximumWidth(150)
-
-        self.overwrite_label = QtWidgets.QLabel("overwrite existing labels:")
-        self.overwrite_checkbox = QtWidgets.QCheckBox()
-        self.overwrite_checkbox.setChecked(True)
-        self.preserveType_label = QtWidgets.QLabel("preserve History:")
-        self.preserveType_checkbox = QtWidgets.QCheckBox()
-        self.preserveType_checkbox.setChecked(True)
-        self.setTimeRange_label = QtWidgets.QLabel("Set Time Range")
-        self.setTimeRange_checkbox = QtWidgets.QCheckBox()
-        self.setTimeRange_checkbox.setChecked(True)
-
-        self.create_btn = QtWidgets.QPushButton("Create")
-        self.deleteHistory_btn = QtWidgets.QPushButton("Delete History")
-        self.close_btn = QtWidgets.QPushButton("Close")
-
-
-        self.listNames_plainTextEdit.setToolTip("Write all your Labels separated by one single blank space :\" \" ")
-        self.frameOffset_lineEdit.setToolTip("set the duration of in frames of each label. Will start form the current frame.")
-        self.overwrite_checkbox.setToolTip("Delete previously created Label Group")
-        self.preserveType_checkbox.setToolTip("if checked you will preserve the \"Type\" node, and be able to modify the text later")
-        self.setTimeRange_checkbox.setToolTip("will set the time range to the actual lenght of the labels animation")
-        self.deleteHistory_btn.setToolTip("Will delete the history of all labels, increasing performance, but the text will not be editable anymore.")
-
-    def create_layouts(self):
-        grid_layout = QtWidgets.QGridLayout()
-        grid_layout.addWidget(self.instructions_text, 0,0,1,4)
-        grid_layout.addWidget(self.listNames_text, 1,0, QtCore.Qt.AlignRight)
-        grid_layout.addWidget(self.listNames_plainTextEdit, 1,1,1,3)
-        grid_layout.addWidget(self.cameraName_text, 2,0, QtCore.Qt.AlignRight)
-        grid_layout.addWidget(self.cameraName_lineEdit, 2,1)
-        grid_layout.addWidget(self.cameraNamefromSel_btn, 2,2)
-        grid_layout.addWidget(self.cameraNamefromView_btn, 2,3)
-        grid_layout.addWidget(self.frameOffset_text, 4,0, QtCore.Qt.AlignRight)
-        grid_layout.addWidget(self.frameOffset_lineEdit, 4,1)
-        
-        grid_layout.addWidget(self.overwrite_label, 5,0, QtCore.Qt.AlignRight)
-        grid_layout.addWidget(self.overwrite_checkbox, 5,1)
-        # grid_layout.addWidget(self.preserveType_label, 5,0)
-        # grid_layout.addWidget(self.preserveType_checkbox, 5,1)
-        grid_layout.addWidget(self.setTimeRange_label, 6,0, QtCore.Qt.AlignRight)
-        grid_layout.addWidget(self.setTimeRange_checkbox, 6,1)
-        
-        # form_layout = QtWidgets.QFormLayout()
-        # form_layout.addRow("List of names: ", self.listNames_plainTextEdit)
-
-        button_layout = QtWidgets.QHBoxLayout()
-        # button_layout.addStretch()
-        button_layout.addWidget(self.create_btn)
-        button_layout.addWidget(self.deleteHistory_btn)
-        button_layout.addWidget(self.close_btn)
-
-        main_layout = QtWidgets.QVBoxLayout(self)
-        main_layout.addLayout(grid_layout)
-        main_layout.addLayout(button_layout)
-
-    def create_connections(self):
-        self.cameraNamefromSel_btn.clicked.connect(self.getSelectedCamera)
-        self.cameraNamefromView_btn.clicked.connect(self.getActiveCamera)
-        self.create_btn.clicked.connect(self.callLabelCreator)
-        self.deleteHistory_btn.clicked.connect(self.labelCreator.deleteHistory)
-        self.close_btn.clicked.connect(self.close)
 
-    
-    #############################################################
-    # METHODS NOT RELATED TO BUILD UI
+    def writeManifest(self, labelList, parent, texts=None, groups=None):
+        texts = texts or [str(label).split("|")[-1] for label in labelList]
+        groups = groups or [None] * len(labelList)
+        labels = []
+        for label, text, group in zip(labelList, texts, groups):
+            label = str(label)
+            condition = cm.listConnections(label + ".visibility", source=True, destination=False, type="condition") or []
+            labels.append({
+                "text": text,
+                "group": group,
+                "node": cm.ls(label, uuid=True)[0],
+                "condition": cm.ls(condition[0], uuid=True)[0] if condition else None,
+            })
+
+        parent = str(parent)
+        if not cm.attributeQuery(self.MANIFEST_ATTR, node=parent, exists=True):
+            cm.addAttr(parent, longName=self.MANIFEST_ATTR, dataType="string")
+        cm.setAttr("%s.%s" % (parent, self.MANIFEST_ATTR), json.dumps({"labels": labels}), type="string")
+
+
+    def updateLabels(self, names, preserve=False):
+        """
+        Diff names against the manifest (see diffLabels), create the missing labels,
+        then rewrite the timing keys once at the end.
+        """
+        parent = self.USER_BUFFER_NAME
+        ordered = self.diffLabels(names)
+
+        created = []
+        for index, text in enumerate(names):
+            if ordered[index] is None:
+                ordered[index] = self.createIndexedLabel(text, parent, index + 1)
+                created.append(ordered[index]["node"])
+
+        if created and not preserve:
+            cm.delete(created, constructionHistory=True)
+
+        self.finishLabels(ordered, parent, self.groups)
+
+
+    def diffLabels(self, names):
+        """
+        Diff names against the manifest: labels with an unchanged text are kept (and only re-indexed if they moved),
+        labels that disappeared are retexted into the new ones while their type history allows it,
+        and the remaining ones deleted. Returns the label entry of every name, None for the labels still to create.
+        """
+        existing = []
+        for entry in self.readManifest().get("labels", []):
+            node = cm.ls(entry["node"], long=True)
+            if node:  # skip labels deleted by hand
+                existing.append(dict(entry, node=node[0], index=len(existing) + 1))
+
+        byText = {}
+        for entry in existing:
+            byText.setdefault(entry["text"], []).append(entry)
+
+        ordered = []
+        for text in names:
+            candidates = byText.get(text)
+            ordered.append(candidates.pop(0) if candidates else None)
+
+        kept = set(id(entry) for entry in ordered if entry)
+        leftovers = [entry for entry in existing if id(entry) not in kept]
+        retextable = [entry for entry in leftovers if self.labelTypeNode(entry["node"])]
+
+        for num, (text, entry) in enumerate(zip(names, ordered), start=1):
+            if entry is None and retextable:
+                entry = retextable.pop(0)
+                leftovers.remove(entry)
+                self.retextLabel(entry, text)
+                ordered[num - 1] = entry
+            if entry is not None:
+                self.indexLabel(entry, num)
+
+        self.deleteLabelNodes([entry["node"] for entry in leftovers])
+        return ordered
+
+
+    def indexLabel(self, entry, num):
+        """Show the label of entry when labelsVisibility == num."""
+        if entry["index"] == num:
+            return
+        condition = cm.ls(entry["condition"]) if entry.get("condition") else []
+        if condition:
+            cm.setAttr(condition[0] + ".secondTerm", num)
+        entry["index"] = num
+
+
+    def createIndexedLabel(self, text, parent, num):
+        """Create the label of text under parent, shown when parent.labelsVisibility == num. Returns its manifest entry."""
+        label = cm.parent(self.createTypeLabel(text), parent, relative=True)[0]
+        condition = self.createCondition(label, parent, num)
+        return {"node": cm.ls(label, long=True)[0], "condition": cm.ls(condition, uuid=True)[0], "index": num, "text": text}
+
+
+    def finishLabels(self, ordered, parent, groups):
+        """
+        Write the timing keys, the manifest and the group sets of the labels of ordered. Missing labels
+        (a cancelled creation) are left out, and the ones after them moved up.
+        """
+        entries = []
+        entryGroups = []
+        for entry, group in zip(ordered, groups):
+            if entry is None:
+                continue
+            entries.append(entry)
+            entryGroups.append(group)
+            self.indexLabel(entry, len(entries))
+
+        self.allTexts = [entry["node"] for entry in entries]
+        cm.addAttr("%s.%s" % (parent, self.VISIBILITY_ATTR), edit=True, max=max(len(entries), 1))
+        self.writeVisibilityKeys(parent, len(entries))
+        self.writeManifest(self.allTexts, parent, texts=[entry["text"] for entry in entries], groups=entryGroups)
+        self.groupLabels(self.allTexts, entryGroups)
+
+
+    def labelTypeNode(self, label):
+        history = cm.listHistory(label) or []
+        typeNodes = cm.ls(history, type="type")
+        return typeNodes[0] if typeNodes else None
+
+
+    def retextLabel(self, entry, text):
+        # the type node stores its text as space separated hexadecimal utf-8 bytes
+        typeNode = self.labelTypeNode(entry["node"])
+        hexText = " ".join("%X" % b for b in text.encode("utf-8"))
+        cm.setAttr(typeNode + ".textInput", hexText, type="string")
+        entry["node"] = cm.ls(cm.rename(entry["node"], self.nodeName(text)), long=True)[0]
+        entry["text"] = text
+
+
+    def deleteLabelNodes(self, labels):
+        """Delete labels with their condition and shading networks, leaving any other scene material alone."""
+        if not labels:
+            return
+        shapes = set(cm.ls(cm.listRelatives(labels, shapes=True, fullPath=True) or [], long=True))
+        toDelete = list(labels)
+        toDelete += cm.listConnections([l + ".visibility" for l in labels], source=True, destination=False, type="condition") or []
+
+        for shadingEngine in set(cm.listConnections(list(shapes), type="shadingEngine") or []):
+            members = set(cm.ls(cm.sets(shadingEngine, q=True) or [], long=True, objectsOnly=True))
+            if members and not members <= shapes:
+                continue  # shared with something that isn't a label
+            toDelete.append(shadingEngine)
+            toDelete += cm.listConnections(shadingEngine + ".surfaceShader", source=True, destination=False) or []
+
+        cm.delete(list(set(toDelete)))
 
-    def selectText(self):
-        cursor = self.listNames_plainTextEdit.textCursor()
-        cursor.setPosition(0)
-        cursor.setPosition(500, QtGui.QTextCursor.KeepAnchor)
 
+    def wait(self):
+        time.sleep(1 * len(self.allTexts))
 
-    def on_enter_pressed(self, text):
-        print("TODO")
 
-    
-    def raiseErrorRed(self, lineEdit):
-        self.cameraName_lineEdit.setStyleSheet
-        
-        # set to red
-        lineEdit.setStyleSheet("""
-                    QLineEdit{
-                        background-color: rgb(255,100,100);
-                        color: rgb(0,0,0)
-                    }""")
-
-        lineEdit.setText("You must select something!")
-        raise Warning("You must select something!")
-        return
-    
-    
-    def getSelectedCamera(self):
-        cam = cm.ls(sl=True)
-        if not cam:
-            self.raiseErrorRed(self.cameraName_lineEdit)
-            return None
-        
-        self.setColortoLocked(self.cameraName_lineEdit)
-        
-        cam = cam[0]
-        self.cameraName_lineEdit.setText(cam)
-        return cam
+    def parseStringIntoList(self, namesString):
+        namesList = [w for w in namesString.split(" ")]
+        return namesList
 
-    def getActiveCamera(self):
-        pan = pm.getPanel(withFocus=True)
-        cam = pm.windows.modelPanel(pan,q=True,camera=True)
-        
-        self.setColortoLocked(self.cameraName_lineEdit)
 
-        self.cameraName_lineEdit.setText(cam)
-        return cam
+    def deleteLabels(self):
+        for node in (self.IMAGE_PLANE_NAME, self.DISPLAY_NODE_NAME):
+            if cm.objExists(node):
+                cm.delete(node)
+        if pm.objExists(self.PARENT_BUFFER_NAME):
+            try: 
+                if cm.objExists(self.USER_BUFFER_NAME):
+                    labels = cm.listRelatives(self.USER_BUFFER_NAME, children=True, type="transform", fullPath=True) or []
+                    self.deleteLabelNodes(labels)
+                pm.delete(self.PARENT_BUFFER_NAME, hi="below")
+            except : 
+                raise Warning
+
+    def updateScreen(self):
+        pm.currentTime( self.FIRST_FRAME + 1, edit=True)
+        pm.currentTime( self.FIRST_FRAME, edit=True)
 
-    def setColortoLocked(self, lineEdit):
-        lineEdit.setStyleSheet("""
-        QLineEdit{
-            background-color: rgb(100,100,100);
-            color: rgb(40,40,40)}""")
-        return
 
-    def callLabelCreator(self):
-        names        = self.listNames_plainTextEdit.toPlainText()
-        frameOffset  = int(self.frameOffset_lineEdit.text())
-        cam          = self.cameraName_lineEdit.text()
-        overwrite    = self.overwrite_checkbox.isChecked()
-        preserve     = self.preserveType_checkbox.isChecked()
-        setTimeRange = self.setTimeRange_checkbox.isChecked()
+    def deleteHistory(self):
+        pm.delete(self.allTexts, constructionHistory=True)
 
-        self.labelCreator.labelCreator( names, 
-                                        cam,
-                                        frameOffset=frameOffset, 
-                                        overwrite=overwrite, 
-                                        preserve=preserve, 
-                                        setTimeRange=setTimeRange
-                                        )
+    
+    def setTimeRange(self):
+        print("setting time range")
+        last_frame = self.labelStartFrames(len(self.allTexts))[-1] -1
 
+        pm.playbackOptions( min = self.FIRST_FRAME,
+                            max = last_frame)
 
 
+# the UI lives in label_creator_ui, Qt is only imported when it is first used
+__getattr__, __dir__ = lazy.attach(
+    __name__,
+    attributes={"label_creator_ui": ["LabelCreatorUI", "MyLineEdit", "getMayaMainWindow"]},
+)
@@ -0,0 +1,235 @@
+"""
+mtLabelDisplay, a locator drawing the current label as screen space text, written with the Python API 2.0.
+
+It's the lightweight backend of mtLabelCreator: no type geometry, no per label node and no camera buffers,
+one locator holds the whole label table and draws through a Viewport 2.0 draw override.
+
+The label table is a list of labels and the frame each one starts at. The node keeps it sorted in a python cache,
+rebuilt only when the table attributes change, so finding the label of the current frame is a binary search.
+
+import maya.cmds as cm
+cm.loadPlugin("<path to>/mtLabelNode.py")
+node = cm.createNode("mtLabelDisplay")
+cm.setAttr(node + ".labels", 3, "walk", "run", "jump", type="stringArray")
+cm.setAttr(node + ".frameOffset", 10)
+cm.connectAttr("time1.outTime", node + ".time")
+
+or, from the label creator:
+LabelCreator().labelCreator("walk run jump", cam="cam", backend="viewport")
+"""
+
+import bisect
+
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaRender as omr
+import maya.api.OpenMayaUI as omui
+
+
+def maya_useNewAPI():
+    pass
+
+
+NODE_NAME = "mtLabelDisplay"
+NODE_ID = om.MTypeId(0x0007F4C1)  # local/development id range
+DRAW_DB_CLASSIFICATION = "drawdb/geometry/mtLabelDisplay"
+DRAW_REGISTRANT_ID = "mtLabelDisplayPlugin"
+
+
+class LabelDisplayNode(omui.MPxLocatorNode):
+    labels = None
+    startFrames = None
+    firstFrame = None
+    frameOffset = None
+    time = None
+    camera = None
+    textSize = None
+    textColor = None
+    screenPosition = None
+    currentIndex = None
+
+    TABLE_ATTRIBUTES = ("labels", "startFrames", "firstFrame", "frameOffset")
+
+    def __init__(self):
+        super(LabelDisplayNode, self).__init__()
+        self._table = None  # (start frames, labels), sorted by start frame
+
+    @staticmethod
+    def creator():
+        return LabelDisplayNode()
+
+    @staticmethod
+    def initialize():
+        typed = om.MFnTypedAttribute()
+        numeric = om.MFnNumericAttribute()
+        unit = om.MFnUnitAttribute()
+        message = om.MFnMessageAttribute()
+
+        LabelDisplayNode.labels = typed.create("labels", "lbs", om.MFnData.kStringArray)
+        LabelDisplayNode.startFrames = typed.create("startFrames", "stf", om.MFnData.kDoubleArray)
+
+        LabelDisplayNode.firstFrame = numeric.create("firstFrame", "ff", om.MFnNumericData.kDouble, 1.0)
+        numeric.keyable = False
+        LabelDisplayNode.frameOffset = numeric.create("frameOffset", "fo", om.MFnNumericData.kDouble, 5.0)
+        numeric.setMin(0.001)
+        numeric.keyable = False
+
+        LabelDisplayNode.time = unit.create("time", "tm", om.MFnUnitAttribute.kTime, 0.0)
+
+        LabelDisplayNode.camera = message.create("camera", "cam")
+
+        LabelDisplayNode.textSize = numeric.create("textSize", "ts", om.MFnNumericData.kInt, 24)
+        numeric.setMin(1)
+        LabelDisplayNode.textColor = numeric.createColor("textColor", "tc")
+        numeric.default = (1.0, 1.0, 1.0)
+        LabelDisplayNode.screenPosition = numeric.create("screenPosition", "sp", om.MFnNumericData.k2Double)
+        numeric.default = (0.05, 0.05)  # fraction of the viewport, from the bottom left corner
+
+        LabelDisplayNode.currentIndex = numeric.create("currentIndex", "ci", om.MFnNumericData.kInt, -1)
+        numeric.writable = False
+        numeric.storable = False
+
+        for attr in (
+            LabelDisplayNode.labels,
+            LabelDisplayNode.startFrames,
+            LabelDisplayNode.firstFrame,
+            LabelDisplayNode.frameOffset,
+            LabelDisplayNode.time,
+            LabelDisplayNode.camera,
+            LabelDisplayNode.textSize,
+            LabelDisplayNode.textColor,
+            LabelDisplayNode.screenPosition,
+            LabelDisplayNode.currentIndex,
+        ):
+            om.MPxNode.addAttribute(attr)
+
+        for attr in (
+            LabelDisplayNode.labels,
+            LabelDisplayNode.startFrames,
+            LabelDisplayNode.firstFrame,
+            LabelDisplayNode.frameOffset,
+            LabelDisplayNode.time,
+        ):
+            om.MPxNode.attributeAffects(attr, LabelDisplayNode.currentIndex)
+
+    def setDependentsDirty(self, plug, affected):
+        if plug.partialName(useLongNames=True) in self.TABLE_ATTRIBUTES:
+            self._table = None
+        return super(LabelDisplayNode, self).setDependentsDirty(plug, affected)
+
+    def compute(self, plug, data):
+        if plug != LabelDisplayNode.currentIndex:
+            return None
+        frame = data.inputValue(LabelDisplayNode.time).asTime().value
+        index, _ = self.lookup(frame)
+        handle = data.outputValue(LabelDisplayNode.currentIndex)
+        handle.setInt(index)
+        data.setClean(plug)
+
+    def table(self):
+        """Return the cached (start frames, labels) table, reading the attributes only when they changed."""
+        if self._table is None:
+            node = self.thisMObject()
+            labelsData = om.MPlug(node, LabelDisplayNode.labels).asMObject()
+            labels = list(om.MFnStringArrayData(labelsData).array()) if not labelsData.isNull() else []
+            startsData = om.MPlug(node, LabelDisplayNode.startFrames).asMObject()
+            starts = list(om.MFnDoubleArrayData(startsData).array()) if not startsData.isNull() else []
+            if len(starts) != len(labels):
+                first = om.MPlug(node, LabelDisplayNode.firstFrame).asDouble()
+                offset = om.MPlug(node, LabelDisplayNode.frameOffset).asDouble()
+                starts = [first + num * offset for num in range(len(labels))]
+            pairs = sorted(zip(starts, labels), key=lambda pair: pair[0])
+            self._table = ([pair[0] for pair in pairs], [pair[1] for pair in pairs])
+        return self._table
+
+    def lookup(self, frame):
+        """Return (index, label) of the label shown at frame, (-1, None) before the first one."""
+        starts, labels = self.table()
+        index = bisect.bisect_right(starts, frame + 1e-6) - 1
+        if index < 0:
+            return -1, None
+        return index, labels[index]
+
+    def isBounded(self):
+        return False
+
+
+class LabelDisplayData(om.MUserData):
+    def __init__(self):
+        super(LabelDisplayData, self).__init__()
+        self.text = None
+        self.size = 24
+        self.color = om.MColor((1.0, 1.0, 1.0))
+        self.position = (0.05, 0.05)
+
+
+class LabelDisplayDrawOverride(omr.MPxDrawOverride):
+    @staticmethod
+    def creator(obj):
+        return LabelDisplayDrawOverride(obj)
+
+    def __init__(self, obj):
+        super(LabelDisplayDrawOverride, self).__init__(obj, None, True)
+
+    def supportedDrawAPIs(self):
+        return omr.MRenderer.kAllDevices
+
+    def hasUIDrawables(self):
+        return True
+
+    def prepareForDraw(self, objPath, cameraPath, frameContext, oldData):
+        data = oldData if isinstance(oldData, LabelDisplayData) else LabelDisplayData()
+        data.text = None
+
+        nodeObj = objPath.node()
+        node = om.MFnDependencyNode(nodeObj).userNode()
+        if node is None:
+            return data
+
+        # only draw through the camera the labels were made for, when one is connected
+        cameraPlug = om.MPlug(nodeObj, LabelDisplayNode.camera)
+        sources = cameraPlug.connectedTo(True, False)
+        if sources and cameraPath.isValid():
+            cameraNode = sources[0].node()
+            if cameraNode != cameraPath.node() and cameraNode != cameraPath.transform():
+                return data
+
+        frame = om.MPlug(nodeObj, LabelDisplayNode.time).asMTime().value
+        _, data.text = node.lookup(frame)
+
+        data.size = om.MPlug(nodeObj, LabelDisplayNode.textSize).asInt()
+        colorPlug = om.MPlug(nodeObj, LabelDisplayNode.textColor)
+        data.color = om.MColor([colorPlug.child(i).asFloat() for i in range(3)])
+        positionPlug = om.MPlug(nodeObj, LabelDisplayNode.screenPosition)
+        data.position = (positionPlug.child(0).asDouble(), positionPlug.child(1).asDouble())
+        return data
+
+    def addUIDrawables(self, objPath, drawManager, frameContext, data):
+        if not isinstance(data, LabelDisplayData) or not data.text:
+            return
+        _, _, width, height = frameContext.getViewportDimensions()
+        position = om.MPoint(data.position[0] * width, data.position[1] * height)
+
+        drawManager.beginDrawable()
+        drawManager.setColor(data.color)
+        drawManager.setFontSize(data.size)
+        drawManager.text2d(position, data.text, omr.MUIDrawManager.kLeft)
+        drawManager.endDrawable()
+
+
+def initializePlugin(obj):
+    plugin = om.MFnPlugin(obj, "LFR", "1.0.0", "Any")
+    plugin.registerNode(
+        NODE_NAME,
+        NODE_ID,
+        LabelDisplayNode.creator,
+        LabelDisplayNode.initialize,
+        om.MPxNode.kLocatorNode,
+        DRAW_DB_CLASSIFICATION,
+    )
+    omr.MDrawRegistry.registerDrawOverrideCreator(DRAW_DB_CLASSIFICATION, DRAW_REGISTRANT_ID, LabelDisplayDrawOverride.creator)
+
+
+def uninitializePlugin(obj):
+    plugin = om.MFnPlugin(obj)
+    omr.MDrawRegistry.deregisterDrawOverrideCreator(DRAW_DB_CLASSIFICATION, DRAW_REGISTRANT_ID)
+    plugin.deregisterNode(NODE_ID)
@@ -0,0 +1,19 @@
+"""
+mt_core
+=======
+Shared helpers for the mtTools, nothing in here is a tool on its own.
+
+- modifier: commit OpenMaya modifiers as a single undoable step.
+- edit_session: session(), undo chunk, viewport refresh and autokey suspension around bulk edits.
+- lazy: module level __getattr__ for the packages, and stand-ins for the heavy modules (PyMEL).
+- sampler: sample(), values or world matrices over a frame range through an MDGContext, cached.
+- trace: opt-in spans and maya.cmds call counts of the tools' entry points (MT_TRACE=1), Chrome trace export.
+"""
+
+__version__ = "1.0.0"
+__author__ = "LFR"
+__all__ = ["edit_session", "lazy", "modifier", "sampler", "session", "trace"]
+
+from . import lazy
+
+__getattr__, __dir__ = lazy.attach(__name__, ["edit_session", "modifier", "sampler", "trace"], {"edit_session": ["session"]})
@@ -0,0 +1,120 @@
+"""
+Scene edit session, shared by the bulk operations of every tool.
+
+A session wraps one button press worth of scene edits:
+- one undo chunk, named after the operation,
+- the viewport refresh suspended, so a loop over hundreds of nodes doesn't redraw hundreds of times,
+- autokey off, edits meant as poses don't leave keys behind,
+- the evaluation manager idle graph rebuild paused,
+- optionally the selection saved and restored.
+
+Everything is restored on exit, exceptions included. Sessions nest: only the outermost one suspends and restores,
+the inner ones only add their undo chunk inside the outer one.
+
+Usage:
+    try:
+        from ..mt_core import edit_session
+    except ImportError:  # tools installed flat in the scripts folder
+        from mt_core import edit_session
+
+    with edit_session.session("mt_reset_character"):
+        ...
+
+    @edit_session.session("mt_anim_to_path", keep_selection=True)
+    def anim_to_path():
+        ...
+"""
+
+from contextlib import ContextDecorator
+
+import maya.cmds as cm
+
+# the outermost session restores the scene state, the nested ones leave it alone
+_depth = 0
+
+
+class Session(ContextDecorator):
+    """
+    Args:
+        name (str, optional): undo chunk name, shown in the undo history.
+        undo (bool, optional): wrap the edits in one undo chunk. Defaults to True.
+        suspend_refresh (bool, optional): suspend the viewport refresh. Defaults to True.
+        suspend_autokey (bool, optional): turn autokey off. Defaults to True.
+        suspend_idle_build (bool, optional): pause the evaluation manager graph rebuild. Defaults to True.
+        keep_selection (bool, optional): restore the selection on exit. Defaults to False.
+    """
+
+    def __init__(self, name=None, undo=True, suspend_refresh=True, suspend_autokey=True, suspend_idle_build=True, keep_selection=False):
+        self.name = name
+        self.undo = undo
+        self.suspend_refresh = suspend_refresh
+        self.suspend_autokey = suspend_autokey
+        self.suspend_idle_build = suspend_idle_build
+        self.keep_selection = keep_selection
+        self._states = []  # one per entry, a decorated function may run recursively
+
+    def __enter__(self):
+        global _depth
+        outermost = _depth == 0
+        _depth += 1
+        state = {}
+        self._states.append(state)
+        try:
+            if self.undo:
+                if self.name:
+                    cm.undoInfo(openChunk=True, chunkName=self.name)
+                else:
+                    cm.undoInfo(openChunk=True)
+                state["undo"] = True
+            if self.keep_selection:
+                state["selection"] = cm.ls(sl=True, long=True)
+            if not outermost:
+                return self
+            if self.suspend_autokey and cm.autoKeyframe(q=True, state=True):
+                cm.autoKeyframe(state=False)
+                state["autokey"] = True
+            if self.suspend_idle_build and _idle_build_enabled():
+                cm.evaluationManager(idleBuild=False)
+                state["idle_build"] = True
+            if self.suspend_refresh and not cm.about(batch=True):
+                cm.refresh(suspend=True)
+                state["refresh"] = True
+        except Exception:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _depth
+        _depth -= 1
+        state = self._states.pop() if self._states else {}
+        # restore in reverse order, the undo chunk is closed whatever happens
+        try:
+            if state.get("refresh"):
+                cm.refresh(suspend=False)
+            if state.get("idle_build"):
+                cm.evaluationManager(idleBuild=True)
+            if state.get("autokey"):
+                cm.autoKeyframe(state=True)
+            if "selection" in state:
+                existing = cm.ls(state["selection"], long=True)
+                if existing:
+                    cm.select(existing, replace=True)
+                else:
+                    cm.select(clear=True)
+        finally:
+            if state.get("undo"):
+                cm.undoInfo(closeChunk=True)
+        return False
+
+
+def _idle_build_enabled() -> bool:
+    try:
+        return bool(cm.evaluationManager(q=True, idleBuild=True))
+    except (RuntimeError, TypeError):
+        return False  # no evaluation manager (batch, older Maya)
+
+
+def session(name=None, undo=True, suspend_refresh=True, suspend_autokey=True, suspend_idle_build=True, keep_selection=False) -> Session:
+    """A scene edit session, use it as a context manager or a decorator. See Session for the arguments."""
+    return Session(name, undo, suspend_refresh, suspend_autokey, suspend_idle_build, keep_selection)
@@ -0,0 +1,77 @@
+"""
+Lazy imports, so importing a tool costs nothing until it is used.
+
+A hotkey importing a tool shouldn't pay for PyMEL or Qt, and a tool should be importable headless.
+Packages load their submodules on first attribute access, through a module level __getattr__:
+    try:
+        from ..mt_core import lazy
+    except ImportError:  # tools installed flat in the scripts folder
+        from mt_core import lazy
+
+    __getattr__, __dir__ = lazy.attach(__name__, ["mt_renamer", "rename_dialog"], {"mt_renamer": ["process_rename"]})
+
+Heavy modules used all over a tool are bound to a stand-in, the real module is imported on first attribute access:
+    pm = lazy.load("pymel.core")
+"""
+
+import importlib
+import sys
+import types
+
+
+def attach(module_name: str, submodules=(), attributes=None) -> tuple:
+    """
+    The (__getattr__, __dir__) pair of a module, loading its submodules and attributes on first access.
+
+    Args:
+        module_name (str): the module to attach to, its __name__.
+        submodules (list, optional): modules of the package, loaded when read as an attribute.
+        attributes (dict, optional): {module: [names]}, names re-exported from a module of the package.
+    """
+    submodules = frozenset(submodules)
+    owners = {name: owner for owner, names in (attributes or {}).items() for name in names}
+
+    def _import(name):
+        package = sys.modules[module_name].__package__
+        if not package:  # a top level module, tool installed flat in the scripts folder
+            return importlib.import_module(name)
+        return importlib.import_module(f".{name}", package)
+
+    def __getattr__(name):
+        module = sys.modules[module_name]
+        if name in submodules:
+            return _import(name)
+        owner = owners.get(name)
+        if owner is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(_import(owner), name)
+        setattr(module, name, value)  # the next reads don't go through __getattr__
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[module_name])) | submodules | set(owners))
+
+    return __getattr__, __dir__
+
+
+class LazyModule(types.ModuleType):
+    """Stands for a module until one of its attributes is read, then imports it."""
+
+    def __getattr__(self, name):
+        # only called for the attributes not copied yet
+        module = importlib.import_module(self.__name__)
+        if module is self:
+            raise AttributeError(name)
+        self.__dict__.update(vars(module))
+        return getattr(module, name)
+
+    def __repr__(self):
+        return f"<lazy module {self.__name__!r}>"
+
+
+def load(name: str) -> types.ModuleType:
+    """The module name if it is already imported, else a stand-in importing it on first use."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
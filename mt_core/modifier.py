@@ -0,0 +1,104 @@
+"""
+Commit OpenMaya modifiers (MDGModifier, MDagModifier) as one undoable step.
+Any object with doIt() / undoIt() methods is accepted, to group a modifier with edits a modifier can't hold
+(MAnimCurveChange keys...).
+
+A modifier executed from a script is invisible to the undo queue, the only way to get it there is
+to execute it from an MPxCommand. This file is also that command's plugin: commit() loads it once,
+hands the modifier over and calls the command, which keeps the modifier for undo/redo.
+
+Usage:
+    import maya.api.OpenMaya as om2
+    from mtTools_public.mt_core import modifier
+
+    mod = om2.MDagModifier()
+    mod.renameNode(obj, "newName")
+    modifier.commit(mod)  # one entry in the undo queue
+"""
+
+import os
+import sys
+import types
+
+import maya.api.OpenMaya as om2
+import maya.cmds as cm
+
+COMMAND_NAME = "mtCommitModifier"
+
+# Maya imports the plugin file as its own module, separated from the one imported by the tools.
+# The pending modifiers are handed over through a module registered under a fixed name, shared by both.
+_SHARED_NAME = "_mtCoreModifierQueue"
+
+
+def maya_useNewAPI():
+    pass
+
+
+def _shared():
+    shared = sys.modules.get(_SHARED_NAME)
+    if shared is None:
+        shared = types.ModuleType(_SHARED_NAME)
+        shared.pending = []
+        sys.modules[_SHARED_NAME] = shared
+    return shared
+
+
+class CommitModifierCommand(om2.MPxCommand):
+    """Executes the pending modifier and keeps it for undo/redo."""
+
+    def __init__(self):
+        super(CommitModifierCommand, self).__init__()
+        self.modifier = None
+
+    @staticmethod
+    def creator():
+        return CommitModifierCommand()
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        self.modifier = _shared().pending.pop()
+        self.modifier.doIt()
+
+    def redoIt(self):
+        self.modifier.doIt()
+
+    def undoIt(self):
+        self.modifier.undoIt()
+
+
+def initializePlugin(obj):
+    plugin = om2.MFnPlugin(obj, "LFR", "1.0.0", "Any")
+    plugin.registerCommand(COMMAND_NAME, CommitModifierCommand.creator)
+
+
+def uninitializePlugin(obj):
+    plugin = om2.MFnPlugin(obj)
+    plugin.deregisterCommand(COMMAND_NAME)
+
+
+def plugin_path() -> str:
+    return os.path.splitext(os.path.abspath(__file__))[0] + ".py"
+
+
+def ensure_plugin():
+    """Load the command plugin, once per session."""
+    if not hasattr(cm, COMMAND_NAME):
+        cm.loadPlugin(plugin_path(), quiet=True)
+
+
+def commit(modifier):
+    """
+    Execute modifier through the undoable command: the whole modifier is a single undo step.
+    """
+    ensure_plugin()
+    pending = _shared().pending
+    pending.append(modifier)
+    try:
+        getattr(cm, COMMAND_NAME)()
+    finally:
+        # the command pops it, unless it failed before
+        if modifier in pending:
+            pending.remove(modifier)
+    return modifier
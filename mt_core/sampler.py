@@ -0,0 +1,194 @@
+"""
+Timeline sampler: the values of a few plugs over a range of frames, without moving the current time.
+
+Stepping cm.currentTime evaluates the whole scene on every frame, for the handful of plugs a tool reads.
+sample() reads only the plugs asked for, frame by frame through an MDGContext, and keeps every value in an LRU cache
+keyed by (plug, frame, dirty counter): sampling the same plugs over the same range again costs nothing.
+
+The dirty counter goes up whenever the scene may have changed under the cache: keys edited, connections made or
+broken, nodes added or removed, an attribute of a sampled node set, undo, redo, new or opened scene. A static
+attribute set on another node, upstream of a sampled plug, is not seen: call invalidate() after such an edit.
+
+Usage:
+    try:
+        from ..mt_core import sampler
+    except ImportError:  # tools installed flat in the scripts folder
+        from mt_core import sampler
+
+    values = sampler.sample(["car_CTL.translateX", "car_CTL.rotateY"], range(1, 121))  # shape (120, 2)
+    matrices = sampler.sample(["car_CTL"], range(1, 121))  # dag nodes: world matrices, shape (120, 1, 4, 4)
+    positions = sampler.world_positions(matrices)  # shape (120, 1, 3)
+
+Values are in internal units (cm, radians), like MPlug.asDouble(), the frames in the UI time unit.
+"""
+
+import collections
+
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+
+from . import lazy
+
+np = lazy.load("numpy")  # imported on the first sample, not with the tools using the sampler
+
+CACHE_SIZE = 500000  # values kept, a matrix counts for one
+
+_cache = collections.OrderedDict()  # (plug name, frame, dirty counter) -> float, or 4x4 tuple for a matrix
+_stats = {"hits": 0, "misses": 0}
+_dirty = 0
+_callbacks = []
+_node_callbacks = {}  # MObjectHandle.hashCode() -> attribute changed callback of a sampled node
+
+
+def invalidate(*args):
+    """Mark everything sampled so far as stale. Also the callback of the scene changes, hence *args."""
+    global _dirty
+    _dirty += 1
+
+
+def dirty_count() -> int:
+    """The dirty counter, part of every cache key."""
+    return _dirty
+
+
+def _attribute_changed(message, plug, other_plug, client_data):
+    if message & (om2.MNodeMessage.kAttributeSet | om2.MNodeMessage.kConnectionMade | om2.MNodeMessage.kConnectionBroken):
+        invalidate()
+
+
+def _scene_changed(*args):
+    """New or opened scene: the sampled nodes are gone, and their callbacks with them."""
+    invalidate()
+    clear()
+    if _node_callbacks:
+        om2.MMessage.removeCallbacks(list(_node_callbacks.values()))
+    _node_callbacks.clear()
+
+
+def _watch():
+    """The scene wide callbacks, registered on the first sample."""
+    if _callbacks:
+        return
+    _callbacks.extend([
+        oma2.MAnimMessage.addAnimCurveEditedCallback(invalidate),
+        om2.MDGMessage.addConnectionCallback(invalidate),
+        om2.MDGMessage.addNodeAddedCallback(invalidate),
+        om2.MDGMessage.addNodeRemovedCallback(invalidate),
+        om2.MEventMessage.addEventCallback("Undo", invalidate),
+        om2.MEventMessage.addEventCallback("Redo", invalidate),
+        om2.MSceneMessage.addCallback(om2.MSceneMessage.kAfterNew, _scene_changed),
+        om2.MSceneMessage.addCallback(om2.MSceneMessage.kAfterOpen, _scene_changed),
+    ])
+
+
+def _watch_node(obj):
+    key = om2.MObjectHandle(obj).hashCode()
+    if key not in _node_callbacks:
+        _node_callbacks[key] = om2.MNodeMessage.addAttributeChangedCallback(obj, _attribute_changed)
+
+
+def stop():
+    """Remove the callbacks and empty the cache. The next sample starts over."""
+    callbacks = _callbacks + list(_node_callbacks.values())
+    if callbacks:
+        om2.MMessage.removeCallbacks(callbacks)
+    _callbacks.clear()
+    _node_callbacks.clear()
+    clear()
+
+
+def clear():
+    """Empty the cache."""
+    _cache.clear()
+    _stats.update(hits=0, misses=0)
+
+
+def cache_info() -> dict:
+    return {"hits": _stats["hits"], "misses": _stats["misses"], "size": len(_cache), "max_size": CACHE_SIZE,
+            "dirty": _dirty}
+
+
+def _plug(item) -> tuple:
+    """(plug, is_matrix) of a plug, or of the worldMatrix plug of a dag node."""
+    if isinstance(item, om2.MPlug):
+        return item, False
+    if isinstance(item, str):
+        selection = om2.MSelectionList()
+        selection.add(item)  # raises RuntimeError when the object doesn't exist
+        if "." in item:
+            return selection.getPlug(0), False
+        item = selection.getDagPath(0)
+    if not isinstance(item, om2.MDagPath):
+        raise TypeError(f"A plug, a dag path or a name is expected, got {item!r}")
+    world_matrix = om2.MFnDagNode(item).findPlug("worldMatrix", False)
+    return world_matrix.elementByLogicalIndex(item.instanceNumber()), True
+
+
+def _resolve(items) -> tuple:
+    """(is_matrix, [(cache name, plug)]), the sampled nodes watched for changes."""
+    resolved = []
+    kinds = set()
+    for item in items:
+        plug, is_matrix = _plug(item)
+        if not is_matrix and plug.isCompound:
+            raise ValueError(f"{plug.name()} is a compound, sample its children")
+        kinds.add(is_matrix)
+        _watch_node(plug.node())
+        resolved.append((plug.name(), plug))
+    if len(kinds) > 1:
+        raise ValueError("Sample plugs and dag nodes in separate calls, their values don't have the same shape")
+    return kinds == {True}, resolved
+
+
+def sample(plugs_or_dagpaths, times):
+    """
+    Values of plugs, or world matrices of dag nodes, at every frame of times.
+
+    Args:
+        plugs_or_dagpaths (list): numeric plugs (MPlug or "node.attr"), or dag nodes (MDagPath or name), not mixed.
+        times (list): frames, in the UI time unit.
+
+    Returns:
+        np.ndarray: (frames, plugs) float64 values, or (frames, nodes, 4, 4) world matrices.
+    """
+    _watch()
+    is_matrix, plugs = _resolve(plugs_or_dagpaths)
+    frames = [float(t) for t in times]
+    shape = (len(frames), len(plugs), 4, 4) if is_matrix else (len(frames), len(plugs))
+    result = np.empty(shape, dtype=np.float64)
+
+    missing = collections.defaultdict(list)  # frame -> [(row, column, cache key, plug)], evaluated together
+    for row, frame in enumerate(frames):
+        for column, (name, plug) in enumerate(plugs):
+            key = (name, frame, _dirty)
+            value = _cache.get(key)
+            if value is None:
+                missing[frame].append((row, column, key, plug))
+                continue
+            _cache.move_to_end(key)
+            result[row, column] = np.reshape(value, (4, 4)) if is_matrix else value
+            _stats["hits"] += 1
+
+    unit = om2.MTime.uiUnit()
+    for frame, cells in missing.items():
+        context = om2.MDGContext(om2.MTime(frame, unit))
+        previous = context.makeCurrent()
+        try:
+            for row, column, key, plug in cells:
+                if is_matrix:
+                    value = tuple(om2.MFnMatrixData(plug.asMObject()).matrix())
+                else:
+                    value = plug.asDouble()
+                _cache[key] = value
+                result[row, column] = np.reshape(value, (4, 4)) if is_matrix else value
+        finally:
+            previous.makeCurrent()
+        _stats["misses"] += len(cells)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
+
+
+def world_positions(matrices):
+    """The translations of world matrices, (..., 4, 4) -> (..., 3). Maya matrices are row major, the translation is the last row."""
+    return matrices[..., 3, :3]
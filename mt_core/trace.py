@@ -0,0 +1,201 @@
+"""
+Opt-in tracing of the tools' entry points, for the "it froze Maya" reports.
+
+A traced function records a span: its duration, the spans it ran inside, and the maya.cmds calls it made, counted per
+command. The spans go to a ring buffer (the last MT_TRACE_BUFFER spans, 10000 by default), read back as a summary
+table or exported as a Chrome trace (chrome://tracing, https://ui.perfetto.dev).
+
+Tracing is off unless the MT_TRACE environment variable is set (1, true, yes, on) before Maya starts, or enable() is
+called. Off, a traced function costs one flag check, and maya.cmds is left untouched: its commands are only wrapped,
+to be counted, while tracing is on.
+
+Usage:
+    try:
+        from ..mt_core import trace
+    except ImportError:  # tools installed flat in the scripts folder
+        from mt_core import trace
+
+    @trace.span()
+    def process_rename(objects, new_name_pattern):
+        ...
+
+    with trace.span("gather"):
+        ...
+
+In Maya, after reproducing the freeze:
+    from mt_core import trace
+    print(trace.summary())
+    trace.export_chrome_trace("C:/temp/mt_trace.json")
+"""
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+import maya.cmds as cm
+
+_TRUE = ("1", "true", "yes", "on")
+
+_enabled = False
+_spans = collections.deque(maxlen=int(os.environ.get("MT_TRACE_BUFFER", 10000)))
+_stack = []  # the open spans, innermost last. The tools run in Maya's main thread
+_originals = {}  # the maya.cmds functions replaced by their counting wrapper while tracing
+_origin = time.perf_counter()
+
+Record = collections.namedtuple("Record", "name start duration depth thread cmds")
+Record.__doc__ = "A finished span: start and duration in seconds, cmds the {command: calls} made in it, nested spans included."
+
+
+class Span:
+    """
+    A traced block, as a context manager, or as a decorator of the functions to trace.
+
+    Args:
+        name (str, optional): span name. A decorated function defaults to its module and qualified name.
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self._open = []  # one per entry, a decorated function may run recursively
+
+    def __call__(self, func):
+        name = self.name or f"{func.__module__.rpartition('.')[2]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def traced(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(name):
+                return func(*args, **kwargs)
+        return traced
+
+    def __enter__(self):
+        if _enabled:
+            entry = [self.name or "span", time.perf_counter(), collections.Counter()]
+            _stack.append(entry)
+            self._open.append(entry)
+        else:
+            self._open.append(None)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        entry = self._open.pop()
+        if entry is None:
+            return False
+        end = time.perf_counter()
+        name, start, counts = entry
+        while _stack and _stack[-1] is not entry:  # tracing toggled inside the span
+            _stack.pop()
+        if _stack:
+            _stack.pop()
+        if _stack:
+            _stack[-1][2].update(counts)  # the parent's counts include its children's
+        _spans.append(Record(name, start - _origin, end - start, len(_stack), threading.get_ident(), dict(counts)))
+        return False
+
+
+def span(name=None) -> Span:
+    """A span, use it as a context manager or a decorator. See Span."""
+    return Span(name)
+
+
+def _counting(command, func):
+    @functools.wraps(func)
+    def counted(*args, **kwargs):
+        if _stack:
+            _stack[-1][2][command] += 1
+        return func(*args, **kwargs)
+    return counted
+
+
+def enable():
+    """Start tracing: the spans are recorded, the maya.cmds commands counted."""
+    global _enabled
+    if _enabled:
+        return
+    for command, func in list(vars(cm).items()):
+        if callable(func) and not command.startswith("_") and not isinstance(func, type):
+            _originals[command] = func
+            setattr(cm, command, _counting(command, func))
+    _enabled = True
+
+
+def disable():
+    """Stop tracing and put back the maya.cmds commands. The recorded spans are kept."""
+    global _enabled
+    _enabled = False
+    for command, func in _originals.items():
+        setattr(cm, command, func)
+    _originals.clear()
+    _stack.clear()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def clear():
+    """Empty the ring buffer."""
+    _spans.clear()
+
+
+def spans() -> list:
+    """The recorded spans, oldest first, as Record."""
+    return list(_spans)
+
+
+def summary(records=None) -> str:
+    """A table of the spans per name: calls, total, mean and max time, and the cmds calls, heaviest total first."""
+    records = spans() if records is None else records
+    rows = {}
+    for record in records:
+        row = rows.setdefault(record.name, {"calls": 0, "total": 0.0, "max": 0.0, "cmds": collections.Counter()})
+        row["calls"] += 1
+        row["total"] += record.duration
+        row["max"] = max(row["max"], record.duration)
+        row["cmds"].update(record.cmds)
+    if not rows:
+        return "no span recorded" + ("" if _enabled else ", tracing is off (MT_TRACE)")
+    width = max(len("span"), *(len(name) for name in rows))
+    lines = [f"{'span':<{width}}  {'calls':>6}  {'total ms':>10}  {'mean ms':>9}  {'max ms':>9}  {'cmds':>7}  top cmds"]
+    for name, row in sorted(rows.items(), key=lambda item: item[1]["total"], reverse=True):
+        top = ", ".join(f"{command} {count}" for command, count in row["cmds"].most_common(3))
+        lines.append(
+            f"{name:<{width}}  {row['calls']:>6}  {row['total'] * 1000:>10.2f}  {row['total'] / row['calls'] * 1000:>9.2f}  "
+            f"{row['max'] * 1000:>9.2f}  {sum(row['cmds'].values()):>7}  {top or '-'}"
+        )
+    return "\n".join(lines)
+
+
+def chrome_trace(records=None) -> dict:
+    """The spans as a Chrome trace event document, complete events in microseconds."""
+    records = spans() if records is None else records
+    pid = os.getpid()
+    events = [
+        {
+            "name": record.name,
+            "cat": "mtTools",
+            "ph": "X",
+            "ts": round(record.start * 1e6, 3),
+            "dur": round(record.duration * 1e6, 3),
+            "pid": pid,
+            "tid": record.thread,
+            "args": {"cmds": sum(record.cmds.values()), **{f"cmds.{c}": n for c, n in sorted(record.cmds.items())}},
+        }
+        for record in records
+    ]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(path, records=None) -> str:
+    """Write the spans to path as a Chrome trace JSON file, returns the path."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(chrome_trace(records), f)
+    return path
+
+
+if os.environ.get("MT_TRACE", "").strip().lower() in _TRUE:
+    enable()
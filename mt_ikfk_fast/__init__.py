@@ -1,3 +1,14 @@
 __version__ = "1.0.0"
 __author__ = "LFR"
 __all__ = ["ik_fk_fast"]
+
+try:
+    from ..mt_core import lazy
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import lazy
+
+__getattr__, __dir__ = lazy.attach(
+    __name__,
+    ["ik_fk_fast"],
+    {"ik_fk_fast": ["main"]},
+)
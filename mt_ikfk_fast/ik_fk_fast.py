@@ -19,6 +19,11 @@ import maya.cmds as cm
 import maya.api.OpenMaya as om2
 from . import _config as _config
 
+try:
+    from ..mt_core import edit_session, trace
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import edit_session, trace
+
 IKStatus = 1
 FKStatus = 0
 
@@ -133,6 +138,8 @@ def ik_to_fk(setup, fresh_start=True, pos=True, rot=True):
     cm.matchTransform(setup["FK_end"],   setup["IK_end"],   pos=pos, rot=rot)
 
 
+@trace.span()
+@edit_session.session("mt_ikfk_fast", suspend_autokey=False)  # the match is keyed with autokey on
 def main(rounded=True, preserve_selection=False):
     """
     main function to switch between IK and FK.
@@ -22,10 +22,16 @@ Author: LostFocusRemedies
 """
 
 import maya.cmds as cm
-import pymel.core as pm
 import random
 from typing import Callable, Dict, List, Sequence, Tuple
 
+try:
+    from ..mt_core import edit_session, lazy, trace
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import edit_session, lazy, trace
+
+pm = lazy.load("pymel.core")  # imported on first use, not with the tool
+
 __all__ = [
     'random_value', 'random_time', 'show_gui', 'randomValue', 'randomTime', 'RandomGui'
 ]
@@ -55,6 +61,7 @@ def _list_key_times(curve: str, selected_only: bool = True) -> List[float]:
     return sorted(times)
 
 
+@trace.span()
 def random_value(random_min: float, random_max: float, selected_only: bool = True, verbose: bool = True) -> Dict[str, int]:
     """Add random offset (uniform) to the values of keyframes.
 
@@ -78,27 +85,26 @@ def random_value(random_min: float, random_max: float, selected_only: bool = Tru
         return {'curves': 0, 'keys_changed': 0}
 
     keys_changed = 0
-    cm.undoInfo(openChunk=True)
-    try:
-        for ac in anim_curves:
-            key_times = _list_key_times(ac, selected_only=selected_only)
-            if not key_times:
-                continue
-            for kt in key_times:
-                # Single command per key; still unavoidable but minimal queries.
-                offset = random.uniform(random_min, random_max)
-                cm.keyframe(ac, valueChange=offset, relative=True, time=(kt, kt))
-                keys_changed += 1
-    except Exception as e:
-        cm.warning(f"Error in random_value: {e}")
-    finally:
-        cm.undoInfo(closeChunk=True)
+    with edit_session.session("mt_random_value"):
+        try:
+            for ac in anim_curves:
+                key_times = _list_key_times(ac, selected_only=selected_only)
+                if not key_times:
+                    continue
+                for kt in key_times:
+                    # Single command per key; still unavoidable but minimal queries.
+                    offset = random.uniform(random_min, random_max)
+                    cm.keyframe(ac, valueChange=offset, relative=True, time=(kt, kt))
+                    keys_changed += 1
+        except Exception as e:
+            cm.warning(f"Error in random_value: {e}")
 
     if verbose:
         print(f"Randomized {keys_changed} keys on {len(anim_curves)} curves (value offsets between {random_min} and {random_max}).")
     return {'curves': len(anim_curves), 'keys_changed': keys_changed}
 
 
+@trace.span()
 def random_time(random_min: int, random_max: int, selected_only: bool = True, collision_strategy: str = 'shift', verbose: bool = True) -> Dict[str, int]:
     """Add random offset to the timing of keyframes with collision avoidance.
 
@@ -126,40 +132,38 @@ def random_time(random_min: int, random_max: int, selected_only: bool = True, co
         return {'curves': 0, 'keys_changed': 0}
 
     keys_changed = 0
-    cm.undoInfo(openChunk=True)
-    try:
-        for ac in anim_curves:
-            key_times = _list_key_times(ac, selected_only=selected_only)
-            if not key_times:
-                continue
-            # Map original time to new time
-            used_new_times = set(key_times)  # start with existing to reduce chance of collision logic bug
-            time_pairs: List[Tuple[float, float]] = []  # (original, new)
-            for ot in key_times:
-                delta = int(round(random.uniform(random_min, random_max)))
-                if delta == 0:
-                    # Keep same
-                    new_time = ot
-                else:
-                    new_time = ot + delta
-                    if collision_strategy == 'shift':
-                        # If occupied, push forward until free
-                        while new_time in used_new_times:
-                            new_time += 1  # simple forward shift
-                used_new_times.add(new_time)
-                time_pairs.append((ot, new_time))
-
-            # Apply moves: sort by whether new_time > orig to minimize chain interactions (not critical here)
-            for orig, new in time_pairs:
-                if new == orig:
+    with edit_session.session("mt_random_time"):
+        try:
+            for ac in anim_curves:
+                key_times = _list_key_times(ac, selected_only=selected_only)
+                if not key_times:
                     continue
-                delta = new - orig
-                cm.keyframe(ac, time=(orig, orig), timeChange=delta, relative=True)
-                keys_changed += 1
-    except Exception as e:
-        cm.warning(f"Error in random_time: {e}")
-    finally:
-        cm.undoInfo(closeChunk=True)
+                # Map original time to new time
+                used_new_times = set(key_times)  # start with existing to reduce chance of collision logic bug
+                time_pairs: List[Tuple[float, float]] = []  # (original, new)
+                for ot in key_times:
+                    delta = int(round(random.uniform(random_min, random_max)))
+                    if delta == 0:
+                        # Keep same
+                        new_time = ot
+                    else:
+                        new_time = ot + delta
+                        if collision_strategy == 'shift':
+                            # If occupied, push forward until free
+                            while new_time in used_new_times:
+                                new_time += 1  # simple forward shift
+                    used_new_times.add(new_time)
+                    time_pairs.append((ot, new_time))
+
+                # Apply moves: sort by whether new_time > orig to minimize chain interactions (not critical here)
+                for orig, new in time_pairs:
+                    if new == orig:
+                        continue
+                    delta = new - orig
+                    cm.keyframe(ac, time=(orig, orig), timeChange=delta, relative=True)
+                    keys_changed += 1
+        except Exception as e:
+            cm.warning(f"Error in random_time: {e}")
 
     if verbose:
         print(f"Randomized timing of {keys_changed} keys on {len(anim_curves)} curves (time offsets between {random_min} and {random_max}).")
@@ -14,16 +14,52 @@ __version__ = "1.0.0"
 __author__ = "LFR"
 __all__ = [
     # Modules
+    "constraint_bake",
+    "constraint_graph",
+    "constraint_index",
+    "constraint_io",
     "constraint_toolkit", 
     "constraint_toolkit_gui",
     # Main classes
     "ConstraintToolkitGUI",
     # Key functions
+    "get_constraint_index",
     "get_all_constraints",
-    "get_constraint_connections"
+    "get_constraint_connections",
+    "get_constraint_targets",
+    "get_constraints_connections",
+    "resolve_constraint_connections",
+    "bake_and_delete_constraints",
+    "get_constraint_graph_report",
+    "export_constraints",
+    "import_constraints",
 ]
 
-logging.basicConfig(
-    level=logging.NOTSET, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# the logging configuration belongs to Maya, or to whoever runs the tool
 logger = logging.getLogger(__name__)
+
+try:
+    from ..mt_core import lazy
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import lazy
+
+# nothing is imported until used, Qt loads with the GUI, not with the package
+__getattr__, __dir__ = lazy.attach(
+    __name__,
+    ["constraint_bake", "constraint_graph", "constraint_index", "constraint_io", "constraint_toolkit", "constraint_toolkit_gui"],
+    {
+        "constraint_toolkit": [
+            "get_constraint_index",
+            "get_all_constraints",
+            "get_constraint_connections",
+            "get_constraint_targets",
+            "get_constraints_connections",
+            "resolve_constraint_connections",
+            "bake_and_delete_constraints",
+            "get_constraint_graph_report",
+            "export_constraints",
+            "import_constraints",
+        ],
+        "constraint_toolkit_gui": ["ConstraintToolkitGUI"],
+    },
+)
@@ -0,0 +1,188 @@
+"""
+Bake constraints to keys, then delete them, as a single undo step.
+
+bakeResults per object scrubs the timeline once per call. Here all the driven plugs of all the constraints are
+sampled together, frame by frame through an MDGContext (the current time never changes), so baking 200 constraints
+costs one sweep. Each plug then gets its anim curve with all its keys in one MFnAnimCurve.addKeys call, after the
+constraints are deleted with one modifier.
+
+Usage:
+    from mt_local_constraint_manager import constraint_bake
+    constraint_bake.bake_and_delete(["parentConstraint1", "orientConstraint3"], start=1, end=1000, simplify=True)
+"""
+
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+import maya.cmds as cm
+
+from . import constraint_index
+
+try:
+    from ..mt_core import modifier
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import modifier
+
+SIMPLIFY_TOLERANCE = 1e-4
+
+
+def driven_plugs(connections) -> list:
+    """The driven plugs of the constraints, compound channels (translate) expanded to their children."""
+    selection = om2.MSelectionList()
+    for c in connections:
+        for node, channels in zip(c.driven, c.channels):
+            for channel in channels:
+                try:
+                    selection.add(f"{node}.{channel}")
+                except RuntimeError:
+                    continue
+
+    plugs = []
+    for i in range(selection.length()):
+        plug = selection.getPlug(i)
+        if plug.isCompound:
+            plugs.extend(plug.child(c) for c in range(plug.numChildren()))
+        else:
+            plugs.append(plug)
+    return plugs
+
+
+def sample(plugs, frames) -> list:
+    """
+    Values of every plug on every frame, in internal units, in one pass over the frames.
+    Returns one list of values per plug.
+    """
+    values = [[] for _ in plugs]
+    unit = om2.MTime.uiUnit()
+    for frame in frames:
+        context = om2.MDGContext(om2.MTime(frame, unit))
+        previous = context.makeCurrent()
+        try:
+            for plug_values, plug in zip(values, plugs):
+                plug_values.append(plug.asDouble())
+        finally:
+            previous.makeCurrent()
+    return values
+
+
+def _is_redundant(frames, values, first, last, tolerance) -> bool:
+    """True when every key between first and last is on the line from first to last."""
+    span = frames[last] - frames[first]
+    for i in range(first + 1, last):
+        t = (frames[i] - frames[first]) / span
+        if abs(values[first] + (values[last] - values[first]) * t - values[i]) > tolerance:
+            return False
+    return True
+
+
+def simplify_keys(frames, values, tolerance=SIMPLIFY_TOLERANCE) -> tuple:
+    """
+    Drop the keys lying on the line between the keys around them, pure python.
+    The first and last keys are always kept, a constant curve ends up with two keys.
+    """
+    count = len(frames)
+    if count < 3:
+        return list(frames), list(values)
+    kept = [0]
+    for i in range(1, count - 1):
+        if not _is_redundant(frames, values, kept[-1], i + 1, tolerance):
+            kept.append(i)
+    kept.append(count - 1)
+    return [frames[i] for i in kept], [values[i] for i in kept]
+
+
+class BakeEdit:
+    """
+    Deletes the constraints then keys their driven plugs, undone and redone as a whole.
+    Committed through mt_core.modifier, like a modifier.
+    """
+
+    def __init__(self, constraints, plugs, frames, values):
+        self.delete_mod = om2.MDagModifier()
+        for obj in constraints:
+            self.delete_mod.deleteNode(obj)
+        self.plugs = plugs
+        self.frames = frames
+        self.values = values
+        self.curve_mod = None
+        self.key_change = None
+
+    def doIt(self):
+        if self.key_change is not None:  # redo
+            self.delete_mod.doIt()
+            self.curve_mod.doIt()
+            self.key_change.redoIt()
+            return
+
+        self.delete_mod.doIt()  # frees the driven plugs for the curves
+        self.curve_mod = om2.MDGModifier()
+        self.key_change = oma2.MAnimCurveChange()
+        curve_fns = []
+        for plug in self.plugs:
+            if plug.isDestination:
+                curve_fns.append(None)  # still driven by something else, a pairBlend input already keyed...
+                continue
+            curve_fn = oma2.MFnAnimCurve()
+            curve_fn.create(plug, modifier=self.curve_mod)
+            curve_fns.append(curve_fn)
+        self.curve_mod.doIt()
+
+        unit = om2.MTime.uiUnit()
+        for curve_fn, frames, values in zip(curve_fns, self.frames, self.values):
+            if curve_fn is None:
+                continue
+            times = om2.MTimeArray([om2.MTime(f, unit) for f in frames])
+            curve_fn.addKeys(times, om2.MDoubleArray(values), change=self.key_change)
+
+    def undoIt(self):
+        self.key_change.undoIt()
+        self.curve_mod.undoIt()
+        self.delete_mod.undoIt()
+
+
+def bake_and_delete(constraint_names, start=None, end=None, simplify=False, tolerance=SIMPLIFY_TOLERANCE) -> dict:
+    """
+    Bake the motion of the constraints to keys on their driven channels, then delete the constraints.
+
+    Args:
+        constraint_names (list): the constraints.
+        start (float, optional): first frame. Defaults to the playback start.
+        end (float, optional): last frame. Defaults to the playback end.
+        simplify (bool, optional): drop the keys on the line between their neighbours. Defaults to False.
+        tolerance (float, optional): simplify tolerance, in internal units (cm, radians).
+
+    Returns:
+        dict with keys: constraints, plugs, keys
+    """
+    connections = constraint_index.resolve_many(constraint_names)
+    if not connections:
+        return {'constraints': 0, 'plugs': 0, 'keys': 0}
+    if start is None:
+        start = cm.playbackOptions(q=True, min=True)
+    if end is None:
+        end = cm.playbackOptions(q=True, max=True)
+
+    selection = om2.MSelectionList()
+    for name in connections:
+        selection.add(name)
+    constraints = [selection.getDependNode(i) for i in range(selection.length())]
+
+    plugs = driven_plugs(connections.values())
+    frames = [float(f) for f in range(int(round(start)), int(round(end)) + 1)]
+    values = sample(plugs, frames)
+
+    plug_frames = []
+    plug_values = []
+    for plug_values_all in values:
+        if simplify:
+            f, v = simplify_keys(frames, plug_values_all, tolerance)
+        else:
+            f, v = frames, plug_values_all
+        plug_frames.append(f)
+        plug_values.append(v)
+
+    modifier.commit(BakeEdit(constraints, plugs, plug_frames, plug_values))
+    return {
+        'constraints': len(constraints),
+        'plugs': len(plugs),
+        'keys': sum(len(f) for f in plug_frames),
+    }
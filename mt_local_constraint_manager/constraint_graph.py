@@ -0,0 +1,229 @@
+"""
+Constraint dependency graph.
+
+The constraint index only gives driver / driven pairs. Here they become a directed graph,
+driver -> constraint -> driven, plus the DAG links (a driven node moves its children, which may drive other constraints),
+to find what makes constraint setups hard to follow and slow to evaluate in parallel:
+- cycles,
+- the longest chain of constraints,
+- nodes driven by more than one constraint.
+
+Everything is linear in the size of the graph (Tarjan's strongly connected components, then a longest path over the
+topological order of the components), and apart from dag_parents it is pure python.
+
+Usage:
+    from mt_local_constraint_manager import constraint_graph
+    report = constraint_graph.analyze_index(index)
+    report.cycles, report.longest_chain, report.multi_driven
+"""
+
+from collections import namedtuple
+
+GraphReport = namedtuple("GraphReport", ["cycles", "longest_chain", "chain_depth", "multi_driven"])
+GraphReport.__doc__ = """
+cycles: list of cycles, each a list of node and constraint names,
+longest_chain: the nodes of the longest driver -> constraint -> driven path, constraints included,
+chain_depth: the number of constraints along longest_chain,
+multi_driven: {driven node: [constraints]} for the nodes driven by more than one constraint.
+"""
+
+
+def build_graph(records, parents=None) -> dict:
+    """
+    Adjacency of the graph, {node: [successors]}.
+
+    Args:
+        records: constraint records (name, targets, driven), see constraint_index.
+        parents (dict, optional): {node: closest ancestor in the graph}, adds the ancestor -> node edges.
+    """
+    graph = {}
+
+    def add_edge(source, destination):
+        graph.setdefault(source, []).append(destination)
+        graph.setdefault(destination, [])
+
+    for record in records:
+        graph.setdefault(record.name, [])
+        for target in record.targets:
+            add_edge(target, record.name)
+        for driven in record.driven:
+            add_edge(record.name, driven)
+    for node, parent in (parents or {}).items():
+        if node in graph and parent in graph:
+            add_edge(parent, node)
+    return graph
+
+
+def strongly_connected_components(graph) -> list:
+    """Tarjan's algorithm, iterative so deep chains don't hit the recursion limit. Components in reverse topological order."""
+    index_of = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in graph:
+        if root in index_of:
+            continue
+        work = [(root, iter(graph[root]))]
+        index_of[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for successor in successors:
+                if successor not in index_of:
+                    index_of[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph[successor])))
+                    advanced = True
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], index_of[successor])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def find_cycles(graph, components=None) -> list:
+    """The components that loop: more than one node, or a node driving itself."""
+    components = components if components is not None else strongly_connected_components(graph)
+    return [
+        c for c in components
+        if len(c) > 1 or c[0] in graph[c[0]]
+    ]
+
+
+def longest_chain(graph, constraints, components=None) -> tuple:
+    """
+    (path, depth): the path through the most constraints, cycles collapsed to one step.
+    Dynamic programming over the components in topological order. The path starts at a driver and ends at a driven
+    node: at equal depth a component steps into a successor rather than ending the path, and the most upstream
+    component starts it.
+    """
+    components = components if components is not None else strongly_connected_components(graph)
+    component_of = {}
+    for i, component in enumerate(components):
+        for node in component:
+            component_of[node] = i
+
+    weight = [sum(1 for n in c if n in constraints) for c in components]
+    best = list(weight)
+    next_component = [None] * len(components)
+    # Tarjan gives successors first: every component is done after everything it reaches
+    for i, component in enumerate(components):
+        for node in component:
+            for successor in graph[node]:
+                j = component_of[successor]
+                if j == i:
+                    continue
+                longer = weight[i] + best[j] > best[i]
+                if longer or (next_component[i] is None and weight[i] + best[j] == best[i]):
+                    best[i] = weight[i] + best[j]
+                    next_component[i] = (node, j, successor)
+
+    if not components or not max(best):
+        return [], 0
+    # components come downstream first, the last of the deepest is where a chain starts
+    start = max(range(len(components)), key=lambda i: (best[i], i))
+
+    path = []
+    i, entry = start, None
+    while True:
+        step = next_component[i]
+        exit_node = step[0] if step is not None else None
+        if entry is None:
+            entry = exit_node if exit_node is not None else components[i][0]
+        path.append(entry)
+        # a cycle on the way: all its members are part of the chain
+        path.extend(n for n in components[i] if n not in (entry, exit_node))
+        if step is None:
+            break
+        if exit_node != entry:
+            path.append(exit_node)
+        i, entry = step[1], step[2]
+    return path, best[start]
+
+
+def multi_driven(records) -> dict:
+    """{node: [constraints]} for the nodes driven by more than one constraint."""
+    drivers = {}
+    for record in records:
+        for driven in record.driven:
+            drivers.setdefault(driven, []).append(record.name)
+    return {node: c for node, c in drivers.items() if len(c) > 1}
+
+
+def analyze(records, parents=None) -> GraphReport:
+    records = list(records)
+    graph = build_graph(records, parents)
+    components = strongly_connected_components(graph)
+    constraints = {r.name for r in records}
+    chain, depth = longest_chain(graph, constraints, components)
+    return GraphReport(find_cycles(graph, components), chain, depth, multi_driven(records))
+
+
+def dag_parents(names) -> dict:
+    """{node: closest ancestor also in names}, from the scene."""
+    import maya.api.OpenMaya as om2  # the rest of the module doesn't need Maya
+
+    names = set(names)
+    selection = om2.MSelectionList()
+    found = []
+    for name in names:
+        try:
+            selection.add(name)
+        except RuntimeError:
+            continue
+        found.append(name)
+
+    short = {}
+    paths = {}
+    for i, name in enumerate(found[:selection.length()]):
+        try:
+            path = selection.getDagPath(i)
+        except (TypeError, RuntimeError):
+            continue  # not a dag node
+        paths[name] = path
+        short[path.fullPathName()] = name
+
+    parents = {}
+    for name, path in paths.items():
+        parent = om2.MDagPath(path)
+        while parent.length() > 1:
+            parent.pop()
+            ancestor = short.get(parent.fullPathName())
+            if ancestor is not None:
+                parents[name] = ancestor
+                break
+    return parents
+
+
+def analyze_index(index) -> GraphReport:
+    """Analyze the constraints of an index, with the DAG links between their drivers and driven nodes."""
+    records = list(index)
+    names = set()
+    for record in records:
+        names.update(record.targets)
+        names.update(record.driven)
+    # constraints are parented under their driven node, those links aren't dependencies
+    names -= {record.name for record in records}
+    return analyze(records, dag_parents(names))
@@ -0,0 +1,371 @@
+"""
+Scene constraint index.
+
+One MItDependencyNodes pass over the constraint nodes reads, for each constraint, its type, whether it is referenced,
+its targets with their weights and the nodes it drives. The records are kept in a ConstraintIndex and reused by every
+GUI action, instead of a cm.referenceQuery per constraint on listing and two cm.listConnections per click.
+
+A watched index follows the scene by itself: node added / removed / renamed and connection callbacks only collect
+what changed, and the changes are applied at idle time, as one batch, so creating hundreds of constraints in a loop
+costs one update.
+
+Usage:
+    from mt_local_constraint_manager import constraint_index
+    index = constraint_index.ConstraintIndex()
+    index.build(local=True)
+    for record in index:
+        print(record.name, record.type, record.targets, record.weights, record.driven)
+
+    index.watch(on_change=lambda changes: print(changes.added, changes.removed, changes.renamed, changes.updated))
+    ...
+    index.unwatch()
+"""
+
+from collections import namedtuple
+
+import maya.api.OpenMaya as om2
+import maya.cmds as cm
+
+ConstraintRecord = namedtuple(
+    "ConstraintRecord", ["handle", "name", "type", "referenced", "targets", "weights", "driven"]
+)
+ConstraintRecord.__doc__ = """
+One constraint of the index.
+
+handle (MObjectHandle), name (str, shortest unique name), type (str, node type), referenced (bool),
+targets (tuple of driver names), weights (tuple of floats, one per target), driven (tuple of driven node names).
+"""
+
+ConstraintConnections = namedtuple(
+    "ConstraintConnections", ["constraint", "targets", "weights", "weight_plugs", "driven", "channels", "target_indices"]
+)
+ConstraintConnections.__doc__ = """
+What a constraint is connected to, see resolve().
+
+targets, weights, weight_plugs ("parentConstraint1.locator1W0") and target_indices (the logical index of the target
+in the target[] multi, which can be sparse once a target was removed) have one entry per target, driven and channels one entry per driven node, channels being a tuple of its driven attributes ("translateX", "rotate"...).
+"""
+
+ConstraintChanges = namedtuple("ConstraintChanges", ["added", "removed", "renamed", "updated", "rebuilt"])
+ConstraintChanges.__doc__ = """
+What a flush changed in the index: added, removed and updated are lists of names, renamed a list of (old, new).
+rebuilt is True when the whole index was read again (new / opened scene).
+"""
+
+CONSTRAINT_TYPES = (
+    "parentConstraint", "pointConstraint", "orientConstraint", "scaleConstraint", "aimConstraint",
+    "poleVectorConstraint", "geometryConstraint", "normalConstraint", "tangentConstraint", "pointOnPolyConstraint",
+)
+
+TARGET_INPUTS = ("targetParentMatrix", "targetGeometry")
+OUTPUT_PREFIX = "constraint"  # constraintTranslate, constraintRotateX, constraintScale...
+
+
+def node_name(obj) -> str:
+    """Shortest unique name of obj."""
+    if obj.hasFn(om2.MFn.kDagNode):
+        return om2.MFnDagNode(obj).partialPathName()
+    return om2.MFnDependencyNode(obj).name()
+
+
+def _source_node(plug):
+    if not plug.isDestination:
+        return None
+    return plug.source().node()
+
+
+def read_targets(node_fn) -> tuple:
+    """(targets, weights, weight plugs, logical indices) of a constraint, walking its target[] multi."""
+    targets, weights, weight_plugs, indices = [], [], [], []
+    target_array = node_fn.findPlug("target", False)
+    for i in range(target_array.numElements()):
+        element = target_array.elementByPhysicalIndex(i)
+        driver = None
+        weight = 1.0
+        weight_plug = None
+        for c in range(element.numChildren()):
+            child = element.child(c)
+            child_name = child.partialName(useLongNames=True).rpartition(".")[2]
+            if child_name in TARGET_INPUTS and driver is None:
+                driver = _source_node(child)
+            elif child_name == "targetWeight":
+                weight = child.asDouble()
+                # the user facing weight is the alias attribute (locator1W0) driving targetWeight
+                weight_plug = child.source() if child.isDestination else child
+        if driver is not None:
+            targets.append(node_name(driver))
+            weights.append(weight)
+            weight_plugs.append(weight_plug.name() if weight_plug is not None else "")
+            indices.append(element.logicalIndex())
+    return tuple(targets), tuple(weights), tuple(weight_plugs), tuple(indices)
+
+
+def read_driven(node_fn) -> tuple:
+    """(driven nodes, driven channels per node) of a constraint, from its output plugs. Other constraints are excluded."""
+    channels = {}  # driven name -> channels, in connection order
+    for plug in node_fn.getConnections():
+        if not plug.isSource:
+            continue
+        if not plug.partialName(useLongNames=True).rpartition(".")[2].startswith(OUTPUT_PREFIX):
+            continue
+        for destination in plug.destinations():
+            obj = destination.node()
+            if obj.hasFn(om2.MFn.kConstraint):
+                continue
+            channel = destination.partialName(useLongNames=True)
+            node_channels = channels.setdefault(node_name(obj), [])
+            if channel not in node_channels:
+                node_channels.append(channel)
+    return tuple(channels), tuple(tuple(c) for c in channels.values())
+
+
+def resolve(obj) -> ConstraintConnections:
+    """Every driver with its weight, and every driven node with its driven channels, of a constraint in one API pass."""
+    node_fn = om2.MFnDependencyNode(obj)
+    targets, weights, weight_plugs, indices = read_targets(node_fn)
+    driven, channels = read_driven(node_fn)
+    return ConstraintConnections(node_name(obj), targets, weights, weight_plugs, driven, channels, indices)
+
+
+def resolve_many(constraint_names) -> dict:
+    """
+    resolve() for many constraints at once: the names are looked up in a single selection list.
+    Returns {name: ConstraintConnections}, names that don't exist or aren't constraints are left out,
+    and so is a second name of the same node (short name and full path), under its first name only.
+    """
+    selection = om2.MSelectionList()
+    names = []
+    for name in dict.fromkeys(constraint_names):
+        count = selection.length()
+        try:
+            selection.add(name)
+        except RuntimeError:
+            continue
+        if selection.length() == count:
+            continue  # another name of a node already added, the list keeps it once
+        names.append(name)
+
+    connections = {}
+    for i, name in enumerate(names):
+        obj = selection.getDependNode(i)
+        if obj.hasFn(om2.MFn.kConstraint):
+            connections[name] = resolve(obj)
+    return connections
+
+
+def read_constraint(obj) -> ConstraintRecord:
+    connections = resolve(obj)
+    return ConstraintRecord(
+        om2.MObjectHandle(obj),
+        connections.constraint,
+        om2.MFnDependencyNode(obj).typeName,
+        om2.MFnDependencyNode(obj).isFromReferencedFile,
+        connections.targets,
+        connections.weights,
+        connections.driven,
+    )
+
+
+class ConstraintIndex:
+    """The constraints of the scene, by name, in scene order."""
+
+    def __init__(self):
+        self.records = {}  # name -> ConstraintRecord
+        self.local = True
+        self._names = {}  # MObjectHandle hash -> name
+        self._callbacks = []
+        self._on_change = None
+        self._flush_scheduled = False
+        self._reset_pending()
+
+    def _reset_pending(self):
+        self._added = {}    # hash -> MObjectHandle
+        self._removed = set()
+        self._renamed = set()
+        self._renamed_others = set()  # previous names of renamed drivers / driven
+        self._reconnected = set()  # hashes of the indexed constraints connected or disconnected since read
+        self._rebuild = False
+
+    def _store(self, record):
+        self.records[record.name] = record
+        self._names[record.handle.hashCode()] = record.name
+
+    def build(self, local=True):
+        """Read every constraint of the scene in one pass. With local, the referenced ones are skipped."""
+        self.local = local
+        self.records = {}
+        self._names = {}
+        it = om2.MItDependencyNodes(om2.MFn.kConstraint)
+        while not it.isDone():
+            obj = it.thisNode()
+            if not (local and om2.MFnDependencyNode(obj).isFromReferencedFile):
+                self._store(read_constraint(obj))
+            it.next()
+        return self
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records.values())
+
+    def __contains__(self, name):
+        return name in self.records
+
+    def names(self) -> list:
+        return list(self.records)
+
+    def get(self, name):
+        """
+        The record of name, None if there is no such constraint.
+        A watched index re-reads a constraint whose connections changed since it was read, without watch() call
+        refresh() after retargeting a constraint.
+        """
+        record = self.records.get(name)
+        if record is not None and record.handle.isValid():
+            if record.handle.hashCode() not in self._reconnected:
+                return record
+            record = read_constraint(record.handle.object())  # the next flush reports it as updated
+            self._store(record)
+            return record
+        self.records.pop(name, None)
+        selection = om2.MSelectionList()
+        try:
+            selection.add(name)
+        except RuntimeError:
+            return None
+        obj = selection.getDependNode(0)
+        if not obj.hasFn(om2.MFn.kConstraint):
+            return None
+        record = read_constraint(obj)
+        self._store(record)
+        return record
+
+    def refresh(self, name):
+        """Re-read one constraint, after its targets changed."""
+        self.records.pop(name, None)
+        return self.get(name)
+
+    # ---- incremental updates
+
+    def watch(self, on_change=None):
+        """Follow the scene with callbacks, on_change(ConstraintChanges) is called after each idle batch."""
+        self.unwatch()
+        self._on_change = on_change
+        for type_name in CONSTRAINT_TYPES:
+            self._callbacks.append(om2.MDGMessage.addNodeAddedCallback(self._node_added, type_name))
+            self._callbacks.append(om2.MDGMessage.addNodeRemovedCallback(self._node_removed, type_name))
+        self._callbacks.append(om2.MNodeMessage.addNameChangedCallback(om2.MObject.kNullObj, self._name_changed))
+        self._callbacks.append(om2.MDGMessage.addConnectionCallback(self._connection_changed))
+        for message in (om2.MSceneMessage.kAfterNew, om2.MSceneMessage.kAfterOpen):
+            self._callbacks.append(om2.MSceneMessage.addCallback(message, self._scene_changed))
+
+    def unwatch(self):
+        if self._callbacks:
+            om2.MMessage.removeCallbacks(self._callbacks)
+        self._callbacks = []
+        self._on_change = None
+        self._reset_pending()
+
+    @property
+    def watching(self) -> bool:
+        return bool(self._callbacks)
+
+    def _schedule_flush(self):
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            cm.evalDeferred(self.flush, lowestPriority=True)
+
+    def _node_added(self, obj, client_data=None):
+        # connections aren't made yet, the node is read at flush time
+        self._added[om2.MObjectHandle(obj).hashCode()] = om2.MObjectHandle(obj)
+        self._schedule_flush()
+
+    def _node_removed(self, obj, client_data=None):
+        key = om2.MObjectHandle(obj).hashCode()
+        self._added.pop(key, None)
+        self._removed.add(key)
+        self._schedule_flush()
+
+    def _name_changed(self, obj, previous_name, client_data=None):
+        if obj.hasFn(om2.MFn.kConstraint):
+            self._renamed.add(om2.MObjectHandle(obj).hashCode())
+        elif previous_name and self.records:
+            self._renamed_others.add(previous_name)
+        else:
+            return
+        self._schedule_flush()
+
+    def _connection_changed(self, source_plug, destination_plug, made, client_data=None):
+        for plug in (source_plug, destination_plug):
+            obj = plug.node()
+            if not obj.hasFn(om2.MFn.kConstraint):
+                continue
+            key = om2.MObjectHandle(obj).hashCode()
+            if key in self._names and key not in self._removed:
+                self._reconnected.add(key)
+                self._schedule_flush()
+
+    def _scene_changed(self, client_data=None):
+        self._rebuild = True
+        self._schedule_flush()
+
+    def flush(self) -> ConstraintChanges:
+        """Apply the pending changes to the index, and report them."""
+        self._flush_scheduled = False
+        if self._rebuild:
+            self._reset_pending()
+            self.build(self.local)
+            changes = ConstraintChanges([], [], [], [], True)
+        else:
+            changes = self._apply_pending()
+            self._reset_pending()
+        if self._on_change is not None and any(changes):
+            self._on_change(changes)
+        return changes
+
+    def _apply_pending(self) -> ConstraintChanges:
+        added, removed, renamed, updated = [], [], [], []
+
+        for key in self._removed:
+            name = self._names.pop(key, None)
+            if name is not None and self.records.pop(name, None) is not None:
+                removed.append(name)
+
+        for key in self._renamed:
+            old_name = self._names.get(key)
+            record = self.records.pop(old_name, None) if old_name is not None else None
+            if record is None or not record.handle.isValid():
+                continue
+            record = record._replace(name=node_name(record.handle.object()))
+            self._store(record)
+            renamed.append((old_name, record.name))
+
+        for key, handle in self._added.items():
+            if not handle.isValid() or key in self._names:
+                continue  # deleted before idle, or already indexed
+            obj = handle.object()
+            if self.local and om2.MFnDependencyNode(obj).isFromReferencedFile:
+                continue
+            record = read_constraint(obj)
+            self._store(record)
+            added.append(record.name)
+
+        for key in self._reconnected:
+            name = self._names.get(key)
+            record = self.records.get(name) if name is not None else None
+            if record is not None and record.handle.isValid():
+                self._store(read_constraint(record.handle.object()))
+                updated.append(name)
+
+        if self._renamed_others:
+            # a driver or driven node was renamed, the records pointing to it are read again
+            short_names = {n.rpartition("|")[2] for n in self._renamed_others}
+            for record in list(self.records.values()):
+                names = {n.rpartition("|")[2] for n in record.targets + record.driven}
+                if names & short_names and record.handle.isValid() and record.name not in updated:
+                    self._store(read_constraint(record.handle.object()))
+                    updated.append(record.name)
+
+        return ConstraintChanges(added, removed, renamed, updated, False)
+
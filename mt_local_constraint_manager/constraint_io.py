@@ -0,0 +1,297 @@
+"""
+Constraint setups export / import.
+
+The constraints are saved as a compact JSON description (type, targets with weights and offsets, driven node and
+channels, settings), and recreated on another character or in another shot with the namespaces remapped.
+The whole import is one MDGModifier holding the constraint commands, committed as a single undo step.
+
+The file format, the namespace remapping and the commands built on import are plain python, they run without Maya:
+    descriptions = constraint_io.load("space_switches.json")
+    constraint_io.remap_namespaces(descriptions, {"char01": "char02"})
+    constraint_io.creation_commands(descriptions[0], "parentConstraint1")
+
+Usage in Maya:
+    from mt_local_constraint_manager import constraint_io
+    constraint_io.export_constraints("space_switches.json")  # all the local constraints
+    constraint_io.import_constraints("space_switches.json", {"char01": "char02"})
+
+File:
+    {"version": 1, "constraints": [
+        {"name": "parentConstraint1", "type": "parentConstraint",
+         "targets": [{"node": "char01:world_CTL", "weight": 1.0, "offsets": {"targetOffsetTranslate": [0, 1, 0]}}],
+         "driven": "char01:hand_CTL", "channels": ["translateX", "translateY", ...],
+         "settings": {"interpType": 1}, "world_up_object": null}
+    ]}
+"""
+
+import json
+
+FORMAT_VERSION = 1
+
+# settings read on every constraint that has them, set back after creation
+SETTINGS = ("offset", "aimVector", "upVector", "worldUpVector", "worldUpType", "interpType")
+TARGET_OFFSETS = ("targetOffsetTranslate", "targetOffsetRotate")
+
+# constraint type -> {driven channel kind: skip flag}
+SKIP_FLAGS = {
+    "parentConstraint": {"translate": "-st", "rotate": "-sr"},
+    "pointConstraint": {"translate": "-sk"},
+    "orientConstraint": {"rotate": "-sk"},
+    "scaleConstraint": {"scale": "-sk"},
+    "aimConstraint": {"rotate": "-sk"},
+}
+CONSTRAINT_COMMANDS = (
+    "parentConstraint", "pointConstraint", "orientConstraint", "scaleConstraint", "aimConstraint",
+    "poleVectorConstraint", "geometryConstraint", "normalConstraint", "tangentConstraint",
+)
+
+
+# ---- file format, pure python
+
+def _check(description):
+    for key in ("name", "type", "targets", "driven"):
+        if key not in description:
+            raise ValueError(f"Constraint description without {key}: {description}")
+    if description["type"] not in CONSTRAINT_COMMANDS:
+        raise ValueError(f"Unsupported constraint type {description['type']}.")
+
+
+def dumps(descriptions) -> str:
+    for description in descriptions:
+        _check(description)
+    return json.dumps({"version": FORMAT_VERSION, "constraints": list(descriptions)}, separators=(",", ":"))
+
+
+def loads(text: str) -> list:
+    data = json.loads(text)
+    if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Not a constraint file (version {FORMAT_VERSION} expected).")
+    descriptions = data.get("constraints", [])
+    for description in descriptions:
+        _check(description)
+    return descriptions
+
+
+def save(path: str, descriptions) -> str:
+    with open(path, "w") as f:
+        f.write(dumps(descriptions))
+    return path
+
+
+def load(path: str) -> list:
+    with open(path) as f:
+        return loads(f.read())
+
+
+def split_namespace(name: str) -> tuple:
+    """'|char01:grp|char01:ctrl' -> ('char01', '|char01:grp|char01:ctrl'), the namespace of the last element."""
+    short = name.rpartition("|")[2]
+    return short.rpartition(":")[0], name
+
+
+def namespaces(descriptions) -> set:
+    """Every namespace used by the descriptions, the root namespace is ''."""
+    found = set()
+    for description in descriptions:
+        for name in _node_names(description):
+            found.add(split_namespace(name)[0])
+    return found
+
+
+def _node_names(description):
+    yield description["driven"]
+    for target in description["targets"]:
+        yield target["node"]
+    if description.get("world_up_object"):
+        yield description["world_up_object"]
+
+
+def remap_name(name: str, mapping: dict) -> str:
+    """Remap the namespace of every path element of name, {"": "char02"} adds one to root namespace nodes."""
+    elements = []
+    for element in name.split("|"):
+        if not element:
+            elements.append(element)
+            continue
+        namespace, _, short = element.rpartition(":")
+        if namespace in mapping:
+            namespace = mapping[namespace]
+        elements.append(f"{namespace}:{short}" if namespace else short)
+    return "|".join(elements)
+
+
+def remap_namespaces(descriptions, mapping: dict) -> list:
+    """Remap, in place, the namespaces of every node of the descriptions. Returns descriptions."""
+    if not mapping:
+        return descriptions
+    for description in descriptions:
+        description["driven"] = remap_name(description["driven"], mapping)
+        for target in description["targets"]:
+            target["node"] = remap_name(target["node"], mapping)
+        if description.get("world_up_object"):
+            description["world_up_object"] = remap_name(description["world_up_object"], mapping)
+    return descriptions
+
+
+def parse_namespace_map(text: str) -> dict:
+    """'char01=char02, prop=' -> {"char01": "char02", "prop": ""}."""
+    mapping = {}
+    for pair in text.split(","):
+        if not pair.strip():
+            continue
+        old, sep, new = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Expected old=new, got {pair.strip()}")
+        mapping[old.strip().strip(":")] = new.strip().strip(":")
+    return mapping
+
+
+def _mel_values(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(_mel_values(v) for v in value)
+    if isinstance(value, bool):
+        return str(int(value))
+    return repr(value)
+
+
+def _skip_flags(description) -> list:
+    flags = SKIP_FLAGS.get(description["type"])
+    channels = description.get("channels")
+    if not flags or channels is None:
+        return []
+    driven_axes = {kind: set() for kind in flags}
+    for channel in channels:
+        for kind in flags:
+            if channel == kind:
+                driven_axes[kind].update("xyz")
+            elif channel.startswith(kind) and len(channel) == len(kind) + 1:
+                driven_axes[kind].add(channel[-1].lower())
+    skips = []
+    for kind, flag in flags.items():
+        skips += [f"{flag} {axis}" for axis in "xyz" if axis not in driven_axes[kind]]
+    return skips
+
+
+def creation_commands(description, name: str) -> list:
+    """The MEL commands recreating the constraint as name: creation, weights, offsets and settings."""
+    constraint_type = description["type"]
+    targets = description["targets"]
+    flags = [f'-n "{name}"'] + _skip_flags(description)
+    if description.get("world_up_object"):
+        flags.append(f'-wuo "{description["world_up_object"]}"')
+    target_names = " ".join(f'"{t["node"]}"' for t in targets)
+    commands = [f'{constraint_type} {" ".join(flags)} {target_names} "{description["driven"]}";']
+
+    # the new constraint gets its targets at the logical indices 0..n-1, in the order of the creation command,
+    # whatever indices they had on the exported constraint
+    for i, target in enumerate(targets):
+        weight = target.get("weight", 1.0)
+        if weight != 1.0:
+            commands.append(f'{constraint_type} -e -w {weight!r} "{target["node"]}" "{name}";')
+        for attr, value in target.get("offsets", {}).items():
+            commands.append(f'setAttr "{name}.target[{i}].{attr}" {_mel_values(value)};')
+    for attr, value in description.get("settings", {}).items():
+        commands.append(f'setAttr "{name}.{attr}" {_mel_values(value)};')
+    return commands
+
+
+# ---- Maya side
+
+def _get_value(cm, plug_name):
+    value = cm.getAttr(plug_name)
+    if isinstance(value, list) and len(value) == 1 and isinstance(value[0], tuple):
+        return list(value[0])  # double3
+    return value
+
+
+def describe(constraint_names) -> list:
+    """The descriptions of the constraints, their connections resolved in one pass."""
+    import maya.cmds as cm  # the file format side of the module doesn't need Maya
+    from . import constraint_index
+
+    connections = constraint_index.resolve_many(constraint_names)
+    descriptions = []
+    for name, c in connections.items():
+        if not c.driven or not c.targets:
+            continue
+        constraint_type = cm.nodeType(name)
+        if constraint_type not in CONSTRAINT_COMMANDS:
+            continue
+        description = {
+            "name": name.rpartition("|")[2].rpartition(":")[2],
+            "type": constraint_type,
+            "targets": [],
+            "driven": c.driven[0],
+            "channels": list(c.channels[0]),
+            "settings": {},
+            "world_up_object": None,
+        }
+        for target, weight, index in zip(c.targets, c.weights, c.target_indices):
+            offsets = {}
+            for attr in TARGET_OFFSETS:
+                if cm.attributeQuery(attr, node=name, exists=True):
+                    offsets[attr] = _get_value(cm, f"{name}.target[{index}].{attr}")
+            description["targets"].append({"node": target, "weight": weight, "offsets": offsets})
+        for attr in SETTINGS:
+            if cm.attributeQuery(attr, node=name, exists=True):
+                description["settings"][attr] = _get_value(cm, f"{name}.{attr}")
+        if cm.attributeQuery("worldUpMatrix", node=name, exists=True):
+            up_object = cm.listConnections(f"{name}.worldUpMatrix", source=True, destination=False)
+            description["world_up_object"] = up_object[0] if up_object else None
+        descriptions.append(description)
+    return descriptions
+
+
+def export_constraints(path: str, constraint_names=None, index=None) -> int:
+    """Save the constraints (all the local ones by default) to path, returns how many were saved."""
+    if constraint_names is None:
+        if index is None:
+            from . import constraint_toolkit
+            index = constraint_toolkit.get_constraint_index()
+        constraint_names = index.names()
+    descriptions = describe(constraint_names)
+    save(path, descriptions)
+    return len(descriptions)
+
+
+def _unique_name(cm, name, used) -> str:
+    candidate = name
+    base = name.rstrip("0123456789")
+    number = 1
+    while candidate in used or cm.objExists(candidate):
+        candidate = f"{base}{number}"
+        number += 1
+    used.add(candidate)
+    return candidate
+
+
+def import_constraints(path: str, namespace_map=None) -> list:
+    """
+    Recreate the constraints of path, with the namespaces remapped ({"char01": "char02"}),
+    in one modifier committed as a single undo step. Returns the names of the created constraints.
+    Constraints whose driven or targets are missing in the scene are skipped.
+    """
+    import maya.api.OpenMaya as om2
+    import maya.cmds as cm
+
+    try:
+        from ..mt_core import modifier
+    except ImportError:  # tools installed flat in the scripts folder
+        from mt_core import modifier
+
+    descriptions = remap_namespaces(load(path), namespace_map or {})
+    mod = om2.MDGModifier()
+    used = set()
+    created = []
+    for description in descriptions:
+        missing = [n for n in _node_names(description) if not cm.objExists(n)]
+        if missing:
+            cm.warning(f"Skipping {description['name']}, missing {', '.join(missing)}.")
+            continue
+        name = _unique_name(cm, description["name"], used)
+        for command in creation_commands(description, name):
+            mod.commandToExecute(command)
+        created.append(name)
+    if created:
+        modifier.commit(mod)
+    return created
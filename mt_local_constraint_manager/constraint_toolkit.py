@@ -1,53 +1,150 @@
-import maya.cmds as cm
 
+from . import constraint_bake
+from . import constraint_graph
+from . import constraint_index
+from . import constraint_io
 from . import logger
 
+try:
+    from ..mt_core import trace
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import trace
 
 
-def get_all_constraints(local=True) -> list:
+def get_constraint_index(local=True) -> constraint_index.ConstraintIndex:
+    """
+    Returns the index of the constraints in the scene, read in a single pass.
+    """
+    index = constraint_index.ConstraintIndex().build(local=local)
+    logger.debug(f"Indexed {len(index)} {'local ' if local else ''}constraints in the scene.")
+    return index
+
+
+@trace.span()
+def get_all_constraints(local=True, index=None) -> list:
     """
     Returns a list of all constraint nodes in the Maya scene.
     """
-    if local:
-        # get all the constraints that are not referenced
-        constraints = cm.ls(type="constraint", long=True, referencedNodes=False)
-        constraints = [
-            c for c in constraints if not cm.referenceQuery(c, isNodeReferenced=True)
-        ] or []
-        logger.debug(f"Found {len(constraints)} local constraints in the scene.")
-    else:
-        constraints = cm.ls(type="constraint")
+    if index is None:
+        index = get_constraint_index(local)
+    constraints = index.names()
     logger.debug(f"Found {len(constraints)} constraints in the scene.")
-    if constraints:
-        constraints = [c.split("|")[-1] for c in constraints]
     return constraints
 
 
-def get_constraint_connections(constraint_name: str) -> list:
+def get_constraint_connections(constraint_name: str, index=None) -> list:
+    """
+    Return a list. The first element is the driver of the first target, the second is a list of all the driven objects.
+    get_constraint_targets gives the driver of every target. With an index, the connections come from it instead of the scene.
+    """
+    connections = get_constraint_targets(constraint_name, index)
+    if not connections:
+        return []
+    drivers, driven = connections
+    return [drivers[0], driven]
+
+
+def get_constraint_targets(constraint_name: str, index=None) -> list:
     """
-    Return a tuple. The first element is the driver (which can only be one), the second is a list of all the driven objects.
+    Return a list. The first element is the list of drivers (one per target), the second is a list of all the driven objects.
+    With an index, the connections come from it instead of the scene.
     """
-    if not cm.objExists(constraint_name):
+    if index is None:
+        index = constraint_index.ConstraintIndex()
+    record = index.get(constraint_name)
+    if record is None:
         logger.warning(f"Constraint {constraint_name} does not exist.")
         return []
 
-    # Get the driver of the constraint
-    driver = cm.listConnections(
-        f"{constraint_name}.target[0].targetParentMatrix",
-        source=True,
-        destination=False,
-    )
-    if not driver:
+    if not record.targets:
         logger.warning(f"No driver found for constraint {constraint_name}.")
         return []
 
-    # Get the driven objects
-    driven = list(set(cm.listConnections(constraint_name, s=False, d=True))) or []
-    driven = [d for d in driven if "Constraint" not in d]  # Exclude other constraints
+    drivers = list(record.targets)
+    driven = list(record.driven)
     logger.debug(
-        f"Constraint {constraint_name} has driver: {driver[0]} and driven: {driven}"
+        f"Constraint {constraint_name} has drivers: {drivers} and driven: {driven}"
     )
 
-    return [driver[0], driven]
+    return [drivers, driven]
+
+
+def get_constraints_connections(constraint_names: list, index=None) -> dict:
+    """
+    Batched get_constraint_targets: {constraint: [drivers, driven]} for many constraints,
+    read from the index, or from the scene in a single lookup.
+    """
+    if index is not None:
+        records = {name: index.get(name) for name in constraint_names}
+        return {
+            name: [list(record.targets), list(record.driven)]
+            for name, record in records.items()
+            if record is not None
+        }
+    return {
+        name: [list(connections.targets), list(connections.driven)]
+        for name, connections in resolve_constraint_connections(constraint_names).items()
+    }
+
+
+def resolve_constraint_connections(constraint_names: list) -> dict:
+    """
+    Returns {constraint: ConstraintConnections}, every driver with its weight plug and every driven node
+    with its driven channels, for all the constraints in one API pass.
+    """
+    if isinstance(constraint_names, str):
+        constraint_names = [constraint_names]
+    connections = constraint_index.resolve_many(constraint_names)
+    missing = len(set(constraint_names)) - len(connections)
+    if missing:
+        logger.warning(f"{missing} constraints don't exist.")
+    return connections
 
 
+def bake_and_delete_constraints(constraint_names: list, start=None, end=None, simplify=False) -> dict:
+    """
+    Bakes the driven channels of the constraints over the frame range (the playback range by default),
+    in a single pass over the frames, then deletes the constraints. One undo step.
+    """
+    if isinstance(constraint_names, str):
+        constraint_names = [constraint_names]
+    result = constraint_bake.bake_and_delete(constraint_names, start, end, simplify=simplify)
+    logger.info(
+        f"Baked {result['plugs']} channels ({result['keys']} keys) and deleted {result['constraints']} constraints."
+    )
+    return result
+
+
+def get_constraint_graph_report(index=None) -> constraint_graph.GraphReport:
+    """
+    Analyzes the driver -> constraint -> driven graph of the constraints (the DAG links included):
+    cycles, longest chain and nodes driven by more than one constraint.
+    """
+    if index is None:
+        index = get_constraint_index()
+    report = constraint_graph.analyze_index(index)
+    logger.info(
+        f"{len(report.cycles)} cycles, longest chain of {report.chain_depth} constraints, "
+        f"{len(report.multi_driven)} nodes driven by several constraints."
+    )
+    return report
+
+
+def export_constraints(path: str, constraint_names=None, index=None) -> int:
+    """
+    Saves the constraints (all the local ones by default) to a JSON file, returns how many were saved.
+    """
+    count = constraint_io.export_constraints(path, constraint_names, index)
+    logger.info(f"Exported {count} constraints to {path}.")
+    return count
+
+
+def import_constraints(path: str, namespace_map=None) -> list:
+    """
+    Recreates the constraints of a JSON file, the namespaces remapped with namespace_map ({"char01": "char02"}).
+    All of them are created in one modifier, a single undo step.
+    """
+    created = constraint_io.import_constraints(path, namespace_map)
+    logger.info(f"Imported {len(created)} constraints from {path}.")
+    return created
+
@@ -6,177 +6,519 @@ reload(ct)
 ct.ConstraintToolkitGUI()
 """
 
+from PySide6 import QtCore, QtGui, QtWidgets
+from shiboken6 import wrapInstance
 
 import maya.cmds as cm
-import pymel.core as pm  # just for the GUI
+import maya.OpenMayaUI as omui
+
+from . import constraint_io
 from . import constraint_toolkit as ct
 from . import logger
 
+FILTER_DELAY_MS = 100
+ROOT_NAMESPACE = ":"
+CYCLE_COLOR = QtGui.QColor(160, 60, 60)
+CHAIN_COLOR = QtGui.QColor(170, 110, 40)
+MULTI_DRIVEN_COLOR = QtGui.QColor(140, 130, 50)
+
+
+def get_maya_main_window():
+    return wrapInstance(int(omui.MQtUtil.mainWindow()), QtWidgets.QWidget)
+
+
+def driven_namespace(record) -> str:
+    """Namespace of the first driven node, the character the constraint belongs to."""
+    if not record.driven:
+        return ROOT_NAMESPACE
+    return record.driven[0].rpartition("|")[2].rpartition(":")[0] or ROOT_NAMESPACE
+
+
+class ConstraintTreeModel(QtCore.QAbstractItemModel):
+    """
+    The constraints of an index, flat or grouped by driven namespace.
+    Rows only hold names, the columns are formatted from the index records when the view asks for them,
+    so only the visible rows are ever read.
+
+    internalId: 0 for a namespace row, group row + 1 for a constraint row.
+    """
+
+    HEADERS = ("Constraint", "Type", "Driver(s)", "Driven", "Weights")
+
+    def __init__(self, index, parent=None):
+        super(ConstraintTreeModel, self).__init__(parent)
+        self.constraint_index = index
+        self.grouped = False
+        self.groups = []  # namespaces, or [None] when flat
+        self.rows = {}    # namespace -> constraint names
+        self.highlights = {}  # constraint name -> (color, reason)
+        self.reload()
+
+    # ---- structure
+
+    def _group_of(self, record):
+        return driven_namespace(record) if self.grouped else None
+
+    def reload(self):
+        self.beginResetModel()
+        self.groups = [] if self.grouped else [None]
+        self.rows = {} if self.grouped else {None: []}
+        for record in self.constraint_index:
+            group = self._group_of(record)
+            if group not in self.rows:
+                self.groups.append(group)
+                self.rows[group] = []
+            self.rows[group].append(record.name)
+        self.endResetModel()
+
+    def set_grouped(self, grouped):
+        if grouped != self.grouped:
+            self.grouped = grouped
+            self.reload()
+
+    def _group_index(self, group):
+        if not self.grouped:
+            return QtCore.QModelIndex()
+        return self.createIndex(self.groups.index(group), 0, 0)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if not parent.isValid():
+            return len(self.rows[None]) if not self.grouped else len(self.groups)
+        if self.grouped and parent.internalId() == 0:
+            return len(self.rows[self.groups[parent.row()]])
+        return 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self.HEADERS)
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        if not self.grouped:
+            return self.createIndex(row, column, 1)
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+        return self.createIndex(row, column, parent.row() + 1)
+
+    def parent(self, index):
+        if not index.isValid() or not self.grouped or index.internalId() == 0:
+            return QtCore.QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
 
-class ConstraintToolkitGUI:
+    def constraint_name(self, index):
+        """Constraint name of a row, None for a namespace row."""
+        if not index.isValid() or (self.grouped and index.internalId() == 0):
+            return None
+        group = self.groups[index.internalId() - 1]
+        return self.rows[group][index.row()]
+
+    def set_highlights(self, highlights):
+        self.highlights = highlights
+        last_column = len(self.HEADERS) - 1
+        for group in self.groups:
+            count = len(self.rows[group])
+            if count:
+                parent = self._group_index(group)
+                self.dataChanged.emit(self.index(0, 0, parent), self.index(count - 1, last_column, parent))
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.BackgroundRole:
+            highlight = self.highlights.get(self.constraint_name(index))
+            return highlight[0] if highlight else None
+        if role == QtCore.Qt.ToolTipRole:
+            highlight = self.highlights.get(self.constraint_name(index))
+            if highlight:
+                return highlight[1]
+        if role not in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            return None
+        name = self.constraint_name(index)
+        if name is None:
+            group = self.groups[index.row()]
+            if index.column() == 0:
+                return f"{group} ({len(self.rows[group])})"
+            return None
+        record = self.constraint_index.records.get(name)
+        if record is None:
+            return name if index.column() == 0 else None
+        column = index.column()
+        if column == 0:
+            return record.name
+        if column == 1:
+            return record.type
+        if column == 2:
+            return ", ".join(record.targets)
+        if column == 3:
+            return ", ".join(record.driven)
+        return ", ".join(f"{w:g}" for w in record.weights)
+
+    # ---- deltas from the index callbacks
+
+    def _remove(self, name):
+        for group in self.groups:
+            names = self.rows[group]
+            if name in names:
+                row = names.index(name)
+                self.beginRemoveRows(self._group_index(group), row, row)
+                names.pop(row)
+                self.endRemoveRows()
+                return group
+        return None
+
+    def _append(self, name):
+        record = self.constraint_index.records.get(name)
+        if record is None:
+            return
+        group = self._group_of(record)
+        if group not in self.rows:
+            # new groups go last, the internal ids of the other groups don't move
+            self.beginInsertRows(QtCore.QModelIndex(), len(self.groups), len(self.groups))
+            self.groups.append(group)
+            self.rows[group] = []
+            self.endInsertRows()
+        names = self.rows[group]
+        self.beginInsertRows(self._group_index(group), len(names), len(names))
+        names.append(name)
+        self.endInsertRows()
+
+    def apply_changes(self, changes):
+        if changes.rebuilt:
+            self.reload()
+            return
+        emptied = False
+        for name in changes.removed + [old for old, _ in changes.renamed]:
+            group = self._remove(name)
+            emptied |= self.grouped and group is not None and not self.rows[group]
+        for name in changes.added + [new for _, new in changes.renamed]:
+            self._append(name)
+        for name in changes.updated:
+            # the namespace of its driven may have changed as well
+            self._remove(name)
+            self._append(name)
+        if emptied:
+            self.reload()  # removing a group would shift the ids of the groups after it
+
+
+class ConstraintToolkitGUI(QtWidgets.QDialog):
     """Constraint Toolkit GUI"""
-    def __init__(self):
-        self.window_name = "ConstraintToolkitWindow"
-        self.create_ui()
-        pm.showWindow(self.window_name)
 
-    def create_ui(self):
-        if pm.window(self.window_name, exists=True):
+    dlg_instance = None
+
+    def __init__(self, parent=None):
+        if ConstraintToolkitGUI.dlg_instance is not None:
             try:
-                pm.deleteUI(self.window_name)
-            except Exception as e:
-                logger.error(f"Error deleting UI: {e}")
-        pm.window(self.window_name, t="Constraint Toolkit", wh=(362, 256), sizeable=False)
-        self.populate_ui()
-
-    def populate_ui(self):
-        pm.columnLayout(adjustableColumn=True)
-        with pm.frameLayout(l="Constraint Toolkit", mh=10, mw=10):
-            with pm.rowLayout(nc=2, adjustableColumn=2):
-                with pm.columnLayout(adjustableColumn=True):
-                    self.constr_tsl = pm.textScrollList(
-                        "constraintList",
-                        allowMultiSelection=True,
-                        append=ct.get_all_constraints(),
-                        height=150,
-                        selectCommand=self.select_constraints,
-                    )
-                    self.constr_conn_tf = pm.textField(
-                        "constraintConnections",
-                        editable=False,
-                        text="Select a constraint to see connections.",
-                    )
-                with pm.columnLayout(adjustableColumn=True):
-                    pm.button(
-                        label="Update List",
-                        command=self.update_list,
-                    )
-                    pm.separator(h=10, style="none")
-                    self.sel_driver_btn = pm.button(
-                        l="Select Driver", c=self.select_driver, enable=False
-                    )
-                    self.sel_driven_btn = pm.button(
-                        l="Select Driven", c=self.select_driven, enable=False
-                    )
-                    pm.separator(h=10, style="none")
-                    self.delete_btn = pm.button(
-                        label="Delete Driver",
-                        command=self.delete_constraints,
-                        enable=False,
-                    )
-            pm.separator(h=6)
-            pm.text("mt_Tools - Local Constraints Manager", align="center")
+                ConstraintToolkitGUI.dlg_instance.close()
+            except RuntimeError:
+                pass  # already deleted with Maya's main window
+        super(ConstraintToolkitGUI, self).__init__(parent or get_maya_main_window())
+        ConstraintToolkitGUI.dlg_instance = self
+        self.setWindowTitle("Constraint Toolkit")
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        self.resize(720, 420)
+
+        self.index = ct.get_constraint_index()
+
+        self.filter_timer = QtCore.QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+
+        self.create_widgets()
+        self.create_layouts()
+        self.create_connections()
+
+        # the list follows the scene, the callbacks go away with the window
+        self.index.watch(on_change=self.apply_changes)
+        self.update_status()
+        self.show()
+
+    def create_widgets(self):
+        self.filter_line = QtWidgets.QLineEdit()
+        self.filter_line.setPlaceholderText("Filter...")
+        self.filter_line.setClearButtonEnabled(True)
+        self.group_cb = QtWidgets.QCheckBox("Group by namespace")
+
+        self.model = ConstraintTreeModel(self.index, self)
+        self.proxy = QtCore.QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterKeyColumn(-1)
+        self.proxy.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.proxy.setRecursiveFilteringEnabled(True)
+
+        self.view = QtWidgets.QTreeView()
+        self.view.setModel(self.proxy)
+        self.view.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.view.setUniformRowHeights(True)  # the view never measures rows that aren't visible
+        self.view.setRootIsDecorated(False)
+        self.view.setSortingEnabled(True)
+        self.view.sortByColumn(0, QtCore.Qt.AscendingOrder)
+
+        self.connections_label = QtWidgets.QLabel("Select a constraint to see connections.")
+        self.status_label = QtWidgets.QLabel()
+
+        self.update_btn = QtWidgets.QPushButton("Update List")
+        self.export_btn = QtWidgets.QPushButton("Export...")
+        self.export_btn.setToolTip("Save the selected constraints, or all of them, to a JSON file.")
+        self.import_btn = QtWidgets.QPushButton("Import...")
+        self.import_btn.setToolTip("Recreate the constraints of a JSON file, with the namespaces remapped.")
+        self.graph_btn = QtWidgets.QPushButton("Check Chains")
+        self.graph_btn.setToolTip(
+            "Highlight the constraints in cycles (red), along the longest chain (orange),\n"
+            "and driving nodes driven by more than one constraint (yellow)."
+        )
+        self.sel_driver_btn = QtWidgets.QPushButton("Select Driver")
+        self.sel_driven_btn = QtWidgets.QPushButton("Select Driven")
+        self.delete_btn = QtWidgets.QPushButton("Delete Constraint")
+        self.bake_btn = QtWidgets.QPushButton("Bake && Delete")
+        self.bake_btn.setToolTip("Bake the driven channels over the playback range, then delete the constraints.")
+        self.simplify_cb = QtWidgets.QCheckBox("Simplify")
+        self.simplify_cb.setToolTip("Drop the baked keys lying on the line between their neighbours.")
+        self.set_buttons_enabled(False)
+
+    def create_layouts(self):
+        filter_layout = QtWidgets.QHBoxLayout()
+        filter_layout.addWidget(self.filter_line)
+        filter_layout.addWidget(self.group_cb)
+        filter_layout.addWidget(self.export_btn)
+        filter_layout.addWidget(self.import_btn)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        button_layout.addWidget(self.status_label)
+        button_layout.addStretch()
+        button_layout.addWidget(self.update_btn)
+        button_layout.addWidget(self.graph_btn)
+        button_layout.addWidget(self.sel_driver_btn)
+        button_layout.addWidget(self.sel_driven_btn)
+        button_layout.addWidget(self.delete_btn)
+        button_layout.addWidget(self.bake_btn)
+        button_layout.addWidget(self.simplify_cb)
+
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addLayout(filter_layout)
+        main_layout.addWidget(self.view)
+        main_layout.addWidget(self.connections_label)
+        main_layout.addLayout(button_layout)
+
+    def create_connections(self):
+        self.filter_line.textChanged.connect(lambda *args: self.filter_timer.start())
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.group_cb.toggled.connect(self.set_grouped)
+        self.view.selectionModel().selectionChanged.connect(self.select_constraints)
+        self.update_btn.clicked.connect(self.update_list)
+        self.graph_btn.clicked.connect(self.check_chains)
+        self.export_btn.clicked.connect(self.export_constraints)
+        self.import_btn.clicked.connect(self.import_constraints)
+        self.sel_driver_btn.clicked.connect(self.select_driver)
+        self.sel_driven_btn.clicked.connect(self.select_driven)
+        self.delete_btn.clicked.connect(self.delete_constraints)
+        self.bake_btn.clicked.connect(self.bake_constraints)
+
+    def set_buttons_enabled(self, enabled):
+        for btn in (self.sel_driver_btn, self.sel_driven_btn, self.delete_btn, self.bake_btn):
+            btn.setEnabled(enabled)
+
+    def update_status(self):
+        self.status_label.setText(f"{len(self.index)} constraints")
+
+    def apply_filter(self):
+        self.proxy.setFilterFixedString(self.filter_line.text())
+        if self.model.grouped:
+            self.view.expandAll()
+
+    def set_grouped(self, grouped):
+        self.model.set_grouped(grouped)
+        self.view.setRootIsDecorated(grouped)
+        if grouped:
+            self.view.expandAll()
+
+    def get_selected_constraints(self) -> list:
+        names = []
+        for index in self.view.selectionModel().selectedRows():
+            name = self.model.constraint_name(self.proxy.mapToSource(index))
+            if name is not None:
+                names.append(name)
+        return names
 
     def select_driver(self, *args):
         """
-        Selects the driver of the selected constraint in the textScrollList.
+        Selects the driver of the selected constraints.
         """
-        selected_constraints = self.constr_tsl.getSelectItem()
+        selected_constraints = self.get_selected_constraints()
         if not selected_constraints:
             logger.warning("No constraints selected.")
             return
 
-        all_drivers = []
-        for constraint in selected_constraints:
-            driver, _ = ct.get_constraint_connections(constraint)
-            all_drivers.append(driver)
+        all_drivers = {}  # ordered set, a driver of many constraints is selected once
+        for drivers, _ in ct.get_constraints_connections(selected_constraints, self.index).values():
+            all_drivers.update(dict.fromkeys(drivers))
+        all_drivers = list(all_drivers)
 
         if all_drivers:
             cm.select(all_drivers, replace=True)
-            logger.info(f"Selected driver: {driver}")
+            logger.info(f"Selected drivers: {all_drivers}")
         else:
             logger.warning("No driver found for the selected constraint.")
 
     def select_driven(self, *args):
         """
-        Selects the driven objects of the selected constraint in the textScrollList.
+        Selects the driven objects of the selected constraints.
         """
-        selected_constraints = self.constr_tsl.getSelectItem()
+        selected_constraints = self.get_selected_constraints()
         if not selected_constraints:
             logger.warning("No constraints selected.")
             return
 
-        all_driven = []
-        for constraint in selected_constraints:
-            _, driven = ct.get_constraint_connections(constraint)
-            all_driven.extend(driven)
+        all_driven = {}  # ordered set, a node driven by many constraints is selected once
+        for _, driven in ct.get_constraints_connections(selected_constraints, self.index).values():
+            all_driven.update(dict.fromkeys(driven))
+        all_driven = list(all_driven)
 
         if all_driven:
             cm.select(all_driven, replace=True)
-            logger.info(f"Selected driven objects: {driven}")
+            logger.info(f"Selected driven objects: {all_driven}")
         else:
             logger.warning("No driven objects found for the selected constraint.")
 
-    def update_constr_conn_tf(self, *args):
+    def update_connections_label(self, selected_constraints):
         """
-        updates the textField with the connections of the selected constraint.
-        It'll show the driver and driven nodes.
+        Shows the driver and driven nodes of the first selected constraint.
         """
-        selected_constraints = self.constr_tsl.getSelectItem()
         if not selected_constraints:
-            pm.textField(
-                self.constr_conn_tf, edit=True, text="No constraints selected."
-            )
+            self.connections_label.setText("No constraints selected.")
             return
 
-        connections = ct.get_constraint_connections(selected_constraints[0])
+        connections = ct.get_constraint_targets(selected_constraints[0], self.index)
         if connections:
-            driver, driven = connections
-            connection_text = f"{driver} ------> {driven}"
+            drivers, driven = connections
+            connection_text = f"{', '.join(drivers)} ------> {', '.join(driven)}"
         else:
             connection_text = "No connections found."
-
-        pm.textField(self.constr_conn_tf, edit=True, text=connection_text)
+        self.connections_label.setText(connection_text)
 
     def delete_constraints(self, *args):
         """
-        Deletes the selected constraints from the textScrollList.
+        Deletes the selected constraints, the list follows through the index callbacks.
         """
-        selected_constraints = self.constr_tsl.getSelectItem()
+        selected_constraints = [c for c in self.get_selected_constraints() if self.index.get(c) is not None]
         if not selected_constraints:
             logger.warning("No constraints selected for deletion.")
             return
 
-        for constraint in selected_constraints:
-            if cm.objExists(constraint):
-                cm.delete(constraint)
-                logger.info(f"Deleted constraint: {constraint}")
-            else:
-                logger.warning(f"Constraint {constraint} does not exist.")
+        cm.delete(selected_constraints)
+        logger.info(f"Deleted constraints: {selected_constraints}")
+
+    def bake_constraints(self, *args):
+        """
+        Bakes then deletes the selected constraints, the list follows through the index callbacks.
+        """
+        selected_constraints = [c for c in self.get_selected_constraints() if self.index.get(c) is not None]
+        if not selected_constraints:
+            logger.warning("No constraints selected to bake.")
+            return
+
+        ct.bake_and_delete_constraints(selected_constraints, simplify=self.simplify_cb.isChecked())
+
+    def export_constraints(self, *args):
+        """
+        Saves the selected constraints, or all the listed ones when nothing is selected.
+        """
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Constraints", "", "Constraints (*.json)")
+        if not path:
+            return
+        selected_constraints = self.get_selected_constraints() or self.index.names()
+        count = ct.export_constraints(path, selected_constraints)
+        self.status_label.setText(f"Exported {count} constraints")
+
+    def import_constraints(self, *args):
+        """
+        Recreates the constraints of a file, asking how to remap its namespaces.
+        """
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Import Constraints", "", "Constraints (*.json)")
+        if not path:
+            return
+        try:
+            file_namespaces = sorted(n for n in constraint_io.namespaces(constraint_io.load(path)) if n)
+        except (ValueError, OSError) as e:
+            cm.warning(f"Can't read {path}: {e}")
+            return
+        text, ok = QtWidgets.QInputDialog.getText(
+            self,
+            "Import Constraints",
+            "Namespace remap, old=new separated by commas:",
+            text=", ".join(f"{n}={n}" for n in file_namespaces),
+        )
+        if not ok:
+            return
+        try:
+            namespace_map = constraint_io.parse_namespace_map(text)
+        except ValueError as e:
+            cm.warning(str(e))
+            return
+        created = ct.import_constraints(path, namespace_map)
+        self.status_label.setText(f"Imported {len(created)} constraints")
 
-        self.update_list()
+    def check_chains(self, *args):
+        """
+        Highlights the constraint setups that hurt evaluation: cycles, the longest chain and the multi driven nodes.
+        """
+        report = ct.get_constraint_graph_report(self.index)
+        highlights = {}
+        for node, constraints in report.multi_driven.items():
+            for constraint in constraints:
+                highlights[constraint] = (MULTI_DRIVEN_COLOR, f"{node} is driven by {len(constraints)} constraints")
+        for constraint in report.longest_chain:
+            if constraint in self.index:
+                highlights[constraint] = (CHAIN_COLOR, f"Longest chain: {report.chain_depth} constraints")
+        for cycle in report.cycles:
+            for constraint in cycle:
+                if constraint in self.index:
+                    highlights[constraint] = (CYCLE_COLOR, "Cycle: " + " -> ".join(cycle))
+        self.model.set_highlights(highlights)
+        self.status_label.setText(
+            f"{len(self.index)} constraints, {len(report.cycles)} cycles, "
+            f"longest chain {report.chain_depth}, {len(report.multi_driven)} multi driven"
+        )
 
     def update_list(self, *args):
         """
-        Updates the constraint list in the textScrollList.
+        Rescans the whole scene.
         """
-        constraints = ct.get_all_constraints()
-        self.constr_tsl.removeAll()
-        self.constr_tsl.append(constraints)
-        self.sel_driven_btn.setEnable(False)
-        self.sel_driver_btn.setEnable(False)
-        self.delete_btn.setEnable(False)
-        logger.info(f"Updated constraint list with {len(constraints)} items.")
+        self.index.build()
+        self.model.reload()
+        if self.model.grouped:
+            self.view.expandAll()
+        self.set_buttons_enabled(False)
+        self.update_status()
+        logger.info(f"Updated constraint list with {len(self.index)} items.")
 
-    def select_constraints(self, *args):
-        # selected_constraints = pm.textScrollList(self.constr_tsl, edit=True, selectItem=selected_constraints)
-        selected_constraints = self.constr_tsl.getSelectItem()
-        if selected_constraints:
-            self.sel_driven_btn.setEnable(True)
-            self.sel_driver_btn.setEnable(True)
-            self.delete_btn.setEnable(True)
-            cm.select(selected_constraints, replace=True)
-            self.update_constr_conn_tf()
-            logger.info(f"Selected constraints: {selected_constraints}")
-        else:
-            logger.warning("No constraints selected.")
-            
-    def _window_size(self):
+    def apply_changes(self, changes):
         """
-        Returns the current window size. for debugging purposes.
+        Applies the idle batch of constraint changes of the index to the view, without a full rescan.
         """
-        size = pm.window(self.window_name, query=True, widthHeight=True)
-        if size is None:
-            logger.warning("Window size not found, returning default size (300, 400).")
-        logger.debug(f"Current window size: {size}")
-        return size
+        self.model.apply_changes(changes)
+        if self.model.grouped:
+            self.view.expandAll()
+        self.update_status()
+        logger.debug(
+            f"Constraint list: {len(changes.added)} added, {len(changes.removed)} removed, {len(changes.renamed)} renamed."
+        )
+
+    def select_constraints(self, *args):
+        selected_constraints = self.get_selected_constraints()
+        self.set_buttons_enabled(bool(selected_constraints))
+        if selected_constraints:
+            existing = [c for c in selected_constraints if self.index.get(c) is not None]
+            if existing:
+                cm.select(existing, replace=True)
+            logger.debug(f"Selected constraints: {selected_constraints}")
+        self.update_connections_label(selected_constraints)
+
+    def closeEvent(self, event):
+        self.index.unwatch()
+        super(ConstraintToolkitGUI, self).closeEvent(event)
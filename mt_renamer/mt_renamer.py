@@ -1,5 +1,13 @@
 import maya.cmds as cm
 
+from . import rename_expressions
+from . import rename_planner
+
+try:
+    from ..mt_core import edit_session, trace
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import edit_session, trace
+
 def show_gui():
     """
     An enhanced object renamer for Maya that:
@@ -7,6 +15,7 @@ def show_gui():
     2. Supports auto-numbering with # placeholders (e.g. Cube_### becomes Cube_001, Cube_002, etc.)
     3. Handles single and multiple object selections intelligently
     4. Supports pressing Enter to rename
+    5. Supports rename expressions: regex s/find/replace/, {parent}, {type}, {side}, {index:03}, case filters
     """
     selection = cm.ls(sl=True)
     
@@ -19,7 +28,7 @@ def show_gui():
     # Create a dialog with built-in Enter key support
     result = cm.promptDialog(
         title="MT Enhanced Object Renamer",
-        message="Enter new name (use # for numbering):",
+        message="Enter new name (use # for numbering, or an expression like {side}_{parent}_{index:03}):",
         text=current_name,
         button=["OK", "Cancel"],
         defaultButton="OK",
@@ -34,17 +43,27 @@ def show_gui():
     else:
         return None
 
+def show_preview_gui(objects=None):
+    """
+    Qt rename dialog with a live old -> new preview of the whole selection, collisions highlighted.
+    Nothing is renamed until Apply.
+    """
+    from . import rename_dialog  # Qt is only loaded when the dialog is used
+
+    if objects is None:
+        objects = cm.ls(sl=True)
+    if not objects:
+        cm.warning("Nothing selected. Please select one or more objects.")
+        return None
+    return rename_dialog.RenamePreviewDialog.show_dialog(objects)
+
+@trace.span()
+@edit_session.session("mt_renamer")
 def process_rename(objects, new_name_pattern):
     """
     Process the renaming operation based on input pattern
     """
-    if '#' in new_name_pattern:
-        renamed_objects = rename_with_numbering(objects, new_name_pattern)
-    else:
-        if len(objects) == 1:
-            renamed_objects = [cm.rename(objects[0], new_name_pattern)]
-        else:
-            renamed_objects = rename_with_numbering(objects, new_name_pattern + "_###")
+    renamed_objects = rename_nodes(objects, new_names(objects, new_name_pattern))
     
     if renamed_objects:
         cm.select(renamed_objects)
@@ -64,27 +83,55 @@ def rename_with_numbering(objects, pattern):
     - "Cube_##" with 3 objects becomes: Cube_01, Cube_02, Cube_03
     - "Cube_###" with 3 objects becomes: Cube_001, Cube_002, Cube_003
     """
-    import re
-    hash_sequences = re.findall(r'#+', pattern)
-    
-    if not hash_sequences:
+    if '#' not in pattern:
         pattern = pattern + "_###"
-        hash_sequences = ["###"]
-    
-    paddings = [len(seq) for seq in hash_sequences]
     
-    name_template = pattern
-    for i, seq in enumerate(hash_sequences):
-        name_template = name_template.replace(seq, '{' + str(i) + '}', 1)
-    
-    renamed_objects = []
-    for i, obj in enumerate(objects, 1):
-        formatted_numbers = []
-        for padding in paddings:
-            formatted_numbers.append(str(i).zfill(padding))
-        
-        new_name = name_template.format(*formatted_numbers)
-        
-        renamed_objects.append(cm.rename(obj, new_name))
+    # braces are literal in a plain pattern, the # are the only tokens
+    template = rename_expressions.compile_expression(pattern.replace("{", "{{").replace("}", "}}"))
+    new_names = template([""] * len(objects), keep_namespace=False)
     
-    return renamed_objects
+    return rename_nodes(objects, new_names)
+
+def _expression_inputs(objects, fields) -> tuple:
+    """
+    (names, parents, types) of objects for an expression using fields.
+    The parent and type of the objects are only queried when the expression uses them, in one command each.
+    """
+    long_names = cm.ls(objects, long=True)
+    names = [o.split("|")[-1] for o in long_names]
+    parents = types = None
+    if "parent" in fields:
+        parents = [o.split("|")[-2] if o.count("|") > 1 else "" for o in long_names]
+    if "type" in fields:
+        types = cm.ls(objects, showType=True)[1::2]
+    return names, parents, types
+
+def new_names(objects, pattern):
+    """
+    The names process_rename gives to objects for pattern, an expression, a # numbered name or a plain name.
+    See rename_expressions.pattern_names, the preview dialog goes through it too.
+    """
+    if rename_expressions.is_expression(pattern):
+        fields = rename_expressions.compile_expression(pattern).fields
+        return rename_expressions.pattern_names(pattern, *_expression_inputs(objects, fields))
+    return rename_expressions.pattern_names(pattern, [""] * len(objects))
+
+def rename_with_expression(objects, expression):
+    """
+    Renames objects with a rename expression, see rename_expressions for the syntax.
+    """
+    compiled = rename_expressions.compile_expression(expression)
+    return rename_nodes(objects, compiled(*_expression_inputs(objects, compiled.fields)))
+
+def rename_nodes(objects, new_names):
+    """
+    Renames objects to new_names in one planned, undoable batch.
+    Names still held by another node of the list are freed first, so the numbering never gets auto-suffixed.
+    Objects whose new name already exists elsewhere in the scene are skipped with a warning.
+    """
+    plan = rename_planner.plan_rename(objects, new_names)
+    if plan.conflicts:
+        skipped = [plan.targets[i] for i in sorted(plan.conflicts) if i < len(objects)]
+        cm.warning(f"Skipped {len(skipped)} objects, names already in use: {', '.join(skipped[:10])}")
+
+    return rename_planner.apply_plan(plan, count=len(objects))
@@ -0,0 +1,254 @@
+"""
+Live preview rename dialog.
+
+Shows the old -> new names of the selection while the pattern is typed, with the collisions highlighted,
+and renames nothing until Apply.
+Made to stay responsive on tens of thousands of nodes:
+- the names, parents, types and scene names are read once, when the dialog opens,
+- the preview is recomputed on a worker thread, debounced while typing, stale results are dropped,
+- the table is a model/view, only the visible rows are ever drawn.
+
+import mt_renamer.mt_renamer as mtr
+mtr.show_preview_gui()
+"""
+
+from PySide6 import QtCore, QtGui, QtWidgets
+from shiboken6 import wrapInstance
+
+import maya.api.OpenMaya as om2
+import maya.cmds as cm
+import maya.OpenMayaUI as omui
+
+from . import mt_renamer
+from . import rename_expressions
+from . import rename_planner
+
+DEBOUNCE_MS = 120
+CONFLICT_COLOR = QtGui.QColor(160, 60, 60)
+
+
+def get_maya_main_window():
+    return wrapInstance(int(omui.MQtUtil.mainWindow()), QtWidgets.QWidget)
+
+
+class SelectionSnapshot:
+    """Everything the preview needs from the scene, read once."""
+
+    def __init__(self, objects):
+        self.handles, self.objects = rename_planner.snapshot(objects)
+        self.names = [o.split("|")[-1] for o in self.objects]
+        self.parents = [o.split("|")[-2] if o.count("|") > 1 else "" for o in self.objects]
+        self.types = cm.ls(self.objects, showType=True)[1::2]
+        self.sources = [rename_planner.split_long_name(o) for o in self.objects]
+        self.occupied = rename_planner.scene_name_keys()
+
+    def current_objects(self) -> list:
+        """The long names of the nodes now, through their handles, None for the deleted ones."""
+        objects = []
+        for handle in self.handles:
+            if not handle.isValid():
+                objects.append(None)
+            elif handle.object().hasFn(om2.MFn.kDagNode):
+                objects.append(om2.MFnDagNode(handle.object()).fullPathName())
+            else:
+                objects.append(om2.MFnDependencyNode(handle.object()).name())
+        return objects
+
+
+def compute_preview(snapshot, pattern) -> tuple:
+    """Pure python: (new names, {row: conflict reason}), or raises ExpressionError."""
+    new_names = rename_expressions.pattern_names(pattern, snapshot.names, snapshot.parents, snapshot.types)
+    _, conflicts = rename_planner.schedule(snapshot.sources, new_names, snapshot.occupied)
+    return new_names, conflicts
+
+
+class PreviewSignals(QtCore.QObject):
+    finished = QtCore.Signal(int, object, object)  # generation, new names, conflicts
+    failed = QtCore.Signal(int, str)
+
+
+class PreviewWorker(QtCore.QRunnable):
+    def __init__(self, generation, snapshot, pattern):
+        super(PreviewWorker, self).__init__()
+        self.generation = generation
+        self.snapshot = snapshot
+        self.pattern = pattern
+        self.signals = PreviewSignals()
+
+    def run(self):
+        try:
+            new_names, conflicts = compute_preview(self.snapshot, self.pattern)
+        except rename_expressions.ExpressionError as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        self.signals.finished.emit(self.generation, new_names, conflicts)
+
+
+class RenamePreviewModel(QtCore.QAbstractTableModel):
+    HEADERS = ("Current Name", "New Name")
+
+    def __init__(self, names, parent=None):
+        super(RenamePreviewModel, self).__init__(parent)
+        self.names = names
+        self.new_names = list(names)
+        self.conflicts = {}
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        row = index.row()
+        if role == QtCore.Qt.DisplayRole:
+            return self.names[row] if index.column() == 0 else self.new_names[row]
+        if role == QtCore.Qt.BackgroundRole and row in self.conflicts:
+            return CONFLICT_COLOR
+        if role == QtCore.Qt.ToolTipRole and row in self.conflicts:
+            return self.conflicts[row]
+        return None
+
+    def set_preview(self, new_names, conflicts):
+        """Only the new name column changes, the view repaints what's visible."""
+        self.new_names = new_names
+        self.conflicts = conflicts
+        if self.names:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.names) - 1, 1))
+
+
+class RenamePreviewDialog(QtWidgets.QDialog):
+
+    dlg_instance = None
+
+    @classmethod
+    def show_dialog(cls, objects=None):
+        if cls.dlg_instance is not None:
+            cls.dlg_instance.close()
+        cls.dlg_instance = RenamePreviewDialog(objects)
+        cls.dlg_instance.show()
+        return cls.dlg_instance
+
+    def __init__(self, objects=None, parent=None):
+        super(RenamePreviewDialog, self).__init__(parent or get_maya_main_window())
+        self.setWindowTitle("MT Renamer Preview")
+        self.setMinimumSize(520, 420)
+
+        self.snapshot = SelectionSnapshot(objects if objects is not None else cm.ls(sl=True))
+        self.generation = 0
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+        self.debounce = QtCore.QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(DEBOUNCE_MS)
+
+        self.create_widgets()
+        self.create_layouts()
+        self.create_connections()
+
+        if self.snapshot.names:
+            self.pattern_line.setText(self.snapshot.names[0].rpartition(":")[2])
+            self.pattern_line.selectAll()
+
+    def create_widgets(self):
+        self.pattern_line = QtWidgets.QLineEdit()
+        self.pattern_line.setToolTip(rename_expressions.__doc__.strip())
+        self.status_label = QtWidgets.QLabel()
+
+        self.model = RenamePreviewModel(self.snapshot.names, self)
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.table.setWordWrap(False)
+        # fixed sizes: the view never measures rows that aren't visible
+        self.table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(20)
+        self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+
+        self.apply_btn = QtWidgets.QPushButton("Apply")
+        self.apply_btn.setDefault(True)
+        self.close_btn = QtWidgets.QPushButton("Close")
+
+    def create_layouts(self):
+        button_layout = QtWidgets.QHBoxLayout()
+        button_layout.addWidget(self.status_label)
+        button_layout.addStretch()
+        button_layout.addWidget(self.apply_btn)
+        button_layout.addWidget(self.close_btn)
+
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addWidget(self.pattern_line)
+        main_layout.addWidget(self.table)
+        main_layout.addLayout(button_layout)
+
+    def create_connections(self):
+        self.pattern_line.textChanged.connect(lambda *args: self.debounce.start())
+        self.pattern_line.returnPressed.connect(self.apply)
+        self.debounce.timeout.connect(self.start_preview)
+        self.apply_btn.clicked.connect(self.apply)
+        self.close_btn.clicked.connect(self.close)
+
+    def start_preview(self):
+        pattern = self.pattern_line.text()
+        self.generation += 1
+        if not pattern:
+            self.model.set_preview(list(self.snapshot.names), {})
+            self.status_label.setText("")
+            return
+        worker = PreviewWorker(self.generation, self.snapshot, pattern)
+        worker.signals.finished.connect(self.preview_finished)
+        worker.signals.failed.connect(self.preview_failed)
+        self.pool.start(worker)
+
+    def preview_finished(self, generation, new_names, conflicts):
+        if generation != self.generation:
+            return  # the pattern changed while computing
+        self.model.set_preview(new_names, conflicts)
+        count = len(new_names)
+        if conflicts:
+            self.status_label.setText(f"{count} objects, {len(conflicts)} collisions")
+        else:
+            self.status_label.setText(f"{count} objects")
+        self.apply_btn.setEnabled(True)
+
+    def preview_failed(self, generation, message):
+        if generation != self.generation:
+            return
+        self.status_label.setText(message)
+        self.apply_btn.setEnabled(False)
+
+    def apply(self):
+        if self.debounce.isActive():
+            self.debounce.stop()
+        pattern = self.pattern_line.text()
+        if not pattern:
+            return
+        objects = self.snapshot.current_objects()
+        if objects != self.snapshot.objects:
+            # what was previewed is not what would be renamed
+            cm.warning("Objects were renamed, reparented or deleted since the preview, it is updated.")
+            self.refresh_snapshot([o for o in objects if o is not None])
+            return
+        try:
+            mt_renamer.process_rename(objects, pattern)
+        except rename_expressions.ExpressionError as e:
+            cm.warning(str(e))
+            return
+        self.close()
+
+    def refresh_snapshot(self, objects):
+        self.snapshot = SelectionSnapshot(objects)
+        self.model = RenamePreviewModel(self.snapshot.names, self)
+        self.table.setModel(self.model)
+        self.start_preview()
+
+    def closeEvent(self, event):
+        self.generation += 1  # drop results still computing
+        self.pool.clear()
+        super(RenamePreviewDialog, self).closeEvent(event)
@@ -0,0 +1,238 @@
+"""
+Planned, collision-aware bulk renaming.
+
+Renaming node by node with cm.rename has two problems on big selections:
+- when a new name is still held by a node later in the list, Maya silently appends a suffix and the numbering breaks,
+- renaming a parent changes the long path of its children still waiting in the list.
+
+Here the nodes are snapshot as MObjectHandles first, the full list of target names is computed, checked against the
+names already in the scene, and ordered so no rename ever hits a name that is still in use: a node waits for the node
+holding its target name, and cycles (a <-> b) go through a temporary name. The plan is applied as one MDagModifier,
+committed as a single undo step.
+
+Usage:
+    from mt_renamer import rename_planner
+    plan = rename_planner.plan_rename(cm.ls(sl=True), ["jnt_001", "jnt_002", ...])
+    if plan.conflicts:
+        print(plan.conflicts)
+    rename_planner.apply_plan(plan)
+"""
+
+import maya.api.OpenMaya as om2
+import maya.cmds as cm
+
+try:
+    from ..mt_core import modifier
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import modifier
+
+TEMP_PREFIX = "__mtRenameTmp"
+
+
+class RenamePlan:
+    """
+    The result of plan_rename.
+
+    Attributes:
+        handles (list): MObjectHandle of every planned node, stable through renames.
+        sources (list): (parent path, name) of every node at snapshot time.
+        targets (list): the wanted name of every node.
+        steps (list): (index, name) renames to apply, in order, temporary names included.
+        conflicts (dict): index -> reason, for the nodes that can't be renamed.
+    """
+
+    def __init__(self, handles, sources, targets):
+        self.handles = handles
+        self.sources = sources
+        self.targets = targets
+        self.steps = []
+        self.conflicts = {}
+
+    def __len__(self):
+        return len(self.handles)
+
+    def renamed_indices(self) -> list:
+        return sorted({index for index, _ in self.steps})
+
+
+def split_long_name(long_name: str) -> tuple:
+    """'|grp|pCube1' -> ('|grp', 'pCube1'). DG and world level nodes share the '' parent."""
+    parent, _, name = long_name.rpartition("|")
+    return parent, name
+
+
+def snapshot(objects) -> tuple:
+    """Return (handles, long names) of objects, in order. A node listed twice, under any name, is a ValueError."""
+    selection = om2.MSelectionList()
+    for obj in objects:
+        count = selection.length()
+        selection.add(obj)
+        if selection.length() == count:
+            raise ValueError(f"{obj} is listed twice, every node gets a single new name.")
+
+    handles, long_names = [], []
+    for i in range(selection.length()):
+        obj = selection.getDependNode(i)
+        handles.append(om2.MObjectHandle(obj))
+        if obj.hasFn(om2.MFn.kDagNode):
+            long_names.append(selection.getDagPath(i).fullPathName())
+        else:
+            long_names.append(om2.MFnDependencyNode(obj).name())
+    return handles, long_names
+
+
+def scene_name_keys() -> set:
+    """All the (parent path, name) keys in the scene, from a single ls."""
+    return {split_long_name(n) for n in cm.ls(long=True)}
+
+
+def schedule(sources: list, targets: list, occupied: set) -> tuple:
+    """
+    Order the renames, pure python.
+
+    Args:
+        sources: (parent, name) key of each node before renaming.
+        targets: wanted name of each node, under the same parent.
+        occupied: (parent, name) keys of every node in the scene.
+
+    Returns:
+        (steps, conflicts): steps is a list of (index, name), conflicts a dict index -> reason.
+    """
+    count = len(sources)
+    target_keys = [(sources[i][0], targets[i]) for i in range(count)]
+    holder = {key: i for i, key in enumerate(sources)}
+    conflicts = {}
+
+    seen = {}
+    for i, key in enumerate(target_keys):
+        if key in seen and key != sources[i]:
+            conflicts[i] = "duplicate target name %s" % targets[i]
+        else:
+            seen[key] = i
+
+    # the node holding my target must move first
+    blocker = [None] * count
+    for i, key in enumerate(target_keys):
+        if i in conflicts or key == sources[i]:
+            continue
+        held_by = holder.get(key)
+        if held_by is not None:
+            blocker[i] = held_by
+        elif key in occupied:
+            conflicts[i] = "%s already exists" % targets[i]
+
+    # a node waiting on a node that won't move can't move either
+    changed = True
+    while changed:
+        changed = False
+        for i in range(count):
+            b = blocker[i]
+            if i not in conflicts and b is not None and (b in conflicts or target_keys[b] == sources[b]):
+                conflicts[i] = "%s is held by a node that is not renamed" % targets[i]
+                changed = True
+
+    waiter = {}
+    for i, b in enumerate(blocker):
+        if b is not None and i not in conflicts:
+            waiter[b] = i
+
+    todo = [i for i in range(count) if i not in conflicts and target_keys[i] != sources[i]]
+    done = set()
+    steps = []
+
+    def release(i):
+        # rename i, then everything waiting on the name it just freed
+        while i is not None and i not in done:
+            steps.append((i, targets[i]))
+            done.add(i)
+            i = waiter.get(i)
+
+    for i in todo:
+        if blocker[i] is None:
+            release(i)
+
+    # what is left is cycles: park one node on a temporary name, unroll the cycle, then finish the parked node
+    used = set(occupied) | set(target_keys)
+    temp_count = 0
+    for i in todo:
+        if i in done:
+            continue
+        temp = "%s%d" % (TEMP_PREFIX, temp_count)
+        while (sources[i][0], temp) in used:
+            temp_count += 1
+            temp = "%s%d" % (TEMP_PREFIX, temp_count)
+        used.add((sources[i][0], temp))
+        steps.append((i, temp))
+        done.add(i)
+        release(waiter.get(i))
+        steps.append((i, targets[i]))
+
+    return steps, conflicts
+
+
+def shape_renames(handles, long_names, targets) -> tuple:
+    """
+    cm.rename also renames the shape named exactly after its transform (pCube1 -> pCube1Shape, not pCube1ShapeOrig),
+    return the extra (handles, long names, targets) keeping that behaviour.
+    """
+    extra_handles, extra_names, extra_targets = [], [], []
+    for handle, long_name, target in zip(handles, long_names, targets):
+        obj = handle.object()
+        if not obj.hasFn(om2.MFn.kTransform):
+            continue
+        old_name = split_long_name(long_name)[1].rpartition(":")[2]
+        dag = om2.MFnDagNode(obj)
+        for c in range(dag.childCount()):
+            child = dag.child(c)
+            if not child.hasFn(om2.MFn.kShape):
+                continue
+            child_name = om2.MFnDependencyNode(child).name()
+            if child_name.rpartition(":")[2] != old_name + "Shape":
+                continue
+            extra_handles.append(om2.MObjectHandle(child))
+            extra_names.append(long_name + "|" + child_name)
+            extra_targets.append(target + "Shape")
+    return extra_handles, extra_names, extra_targets
+
+
+def plan_rename(objects, targets, rename_shapes=True) -> RenamePlan:
+    """
+    Compute the rename plan of objects to targets (one name per object), nothing is renamed yet.
+    """
+    if len(objects) != len(targets):
+        raise ValueError(f"Got {len(objects)} objects but {len(targets)} names.")
+
+    handles, long_names = snapshot(objects)
+    targets = list(targets)
+    if rename_shapes:
+        extra_handles, extra_names, extra_targets = shape_renames(handles, long_names, targets)
+        handles += extra_handles
+        long_names += extra_names
+        targets += extra_targets
+
+    sources = [split_long_name(n) for n in long_names]
+    plan = RenamePlan(handles, sources, targets)
+    plan.steps, plan.conflicts = schedule(sources, targets, scene_name_keys())
+    return plan
+
+
+def node_name(handle) -> str:
+    obj = handle.object()
+    if obj.hasFn(om2.MFn.kDagNode):
+        return om2.MFnDagNode(obj).partialPathName()
+    return om2.MFnDependencyNode(obj).name()
+
+
+def apply_plan(plan: RenamePlan, count=None) -> list:
+    """
+    Apply the plan in a single MDagModifier, one undo step.
+    Returns the new names of the first count nodes (all by default, shapes added by the plan come last).
+    """
+    if plan.steps:
+        mod = om2.MDagModifier()
+        for index, name in plan.steps:
+            mod.renameNode(plan.handles[index].object(), name)
+        modifier.commit(mod)
+
+    count = len(plan.handles) if count is None else count
+    return [node_name(plan.handles[i]) for i in range(count) if plan.handles[i].isValid()]
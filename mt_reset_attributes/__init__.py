@@ -1,3 +1,14 @@
 __version__ = "1.0.0"
 __author__ = "LFR"
 __all__ = ["mt_reset_attributes"]
+
+try:
+    from ..mt_core import lazy
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import lazy
+
+__getattr__, __dir__ = lazy.attach(
+    __name__,
+    ["anim_store", "default_cache", "mt_reset_attributes", "plugs", "pose_store"],
+    {"mt_reset_attributes": ["main", "reset_character", "reset_keys"]},
+)
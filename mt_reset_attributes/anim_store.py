@@ -0,0 +1,339 @@
+"""
+Animation snapshots: the keys of every anim curve of a character, saved as columns and keyed back in bulk.
+
+A character is hundreds of curves with thousands of keys: a key per row, in json or through one command per key,
+is slow to write, slow to read and all on the heap. Here the curves are found in one API pass, their keys read with
+one keyframe / keyTangent query per column for all the curves at once, and saved as a folder of plain .npy files:
+    header.json     version, namespace and time unit of the export
+    curves.npy      one record per curve:
+        plug      "ctrl.translateX", namespace stripped like the poses, so the animation goes on any instance
+        type      MFnAnimCurve type, kAnimCurveTA / TL / TT / TU
+        pre post  infinity types
+        weighted  weighted tangents
+        offset    index of the curve's first key in the key columns
+        count     number of keys
+    times.npy, values.npy, in_types.npy, out_types.npy, in_angles.npy, out_angles.npy, in_weights.npy,
+    out_weights.npy     the keys of all the curves end to end, curve after curve
+
+Times are frames in the time unit of the header, values and angles in internal units (cm, radians), the tangent
+types indices into TANGENT_TYPES. The columns load memory mapped, a curve's keys are read from disk when keyed:
+    clip = anim_store.load("char01_walk.anim")
+    clip.curves["plug"], clip.keys(clip.find("L_foot_CTL.translateY"))["values"]
+
+Usage:
+    from mt_reset_attributes import anim_store
+    anim_store.export_curves("char01", "D:/shots/sh010/char01_walk.anim")
+    anim_store.import_curves("D:/shots/sh010/char01_walk.anim", namespace="char02")
+"""
+
+import json
+import os
+
+import numpy as np
+
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+import maya.cmds as cm
+
+from . import plugs
+from .pose_store import add_namespace, strip_namespace
+
+try:
+    from ..mt_core import edit_session, modifier
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import edit_session, modifier
+
+FORMAT_VERSION = 1
+HEADER = "header.json"
+
+# keyTangent names, stored as their index, with the MFnAnimCurve tangent they're keyed back as
+TANGENT_TYPES = (
+    "auto", "spline", "linear", "fast", "slow", "flat", "step", "stepnext", "fixed", "clamped", "plateau",
+)
+_TANGENT_CONSTANTS = (
+    "kTangentAuto", "kTangentSmooth", "kTangentLinear", "kTangentFast", "kTangentSlow", "kTangentFlat",
+    "kTangentStep", "kTangentStepNext", "kTangentFixed", "kTangentClamped", "kTangentPlateau",
+)
+FIXED = TANGENT_TYPES.index("fixed")
+
+# key column -> (keyTangent query flag, dtype), times and values come from keyframe
+KEY_COLUMNS = {
+    "times": (None, "f8"),
+    "values": (None, "f8"),
+    "in_types": ("inTangentType", "u1"),
+    "out_types": ("outTangentType", "u1"),
+    "in_angles": ("inAngle", "f8"),
+    "out_angles": ("outAngle", "f8"),
+    "in_weights": ("inWeight", "f8"),
+    "out_weights": ("outWeight", "f8"),
+}
+
+
+class Clip:
+    """The curve table and key columns of an export, as saved on disk."""
+
+    def __init__(self, header: dict, curves: np.ndarray, columns: dict):
+        self.header = header
+        self.curves = curves
+        self.columns = columns
+        self._index = None
+
+    def __len__(self):
+        return len(self.curves)
+
+    def keys(self, index: int) -> dict:
+        """The key columns of the curve at index, views into the (memory mapped) columns."""
+        offset, count = int(self.curves["offset"][index]), int(self.curves["count"][index])
+        return {name: column[offset:offset + count] for name, column in self.columns.items()}
+
+    def find(self, plug: str) -> int:
+        """Index of the curve keying plug ("ctrl.translateX", no namespace), KeyError when there is none."""
+        if self._index is None:
+            self._index = {p: i for i, p in enumerate(self.curves["plug"].tolist())}
+        return self._index[plug]
+
+
+# ---- file format, numpy only
+
+def curve_table(plug_names, types, pre, post, weighted, counts) -> np.ndarray:
+    """Build the curve record array from parallel lists, the offsets follow from the key counts."""
+    width = max((len(p) for p in plug_names), default=1)
+    curves = np.empty(len(plug_names), dtype=[
+        ("plug", f"U{width}"), ("type", "u1"), ("pre", "u1"), ("post", "u1"), ("weighted", "?"),
+        ("offset", "i8"), ("count", "i8"),
+    ])
+    curves["plug"] = plug_names
+    curves["type"] = types
+    curves["pre"] = pre
+    curves["post"] = post
+    curves["weighted"] = weighted
+    curves["count"] = counts
+    curves["offset"] = np.cumsum(curves["count"]) - curves["count"]
+    return curves
+
+
+def save(path: str, clip: Clip) -> str:
+    """Save clip to the folder path. The header is written last, a folder without one is an unfinished save."""
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "curves.npy"), clip.curves, allow_pickle=False)
+    for name in KEY_COLUMNS:
+        np.save(os.path.join(path, name + ".npy"), clip.columns[name], allow_pickle=False)
+    with open(os.path.join(path, HEADER), "w") as f:
+        json.dump(dict(clip.header, version=FORMAT_VERSION), f)
+    return path
+
+
+def load(path: str, mmap=True) -> Clip:
+    """Load the export in the folder path, memory mapped by default: only the keys used are read from disk."""
+    header_path = os.path.join(path, HEADER)
+    if not os.path.isfile(header_path):
+        raise ValueError(f"Not an animation export, no {HEADER} in {path}.")
+    with open(header_path) as f:
+        header = json.load(f)
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Not an animation export (version {FORMAT_VERSION} expected): {path}.")
+    mode = "r" if mmap else None
+    curves = np.load(os.path.join(path, "curves.npy"), mmap_mode=mode, allow_pickle=False)
+    columns = {
+        name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mode, allow_pickle=False) for name in KEY_COLUMNS
+    }
+    return Clip(header, curves, columns)
+
+
+# ---- export
+
+def _tangent_codes(names) -> np.ndarray:
+    """keyTangent names -> TANGENT_TYPES indices, the tangents unknown here (autoease, automix...) as auto."""
+    codes = {name: i for i, name in enumerate(TANGENT_TYPES)}
+    return np.array([codes.get(name, 0) for name in names], dtype="u1")
+
+
+def _namespace_curves(namespace: str) -> list:
+    """(anim curve MObject, keyed plug) of the time driven curves keying nodes of namespace, in one API pass."""
+    prefix = namespace.strip(":") + ":"
+    found = []
+    it = om2.MItDependencyNodes(om2.MFn.kAnimCurve)
+    while not it.isDone():
+        obj = it.thisNode()
+        it.next()
+        curve_fn = oma2.MFnAnimCurve(obj)
+        if not curve_fn.isTimeInput:  # set driven keys
+            continue
+        for plug in curve_fn.findPlug("output", False).destinations():
+            if om2.MFnDependencyNode(plug.node()).name().startswith(prefix):
+                found.append((obj, plug))
+                break
+    return found
+
+
+def capture(namespace: str) -> Clip:
+    """
+    Read the keys of every anim curve of the namespace.
+
+    The curves are found in one API pass, then each key column is one keyframe / keyTangent query over all of them.
+    """
+    found = _namespace_curves(namespace)
+    curve_names, plug_names, types, pre, post, weighted, counts = [], [], [], [], [], [], []
+    for obj, plug in found:
+        curve_fn = oma2.MFnAnimCurve(obj)
+        curve_names.append(curve_fn.name())
+        plug_names.append(strip_namespace(plugs.plug_path(plug), namespace))
+        types.append(curve_fn.animCurveType)
+        pre.append(curve_fn.preInfinityType)
+        post.append(curve_fn.postInfinityType)
+        weighted.append(curve_fn.isWeighted)
+        counts.append(curve_fn.numKeys)
+    curves = curve_table(plug_names, types, pre, post, weighted, counts)
+
+    total = int(curves["count"].sum())
+    columns = {}
+    if curve_names:
+        columns["times"] = cm.keyframe(curve_names, q=True, timeChange=True)
+        columns["values"] = cm.keyframe(curve_names, q=True, valueChange=True)
+        for name, (flag, _) in KEY_COLUMNS.items():
+            if flag is not None:
+                columns[name] = cm.keyTangent(curve_names, q=True, **{flag: True})
+    for name, (_, dtype) in KEY_COLUMNS.items():
+        values = columns.get(name) or []
+        if len(values) != total:
+            raise RuntimeError(f"{len(values)} {name} read for {total} keys, the curves changed during the export.")
+        columns[name] = _tangent_codes(values) if dtype == "u1" else np.array(values, dtype=dtype)
+
+    # keyframe and keyTangent answer in UI units, stored in internal units like the API keys them
+    angle = om2.MAngle(1.0, om2.MAngle.uiUnit()).asRadians()
+    distance = om2.MDistance(1.0, om2.MDistance.uiUnit()).asCentimeters()
+    columns["values"][np.repeat(curves["type"] == oma2.MFnAnimCurve.kAnimCurveTA, curves["count"])] *= angle
+    columns["values"][np.repeat(curves["type"] == oma2.MFnAnimCurve.kAnimCurveTL, curves["count"])] *= distance
+    columns["in_angles"] *= angle
+    columns["out_angles"] *= angle
+
+    header = {"namespace": namespace.strip(":"), "time_unit": cm.currentUnit(q=True, time=True)}
+    return Clip(header, curves, columns)
+
+
+def export_curves(namespace: str, path: str) -> dict:
+    """
+    Save the animation of the namespace to the folder path.
+
+    Returns:
+        dict: {"path": path, "curves": curves saved, "keys": keys saved}
+    """
+    clip = capture(namespace)
+    save(path, clip)
+    return {"path": path, "curves": len(clip), "keys": len(clip.columns["times"])}
+
+
+# ---- import
+
+class KeyImport:
+    """
+    Creates the missing curves then keys them, undone and redone as a whole.
+    Committed through mt_core.modifier, like a modifier.
+    """
+
+    def __init__(self, plugs_to_key, clip: Clip, rows):
+        self.plugs = plugs_to_key
+        self.clip = clip
+        self.rows = rows
+        self.curve_mod = None
+        self.key_change = None
+        self.keyed = 0
+        self.keys = 0
+
+    def _curve_fns(self) -> list:
+        """MFnAnimCurve per plug: its current curve, a new one, None when it's driven by something else."""
+        curve_fns = []
+        for plug in self.plugs:
+            if plug.isDestination:
+                source = plug.source().node()
+                curve_fns.append(oma2.MFnAnimCurve(source) if source.hasFn(om2.MFn.kAnimCurve) else None)
+                continue
+            curve_fn = oma2.MFnAnimCurve()
+            curve_fn.create(plug, modifier=self.curve_mod)
+            curve_fns.append(curve_fn)
+        return curve_fns
+
+    def doIt(self):
+        if self.key_change is not None:  # redo
+            self.curve_mod.doIt()
+            self.key_change.redoIt()
+            return
+
+        self.curve_mod = om2.MDGModifier()
+        self.key_change = oma2.MAnimCurveChange()
+        curve_fns = self._curve_fns()
+        self.curve_mod.doIt()
+
+        unit = om2.MTime.uiUnit()
+        change = self.key_change
+        constants = [getattr(oma2.MFnAnimCurve, c) for c in _TANGENT_CONSTANTS]
+        for curve_fn, row in zip(curve_fns, self.rows):
+            if curve_fn is None:
+                continue
+            record = self.clip.curves[row]
+            keys = self.clip.keys(row)
+            in_types, out_types = keys["in_types"], keys["out_types"]
+            uniform = len(in_types) and (in_types == in_types[0]).all() and (out_types == out_types[0]).all()
+
+            curve_fn.setIsWeighted(bool(record["weighted"]), change=change)
+            times = om2.MTimeArray([om2.MTime(t, unit) for t in keys["times"].tolist()])
+            tangents = (constants[in_types[0]], constants[out_types[0]]) if uniform else ()
+            curve_fn.addKeys(times, om2.MDoubleArray(keys["values"].tolist()), *tangents,
+                             keepExistingKeys=False, change=change)
+            if not uniform:
+                for i, (in_type, out_type) in enumerate(zip(in_types.tolist(), out_types.tolist())):
+                    curve_fn.setInTangentType(i, constants[in_type], change=change)
+                    curve_fn.setOutTangentType(i, constants[out_type], change=change)
+            # the other tangents are computed back from the keys, the fixed ones are set as saved
+            for i in np.flatnonzero(in_types == FIXED).tolist():
+                curve_fn.setAngle(i, om2.MAngle(float(keys["in_angles"][i])), True, change=change)
+                curve_fn.setWeight(i, float(keys["in_weights"][i]), True, change=change)
+            for i in np.flatnonzero(out_types == FIXED).tolist():
+                curve_fn.setAngle(i, om2.MAngle(float(keys["out_angles"][i])), False, change=change)
+                curve_fn.setWeight(i, float(keys["out_weights"][i]), False, change=change)
+            curve_fn.setPreInfinityType(int(record["pre"]), change=change)
+            curve_fn.setPostInfinityType(int(record["post"]), change=change)
+            self.keyed += 1
+            self.keys += len(times)
+
+    def undoIt(self):
+        self.key_change.undoIt()
+        self.curve_mod.undoIt()
+
+
+def import_curves(clip, namespace="") -> dict:
+    """
+    Key an export back, as a single undo step: every curve gets all its keys in one addKeys.
+
+    Args:
+        clip: a Clip, or the folder of an export.
+        namespace (str, optional): namespace of the character to key. Defaults to the root namespace.
+
+    Returns:
+        dict: {"curves": curves keyed, "keys": keys set, "skipped": plugs missing, or driven by something else}
+    """
+    if isinstance(clip, str):
+        clip = load(clip)
+    time_unit = cm.currentUnit(q=True, time=True)
+    if clip.header["time_unit"] != time_unit:
+        raise RuntimeError(f"The animation was exported at {clip.header['time_unit']}, the scene is at {time_unit}.")
+
+    selection = om2.MSelectionList()
+    rows = []
+    for row, plug_name in enumerate(clip.curves["plug"].tolist()):
+        count = selection.length()
+        try:
+            selection.add(add_namespace(plug_name, namespace))
+        except RuntimeError:
+            continue  # not in this character
+        if selection.length() == count:
+            continue  # a plug already added, under another name: the list keeps it once
+        rows.append(row)
+    plugs_to_key = [selection.getPlug(i) for i in range(len(rows))]
+    if not rows:
+        return {"curves": 0, "keys": 0, "skipped": len(clip)}
+
+    edit = KeyImport(plugs_to_key, clip, rows)
+    with edit_session.session("mt_import_anim"):
+        modifier.commit(edit)
+    return {"curves": edit.keyed, "keys": edit.keys, "skipped": len(clip) - edit.keyed}
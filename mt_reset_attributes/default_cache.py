@@ -0,0 +1,181 @@
+"""
+Default value cache for mt_reset_attributes.
+
+Attribute defaults rarely change, so instead of a cm.attributeQuery per attribute per reset they're read once:
+- static attributes: one entry per node type, shared by every node of that type,
+- dynamic (user) attributes: one entry per node, read in the same API pass,
+  evicted by an attribute added/removed callback on the node.
+
+The whole cache is dropped on new scene / open scene, stop() removes its callbacks.
+
+Usage:
+    from mt_reset_attributes import default_cache
+    defaults = default_cache.get("l_arm_CTL")
+    defaults.get("translateX"), defaults.get("tx"), defaults.user_attributes
+"""
+
+import maya.api.OpenMaya as om2
+
+
+class NodeDefaults:
+    """Defaults of one node, by long and short attribute name."""
+
+    __slots__ = ("static", "dynamic", "user_attributes")
+
+    def __init__(self, static, dynamic, user_attributes):
+        self.static = static
+        self.dynamic = dynamic
+        self.user_attributes = user_attributes  # keyable user defined attributes, long names
+
+    def get(self, attr, fallback=None):
+        value = self.dynamic.get(attr)
+        if value is None:
+            value = self.static.get(attr, fallback)
+        return value
+
+
+def read_default(attr_obj):
+    """Default of a numeric, unit or enum attribute in UI units, None for anything else or compounds."""
+    if attr_obj.hasFn(om2.MFn.kNumericAttribute):
+        default = om2.MFnNumericAttribute(attr_obj).default
+        if isinstance(default, (tuple, list)):
+            return None
+        return default
+    if attr_obj.hasFn(om2.MFn.kUnitAttribute):
+        fn = om2.MFnUnitAttribute(attr_obj)
+        default = fn.default
+        unit_type = fn.unitType()
+        if unit_type == om2.MFnUnitAttribute.kAngle:
+            return default.asUnits(om2.MAngle.uiUnit())
+        if unit_type == om2.MFnUnitAttribute.kDistance:
+            return default.asUnits(om2.MDistance.uiUnit())
+        if unit_type == om2.MFnUnitAttribute.kTime:
+            return default.asUnits(om2.MTime.uiUnit())
+        return None
+    if attr_obj.hasFn(om2.MFn.kEnumAttribute):
+        return om2.MFnEnumAttribute(attr_obj).default
+    return None
+
+
+def read_node(node_fn, static=True):
+    """
+    One pass over the attributes of a node.
+    Returns (static defaults or None, dynamic defaults, keyable user attributes).
+    """
+    static_defaults = {} if static else None
+    dynamic_defaults = {}
+    user_attributes = []
+    for i in range(node_fn.attributeCount()):
+        attr_obj = node_fn.attribute(i)
+        attr_fn = om2.MFnAttribute(attr_obj)
+        is_dynamic = attr_fn.dynamic
+        if not is_dynamic and not static:
+            continue
+        default = read_default(attr_obj)
+        if default is None:
+            continue
+        target = dynamic_defaults if is_dynamic else static_defaults
+        target[attr_fn.name] = default
+        target[attr_fn.shortName] = default
+        if is_dynamic and attr_fn.keyable and attr_fn.parent.isNull():
+            user_attributes.append(attr_fn.name)
+    return static_defaults, dynamic_defaults, user_attributes
+
+
+class DefaultValueCache:
+    def __init__(self):
+        self._types = {}      # node type -> {attr: default}
+        self._nodes = {}      # MObjectHandle hash -> (handle, dynamic defaults, user attributes)
+        self._callbacks = {}  # MObjectHandle hash -> attribute added/removed callback id
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, node):
+        """Return the NodeDefaults of node (name or MObject), reading the scene only on a miss."""
+        if isinstance(node, om2.MObject):
+            obj = node
+        else:
+            selection = om2.MSelectionList()
+            selection.add(node)
+            obj = selection.getDependNode(0)
+        handle = om2.MObjectHandle(obj)
+        key = handle.hashCode()
+        node_fn = om2.MFnDependencyNode(obj)
+        type_name = node_fn.typeName
+
+        entry = self._nodes.get(key)
+        if entry is not None and (not entry[0].isValid() or entry[0].object() != obj):
+            self.evict(key)  # deleted node, its hash was reused
+            entry = None
+        static = self._types.get(type_name)
+
+        if entry is None or static is None:
+            self.misses += 1
+            static_defaults, dynamic_defaults, user_attributes = read_node(node_fn, static=static is None)
+            if static is None:
+                static = self._types[type_name] = static_defaults
+            entry = (handle, dynamic_defaults, user_attributes)
+            self._nodes[key] = entry
+            self._watch(obj, key)
+        else:
+            self.hits += 1
+
+        return NodeDefaults(static, entry[1], entry[2])
+
+    def _watch(self, obj, key):
+        if key in self._callbacks:
+            return
+        self._callbacks[key] = om2.MNodeMessage.addAttributeAddedOrRemovedCallback(
+            obj, self._attribute_added_or_removed, key
+        )
+
+    def _attribute_added_or_removed(self, msg, plug, key):
+        # keep the callback, only the entry is stale
+        self._nodes.pop(key, None)
+
+    def evict(self, key):
+        self._nodes.pop(key, None)
+        callback = self._callbacks.pop(key, None)
+        if callback is not None:
+            om2.MMessage.removeCallback(callback)
+
+    def clear(self, *args):
+        if self._callbacks:
+            om2.MMessage.removeCallbacks(list(self._callbacks.values()))
+        self._callbacks.clear()
+        self._nodes.clear()
+        self._types.clear()
+
+
+def stop():
+    """Remove the scene callbacks and empty the cache, its node callbacks with it. The next get starts over."""
+    if _scene_callbacks:
+        om2.MMessage.removeCallbacks(_scene_callbacks)
+    _scene_callbacks.clear()
+    CACHE.clear()
+
+
+if "CACHE" in globals():  # reload() runs the module again in the same namespace, the previous cache goes first
+    stop()
+
+CACHE = DefaultValueCache()
+_scene_callbacks = []
+
+
+def _watch():
+    """The new / open scene callbacks, registered on the first get."""
+    if _scene_callbacks:
+        return
+    _scene_callbacks.extend([
+        om2.MSceneMessage.addCallback(om2.MSceneMessage.kBeforeNew, CACHE.clear),
+        om2.MSceneMessage.addCallback(om2.MSceneMessage.kBeforeOpen, CACHE.clear),
+    ])
+
+
+def get(node) -> NodeDefaults:
+    _watch()
+    return CACHE.get(node)
+
+
+def clear():
+    CACHE.clear()
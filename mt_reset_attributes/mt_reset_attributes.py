@@ -1,7 +1,17 @@
+import maya.api.OpenMaya as om2
 import maya.cmds as cm
 import maya.mel as mel
 
+from . import default_cache
+from . import plugs
 
+try:
+    from ..mt_core import edit_session, modifier
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import edit_session, modifier
+
+
+@edit_session.session("mt_reset_attributes", suspend_autokey=False)  # resetting with autokey on keys the reset
 def main(preserve_selection=False, translation=True, rotation=True, scale=True, custom_attributes=True):
     """Reset the attributes of selected objects to their default values.
 
@@ -29,21 +39,195 @@ def main(preserve_selection=False, translation=True, rotation=True, scale=True,
         to_reset = trs_attrs
 
     for obj in selected_objs:
+        # defaults are cached per node type and per node, repeated resets don't query the scene
+        defaults = default_cache.get(obj)
         to_reset = selected_attrs if selected_attrs else trs_attrs[:]
         if not selected_attrs and custom_attributes:
-            obj_custom_attrs = cm.listAttr(obj, k=True, l=False, userDefined=True) or []
-            to_reset.extend(obj_custom_attrs)
+            to_reset.extend(defaults.user_attributes)
         for attr in to_reset:
-            if cm.objExists(f"{obj}.{attr}"):
-                try:
-                    default_val = cm.attributeQuery(attr, node=obj, listDefault=True)[0]
-                    cm.setAttr(f"{obj}.{attr}", default_val)
-                except:
-                    continue  # skip attributes without defaults
+            default_val = defaults.get(attr)
+            if default_val is None:
+                continue  # skip attributes without defaults
+            try:
+                cm.setAttr(f"{obj}.{attr}", default_val)
+            except:
+                continue  # locked or connected
 
     if not preserve_selection:
         cm.channelBox("mainChannelBox", e=True, select=None)
-        
-        
-        
-        
+
+
+def _is_control(obj) -> bool:
+    """A control is a transform with a nurbs curve shape."""
+    if not obj.hasFn(om2.MFn.kTransform):
+        return False
+    dag_fn = om2.MFnDagNode(obj)
+    return any(dag_fn.child(i).hasFn(om2.MFn.kNurbsCurve) for i in range(dag_fn.childCount()))
+
+
+def _set_members(set_name) -> list:
+    """Members of an object set (nested sets flattened) as names, or plugs for a character set."""
+    members = []
+    for member in cm.sets(set_name, q=True) or []:
+        if "." not in member and cm.nodeType(member) in ("objectSet", "character"):
+            members.extend(_set_members(member))
+        else:
+            members.append(member)
+    return members
+
+
+def node_plugs(nodes, channels, custom_attributes) -> list:
+    """(node, plug) of the channels, and keyable user attributes, of every node."""
+    candidates = []
+    for node in nodes:
+        node_fn = om2.MFnDependencyNode(node)
+        attrs = list(channels)
+        if custom_attributes:
+            attrs += default_cache.get(node).user_attributes
+        for attr in attrs:
+            plug = plugs.find_plug(node_fn, attr)
+            if plug is not None:
+                candidates.append((node, plug))
+    return candidates
+
+
+def gather_reset_plugs(target, translation=True, rotation=True, scale=True, custom_attributes=True, controls_only=True) -> list:
+    """
+    Collect, in one pass, the (plug, default value) of every control of a namespace or a set
+    that is settable and not already at its default.
+    """
+    channels = plugs.channel_names(translation, rotation, scale)
+    selection = om2.MSelectionList()
+    explicit_plugs = []
+
+    if cm.objExists(target) and cm.nodeType(target) in ("objectSet", "character"):
+        for member in _set_members(target):
+            if "." in member:
+                explicit_plugs.append(member)  # character sets hold attributes
+            else:
+                selection.add(member)
+        nodes = [selection.getDependNode(i) for i in range(selection.length())]
+    elif cm.namespace(exists=target):
+        nodes = list(om2.MNamespace.getNamespaceObjects(target, True))
+        nodes = [n for n in nodes if n.hasFn(om2.MFn.kTransform)]
+    else:
+        raise ValueError(f"{target} is neither a namespace nor a set.")
+
+    if controls_only:
+        nodes = [n for n in nodes if _is_control(n)]
+
+    candidates = node_plugs(nodes, channels, custom_attributes)
+
+    plug_selection = om2.MSelectionList()
+    for plug_name in explicit_plugs:
+        plug_selection.add(plug_name)
+    for i in range(plug_selection.length()):
+        plug = plug_selection.getPlug(i)
+        candidates.append((plug.node(), plug))
+
+    to_reset = []
+    for node, plug in candidates:
+        if not plugs.is_settable(plug):
+            continue
+        default = default_cache.get(node).get(plug.partialName(useLongNames=True))
+        if default is None:
+            continue
+        if abs(plugs.read_plug(plug) - default) <= plugs.TOLERANCE:
+            continue
+        to_reset.append((plug, default))
+    return to_reset
+
+
+def reset_character(target, translation=True, rotation=True, scale=True, custom_attributes=True, controls_only=True) -> int:
+    """Reset every control of a character to its default values, as a single undo step.
+
+    Args:
+        target (str): a namespace ("char01") or a set / character set name.
+        translation (bool, optional): reset the translation. Defaults to True.
+        rotation (bool, optional): reset the rotation. Defaults to True.
+        scale (bool, optional): reset the scale. Defaults to True.
+        custom_attributes (bool, optional): reset the keyable user defined attributes. Defaults to True.
+        controls_only (bool, optional): only the transforms with a nurbs curve shape, for a namespace or object set. Defaults to True.
+
+    Returns:
+        int: the number of plugs that were reset. Plugs already at their default are skipped.
+    """
+    to_reset = gather_reset_plugs(target, translation, rotation, scale, custom_attributes, controls_only)
+    if not to_reset:
+        return 0
+
+    # one modifier: one undo step, and the graph is dirtied once instead of once per setAttr
+    mod = om2.MDGModifier()
+    for plug, default in to_reset:
+        plugs.write_plug(mod, plug, default)
+    with edit_session.session("mt_reset_character"):
+        modifier.commit(mod)
+    return len(to_reset)
+
+
+RESET_KEY_MODES = ("existing_keys", "every_frame", "range_ends")
+
+
+def reset_keys(objects=None, start=None, end=None, mode="existing_keys", translation=True, rotation=True, scale=True, custom_attributes=True) -> dict:
+    """Write default values as keys over a frame range, without ever changing the current time.
+
+    Args:
+        objects (list, optional): objects to reset. Defaults to the selection.
+        start (float, optional): first frame. Defaults to the playback start.
+        end (float, optional): last frame. Defaults to the playback end.
+        mode (str, optional):
+            "existing_keys": every key already in the range is set to the default value,
+            "every_frame": a default key on every frame of the range,
+            "range_ends": a default key on the first and last frame.
+            Defaults to "existing_keys".
+        translation, rotation, scale, custom_attributes (bool, optional): channels to reset, like main().
+
+    Returns:
+        dict with keys: curves, keys
+    """
+    if mode not in RESET_KEY_MODES:
+        raise ValueError(f"Unknown mode {mode}, expected one of {RESET_KEY_MODES}.")
+    objects = objects if objects is not None else cm.ls(sl=True)
+    if not objects:
+        cm.warning("No objects selected.")
+        return {'curves': 0, 'keys': 0}
+    if start is None:
+        start = cm.playbackOptions(q=True, min=True)
+    if end is None:
+        end = cm.playbackOptions(q=True, max=True)
+
+    selection = om2.MSelectionList()
+    for obj in objects:
+        selection.add(obj)
+    nodes = [selection.getDependNode(i) for i in range(selection.length())]
+    channels = plugs.channel_names(translation, rotation, scale)
+
+    if mode == "every_frame":
+        times = [float(t) for t in range(int(round(start)), int(round(end)) + 1)]
+    else:
+        times = sorted({float(start), float(end)})
+
+    curves = keys = 0
+    with edit_session.session("mt_reset_keys"):
+        for node, plug in node_plugs(nodes, channels, custom_attributes):
+            if plug.isLocked:
+                continue
+            default = default_cache.get(node).get(plug.partialName(useLongNames=True))
+            if default is None:
+                continue
+            curve = plugs.anim_curve(plug)
+            # a single command per curve, whatever the amount of keys
+            if mode == "existing_keys":
+                if curve is None:
+                    continue
+                changed = cm.keyframe(curve, edit=True, time=(start, end), valueChange=default, absolute=True) or 0
+            else:
+                if plug.isDestination and curve is None:
+                    continue  # driven by something else than a curve
+                changed = cm.setKeyframe(plugs.plug_path(plug), time=times, value=default) or 0
+            if changed:
+                curves += 1
+                keys += changed
+
+    return {'curves': curves, 'keys': keys}
+
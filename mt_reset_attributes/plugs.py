@@ -0,0 +1,93 @@
+"""
+Plug helpers shared by the reset and pose tools: read and write numeric plugs in UI units,
+through the API, so a whole character goes in a single modifier.
+"""
+
+import maya.api.OpenMaya as om2
+
+TRANSLATION = ("translateX", "translateY", "translateZ")
+ROTATION = ("rotateX", "rotateY", "rotateZ")
+SCALE = ("scaleX", "scaleY", "scaleZ")
+
+TOLERANCE = 1e-6
+
+
+def channel_names(translation=True, rotation=True, scale=True) -> list:
+    names = []
+    if translation:
+        names += TRANSLATION
+    if rotation:
+        names += ROTATION
+    if scale:
+        names += SCALE
+    return names
+
+
+def _unit_type(plug):
+    attr_obj = plug.attribute()
+    if attr_obj.hasFn(om2.MFn.kUnitAttribute):
+        return om2.MFnUnitAttribute(attr_obj).unitType()
+    return None
+
+
+def read_plug(plug) -> float:
+    """Value of a numeric plug, in UI units."""
+    unit_type = _unit_type(plug)
+    if unit_type == om2.MFnUnitAttribute.kAngle:
+        return plug.asMAngle().asUnits(om2.MAngle.uiUnit())
+    if unit_type == om2.MFnUnitAttribute.kDistance:
+        return plug.asMDistance().asUnits(om2.MDistance.uiUnit())
+    if unit_type == om2.MFnUnitAttribute.kTime:
+        return plug.asMTime().asUnits(om2.MTime.uiUnit())
+    return plug.asDouble()
+
+
+def write_plug(modifier, plug, value):
+    """Queue value (UI units) on plug in modifier."""
+    unit_type = _unit_type(plug)
+    if unit_type == om2.MFnUnitAttribute.kAngle:
+        modifier.newPlugValueMAngle(plug, om2.MAngle(value, om2.MAngle.uiUnit()))
+    elif unit_type == om2.MFnUnitAttribute.kDistance:
+        modifier.newPlugValueMDistance(plug, om2.MDistance(value, om2.MDistance.uiUnit()))
+    elif unit_type == om2.MFnUnitAttribute.kTime:
+        modifier.newPlugValueMTime(plug, om2.MTime(value, om2.MTime.uiUnit()))
+    elif plug.attribute().hasFn(om2.MFn.kEnumAttribute):
+        modifier.newPlugValueInt(plug, int(round(value)))
+    else:
+        modifier.newPlugValueDouble(plug, value)
+
+
+def is_settable(plug) -> bool:
+    """Unlocked, and either free or driven by an anim curve (setAttr would fail otherwise)."""
+    if plug.isLocked:
+        return False
+    if plug.isDestination:
+        return plug.source().node().hasFn(om2.MFn.kAnimCurve)
+    return True
+
+
+def plug_path(plug) -> str:
+    """Unique 'node.attr' name of plug, full path for dag nodes."""
+    node = plug.node()
+    if node.hasFn(om2.MFn.kDagNode):
+        node_name = om2.MFnDagNode(node).fullPathName()
+    else:
+        node_name = om2.MFnDependencyNode(node).name()
+    return f"{node_name}.{plug.partialName(useLongNames=True)}"
+
+
+def anim_curve(plug):
+    """Name of the anim curve driving plug, None if it isn't keyed."""
+    if not plug.isDestination:
+        return None
+    source = plug.source().node()
+    if not source.hasFn(om2.MFn.kAnimCurve):
+        return None
+    return om2.MFnDependencyNode(source).name()
+
+
+def find_plug(node_fn, attr):
+    try:
+        return node_fn.findPlug(attr, False)
+    except RuntimeError:
+        return None
@@ -0,0 +1,253 @@
+"""
+Pose snapshots: capture the channels of a whole character and restore them later, rest, bind or any user pose.
+
+A pose is a numpy structured array with one record per plug:
+    plug   "ctrl.translateX", the character's namespace stripped so a pose goes on any instance of the character
+           (a nested "sub:ctrl" keeps its sub namespace, a node out of the character its absolute ":world_GRP")
+    value  float64, in UI units
+
+It is saved as a plain .npy next to the scene (<scene>_poses/<name>.npy), loads memory mapped,
+and reading or diffing it only needs numpy, not Maya:
+    import numpy as np
+    pose = np.load("shot010_poses/rest.npy", mmap_mode="r")
+    pose["plug"], pose["value"]
+
+Usage:
+    from mt_reset_attributes import pose_store
+    pose_store.save_pose("rest", pose_store.capture("char01"))
+    pose_store.restore(pose_store.load_pose("rest"), namespace="char02")
+    pose_store.restore(pose, namespace="char02", mask=pose_store.channel_box_mask(pose))  # selected channels only
+"""
+
+import os
+
+import numpy as np
+
+import maya.api.OpenMaya as om2
+import maya.cmds as cm
+import maya.mel as mel
+
+from . import plugs
+from .mt_reset_attributes import node_plugs
+
+try:
+    from ..mt_core import edit_session, modifier
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import edit_session, modifier
+
+POSE_DIR_SUFFIX = "_poses"
+
+
+def pose_array(plug_names, values) -> np.ndarray:
+    """Build a pose record array from parallel lists of plug names and values."""
+    width = max((len(p) for p in plug_names), default=1)
+    pose = np.empty(len(plug_names), dtype=[("plug", f"U{width}"), ("value", "f8")])
+    pose["plug"] = plug_names
+    pose["value"] = values
+    return pose
+
+
+def strip_namespace(plug_name: str, namespace: str) -> str:
+    """
+    '|world_GRP|char01:grp|char01:sub:ctrl.translateX', 'char01' -> ':world_GRP|grp|sub:ctrl.translateX'.
+    Only namespace is stripped, from every path element in it. The elements out of it keep their absolute name,
+    marked by a leading ':'.
+    """
+    namespace = namespace.strip(":")
+    prefix = namespace + ":"
+    node, _, attr = plug_name.partition(".")
+    parts = []
+    for part in node.strip("|").split("|"):
+        if namespace and part.startswith(prefix):
+            parts.append(part[len(prefix):])
+        elif namespace or ":" in part:
+            parts.append(":" + part)
+        else:
+            parts.append(part)  # root namespace export, the node is in it
+    return "|".join(parts) + "." + attr
+
+
+def add_namespace(plug_name: str, namespace: str) -> str:
+    """':world_GRP|grp|sub:ctrl.translateX', 'char02' -> 'world_GRP|char02:grp|char02:sub:ctrl.translateX'."""
+    namespace = namespace.strip(":")
+    node, _, attr = plug_name.partition(".")
+    parts = []
+    for part in node.split("|"):
+        if part.startswith(":"):
+            parts.append(part[1:])
+        else:
+            parts.append(f"{namespace}:{part}" if namespace else part)
+    return "|".join(parts) + "." + attr
+
+
+def _is_namespace(target) -> bool:
+    return isinstance(target, str) and cm.namespace(exists=target) and not cm.objExists(target)
+
+
+def _target_nodes(target) -> list:
+    """Nodes of a namespace, a set, or a list of objects (the selection by default)."""
+    if target is None:
+        target = cm.ls(sl=True)
+    selection = om2.MSelectionList()
+    if _is_namespace(target):
+        return [n for n in om2.MNamespace.getNamespaceObjects(target, True) if n.hasFn(om2.MFn.kTransform)]
+    if isinstance(target, str) and cm.nodeType(target) in ("objectSet", "character"):
+        target = [m.partition(".")[0] for m in cm.sets(target, q=True) or []]
+    for obj in ([target] if isinstance(target, str) else target):
+        selection.add(obj)
+    return [selection.getDependNode(i) for i in range(selection.length())]
+
+
+def capture(target=None, translation=True, rotation=True, scale=True, custom_attributes=True,
+            namespace=None) -> np.ndarray:
+    """
+    Capture the current values of a character, in one API pass.
+
+    Args:
+        target: a namespace, a set, or a list of objects. Defaults to the selection.
+        translation, rotation, scale, custom_attributes (bool, optional): channels to capture.
+        namespace (str, optional): namespace stripped from the plugs. Defaults to target when it is a namespace,
+            else to the namespace of the first node.
+
+    Returns:
+        the pose record array.
+    """
+    channels = plugs.channel_names(translation, rotation, scale)
+    nodes = _target_nodes(target)
+    if namespace is None:
+        if _is_namespace(target):
+            namespace = target
+        else:
+            namespace = om2.MFnDependencyNode(nodes[0]).name().rpartition(":")[0] if nodes else ""
+    plug_names, values = [], []
+    for _, plug in node_plugs(nodes, channels, custom_attributes):
+        if plug.isCompound or plug.isArray:
+            continue
+        plug_names.append(strip_namespace(plugs.plug_path(plug), namespace))
+        values.append(plugs.read_plug(plug))
+    return pose_array(plug_names, values)
+
+
+def pose_dir(scene=None) -> str:
+    """<scene folder>/<scene name>_poses, the poses live alongside the scene."""
+    scene = scene or cm.file(q=True, sceneName=True)
+    if not scene:
+        raise RuntimeError("Save the scene first, poses are stored alongside it.")
+    base = os.path.splitext(scene)[0]
+    return base + POSE_DIR_SUFFIX
+
+
+def pose_path(name: str, scene=None) -> str:
+    if name.endswith(".npy") or os.path.isabs(name):
+        return name
+    return os.path.join(pose_dir(scene), name + ".npy")
+
+
+def save_pose(name: str, pose: np.ndarray, scene=None) -> str:
+    """Save pose as name (or a full .npy path), returns the file path."""
+    path = pose_path(name, scene)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, pose, allow_pickle=False)
+    return path
+
+
+def load_pose(name: str, scene=None, mmap=True) -> np.ndarray:
+    """Load a pose, memory mapped by default: only the records a restore touches are read from disk."""
+    return np.load(pose_path(name, scene), mmap_mode="r" if mmap else None, allow_pickle=False)
+
+
+def list_poses(scene=None) -> list:
+    directory = pose_dir(scene)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(f[:-4] for f in os.listdir(directory) if f.endswith(".npy"))
+
+
+def pose_mask(pose: np.ndarray, attributes=None, nodes=None) -> np.ndarray:
+    """Boolean mask of the records of pose on the given attribute long names and / or node names."""
+    mask = np.ones(len(pose), dtype=bool)
+    if not attributes and not nodes:
+        return mask
+    split = np.char.partition(pose["plug"], ".")
+    if attributes:
+        mask &= np.isin(split[:, 2], list(attributes))
+    if nodes:
+        short_nodes = np.char.rpartition(np.char.rpartition(split[:, 0], "|")[:, 2], ":")[:, 2]
+        mask &= np.isin(short_nodes, [n.rpartition("|")[2].rpartition(":")[2] for n in nodes])
+    return mask
+
+
+def channel_box_mask(pose: np.ndarray = None) -> dict:
+    """
+    The channel box selection as mask arguments: {"attributes": [...], "nodes": [...]}.
+    With a pose, returns the boolean mask directly.
+    """
+    channel_box = mel.eval('$temp=$gChannelBoxName')
+    objects = cm.ls(sl=True)
+    short_names = cm.channelBox(channel_box, q=True, selectedMainAttributes=True) or []
+    attributes = []
+    if objects:
+        for attr in short_names:
+            if cm.attributeQuery(attr, node=objects[0], exists=True):
+                attributes.append(cm.attributeQuery(attr, node=objects[0], longName=True))
+    mask_args = {"attributes": attributes, "nodes": objects}
+    if pose is not None:
+        return pose_mask(pose, **mask_args)
+    return mask_args
+
+
+def restore(pose: np.ndarray, namespace="", mask=None) -> int:
+    """
+    Restore pose as a single undo step: the plugs are resolved in one selection list, written with one MDGModifier.
+
+    Args:
+        pose: a pose record array, from capture or load_pose.
+        namespace (str, optional): namespace of the character to restore on. Defaults to the root namespace.
+        mask (optional): boolean array (see pose_mask / channel_box_mask) to restore only part of the pose.
+
+    Returns:
+        int: the number of plugs written. Missing, locked or connected plugs are skipped.
+    """
+    if mask is not None:
+        pose = pose[np.asarray(mask, dtype=bool)]
+    if not len(pose):
+        return 0
+
+    selection = om2.MSelectionList()
+    values = []
+    for plug_name, value in zip(pose["plug"].tolist(), pose["value"].tolist()):
+        count = selection.length()
+        try:
+            selection.add(add_namespace(plug_name, namespace))
+        except RuntimeError:
+            continue  # not in this character
+        if selection.length() == count:
+            continue  # a plug already added, under another name: the list keeps it once
+        values.append(value)
+
+    mod = om2.MDGModifier()
+    count = 0
+    for i, value in enumerate(values):
+        plug = selection.getPlug(i)
+        if not plugs.is_settable(plug):
+            continue
+        plugs.write_plug(mod, plug, value)
+        count += 1
+    if count:
+        with edit_session.session("mt_restore_pose"):
+            modifier.commit(mod)
+    return count
+
+
+def diff_poses(pose_a: np.ndarray, pose_b: np.ndarray, tolerance=plugs.TOLERANCE) -> list:
+    """
+    Plain numpy, no Maya: the (plug, value a, value b) that differ, a plug missing on one side has a nan value.
+    """
+    plugs_a, plugs_b = pose_a["plug"], pose_b["plug"]
+    all_plugs = np.union1d(plugs_a, plugs_b)
+    values_a = np.full(len(all_plugs), np.nan)
+    values_b = np.full(len(all_plugs), np.nan)
+    values_a[np.searchsorted(all_plugs, plugs_a)] = pose_a["value"]
+    values_b[np.searchsorted(all_plugs, plugs_b)] = pose_b["value"]
+    changed = ~(np.abs(values_a - values_b) <= tolerance)
+    return list(zip(all_plugs[changed].tolist(), values_a[changed].tolist(), values_b[changed].tolist()))
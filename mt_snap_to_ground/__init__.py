@@ -1,3 +1,14 @@
 __version__ = "1.0.0"
 __author__ = "LFR"
 __all__ = ["mt_snap_to_ground"]
+
+try:
+    from ..mt_core import lazy
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import lazy
+
+__getattr__, __dir__ = lazy.attach(
+    __name__,
+    ["mt_snap_to_ground"],
+    {"mt_snap_to_ground": ["GroundSnapper", "GroundSnapperGUI"]},
+)
@@ -23,10 +23,17 @@ snapperUi.show()
 
 import logging
 from pprint import pprint
-import pymel.core as pm
 
+try:
+    from ..mt_core import edit_session, lazy, trace
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import edit_session, lazy, trace
+
+pm = lazy.load("pymel.core")  # imported on first use, not with the tool
+
+# the logging configuration belongs to Maya, or to whoever runs the tool: the debug lines of every ray are only
+# built when asked for. For timings, see mt_core.trace
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 
 class GroundSnapper:
@@ -41,6 +48,7 @@ class GroundSnapper:
         self.use_bb = True  # is the tY offset calculated using the Bounding Box?
         self.user_offset = 0.0  # tY offset dictated by the user
 
+    @edit_session.session("mt_snap_to_ground", suspend_autokey=False)
     def do_it(self, *args):
         # TODO ! need to decouple the obj selection from the raycast execution
         selection = self.get_selected_objects()
@@ -51,6 +59,7 @@ class GroundSnapper:
     def doIt(self, *args):  # noqa: N802 (Maya style camelCase retained for compatibility)
         return self.do_it(*args)
 
+    @trace.span()
     def raycast(self, obj, orient: bool = True, position: bool = True):
         # Ensure ground is set
         if not self.ground_shape:
@@ -59,8 +68,8 @@ class GroundSnapper:
 
         ray_source = obj.getTranslation(space="world")
 
-        logger.debug(f"ray_source = {ray_source}")
-        logger.debug(f"ray_direction = {self.down}")
+        logger.debug("ray_source = %s", ray_source)
+        logger.debug("ray_direction = %s", self.down)
 
         hit, hit_points, hit_faces = self.ground_shape.intersect(
             raySource=ray_source,
@@ -109,7 +118,7 @@ class GroundSnapper:
         projected_matrix.setRotation(projected_rotation_quat.asEulerRotation())
         projected_matrix.setScale(projected_scale, space="world")
         
-        logger.debug(f"matrix: {projected_matrix}")
+        logger.debug("matrix: %s", projected_matrix)
         
         # finally apply the matrix
         # obj.setMatrix(projected_matrix)
@@ -0,0 +1,18 @@
+"""
+mt_testing
+==========
+Running the mtTools outside of Maya, for benchmarks and tests. Not a tool, nothing in here is used in Maya.
+
+- fake_maya: in-memory maya.cmds, maya.api.OpenMaya and pymel.core stand-ins, with call counters.
+"""
+
+__version__ = "1.0.0"
+__author__ = "LFR"
+__all__ = ["fake_maya"]
+
+try:
+    from ..mt_core import lazy
+except ImportError:  # tools installed flat in the scripts folder
+    from mt_core import lazy
+
+__getattr__, __dir__ = lazy.attach(__name__, ["fake_maya"])
@@ -0,0 +1,90 @@
+"""
+fake_maya
+=========
+An in-memory Maya for plain CPython: maya.cmds, maya.mel, maya.api.OpenMaya, maya.api.OpenMayaAnim and pymel.core
+stand-ins sharing one scene, so the tools run, and can be measured, without a Maya license.
+
+Usage:
+    from mt_testing import fake_maya
+
+    fake_maya.install()  # before the tools import maya
+    import maya.cmds as cm
+    cm.spaceLocator(n="loc")
+    ...
+    fake_maya.counters()  # {"cmds.spaceLocator": 1, ...}
+
+Every fake command counts its calls, "cmds.<command>", "om2.<class>" for the API constructions, "pm.<method>"...
+See the README for what the scene supports, and what it doesn't.
+"""
+
+import importlib
+import sys
+import types
+
+from . import scene as _scene
+
+_MODULES = {
+    "maya.cmds": "cmds",
+    "maya.mel": "mel",
+    "maya.api.OpenMaya": "openmaya",
+    "maya.api.OpenMayaAnim": "openmaya_anim",
+    "pymel.core": "pymel_core",
+}
+_PACKAGES = ("maya", "maya.api", "pymel")
+
+_saved = None  # the modules replaced by install(), put back by uninstall()
+
+
+def install():
+    """Register the fake modules in sys.modules, a later 'import maya.cmds' gets them."""
+    global _saved
+    if _saved is not None:
+        return
+    names = _PACKAGES + tuple(_MODULES)
+    _saved = {name: sys.modules.get(name) for name in names}
+    for name in _PACKAGES:
+        package = types.ModuleType(name, "fake_maya package")
+        package.__path__ = []
+        sys.modules[name] = package
+    for name, module_name in _MODULES.items():
+        sys.modules[name] = importlib.import_module(f".{module_name}", __name__)
+    for name in names:  # maya.api.OpenMaya as an attribute of maya.api...
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(sys.modules[parent], child, sys.modules[name])
+
+
+def uninstall():
+    """Put back the modules install() replaced. Modules already imported keep their reference to the fakes."""
+    global _saved
+    if _saved is None:
+        return
+    for name, module in _saved.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+    _saved = None
+
+
+def installed() -> bool:
+    return _saved is not None
+
+
+def get_scene() -> _scene.Scene:
+    """The scene of the session, what the fake modules edit."""
+    return _scene.SCENE
+
+
+def new_scene():
+    """File > New: an empty scene, the callbacks of the tools (scene, node added...) run like in Maya."""
+    _scene.SCENE.clear()
+
+
+def counters() -> dict:
+    """Calls of the fake commands since the last reset_counters(), {"cmds.setAttr": 12, ...}."""
+    return dict(_scene.CALLS)
+
+
+def reset_counters():
+    _scene.CALLS.clear()
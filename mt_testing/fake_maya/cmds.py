@@ -0,0 +1,1377 @@
+"""
+Fake maya.cmds, on the in-memory scene.
+
+The commands the tools use, with the flags they use, long and short names. Values are in UI units (cm, degrees,
+film frames) like in Maya. Every call is counted in scene.CALLS as "cmds.<command>".
+A missing object raises ValueError, a failed edit RuntimeError, like the real commands.
+
+UI commands only keep their flags in a registry, so a GUI can be built and queried headless.
+"""
+
+import functools
+import importlib.util
+import math
+import os
+
+from . import geometry
+from . import math3d
+from .scene import CALLS, SCENE, FPS
+from .scene import Attr as _Attr, from_ui as _from_ui, to_ui as _to_ui  # private, maya.cmds only holds commands
+
+_CONSTRAINT_OUTPUTS = {
+    "parentConstraint": ("translate", "rotate"),
+    "pointConstraint": ("translate",),
+    "orientConstraint": ("rotate",),
+    "scaleConstraint": ("scale",),
+    "aimConstraint": ("rotate",),
+    "poleVectorConstraint": ("translate",),
+    "geometryConstraint": ("translate",),
+    "normalConstraint": ("rotate",),
+    "tangentConstraint": ("rotate",),
+}
+_SKIP_FLAGS = {"translate": ("skipTranslate", "st"), "rotate": ("skipRotate", "sr"), "scale": ("skip", "sk")}
+_UI_ALIASES = {
+    "v": "value", "v1": "value1", "v2": "value2", "v3": "value3", "tx": "text", "l": "label", "en": "enable",
+    "vis": "visible", "ann": "annotation", "cc": "changeCommand", "c": "command", "bl": "buttonLabel",
+    "bc": "buttonCommand", "t": "title", "w": "width", "h": "height", "ed": "editable", "min": "minValue",
+    "max": "maxValue", "ex": "exists",
+}
+
+
+def _command(function):
+    """Counts the calls of a command."""
+    key = "cmds." + function.__name__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        CALLS[key] += 1
+        return function(*args, **kwargs)
+
+    return wrapper
+
+
+def _flag(kwargs, *names, default=None):
+    for name in names:
+        if name in kwargs:
+            return kwargs[name]
+    return default
+
+
+def _flatten(args) -> list:
+    names = []
+    for arg in args:
+        if isinstance(arg, (list, tuple, set)):
+            names.extend(_flatten(arg))
+        elif arg is not None:
+            names.append(str(arg))
+    return names
+
+
+def _name(node, long=False) -> str:
+    if long and node.dag:
+        return node.full_path()
+    return SCENE.partial_path(node)
+
+
+def _nodes(args, selection=True) -> list:
+    """Nodes of the names in args, the selection when there are none. Raises ValueError for a missing name."""
+    names = _flatten(args)
+    if not names:
+        return list(SCENE.selection) if selection else []
+    return [SCENE.find(name.partition(".")[0]) for name in names]
+
+
+def _plug(plug_name):
+    return SCENE.parse_plug(str(plug_name))
+
+
+def _ui_value(attr, value):
+    if isinstance(value, tuple):
+        if attr is not None and attr.kind == "matrix":
+            return list(value)
+        children = attr.children if attr is not None else ()
+        return [tuple(_to_ui(c, v) for c, v in zip(children, value))]
+    return _to_ui(attr, value)
+
+
+def _time_ranges(value) -> list:
+    """time flag -> [(start, end)], None for every key."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return [(float(value), float(value))]
+    if isinstance(value, str):
+        start, _, end = value.partition(":")
+        return [(float(start) if start else None, float(end or start) if (end or start) else None)]
+    if isinstance(value, tuple) and len(value) in (1, 2) and all(v is None or isinstance(v, (int, float)) for v in value):
+        start = value[0]
+        end = value[-1]
+        return [(None if start is None else float(start), None if end is None else float(end))]
+    ranges = []
+    for item in value:
+        ranges.extend(_time_ranges(item))
+    return ranges
+
+
+def _key_indices(curve, ranges, index=None, selected=False) -> list:
+    if index is not None:
+        first, last = (index, index) if isinstance(index, int) else (index[0], index[-1])
+        indices = [i for i in range(len(curve)) if first <= i <= last]
+    elif ranges is None:
+        indices = list(range(len(curve)))
+    else:
+        found = set()
+        for start, end in ranges:
+            found.update(curve.in_range(start, end))
+        indices = sorted(found)
+    if selected:
+        indices = [i for i in indices if curve.times[i] in curve.selected]
+    return indices
+
+
+def _curve_output_attr(curve_node):
+    return curve_node.attr("output")
+
+
+def _curves(args, attribute=None) -> list:
+    """Anim curve nodes of anim curve, plug or node names (the selection by default), driving the plugs."""
+    names = _flatten(args)
+    if not names:
+        names = [SCENE.partial_path(n) for n in SCENE.selection]
+    attributes = set(_flatten([attribute])) if attribute else None
+    curves = []
+    for name in names:
+        if "." in name:
+            node, path = _plug(name)
+            source = SCENE.source(node, path)
+            candidates = [source[0]] if source else []
+            if not candidates and node.attr(path) is not None and node.attr(path).children:
+                candidates = [
+                    SCENE.source(node, path_child)[0]
+                    for path_child in (_child(path, c.name) for c in node.attr(path).children)
+                    if SCENE.source(node, path_child)
+                ]
+        else:
+            node = SCENE.find(name)
+            if node.has_fn("kAnimCurve"):
+                candidates = [node]
+            else:
+                candidates = []
+                for path, (src, _) in node.inputs.items():
+                    if attributes is not None:
+                        attr = node.attr(path)
+                        if path not in attributes and (attr is None or attr.short not in attributes):
+                            continue
+                    candidates.append(src)
+        for curve in candidates:
+            if curve.has_fn("kAnimCurve") and curve not in curves:
+                curves.append(curve)
+    return curves
+
+
+def _child(path, child_name) -> str:
+    if path.endswith("]"):
+        return f"{path}.{child_name}"
+    prefix = path.rpartition(".")[0]
+    return (prefix + "." if prefix else "") + child_name
+
+
+def _curve_type(attr) -> str:
+    return {"distance": "animCurveTL", "angle": "animCurveTA", "time": "animCurveTT"}.get(attr.kind, "animCurveTU")
+
+
+# ---- scene queries
+
+@_command
+def ls(*args, **kwargs):
+    long = _flag(kwargs, "long", "l", default=False)
+    type_filter = _flag(kwargs, "type", "typ")
+    if _flag(kwargs, "selection", "sl", default=False):
+        nodes = list(SCENE.selection)
+        names = _flatten(args)
+        if names:
+            wanted = {n for name in names for n in SCENE.match(name)}
+            nodes = [n for n in nodes if n in wanted]
+    elif args:
+        nodes = []
+        for name in _flatten(args):
+            for node in SCENE.match(name.partition(".")[0]):
+                if node not in nodes:
+                    nodes.append(node)
+    else:
+        nodes = SCENE.ls()
+    if type_filter:
+        types = _flatten([type_filter])
+        nodes = [n for n in nodes if any(n.type.isa(t) for t in types)]
+    if _flag(kwargs, "transforms", "tr", default=False):
+        nodes = [n for n in nodes if n.type.isa("transform")]
+    if _flag(kwargs, "dag", default=False):
+        nodes = [n for n in nodes if n.dag]
+    if _flag(kwargs, "showType", "st", default=False):
+        result = []
+        for node in nodes:
+            result += [_name(node, long), node.type.name]
+        return result
+    return [_name(node, long) for node in nodes]
+
+
+@_command
+def select(*args, **kwargs):
+    if _flag(kwargs, "clear", "cl", default=False):
+        SCENE.selection.clear()
+        return
+    nodes = []
+    for name in _flatten(args):
+        matches = SCENE.match(name)
+        if not matches:
+            raise ValueError(f"No object matches name: {name}")
+        nodes.extend(matches)
+    if _flag(kwargs, "deselect", "d", default=False):
+        SCENE.selection[:] = [n for n in SCENE.selection if n not in nodes]
+    elif _flag(kwargs, "add", default=False):
+        SCENE.selection.extend(n for n in nodes if n not in SCENE.selection)
+    elif _flag(kwargs, "toggle", "tgl", default=False):
+        for node in nodes:
+            if node in SCENE.selection:
+                SCENE.selection.remove(node)
+            else:
+                SCENE.selection.append(node)
+    else:
+        SCENE.selection[:] = list(dict.fromkeys(nodes))
+
+
+@_command
+def objExists(name):
+    name = str(name)
+    try:
+        if "." in name:
+            return SCENE.parse_plug(name, required=False) is not None
+        return SCENE.find(name, required=False) is not None
+    except ValueError:
+        return True  # more than one match
+
+
+@_command
+def nodeType(name, **kwargs):
+    node = SCENE.find(str(name).partition(".")[0])
+    if _flag(kwargs, "inherited", "i", default=False):
+        return list(node.type.inherited)
+    return node.type.name
+
+
+@_command
+def listRelatives(*args, **kwargs):
+    long = _flag(kwargs, "fullPath", "f", default=False)
+    type_filter = _flag(kwargs, "type", "typ")
+    result = []
+    for node in _nodes(args):
+        if _flag(kwargs, "parent", "p", default=False):
+            related = [node.parent] if node.parent is not None else []
+        elif _flag(kwargs, "allDescendents", "ad", default=False):
+            related = list(node.descendants())
+        else:
+            related = list(node.children)
+        if _flag(kwargs, "shapes", "s", default=False):
+            related = [n for n in related if n.type.shape]
+        if type_filter:
+            types = _flatten([type_filter])
+            related = [n for n in related if any(n.type.isa(t) for t in types)]
+        result += [_name(n, long) for n in related]
+    return result or None
+
+
+@_command
+def listConnections(*args, **kwargs):
+    source = _flag(kwargs, "source", "s", default=True)
+    destination = _flag(kwargs, "destination", "d", default=True)
+    plugs = _flag(kwargs, "plugs", "p", default=False)
+    connections = _flag(kwargs, "connections", "c", default=False)
+    type_filter = _flag(kwargs, "type", "t")
+    result = []
+    for name in _flatten(args) or [SCENE.partial_path(n) for n in SCENE.selection]:
+        if "." in name:
+            node, path = _plug(name)
+            inputs = [(path, node.inputs[path])] if path in node.inputs else []
+            outputs = [(path, d) for d in node.outputs.get(path, ())]
+            for p, child_inputs in list(node.inputs.items()):
+                if p != path and (p.startswith(path + ".") or p.startswith(path + "[")):
+                    inputs.append((p, child_inputs))
+            for p, dsts in node.outputs.items():
+                if p != path and (p.startswith(path + ".") or p.startswith(path + "[")):
+                    outputs += [(p, d) for d in dsts]
+        else:
+            node = SCENE.find(name)
+            inputs = list(node.inputs.items())
+            outputs = [(p, d) for p, dsts in node.outputs.items() for d in dsts]
+        pairs = (inputs if source else []) + (outputs if destination else [])
+        for own_path, (other, other_path) in pairs:
+            if type_filter and not other.type.isa(type_filter):
+                continue
+            if connections:
+                result.append(f"{SCENE.partial_path(node)}.{own_path}")
+            result.append(f"{SCENE.partial_path(other)}.{other_path}" if plugs else SCENE.partial_path(other))
+    return result or None
+
+
+@_command
+def referenceQuery(name, **kwargs):
+    node = SCENE.find(str(name).partition(".")[0])
+    if _flag(kwargs, "isNodeReferenced", "inr", default=False):
+        return node.referenced
+    raise RuntimeError("referenceQuery: only isNodeReferenced is supported by the fake scene.")
+
+
+# ---- attributes
+
+@_command
+def getAttr(plug_name, **kwargs):
+    node, path = _plug(plug_name)
+    attr = SCENE.plug_attr(node, path)
+    if _flag(kwargs, "lock", "l", default=False):
+        return path in node.locked
+    if _flag(kwargs, "keyable", "k", default=False):
+        return attr.keyable
+    if _flag(kwargs, "size", "s", default=False):
+        return len(node.element_indices(path))
+    if attr.multi and not path.endswith("]"):
+        path += "[0]"
+    time = _flag(kwargs, "time", "t")
+    if time is None:
+        return _ui_value(attr, SCENE.plug_value(node, path))
+    previous, SCENE.context_time = SCENE.context_time, float(time)
+    try:
+        return _ui_value(attr, SCENE.plug_value(node, path))
+    finally:
+        SCENE.context_time = previous
+
+
+@_command
+def setAttr(plug_name, *values, **kwargs):
+    node, path = _plug(plug_name)
+    attr = SCENE.plug_attr(node, path)
+    lock = _flag(kwargs, "lock", "l")
+    if lock is not None:
+        (node.locked.add if lock else node.locked.discard)(path)
+    keyable = _flag(kwargs, "keyable", "k")
+    if keyable is not None:
+        attr.keyable = bool(keyable)
+    if not values:
+        return
+    if len(values) == 1 and isinstance(values[0], (list, tuple)):
+        values = tuple(values[0])
+    if attr.kind == "matrix":
+        SCENE.set_plug(node, path, tuple(float(v) for v in values))
+    elif attr.kind == "string" or _flag(kwargs, "type", "typ") == "string":
+        node.values[path] = str(values[0])
+    elif attr.children:
+        SCENE.set_plug(node, path, tuple(_from_ui(c, v) for c, v in zip(attr.children, values)))
+    else:
+        SCENE.set_plug(node, path, _from_ui(attr, values[0]))
+
+
+@_command
+def addAttr(*args, **kwargs):
+    node = _nodes(args)[0]
+    long_name = _flag(kwargs, "longName", "ln")
+    short_name = _flag(kwargs, "shortName", "sn", default=long_name)
+    attribute_type = _flag(kwargs, "attributeType", "at")
+    data_type = _flag(kwargs, "dataType", "dt")
+    kind = {
+        "double": "double", "float": "double", "bool": "bool", "long": "long", "short": "long", "byte": "long",
+        "enum": "enum", "doubleLinear": "distance", "doubleAngle": "angle", "time": "time", "double3": "double3",
+        "float3": "double3", "compound": "compound", "message": "message", "matrix": "matrix",
+    }.get(attribute_type, "string" if data_type == "string" else "matrix" if data_type == "matrix" else "double")
+    default = _flag(kwargs, "defaultValue", "dv", default=0.0)
+    enum_names = _flag(kwargs, "enumName", "en")
+    attr = _Attr(
+        long_name, short_name, kind, _from_ui(_Attr("", kind=kind), default) if kind == "angle" else default,
+        keyable=_flag(kwargs, "keyable", "k", default=False),
+        multi=_flag(kwargs, "multi", "m", default=False),
+        enum_names=enum_names.split(":") if enum_names else None,
+        minimum=_flag(kwargs, "minValue", "min"),
+        maximum=_flag(kwargs, "maxValue", "max"),
+    )
+    if kind == "bool":
+        attr.default = bool(default)
+    elif kind in ("string", "message"):
+        attr.default = "" if kind == "string" else None
+    elif kind in ("double3", "compound"):
+        attr.default = None
+    parent_name = _flag(kwargs, "parent", "p")
+    if parent_name:
+        parent = node.attr(parent_name)
+        if parent is None:
+            raise RuntimeError(f"addAttr: no parent attribute {parent_name} on {node.name}.")
+        attr.parent = parent
+        attr.dynamic = True
+        parent.children.append(attr)
+        node.dynamic[attr.name] = attr
+        node.dynamic.setdefault(attr.short, attr)
+        if parent.kind == "double3":
+            parent.default = tuple(c.default for c in parent.children)
+        return
+    SCENE.add_attr(node, attr)
+
+
+@_command
+def deleteAttr(*args, **kwargs):
+    names = _flatten(args)
+    if _flag(kwargs, "attribute", "at"):
+        node, attribute = SCENE.find(names[0]), kwargs.get("attribute", kwargs.get("at"))
+    else:
+        node_name, _, attribute = names[0].partition(".")
+        node = SCENE.find(node_name)
+    SCENE.delete_attr(node, node.attr(attribute).name if node.attr(attribute) else attribute)
+
+
+@_command
+def attributeQuery(attribute, **kwargs):
+    node = SCENE.find(str(_flag(kwargs, "node", "n")))
+    attr = node.attr(attribute)
+    if _flag(kwargs, "exists", "ex", default=False):
+        return attr is not None
+    if attr is None:
+        raise RuntimeError(f"attributeQuery: Attribute '{attribute}' not found on {node.name}.")
+    if _flag(kwargs, "keyable", "k", default=False):
+        return attr.keyable
+    if _flag(kwargs, "listDefault", "ld", default=False):
+        if attr.children:
+            return [_to_ui(c, c.default) for c in attr.children]
+        return [_to_ui(attr, attr.default)] if isinstance(attr.default, (int, float)) else None
+    if _flag(kwargs, "attributeType", "at", default=False):
+        return {"distance": "doubleLinear", "angle": "doubleAngle", "double3": "double3"}.get(attr.kind, attr.kind)
+    if _flag(kwargs, "listChildren", "lc", default=False):
+        return [c.name for c in attr.children] or None
+    if _flag(kwargs, "listParent", "lp", default=False):
+        return [attr.parent.name] if attr.parent else None
+    if _flag(kwargs, "longName", "ln", default=False):
+        return attr.name
+    if _flag(kwargs, "shortName", "sn", default=False):
+        return attr.short
+    if _flag(kwargs, "multi", "m", default=False):
+        return attr.multi
+    if _flag(kwargs, "listEnum", "le", default=False):
+        return [":".join(attr.enum_names or ())]
+    if _flag(kwargs, "minExists", "mne", default=False):
+        return attr.minimum is not None
+    if _flag(kwargs, "maxExists", "mxe", default=False):
+        return attr.maximum is not None
+    if _flag(kwargs, "minimum", "min", default=False):
+        return [attr.minimum]
+    if _flag(kwargs, "maximum", "max", default=False):
+        return [attr.maximum]
+    raise RuntimeError("attributeQuery: flag not supported by the fake scene.")
+
+
+@_command
+def listAttr(*args, **kwargs):
+    node = _nodes(args)[0]
+    attrs = node.attributes()
+    if _flag(kwargs, "keyable", "k", default=False):
+        attrs = [a for a in attrs if a.keyable and not a.children]
+    if _flag(kwargs, "userDefined", "ud", default=False):
+        attrs = [a for a in attrs if a.dynamic]
+    if _flag(kwargs, "locked", "l", default=False):
+        attrs = [a for a in attrs if a.name in node.locked]
+    return [a.name for a in attrs] or None
+
+
+@_command
+def connectAttr(source, destination, **kwargs):
+    src, src_path = _plug(source)
+    dst, dst_path = _plug(destination)
+    if dst_path in dst.locked:
+        raise RuntimeError(f"connectAttr: The destination attribute '{destination}' is locked.")
+    SCENE.connect(src, src_path, dst, dst_path, force=_flag(kwargs, "force", "f", default=False))
+
+
+@_command
+def disconnectAttr(source, destination, **kwargs):
+    src, src_path = _plug(source)
+    dst, dst_path = _plug(destination)
+    attr = SCENE.plug_attr(dst, dst_path)
+    if attr is not None and attr.kind == "double3":
+        for src_child, dst_child in zip(SCENE.plug_attr(src, src_path).children, attr.children):
+            SCENE.disconnect(src, _child(src_path, src_child.name), dst, _child(dst_path, dst_child.name))
+        return
+    SCENE.disconnect(src, src_path, dst, dst_path)
+
+
+@_command
+def isConnected(source, destination, **kwargs):
+    src, src_path = _plug(source)
+    dst, dst_path = _plug(destination)
+    return dst.inputs.get(dst_path) == (src, src_path)
+
+
+# ---- nodes and hierarchy
+
+@_command
+def createNode(type_name, **kwargs):
+    parent = _flag(kwargs, "parent", "p")
+    node = SCENE.create_node(
+        type_name, _flag(kwargs, "name", "n"), SCENE.find(parent) if parent else None,
+    )
+    if not _flag(kwargs, "skipSelect", "ss", default=False):
+        SCENE.selection[:] = [node]
+    return _name(node)
+
+
+@_command
+def rename(*args, **kwargs):
+    names = _flatten(args)
+    if len(names) == 1:
+        if not SCENE.selection:
+            raise RuntimeError("rename: Nothing selected.")
+        node, new_name = SCENE.selection[0], names[0]
+    else:
+        node, new_name = SCENE.find(names[0]), names[1]
+    old_name = node.name
+    new_name = SCENE.rename(node, new_name.rpartition("|")[2])
+    if not _flag(kwargs, "ignoreShape", "is", default=False) and node.type.isa("transform"):
+        for child in node.children:
+            if child.type.shape and child.name.startswith(old_name + "Shape"):
+                SCENE.rename(child, new_name + "Shape" + child.name[len(old_name) + 5:])
+    return _name(node)
+
+
+def _motion_paths(node) -> list:
+    paths = []
+    for path, (src, _) in node.inputs.items():
+        if src.type.isa("motionPath") and src not in paths:
+            paths.append(src)
+    return paths
+
+
+def _constraints(node) -> list:
+    constraints = []
+    for path, (src, _) in node.inputs.items():
+        if src.has_fn("kConstraint") and src not in constraints:
+            constraints.append(src)
+    return constraints
+
+
+@_command
+def delete(*args, **kwargs):
+    names = _flatten(args)
+    nodes = _nodes(args)
+    if not nodes and not names:
+        raise RuntimeError("delete: Not enough objects or values.")
+    motion_paths = _flag(kwargs, "motionPaths", "mp", default=False)
+    constraints = _flag(kwargs, "constraints", "cn", default=False)
+    channels = _flag(kwargs, "channels", "c", default=False)
+    for node in nodes:
+        if not node.alive:
+            continue
+        if motion_paths or constraints or channels:
+            doomed = []
+            if motion_paths:
+                doomed += _motion_paths(node)
+            if constraints:
+                doomed += _constraints(node)
+            if channels:
+                doomed += [src for src, _ in node.inputs.values() if src.has_fn("kAnimCurve")]
+            for other in doomed:
+                for source, _ in list(other.inputs.values()):
+                    if source.has_fn("kAnimCurve"):
+                        SCENE.delete(source)
+                SCENE.delete(other)
+            continue
+        SCENE.delete(node)
+
+
+@_command
+def parent(*args, **kwargs):
+    names = _flatten(args)
+    world = _flag(kwargs, "world", "w", default=False)
+    relative = _flag(kwargs, "relative", "r", default=False)
+    if world:
+        children, new_parent = _nodes(names), None
+    else:
+        if len(names) < 2:
+            raise RuntimeError("parent: Not enough objects or values.")
+        children, new_parent = _nodes(names[:-1]), SCENE.find(names[-1])
+    result = []
+    for child in children:
+        world_matrix = SCENE.world_matrix(child)
+        SCENE.set_parent(child, new_parent)
+        if child.name != SCENE.unique_name(child.name, new_parent, True, ignore=child):
+            SCENE.rename(child, child.name)
+        if not relative and child.type.isa("transform"):
+            SCENE.set_world_matrix(child, world_matrix)
+        result.append(_name(child))
+    return result
+
+
+@_command
+def group(*args, **kwargs):
+    parent_name = _flag(kwargs, "parent", "p")
+    new_group = SCENE.create_node(
+        "transform", _flag(kwargs, "name", "n", default="group#"), SCENE.find(parent_name) if parent_name else None,
+    )
+    if not _flag(kwargs, "empty", "em", default=False):
+        for child in _nodes(args):
+            world_matrix = SCENE.world_matrix(child)
+            SCENE.set_parent(child, new_group)
+            SCENE.set_world_matrix(child, world_matrix)
+    SCENE.selection[:] = [new_group]
+    return _name(new_group)
+
+
+# ---- transforms
+
+def _degrees(values) -> list:
+    return [math.degrees(v) for v in values]
+
+
+@_command
+def xform(*args, **kwargs):
+    node = _nodes(args)[0]
+    world = _flag(kwargs, "worldSpace", "ws", default=False)
+    relative = _flag(kwargs, "relative", "r", default=False)
+    matrix = _flag(kwargs, "matrix", "m")
+    translation = _flag(kwargs, "translation", "t")
+    rotation = _flag(kwargs, "rotation", "ro")
+    scale = _flag(kwargs, "scale", "s")
+
+    if _flag(kwargs, "query", "q", default=False):
+        current = SCENE.world_matrix(node) if world else SCENE.local_matrix(node)
+        if matrix:
+            return list(current)
+        if translation:
+            return list(math3d.translation(current)) if world else list(SCENE.plug_value(node, "translate"))
+        if rotation:
+            return _degrees(math3d.matrix_euler(current)) if world else _degrees(SCENE.plug_value(node, "rotate"))
+        if scale:
+            return list(math3d.decompose(current)[2]) if world else list(SCENE.plug_value(node, "scale"))
+        raise RuntimeError("xform: flag not supported by the fake scene.")
+
+    if matrix is not None:
+        matrix = tuple(float(v) for v in matrix)
+        if world:
+            SCENE.set_world_matrix(node, matrix)
+        else:
+            t, r, s = math3d.decompose(matrix)
+            SCENE._set_free(node, "translate", t)
+            SCENE._set_free(node, "rotate", r)
+            SCENE._set_free(node, "scale", s)
+    if translation is not None:
+        translation = tuple(float(v) for v in translation)
+        if world:
+            current = math3d.translation(SCENE.world_matrix(node))
+            target = math3d.add(current, translation) if relative else translation
+            local = math3d.transform_point(target, math3d.inverse(SCENE.parent_world_matrix(node)))
+            SCENE._set_free(node, "translate", local)
+        else:
+            current = SCENE.plug_value(node, "translate")
+            SCENE._set_free(node, "translate", math3d.add(current, translation) if relative else translation)
+    if rotation is not None:
+        rotation = tuple(math.radians(v) for v in rotation)
+        if relative:
+            rotation = math3d.add(SCENE.plug_value(node, "rotate"), rotation)
+        if world:
+            wanted = math3d.multiply(math3d.euler_matrix(rotation), math3d.inverse(SCENE.parent_world_matrix(node)))
+            rotation = math3d.matrix_euler(wanted)
+        SCENE._set_free(node, "rotate", rotation)
+    if scale is not None:
+        scale = tuple(float(v) for v in scale)
+        if relative:
+            current = SCENE.plug_value(node, "scale")
+            scale = (current[0] * scale[0], current[1] * scale[1], current[2] * scale[2])
+        SCENE._set_free(node, "scale", scale)
+
+
+@_command
+def matchTransform(*args, **kwargs):
+    nodes = _nodes(args)
+    target, movers = nodes[-1], nodes[:-1]
+    position = _flag(kwargs, "position", "pos")
+    rotation = _flag(kwargs, "rotation", "rot")
+    scale = _flag(kwargs, "scale", "scl")
+    if position is None and rotation is None and scale is None:
+        position = rotation = scale = True
+    target_matrix = SCENE.world_matrix(target)
+    for node in movers:
+        SCENE.set_world_matrix(node, target_matrix, bool(position), bool(rotation), bool(scale))
+
+
+# ---- keys and time
+
+@_command
+def keyframe(*args, **kwargs):
+    curves = _curves(args, _flag(kwargs, "attribute", "at"))
+    ranges = _time_ranges(_flag(kwargs, "time", "t"))
+    index = _flag(kwargs, "index", "in")
+    selected = _flag(kwargs, "selected", "sl", default=False)
+
+    if _flag(kwargs, "query", "q", default=False):
+        if _flag(kwargs, "name", "n", default=False):
+            names = [SCENE.partial_path(c) for c in curves if not selected or c.data["curve"].selected]
+            return names
+        if _flag(kwargs, "keyframeCount", "kc", default=False):
+            return sum(len(_key_indices(c.data["curve"], ranges, index, selected)) for c in curves)
+        result = []
+        time_change = _flag(kwargs, "timeChange", "tc", default=False)
+        value_change = _flag(kwargs, "valueChange", "vc", default=False)
+        for curve_node in curves:
+            curve = curve_node.data["curve"]
+            attr = _curve_output_attr(curve_node)
+            for i in _key_indices(curve, ranges, index, selected):
+                if time_change:
+                    result.append(curve.times[i])
+                if value_change:
+                    result.append(_to_ui(attr, curve.values[i]))
+        return result
+
+    if not _flag(kwargs, "edit", "e", default=False) and _flag(kwargs, "valueChange", "vc") is None \
+            and _flag(kwargs, "timeChange", "tc") is None:
+        raise RuntimeError("keyframe: use query or edit flags.")
+
+    relative = _flag(kwargs, "relative", "r", default=False)
+    value_change = _flag(kwargs, "valueChange", "vc")
+    time_change = _flag(kwargs, "timeChange", "tc")
+    changed = 0
+    for curve_node in curves:
+        curve = curve_node.data["curve"]
+        attr = _curve_output_attr(curve_node)
+        indices = _key_indices(curve, ranges, index, selected)
+        if not indices:
+            continue
+        if value_change is not None:
+            delta = _from_ui(attr, value_change)
+            for i in indices:
+                curve.values[i] = curve.values[i] + delta if relative else delta
+        if time_change is not None:
+            moved = {curve.times[i]: (curve.times[i] + time_change if relative else float(time_change)) for i in indices}
+            kept = set(curve.times) - set(moved)
+            new_times = list(moved.values())
+            if len(set(new_times)) != len(new_times) or kept & set(new_times):
+                raise RuntimeError(f"keyframe: Cannot move keys of {curve_node.name}, they would overlap other keys.")
+            pairs = [(moved.get(t, t), v) for t, v in zip(curve.times, curve.values)]
+            pairs.sort(key=lambda pair: pair[0])
+            curve.selected = {moved.get(t, t) for t in curve.selected}
+            curve.times = [t for t, _ in pairs]
+            curve.values = [v for _, v in pairs]
+        changed += len(indices)
+        SCENE.curve_edited(curve_node)
+    return changed
+
+
+@_command
+def setKeyframe(*args, **kwargs):
+    names = _flatten(args) or [SCENE.partial_path(n) for n in SCENE.selection]
+    times = _flag(kwargs, "time", "t")
+    if times is None:
+        times = [SCENE.time]
+    elif isinstance(times, (int, float)):
+        times = [times]
+    else:
+        times = [t[0] if isinstance(t, tuple) else t for t in times]
+    value = _flag(kwargs, "value", "v")
+    attributes = _flatten([_flag(kwargs, "attribute", "at")]) if _flag(kwargs, "attribute", "at") else None
+
+    plugs = []
+    for name in names:
+        if "." in name:
+            plugs.append(_plug(name))
+            continue
+        node = SCENE.find(name)
+        for attr in node.attributes():
+            if attributes is not None and attr.name not in attributes and attr.short not in attributes:
+                continue
+            if attributes is None and not attr.keyable:
+                continue
+            if attr.children or attr.multi or attr.kind in ("matrix", "message", "string"):
+                continue
+            plugs.append((node, attr.name))
+
+    count = 0
+    for node, path in plugs:
+        attr = SCENE.plug_attr(node, path)
+        if path in node.locked:
+            continue
+        # without a value, the current value (a setAttr on a keyed plug included) is keyed at every time
+        key_value = _from_ui(attr, value) if value is not None else SCENE.plug_value(node, path)
+        source = SCENE.source(node, path)
+        if source is None:
+            curve_node = SCENE.create_node(_curve_type(attr), f"{node.name.rpartition(':')[2]}_{attr.name}")
+            SCENE.connect(curve_node, "output", node, path)
+        elif source[0].has_fn("kAnimCurve"):
+            curve_node = source[0]
+        else:
+            continue  # driven by something else
+        curve = curve_node.data["curve"]
+        for time in times:
+            curve.set_key(float(time), key_value)
+            count += 1
+        SCENE.curve_edited(curve_node)
+        SCENE.overrides.pop((node.uid, path), None)
+    return count
+
+
+@_command
+def cutKey(*args, **kwargs):
+    curves = _curves(args, _flag(kwargs, "attribute", "at"))
+    ranges = _time_ranges(_flag(kwargs, "time", "t"))
+    removed = 0
+    for curve_node in curves:
+        curve = curve_node.data["curve"]
+        indices = _key_indices(curve, ranges, _flag(kwargs, "index", "in"), _flag(kwargs, "selected", "sl", default=False))
+        curve.remove(indices)
+        removed += len(indices)
+        SCENE.curve_edited(curve_node)
+        if not len(curve):
+            SCENE.delete(curve_node)  # a curve left without keys is deleted, like Maya
+    return removed
+
+
+@_command
+def keyTangent(*args, **kwargs):
+    """Tangents are always linear: queried as linear, unit weight and flat angle, one value per key. Edits are ignored."""
+    if not _flag(kwargs, "query", "q", default=False):
+        return None
+    curves = _curves(args, _flag(kwargs, "attribute", "at"))
+    ranges = _time_ranges(_flag(kwargs, "time", "t"))
+    index = _flag(kwargs, "index", "in")
+    count = sum(len(_key_indices(c.data["curve"], ranges, index, False)) for c in curves)
+    if _flag(kwargs, "weightedTangents", "wt", default=False):
+        return [False] * len(curves)
+    if _flag(kwargs, "inTangentType", "itt", default=False) or _flag(kwargs, "outTangentType", "ott", default=False):
+        return ["linear"] * count
+    if _flag(kwargs, "inWeight", "iw", default=False) or _flag(kwargs, "outWeight", "ow", default=False):
+        return [1.0] * count
+    return [0.0] * count  # inAngle, outAngle
+
+
+@_command
+def selectKey(*args, **kwargs):
+    if _flag(kwargs, "clear", "cl", default=False):
+        for curve_node in SCENE.ls("animCurve"):
+            curve_node.data["curve"].selected.clear()
+        if not args:
+            return 0
+    curves = _curves(args, _flag(kwargs, "attribute", "at"))
+    ranges = _time_ranges(_flag(kwargs, "time", "t"))
+    add = _flag(kwargs, "add", default=False)
+    remove = _flag(kwargs, "remove", "rm", default=False)
+    if not add and not remove:
+        for curve_node in SCENE.ls("animCurve"):
+            curve_node.data["curve"].selected.clear()
+    count = 0
+    for curve_node in curves:
+        curve = curve_node.data["curve"]
+        times = {curve.times[i] for i in _key_indices(curve, ranges, _flag(kwargs, "index", "in"))}
+        if remove:
+            curve.selected -= times
+        else:
+            curve.selected |= times
+        count += len(times)
+    return count
+
+
+@_command
+def currentTime(*args, **kwargs):
+    if _flag(kwargs, "query", "q", default=False):
+        return SCENE.time
+    time = args[0] if args else _flag(kwargs, "edit", "e")
+    SCENE.time = float(time)
+    SCENE.overrides.clear()  # setAttr on keyed plugs only last until the time changes
+    return SCENE.time
+
+
+_PLAYBACK_FLAGS = {
+    "min": "min", "minTime": "min", "max": "max", "maxTime": "max",
+    "ast": "animationStartTime", "animationStartTime": "animationStartTime",
+    "aet": "animationEndTime", "animationEndTime": "animationEndTime",
+}
+
+
+@_command
+def playbackOptions(**kwargs):
+    query = _flag(kwargs, "query", "q", default=False)
+    for flag, value in kwargs.items():
+        key = _PLAYBACK_FLAGS.get(flag)
+        if key is None:
+            continue
+        if query:
+            return SCENE.playback[key]
+        SCENE.playback[key] = float(value)
+    return None
+
+
+@_command
+def currentUnit(**kwargs):
+    if _flag(kwargs, "query", "q", default=False):
+        if _flag(kwargs, "time", "t", default=False):
+            return SCENE.time_unit
+        if _flag(kwargs, "angle", "a", default=False):
+            return "deg"
+        return "cm"
+    time_unit = _flag(kwargs, "time", "t")
+    if time_unit:
+        if time_unit not in FPS:
+            raise RuntimeError(f"currentUnit: time unit {time_unit} not supported by the fake scene.")
+        SCENE.time_unit = time_unit
+    return None
+
+
+# ---- creation
+
+def _shape_parent(name, default):
+    transform = SCENE.create_node("transform", name or default)
+    return transform
+
+
+@_command
+def spaceLocator(*args, **kwargs):
+    transform = _shape_parent(_flag(kwargs, "name", "n"), "locator#")
+    shape = SCENE.create_node("locator", transform.name + "Shape", transform)
+    position = _flag(kwargs, "position", "p")
+    if position:
+        SCENE.set_plug(shape, "localPosition", tuple(float(v) for v in position))
+    SCENE.selection[:] = [transform]
+    return [_name(transform)]
+
+
+@_command
+def curve(*args, **kwargs):
+    points = _flag(kwargs, "point", "p")
+    if not points:
+        raise RuntimeError("curve: needs points.")
+    transform = _shape_parent(_flag(kwargs, "name", "n"), "curve#")
+    shape = SCENE.create_node("nurbsCurve", transform.name + "Shape", transform)
+    shape.data["points"] = [tuple(float(v) for v in p) for p in points]
+    shape.data["degree"] = _flag(kwargs, "degree", "d", default=3)
+    SCENE.selection[:] = [transform]
+    return _name(transform)
+
+
+def _poly(kind, name, points, faces, history_values):
+    transform = _shape_parent(name, "p" + kind[4:] + "#" if kind else "polySurface#")
+    shape = SCENE.create_node("mesh", transform.name + "Shape", transform)
+    shape.data["points"] = points
+    shape.data["faces"] = faces
+    history = SCENE.create_node(kind, kind + "#")
+    for attr_name, value in history_values.items():
+        SCENE.set_plug(history, attr_name, value)
+    SCENE.connect(history, "output", shape, "inMesh")
+    SCENE.selection[:] = [transform]
+    return [_name(transform), _name(history)]
+
+
+@_command
+def polyPlane(**kwargs):
+    width = float(_flag(kwargs, "width", "w", default=1.0))
+    height = float(_flag(kwargs, "height", "h", default=1.0))
+    sx = int(_flag(kwargs, "subdivisionsX", "sx", "subdivisionsWidth", "sw", default=10))
+    sy = int(_flag(kwargs, "subdivisionsY", "sy", "subdivisionsHeight", "sh", default=10))
+    points, faces = geometry.plane(width, height, sx, sy)
+    return _poly("polyPlane", _flag(kwargs, "name", "n"), points, faces, {
+        "width": width, "height": height, "subdivisionsWidth": sx, "subdivisionsHeight": sy,
+    })
+
+
+@_command
+def polyCube(**kwargs):
+    width = float(_flag(kwargs, "width", "w", default=1.0))
+    height = float(_flag(kwargs, "height", "h", default=1.0))
+    depth = float(_flag(kwargs, "depth", "d", default=1.0))
+    points, faces = geometry.cube(width, height, depth)
+    return _poly("polyCube", _flag(kwargs, "name", "n"), points, faces, {
+        "width": width, "height": height, "depth": depth,
+    })
+
+
+@_command
+def pathAnimation(*args, **kwargs):
+    nodes = _nodes(args)
+    curve_name = _flag(kwargs, "curve", "c")
+    curve_node = SCENE.find(curve_name)
+    if curve_node.type.isa("transform"):
+        shapes = [c for c in curve_node.children if c.type.isa("nurbsCurve")]
+        if not shapes:
+            raise RuntimeError(f"pathAnimation: {curve_name} is not a curve.")
+        curve_node = shapes[0]
+    fraction_mode = _flag(kwargs, "fractionMode", "fm", default=False)
+    start_u = float(_flag(kwargs, "startU", "su", default=0.0))
+    end_u = float(_flag(kwargs, "endU", "eu", default=1.0 if fraction_mode else len(curve_node.data["points"]) - 1))
+    start_time = float(_flag(kwargs, "startTimeU", "stu", default=SCENE.playback["min"]))
+    end_time = float(_flag(kwargs, "endTimeU", "etu", default=SCENE.playback["max"]))
+
+    motion_path = SCENE.create_node("motionPath", _flag(kwargs, "name", "n", default="motionPath#"))
+    SCENE.set_plug(motion_path, "fractionMode", fraction_mode)
+    SCENE.set_plug(motion_path, "follow", _flag(kwargs, "follow", "f", default=False))
+    SCENE.connect(curve_node, "worldSpace[0]", motion_path, "geometryPath")
+    u_curve = SCENE.create_node("animCurveTU", motion_path.name + "_uValue")
+    u_curve.data["curve"].set_key(start_time, start_u)
+    u_curve.data["curve"].set_key(end_time, end_u)
+    SCENE.connect(u_curve, "output", motion_path, "uValue")
+    for node in nodes:
+        SCENE.connect(motion_path, "allCoordinates", node, "translate", force=True)
+    return _name(motion_path)
+
+
+def _constraint(constraint_type, args, kwargs):
+    names = _flatten(args)
+    if _flag(kwargs, "query", "q", default=False):
+        constraint = SCENE.find(names[-1])
+        indices = constraint.element_indices("target")
+        if _flag(kwargs, "targetList", "tl", default=False):
+            return [
+                SCENE.partial_path(constraint.inputs[f"target[{i}].targetParentMatrix"][0])
+                for i in indices if f"target[{i}].targetParentMatrix" in constraint.inputs
+            ]
+        if _flag(kwargs, "weightAliasList", "wal", default=False):
+            return [
+                constraint.inputs[f"target[{i}].targetWeight"][1]
+                for i in indices if f"target[{i}].targetWeight" in constraint.inputs
+            ]
+        raise RuntimeError(f"{constraint_type}: query flag not supported by the fake scene.")
+
+    if _flag(kwargs, "edit", "e", default=False):
+        constraint = SCENE.find(names[-1])
+        weight = _flag(kwargs, "weight", "w")
+        for target in _nodes(names[:-1], selection=False):
+            for i in constraint.element_indices("target"):
+                source = constraint.inputs.get(f"target[{i}].targetParentMatrix")
+                if source is not None and source[0] is target and weight is not None:
+                    weight_source = constraint.inputs[f"target[{i}].targetWeight"]
+                    SCENE.set_plug(weight_source[0], weight_source[1], float(weight))
+        return [SCENE.partial_path(constraint)]
+
+    if len(names) < 2:
+        names = [SCENE.partial_path(n) for n in SCENE.selection]
+    if len(names) < 2:
+        raise RuntimeError(f"{constraint_type}: needs at least a target and an object to constrain.")
+    targets = [SCENE.find(n) for n in names[:-1]]
+    driven = SCENE.find(names[-1])
+    weight = float(_flag(kwargs, "weight", "w", default=1.0))
+
+    constraint = next((c for c in driven.children if c.type.name == constraint_type), None)
+    if constraint is None:
+        constraint = SCENE.create_node(
+            constraint_type, _flag(kwargs, "name", "n", default=f"{driven.name.rpartition(':')[2]}_{constraint_type}1"),
+            driven,
+        )
+        for channel in _CONSTRAINT_OUTPUTS[constraint_type]:
+            skip = _flatten([_flag(kwargs, *_SKIP_FLAGS[channel], default=[])])
+            output = "constraint" + channel.capitalize()
+            if constraint_type == "poleVectorConstraint" and driven.attr("poleVector") is not None:
+                SCENE.connect(constraint, output, driven, "poleVector")
+                continue
+            for axis, child in zip("xyz", driven.attr(channel).children):
+                if axis in skip or "all" in skip:
+                    continue
+                SCENE.connect(constraint, output + axis.upper(), driven, child.name)
+        if driven.dag:
+            SCENE.connect(driven, "parentInverseMatrix[0]", constraint, "constraintParentInverseMatrix")
+        up_object = _flag(kwargs, "worldUpObject", "wuo")
+        if up_object and constraint.attr("worldUpMatrix") is not None:
+            SCENE.connect(SCENE.find(up_object), "worldMatrix[0]", constraint, "worldUpMatrix")
+            SCENE.set_plug(constraint, "worldUpType", 1)
+
+    for target in targets:
+        index = max(constraint.element_indices("target"), default=-1) + 1
+        element = f"target[{index}]"
+        if constraint.attr("targetParentMatrix") is not None:
+            SCENE.connect(target, "parentMatrix[0]", constraint, f"{element}.targetParentMatrix")
+            for channel in ("translate", "rotate", "scale"):
+                if target.attr(channel) is not None:
+                    SCENE.connect(target, channel, constraint, f"{element}.target{channel.capitalize()}")
+        else:
+            shape = next((c for c in target.children if c.type.shape), target)
+            SCENE.connect(shape, "worldMesh[0]", constraint, f"{element}.targetGeometry")
+        alias = f"{target.name.rpartition(':')[2]}W{index}"
+        SCENE.add_attr(constraint, _Attr(alias, alias, "double", 1.0, keyable=True, minimum=0.0))
+        SCENE.set_plug(constraint, alias, weight)
+        SCENE.connect(constraint, alias, constraint, f"{element}.targetWeight")
+    return [SCENE.partial_path(constraint)]
+
+
+def _constraint_command(constraint_type):
+    def constraint_command(*args, **kwargs):
+        return _constraint(constraint_type, args, kwargs)
+
+    constraint_command.__name__ = constraint_type
+    constraint_command.__doc__ = f"Fake {constraint_type} command, offsets are ignored by the evaluation."
+    return _command(constraint_command)
+
+
+parentConstraint = _constraint_command("parentConstraint")
+pointConstraint = _constraint_command("pointConstraint")
+orientConstraint = _constraint_command("orientConstraint")
+scaleConstraint = _constraint_command("scaleConstraint")
+aimConstraint = _constraint_command("aimConstraint")
+poleVectorConstraint = _constraint_command("poleVectorConstraint")
+geometryConstraint = _constraint_command("geometryConstraint")
+normalConstraint = _constraint_command("normalConstraint")
+tangentConstraint = _constraint_command("tangentConstraint")
+
+
+@_command
+def sets(*args, **kwargs):
+    if _flag(kwargs, "query", "q", default=False):
+        object_set = SCENE.find(_flatten(args)[0])
+        return [SCENE.partial_path(m) for m in object_set.data.get("members", [])] or None
+    add_to = _flag(kwargs, "addElement", "add", "include", "in")
+    if add_to:
+        object_set = SCENE.find(add_to)
+        object_set.data.setdefault("members", []).extend(_nodes(args, selection=False))
+        return None
+    members = [] if _flag(kwargs, "empty", "em", default=False) else _nodes(args)
+    object_set = SCENE.create_node("objectSet", _flag(kwargs, "name", "n", default="set#"))
+    object_set.data["members"] = list(members)
+    return _name(object_set)
+
+
+@_command
+def namespace(*args, **kwargs):
+    exists = _flag(kwargs, "exists", "ex")
+    if exists is not None:
+        name = str(exists).strip(":")
+        return name in SCENE.namespaces or any(n.startswith(name + ":") for n in SCENE.by_name)
+    add = _flag(kwargs, "add", "addNamespace")
+    if add:
+        SCENE.namespaces.add(str(add).strip(":"))
+        return add
+    raise RuntimeError("namespace: flag not supported by the fake scene.")
+
+
+# ---- session state
+
+@_command
+def undoInfo(*args, **kwargs):
+    if _flag(kwargs, "query", "q", default=False):
+        if _flag(kwargs, "state", "st", default=False):
+            return True
+        if _flag(kwargs, "undoName", "un", default=False):
+            return SCENE.chunk_names[-1] if SCENE.chunk_names else ""
+        return None
+    if _flag(kwargs, "openChunk", "ock", default=False):
+        SCENE.chunk_depth += 1
+        SCENE.chunk_names.append(_flag(kwargs, "chunkName", "cn", default=""))
+    elif _flag(kwargs, "closeChunk", "cck", default=False):
+        if SCENE.chunk_depth == 0:
+            raise RuntimeError("undoInfo: no chunk to close.")
+        SCENE.chunk_depth -= 1
+    return None
+
+
+@_command
+def undo(*args, **kwargs):
+    if not SCENE.undo_queue:
+        SCENE.warnings.append("There are no more commands to undo.")
+        return
+    entry = SCENE.undo_queue.pop()
+    entry.undoIt()
+    SCENE.redo_queue.append(entry)
+    SCENE.emit("event", "Undo")
+
+
+@_command
+def redo(*args, **kwargs):
+    if not SCENE.redo_queue:
+        SCENE.warnings.append("There are no more commands to redo.")
+        return
+    entry = SCENE.redo_queue.pop()
+    entry.redoIt()
+    SCENE.undo_queue.append(entry)
+    SCENE.emit("event", "Redo")
+
+
+@_command
+def autoKeyframe(**kwargs):
+    if _flag(kwargs, "query", "q", default=False):
+        return SCENE.autokey
+    state = _flag(kwargs, "state", "st")
+    if state is not None:
+        SCENE.autokey = bool(state)
+    return None
+
+
+@_command
+def evaluationManager(**kwargs):
+    if _flag(kwargs, "query", "q", default=False):
+        if _flag(kwargs, "idleBuild", default=False):
+            return SCENE.idle_build
+        if _flag(kwargs, "mode", default=False):
+            return ["parallel"]
+        return None
+    idle_build = _flag(kwargs, "idleBuild")
+    if idle_build is not None:
+        SCENE.idle_build = bool(idle_build)
+    return None
+
+
+@_command
+def refresh(**kwargs):
+    suspend = _flag(kwargs, "suspend", "su")
+    if suspend is not None:
+        SCENE.refresh_suspended = bool(suspend)
+
+
+@_command
+def about(**kwargs):
+    if _flag(kwargs, "batch", "b", default=False):
+        return SCENE.batch
+    if _flag(kwargs, "version", "v", default=False):
+        return "fake"
+    if _flag(kwargs, "apiVersion", "api", default=False):
+        return 20240000
+    return None
+
+
+@_command
+def warning(*args, **kwargs):
+    SCENE.warnings.append(" ".join(str(a) for a in args))
+
+
+@_command
+def error(*args, **kwargs):
+    raise RuntimeError(" ".join(str(a) for a in args))
+
+
+@_command
+def inViewMessage(**kwargs):
+    SCENE.messages.append(_flag(kwargs, "message", "msg", "assistMessage", "amg", default=""))
+
+
+@_command
+def channelBox(*args, **kwargs):
+    if _flag(kwargs, "query", "q", default=False):
+        if _flag(kwargs, "selectedMainAttributes", "sma", default=False):
+            return SCENE.channel_box_selection
+        return None
+    if "select" in kwargs or "s" in kwargs:
+        selection = _flag(kwargs, "select", "s")
+        SCENE.channel_box_selection = None if selection is None else _flatten([selection])
+    return None
+
+
+@_command
+def loadPlugin(path, **kwargs):
+    """Imports the plugin file as its own module, like Maya, and runs its initializePlugin."""
+    from . import openmaya
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name in SCENE.plugins:
+        return [name]
+    spec = importlib.util.spec_from_file_location(f"_fakeMayaPlugin_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.initializePlugin(openmaya.MObject())
+    SCENE.plugins[name] = module
+    return [name]
+
+
+@_command
+def pluginInfo(name, **kwargs):
+    if _flag(kwargs, "query", "q", default=False) and _flag(kwargs, "loaded", "l", default=False):
+        return os.path.splitext(os.path.basename(name))[0] in SCENE.plugins
+    return None
+
+
+@_command
+def evalDeferred(*args, **kwargs):
+    if _flag(kwargs, "lowestPriority", "low", default=False) or not kwargs:
+        SCENE.deferred.append(args[0])
+    else:
+        SCENE.deferred.insert(0, args[0])
+
+
+@_command
+def flushIdleQueue(**kwargs):
+    return SCENE.flush_deferred()
+
+
+@_command
+def file(*args, **kwargs):
+    if _flag(kwargs, "query", "q", default=False):
+        if _flag(kwargs, "sceneName", "sn", default=False):
+            return SCENE.file_name
+        return None
+    if _flag(kwargs, "new", "f", default=False):
+        SCENE.clear()
+        return "untitled"
+    rename_to = _flag(kwargs, "rename", "rn")
+    if rename_to:
+        SCENE.file_name = rename_to
+        return rename_to
+    raise RuntimeError("file: only new, rename and query sceneName are supported by the fake scene.")
+
+
+# ---- UI, a registry of controls and their flags
+
+def _control(kind):
+    def control(*args, **kwargs):
+        name = str(args[0]) if args else None
+        flags = {_UI_ALIASES.get(k, k): v for k, v in kwargs.items()}
+        query = flags.pop("query", flags.pop("q", False))
+        edit = flags.pop("edit", flags.pop("e", False))
+        if flags.pop("exists", False):
+            return name in SCENE.ui
+        if query:
+            if name not in SCENE.ui:
+                raise RuntimeError(f"{kind}: Object '{name}' not found.")
+            for flag in flags:
+                return SCENE.ui[name].get(flag)
+            return None
+        if edit:
+            if name not in SCENE.ui:
+                raise RuntimeError(f"{kind}: Object '{name}' not found.")
+            SCENE.ui[name].update(flags)
+            return name
+        if name is None or name in SCENE.ui:
+            name = f"{kind}{next(SCENE.ui_counter)}"
+        flags["kind"] = kind
+        SCENE.ui[name] = flags
+        return name
+
+    control.__name__ = kind
+    control.__doc__ = f"Fake {kind}, the flags are stored and returned by queries."
+    return _command(control)
+
+
+window = _control("window")
+columnLayout = _control("columnLayout")
+rowLayout = _control("rowLayout")
+rowColumnLayout = _control("rowColumnLayout")
+frameLayout = _control("frameLayout")
+formLayout = _control("formLayout")
+button = _control("button")
+separator = _control("separator")
+text = _control("text")
+textField = _control("textField")
+textFieldButtonGrp = _control("textFieldButtonGrp")
+intSliderGrp = _control("intSliderGrp")
+floatSliderGrp = _control("floatSliderGrp")
+floatFieldGrp = _control("floatFieldGrp")
+floatField = _control("floatField")
+intField = _control("intField")
+checkBox = _control("checkBox")
+optionMenu = _control("optionMenu")
+menuItem = _control("menuItem")
+
+
+@_command
+def deleteUI(*args, **kwargs):
+    for name in _flatten(args):
+        if SCENE.ui.pop(name, None) is None:
+            raise RuntimeError(f"deleteUI: Object '{name}' not found.")
+
+
+@_command
+def showWindow(*args, **kwargs):
+    return args[0] if args else None
+
+
+@_command
+def setParent(*args, **kwargs):
+    return args[0] if args else None
+
+
+@_command
+def promptDialog(*args, **kwargs):
+    if _flag(kwargs, "query", "q", default=False):
+        return SCENE.prompt_text
+    return SCENE.prompt_button
@@ -0,0 +1,76 @@
+"""
+Mesh data of the fake scene: the polyPlane and polyCube primitives, ray intersection and face normals.
+
+A mesh is stored on its shape node, node.data["points"] (object space) and node.data["faces"] (lists of point indices,
+counter clockwise seen from the side the normal points to). Faces are split in triangles for the ray tests only.
+"""
+
+from . import math3d
+
+
+def plane(width=1.0, height=1.0, subdivisions_x=10, subdivisions_y=10) -> tuple:
+    """(points, faces) of a plane in XZ centred on the origin, normals +Y, like cm.polyPlane."""
+    points = []
+    for j in range(subdivisions_y + 1):
+        z = height * (0.5 - j / subdivisions_y)
+        for i in range(subdivisions_x + 1):
+            points.append((width * (i / subdivisions_x - 0.5), 0.0, z))
+    row = subdivisions_x + 1
+    faces = []
+    for j in range(subdivisions_y):
+        for i in range(subdivisions_x):
+            a = j * row + i
+            faces.append([a, a + 1, a + 1 + row, a + row])
+    return points, orient(points, faces, lambda centre: (0.0, 1.0, 0.0))
+
+
+def cube(width=1.0, height=1.0, depth=1.0) -> tuple:
+    """(points, faces) of a box centred on the origin, normals facing out, like cm.polyCube."""
+    x, y, z = width / 2.0, height / 2.0, depth / 2.0
+    points = [
+        (-x, -y, z), (x, -y, z), (-x, y, z), (x, y, z),
+        (-x, y, -z), (x, y, -z), (-x, -y, -z), (x, -y, -z),
+    ]
+    faces = [[0, 1, 3, 2], [2, 3, 5, 4], [4, 5, 7, 6], [6, 7, 1, 0], [1, 7, 5, 3], [6, 0, 2, 4]]
+    return points, orient(points, faces, lambda centre: centre)
+
+
+def orient(points, faces, outside) -> list:
+    """faces, each reversed when its normal doesn't point to outside(face centre)."""
+    oriented = []
+    for face in faces:
+        face_points = [points[i] for i in face]
+        centre = math3d.scale(
+            (sum(p[0] for p in face_points), sum(p[1] for p in face_points), sum(p[2] for p in face_points)),
+            1.0 / len(face_points),
+        )
+        if math3d.dot(math3d.polygon_normal(face_points), outside(centre)) < 0.0:
+            face = list(reversed(face))
+        oriented.append(list(face))
+    return oriented
+
+
+def world_points(scene, shape) -> list:
+    matrix = scene.world_matrix(shape)
+    return [math3d.transform_point(p, matrix) for p in shape.data.get("points", ())]
+
+
+def intersect(scene, shape, origin, direction) -> list:
+    """(distance, world point, face id) of every face hit by the ray, sorted by distance. World space."""
+    points = world_points(scene, shape)
+    direction = math3d.normalize(direction)
+    hits = []
+    for face_id, face in enumerate(shape.data.get("faces", ())):
+        for k in range(1, len(face) - 1):
+            distance = math3d.ray_triangle(origin, direction, points[face[0]], points[face[k]], points[face[k + 1]])
+            if distance is not None:
+                hits.append((distance, math3d.add(origin, math3d.scale(direction, distance)), face_id))
+                break
+    hits.sort(key=lambda hit: hit[0])
+    return hits
+
+
+def face_normal(scene, shape, face_id, world=True) -> tuple:
+    face = shape.data["faces"][face_id]
+    points = world_points(scene, shape) if world else shape.data["points"]
+    return math3d.polygon_normal([points[i] for i in face])
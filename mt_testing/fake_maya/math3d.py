@@ -0,0 +1,242 @@
+"""
+Vector, matrix and quaternion maths of the fake scene, pure python.
+
+Maya conventions: row vectors, matrices as 16 floats in row order (what cm.xform(q=True, matrix=True) returns),
+translation in the last row, world = local * parent world. Rotations are radians, rotate order xyz.
+A quaternion is (x, y, z, w), and q1 * q2 rotates by q1 then by q2, like MQuaternion.
+"""
+
+import math
+
+IDENTITY = (
+    1.0, 0.0, 0.0, 0.0,
+    0.0, 1.0, 0.0, 0.0,
+    0.0, 0.0, 1.0, 0.0,
+    0.0, 0.0, 0.0, 1.0,
+)
+EPSILON = 1e-10
+
+
+# ---- vectors
+
+def add(a, b):
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+
+def sub(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def scale(a, s):
+    return (a[0] * s, a[1] * s, a[2] * s)
+
+
+def dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def length(a):
+    return math.sqrt(dot(a, a))
+
+
+def normalize(a):
+    size = length(a)
+    if size < EPSILON:
+        return (0.0, 0.0, 0.0)
+    return (a[0] / size, a[1] / size, a[2] / size)
+
+
+# ---- matrices
+
+def multiply(a, b):
+    """a * b, both 16 floats."""
+    return tuple(
+        a[row * 4] * b[col] + a[row * 4 + 1] * b[4 + col] + a[row * 4 + 2] * b[8 + col] + a[row * 4 + 3] * b[12 + col]
+        for row in range(4)
+        for col in range(4)
+    )
+
+
+def inverse(m):
+    """Inverse of a 4x4 matrix, Gauss-Jordan with partial pivoting. Raises ValueError when singular."""
+    rows = [list(m[i * 4:i * 4 + 4]) + [1.0 if i == j else 0.0 for j in range(4)] for i in range(4)]
+    for col in range(4):
+        pivot = max(range(col, 4), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < EPSILON:
+            raise ValueError("Singular matrix.")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        factor = rows[col][col]
+        rows[col] = [v / factor for v in rows[col]]
+        for r in range(4):
+            if r != col and rows[r][col]:
+                factor = rows[r][col]
+                rows[r] = [v - factor * p for v, p in zip(rows[r], rows[col])]
+    return tuple(v for row in rows for v in row[4:])
+
+
+def transform_point(p, m):
+    """p * m, p a point (w = 1)."""
+    return (
+        p[0] * m[0] + p[1] * m[4] + p[2] * m[8] + m[12],
+        p[0] * m[1] + p[1] * m[5] + p[2] * m[9] + m[13],
+        p[0] * m[2] + p[1] * m[6] + p[2] * m[10] + m[14],
+    )
+
+
+def transform_vector(v, m):
+    """v * m, v a direction (w = 0)."""
+    return (
+        v[0] * m[0] + v[1] * m[4] + v[2] * m[8],
+        v[0] * m[1] + v[1] * m[5] + v[2] * m[9],
+        v[0] * m[2] + v[1] * m[6] + v[2] * m[10],
+    )
+
+
+def translation(m):
+    return (m[12], m[13], m[14])
+
+
+def euler_matrix(r):
+    """Rotation matrix of the euler angles r (radians, xyz order): Rx * Ry * Rz."""
+    cx, sx = math.cos(r[0]), math.sin(r[0])
+    cy, sy = math.cos(r[1]), math.sin(r[1])
+    cz, sz = math.cos(r[2]), math.sin(r[2])
+    return (
+        cy * cz, cy * sz, -sy, 0.0,
+        sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy, 0.0,
+        cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy, 0.0,
+        0.0, 0.0, 0.0, 1.0,
+    )
+
+
+def matrix_euler(m):
+    """Euler angles (radians, xyz order) of the rotation part of m, scale removed."""
+    rows = [normalize(m[i * 4:i * 4 + 3]) for i in range(3)]
+    sy = max(-1.0, min(1.0, -rows[0][2]))
+    ry = math.asin(sy)
+    if abs(math.cos(ry)) > 1e-6:
+        rx = math.atan2(rows[1][2], rows[2][2])
+        rz = math.atan2(rows[0][1], rows[0][0])
+    else:  # gimbal lock, z folded into x
+        rx = math.atan2(-rows[2][1], rows[1][1])
+        rz = 0.0
+    return (rx, ry, rz)
+
+
+def compose(t=(0.0, 0.0, 0.0), r=(0.0, 0.0, 0.0), s=(1.0, 1.0, 1.0), joint_orient=None):
+    """Local matrix of a transform: scale * rotate * joint orient * translate."""
+    m = (
+        s[0], 0.0, 0.0, 0.0,
+        0.0, s[1], 0.0, 0.0,
+        0.0, 0.0, s[2], 0.0,
+        0.0, 0.0, 0.0, 1.0,
+    )
+    m = multiply(m, euler_matrix(r))
+    if joint_orient is not None and any(joint_orient):
+        m = multiply(m, euler_matrix(joint_orient))
+    return m[:12] + (t[0], t[1], t[2], 1.0)
+
+
+def decompose(m):
+    """(translate, rotate, scale) of m, rotate in radians, xyz order. Shear is lost."""
+    s = tuple(length(m[i * 4:i * 4 + 3]) for i in range(3))
+    return translation(m), matrix_euler(m), s
+
+
+# ---- quaternions
+
+def quaternion_matrix(q):
+    x, y, z, w = q
+    return (
+        1 - 2 * (y * y + z * z), 2 * (x * y + z * w), 2 * (x * z - y * w), 0.0,
+        2 * (x * y - z * w), 1 - 2 * (x * x + z * z), 2 * (y * z + x * w), 0.0,
+        2 * (x * z + y * w), 2 * (y * z - x * w), 1 - 2 * (x * x + y * y), 0.0,
+        0.0, 0.0, 0.0, 1.0,
+    )
+
+
+def matrix_quaternion(m):
+    rows = [normalize(m[i * 4:i * 4 + 3]) for i in range(3)]
+    trace = rows[0][0] + rows[1][1] + rows[2][2]
+    if trace > 0:
+        s = math.sqrt(trace + 1.0) * 2
+        q = ((rows[1][2] - rows[2][1]) / s, (rows[2][0] - rows[0][2]) / s, (rows[0][1] - rows[1][0]) / s, 0.25 * s)
+    elif rows[0][0] > rows[1][1] and rows[0][0] > rows[2][2]:
+        s = math.sqrt(1.0 + rows[0][0] - rows[1][1] - rows[2][2]) * 2
+        q = (0.25 * s, (rows[1][0] + rows[0][1]) / s, (rows[2][0] + rows[0][2]) / s, (rows[1][2] - rows[2][1]) / s)
+    elif rows[1][1] > rows[2][2]:
+        s = math.sqrt(1.0 + rows[1][1] - rows[0][0] - rows[2][2]) * 2
+        q = ((rows[1][0] + rows[0][1]) / s, 0.25 * s, (rows[2][1] + rows[1][2]) / s, (rows[2][0] - rows[0][2]) / s)
+    else:
+        s = math.sqrt(1.0 + rows[2][2] - rows[0][0] - rows[1][1]) * 2
+        q = ((rows[2][0] + rows[0][2]) / s, (rows[2][1] + rows[1][2]) / s, 0.25 * s, (rows[0][1] - rows[1][0]) / s)
+    return q
+
+
+def quaternion_multiply(a, b):
+    """Rotation by a then by b (Hamilton product b a)."""
+    ax, ay, az, aw = b
+    bx, by, bz, bw = a
+    return (
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+        aw * bw - ax * bx - ay * by - az * bz,
+    )
+
+
+def quaternion_between(a, b):
+    """Shortest rotation taking direction a to direction b."""
+    a, b = normalize(a), normalize(b)
+    d = dot(a, b)
+    if d > 1.0 - EPSILON:
+        return (0.0, 0.0, 0.0, 1.0)
+    if d < -1.0 + EPSILON:
+        axis = cross((1.0, 0.0, 0.0), a)
+        if length(axis) < EPSILON:
+            axis = cross((0.0, 1.0, 0.0), a)
+        axis = normalize(axis)
+        return (axis[0], axis[1], axis[2], 0.0)
+    axis = cross(a, b)
+    w = 1.0 + d
+    size = math.sqrt(dot(axis, axis) + w * w)
+    return (axis[0] / size, axis[1] / size, axis[2] / size, w / size)
+
+
+# ---- geometry
+
+def ray_triangle(origin, direction, a, b, c):
+    """Distance along direction from origin to the triangle abc (both sides), None when missed. Moller-Trumbore."""
+    edge1 = sub(b, a)
+    edge2 = sub(c, a)
+    p = cross(direction, edge2)
+    det = dot(edge1, p)
+    if abs(det) < EPSILON:
+        return None
+    inv = 1.0 / det
+    offset = sub(origin, a)
+    u = dot(offset, p) * inv
+    if u < -EPSILON or u > 1.0 + EPSILON:
+        return None
+    q = cross(offset, edge1)
+    v = dot(direction, q) * inv
+    if v < -EPSILON or u + v > 1.0 + EPSILON:
+        return None
+    distance = dot(edge2, q) * inv
+    return distance if distance >= 0.0 else None
+
+
+def polygon_normal(points):
+    """Normal of a planar polygon, counter clockwise winding facing the normal (Newell's method)."""
+    n = [0.0, 0.0, 0.0]
+    count = len(points)
+    for i in range(count):
+        cur, nxt = points[i], points[(i + 1) % count]
+        n[0] += (cur[1] - nxt[1]) * (cur[2] + nxt[2])
+        n[1] += (cur[2] - nxt[2]) * (cur[0] + nxt[0])
+        n[2] += (cur[0] - nxt[0]) * (cur[1] + nxt[1])
+    return normalize(n)
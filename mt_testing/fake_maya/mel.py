@@ -0,0 +1,86 @@
+"""
+Fake maya.mel: global variable reads ($temp=$gChannelBoxName) and plain command statements,
+'parentConstraint -n "c" -mo "a" "b";', run by the fake cmds. No procedures, expressions or control flow.
+"""
+
+import re
+import shlex
+
+from . import cmds
+from .scene import CALLS, SCENE
+
+_ASSIGNMENT = re.compile(r"^\s*(?:string\s+)?\$\w+\s*=\s*(\$\w+)\s*;?\s*$")
+_NUMBER = re.compile(r"^-?(\d+\.?\d*|\.\d+)(e-?\d+)?$")
+
+# flags taking no value, the others take the next token
+_BOOLEAN_FLAGS = {
+    "e", "edit", "q", "query", "mo", "maintainOffset", "r", "relative", "a", "absolute", "ws", "worldSpace",
+    "os", "objectSpace", "tl", "targetList", "wal", "weightAliasList", "rm", "remove", "l", "lock", "k", "keyable",
+    "f", "force", "cl", "clear", "add", "tgl", "toggle", "d", "deselect", "ne", "noExpand", "em", "empty",
+}
+
+
+def _value(token):
+    if _NUMBER.match(token):
+        return float(token) if any(c in token for c in ".e") else int(token)
+    return token
+
+
+def _statements(source) -> list:
+    lexer = shlex.shlex(source, posix=True, punctuation_chars=";")
+    lexer.whitespace_split = True
+    statement = []
+    statements = []
+    for token in lexer:
+        if token == ";":
+            if statement:
+                statements.append(statement)
+            statement = []
+        else:
+            statement.append(token)
+    if statement:
+        statements.append(statement)
+    return statements
+
+
+def _run(tokens):
+    name, tokens = tokens[0], tokens[1:]
+    function = getattr(cmds, name, None)
+    if function is None or name.startswith("_"):
+        raise RuntimeError(f'Cannot find procedure "{name}".')
+    args = []
+    kwargs = {}
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token.startswith("-") and not _NUMBER.match(token):
+            flag = token[1:]
+            if flag in _BOOLEAN_FLAGS:
+                value = True
+            else:
+                i += 1
+                value = _value(tokens[i])
+            if flag in kwargs:  # repeated flags, -skip x -skip y
+                previous = kwargs[flag]
+                kwargs[flag] = (previous if isinstance(previous, list) else [previous]) + [value]
+            else:
+                kwargs[flag] = value
+        else:
+            args.append(_value(token))
+        i += 1
+    return function(*args, **kwargs)
+
+
+def eval(source):
+    """Run source, returns the result of its last statement."""
+    CALLS["mel.eval"] += 1
+    assignment = _ASSIGNMENT.match(source)
+    if assignment:
+        variable = assignment.group(1)
+        if variable not in SCENE.mel_globals:
+            raise RuntimeError(f'"{variable}" is an undeclared variable.')
+        return SCENE.mel_globals[variable]
+    result = None
+    for statement in _statements(source):
+        result = _run(statement)
+    return result
@@ -0,0 +1,1647 @@
+"""
+Fake maya.api.OpenMaya, on the in-memory scene.
+
+The subset the tools use: MObject / MObjectHandle / MSelectionList, the node, dag and attribute function sets, MPlug,
+the unit and maths types, MDGModifier / MDagModifier, MPxCommand and MFnPlugin (plugin commands end up in the fake
+cmds), MItDependencyNodes, MNamespace, MDGContext and the message callbacks.
+Plug values are in internal units (cm, radians), like the real API. Constructions are counted as "om2.<class>".
+"""
+
+import math
+
+from . import math3d
+from . import scene as _scene
+from .scene import CALLS, SCENE
+
+
+def _counted(cls):
+    """Counts the constructions of an API class and of its subclasses, by class name."""
+    init = cls.__init__
+
+    def __init__(self, *args, **kwargs):
+        CALLS["om2." + type(self).__name__] += 1
+        init(self, *args, **kwargs)
+
+    __init__.__doc__ = init.__doc__
+    cls.__init__ = __init__
+    return cls
+
+
+class MFn:
+    kInvalid = 0
+    kBase = 1
+    kNamedObject = 2
+    kDependencyNode = 4
+    kDagNode = 107
+    kTransform = 110
+    kJoint = 121
+    kShape = 248
+    kLocator = 281
+    kMesh = 296
+    kNurbsCurve = 267
+    kCamera = 250
+    kAnimCurve = 7
+    kMotionPath = 440
+    kSet = 464
+    kCharacter = 680
+    kPolyCreator = 403
+    kConstraint = 917
+    kParentConstraint = 242
+    kPointConstraint = 240
+    kOrientConstraint = 239
+    kScaleConstraint = 244
+    kAimConstraint = 111
+    kPoleVectorConstraint = 243
+    kAttribute = 558
+    kNumericAttribute = 565
+    kUnitAttribute = 566
+    kEnumAttribute = 567
+    kCompoundAttribute = 568
+    kTypedAttribute = 569
+    kMatrixAttribute = 570
+    kMessageAttribute = 571
+    kAttribute3Double = 573
+    kMatrixData = 586
+
+
+_FN_NAMES = {value: name for name, value in vars(MFn).items() if name.startswith("k")}
+_COMMON_FNS = frozenset({"kBase", "kNamedObject", "kDependencyNode"})
+
+
+def _attribute_fns(attr) -> frozenset:
+    fns = {"kBase", "kAttribute"}
+    if attr.kind in _scene.Attr.NUMERIC:
+        fns.add("kNumericAttribute")
+    elif attr.kind in _scene.Attr.UNIT:
+        fns.add("kUnitAttribute")
+    elif attr.kind == "enum":
+        fns.add("kEnumAttribute")
+    elif attr.kind == "double3":
+        fns |= {"kNumericAttribute", "kCompoundAttribute", "kAttribute3Double"}
+    elif attr.kind == "compound":
+        fns.add("kCompoundAttribute")
+    elif attr.kind == "matrix":
+        fns |= {"kMatrixAttribute", "kTypedAttribute"}
+    elif attr.kind == "message":
+        fns.add("kMessageAttribute")
+    else:
+        fns.add("kTypedAttribute")
+    return frozenset(fns)
+
+
+class MObject:
+    """A node, or an attribute of a node type when attr is set. Null when neither."""
+
+    kNullObj = None  # set below
+
+    __slots__ = ("_node", "_attr")
+
+    def __init__(self, other=None):
+        if isinstance(other, MObject):
+            self._node, self._attr = other._node, other._attr
+        else:
+            self._node, self._attr = None, None
+
+    @classmethod
+    def _of(cls, node=None, attr=None):
+        obj = cls.__new__(cls)
+        obj._node, obj._attr = node, attr
+        return obj
+
+    def isNull(self) -> bool:
+        return self._node is None and self._attr is None
+
+    def hasFn(self, fn) -> bool:
+        name = _FN_NAMES.get(fn)
+        if self._attr is not None:
+            return name in _attribute_fns(self._attr)
+        if self._node is None:
+            return False
+        return name in _COMMON_FNS or name in self._node.type.fns
+
+    def apiType(self) -> int:
+        if self._attr is not None:
+            fns = _attribute_fns(self._attr)
+            return next((v for v, n in _FN_NAMES.items() if n in fns and n not in ("kBase", "kAttribute")), MFn.kAttribute)
+        if self._node is None:
+            return MFn.kInvalid
+        specific = [getattr(MFn, fn) for fn in self._node.type.fns if hasattr(MFn, fn)]
+        return max(specific) if specific else MFn.kDependencyNode
+
+    @property
+    def apiTypeStr(self) -> str:
+        return _FN_NAMES.get(self.apiType(), "kInvalid")
+
+    def __eq__(self, other):
+        return isinstance(other, MObject) and self._node is other._node and self._attr is other._attr
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self._node), id(self._attr)))
+
+    def __repr__(self):
+        if self._attr is not None:
+            return f"<MObject attribute {self._attr.name}>"
+        return f"<MObject {self._node.name if self._node else 'null'}>"
+
+
+MObject.kNullObj = MObject()
+
+
+class _DataObject(MObject):
+    """A data MObject, what MPlug.asMObject() returns for a matrix, read with MFnMatrixData."""
+
+    __slots__ = ("_data", "_fn")
+
+    @classmethod
+    def _with(cls, data, fn):
+        obj = cls._of()
+        obj._data, obj._fn = data, fn
+        return obj
+
+    def isNull(self) -> bool:
+        return False
+
+    def hasFn(self, fn) -> bool:
+        return fn == self._fn
+
+    def apiType(self) -> int:
+        return self._fn
+
+
+def wrap(node) -> MObject:
+    return MObject._of(node)
+
+
+def _node(obj):
+    """The scene node of an MObject, MDagPath or name."""
+    if isinstance(obj, MDagPath):
+        obj = obj.node()
+    if isinstance(obj, str):
+        return SCENE.find(obj)
+    if obj is None or obj._node is None:
+        raise RuntimeError("(kInvalidParameter): Object is null")
+    if not obj._node.alive:
+        raise RuntimeError("(kInvalidParameter): Object does not exist")
+    return obj._node
+
+
+@_counted
+class MObjectHandle:
+    def __init__(self, obj=None):
+        self._obj = MObject(obj) if obj is not None else MObject()
+
+    def object(self) -> MObject:
+        return self._obj
+
+    def isValid(self) -> bool:
+        return self._obj._node is not None and self._obj._node.alive
+
+    def isAlive(self) -> bool:
+        return self.isValid()
+
+    def hashCode(self) -> int:
+        return self._obj._node.uid if self._obj._node is not None else 0
+
+    def __eq__(self, other):
+        return isinstance(other, MObjectHandle) and self._obj == other._obj
+
+    def __hash__(self):
+        return hash(self._obj)
+
+
+# ---- units and maths
+
+class MAngle:
+    kInvalid, kRadians, kDegrees, kAngMinutes, kAngSeconds = range(5)
+    _FACTORS = {1: 1.0, 2: math.pi / 180.0, 3: math.pi / 10800.0, 4: math.pi / 648000.0}
+
+    def __init__(self, value=0.0, unit=1):
+        self.value = float(value)
+        self.unit = unit
+
+    def asUnits(self, unit) -> float:
+        return self.value * self._FACTORS[self.unit] / self._FACTORS[unit]
+
+    def asRadians(self) -> float:
+        return self.asUnits(MAngle.kRadians)
+
+    def asDegrees(self) -> float:
+        return self.asUnits(MAngle.kDegrees)
+
+    @staticmethod
+    def uiUnit():
+        return MAngle.kDegrees
+
+    @staticmethod
+    def internalUnit():
+        return MAngle.kRadians
+
+
+class MDistance:
+    kInvalid, kInches, kFeet, kYards, kMiles, kMillimeters, kCentimeters, kKilometers, kMeters = range(9)
+    _FACTORS = {1: 2.54, 2: 30.48, 3: 91.44, 4: 160934.4, 5: 0.1, 6: 1.0, 7: 100000.0, 8: 100.0}
+
+    def __init__(self, value=0.0, unit=6):
+        self.value = float(value)
+        self.unit = unit
+
+    def asUnits(self, unit) -> float:
+        return self.value * self._FACTORS[self.unit] / self._FACTORS[unit]
+
+    def asCentimeters(self) -> float:
+        return self.asUnits(MDistance.kCentimeters)
+
+    @staticmethod
+    def uiUnit():
+        return MDistance.kCentimeters
+
+    @staticmethod
+    def internalUnit():
+        return MDistance.kCentimeters
+
+
+class MTime:
+    kInvalid = 0
+    kHours, kMinutes, kSeconds, kMilliseconds = 1, 2, 3, 4
+    kGames, kFilm, kPALFrame, kNTSCFrame, kShowScan, kPALField, kNTSCField = 5, 6, 7, 8, 9, 10, 11
+    # seconds per unit
+    _SECONDS = {
+        1: 3600.0, 2: 60.0, 3: 1.0, 4: 0.001, 5: 1 / 15.0, 6: 1 / 24.0, 7: 1 / 25.0, 8: 1 / 30.0,
+        9: 1 / 48.0, 10: 1 / 50.0, 11: 1 / 60.0,
+    }
+    _UI_UNITS = {"game": 5, "film": 6, "pal": 7, "ntsc": 8, "show": 9, "palf": 10, "ntscf": 11}
+
+    def __init__(self, value=0.0, unit=None):
+        self.value = float(value)
+        self.unit = MTime.uiUnit() if unit is None else unit
+
+    def asUnits(self, unit) -> float:
+        return self.value * self._SECONDS[self.unit] / self._SECONDS[unit]
+
+    @staticmethod
+    def uiUnit():
+        return MTime._UI_UNITS[SCENE.time_unit]
+
+    def _frames(self) -> float:
+        return self.asUnits(MTime.uiUnit())
+
+    def __eq__(self, other):
+        return isinstance(other, MTime) and abs(self._frames() - other._frames()) < 1e-9
+
+    def __lt__(self, other):
+        return self._frames() < other._frames()
+
+    def __hash__(self):
+        return hash(round(self._frames(), 6))
+
+    def __repr__(self):
+        return f"MTime({self.value}, {self.unit})"
+
+
+class MVector:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        if isinstance(x, (MVector, MPoint, tuple, list)):
+            x, y, z = x[0], x[1], x[2]
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+    def __getitem__(self, i):
+        return (self.x, self.y, self.z)[i]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __len__(self):
+        return 3
+
+    def __add__(self, other):
+        return type(self)(self.x + other[0], self.y + other[1], self.z + other[2])
+
+    def __sub__(self, other):
+        return MVector(self.x - other[0], self.y - other[1], self.z - other[2])
+
+    def __neg__(self):
+        return type(self)(-self.x, -self.y, -self.z)
+
+    def __mul__(self, other):
+        if isinstance(other, MMatrix):
+            return MVector(math3d.transform_vector(tuple(self), other._m))
+        if isinstance(other, MVector):
+            return math3d.dot(tuple(self), tuple(other))
+        return MVector(self.x * other, self.y * other, self.z * other)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, other):
+        return MVector(self.x / other, self.y / other, self.z / other)
+
+    def __xor__(self, other):
+        return MVector(math3d.cross(tuple(self), tuple(other)))
+
+    def __eq__(self, other):
+        return isinstance(other, (MVector, MPoint)) and tuple(self)[:3] == tuple(other)[:3]
+
+    def length(self) -> float:
+        return math3d.length(tuple(self))
+
+    def normal(self):
+        return MVector(math3d.normalize(tuple(self)))
+
+    def normalize(self):
+        self.x, self.y, self.z = math3d.normalize(tuple(self))
+        return self
+
+    def isEquivalent(self, other, tolerance=1e-10) -> bool:
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"MVector({self.x}, {self.y}, {self.z})"
+
+
+class MPoint(MVector):
+    __slots__ = ()
+
+    def __mul__(self, other):
+        if isinstance(other, MMatrix):
+            return MPoint(math3d.transform_point(tuple(self), other._m))
+        return MPoint(self.x * other, self.y * other, self.z * other)
+
+    def __sub__(self, other):
+        return MVector(self.x - other[0], self.y - other[1], self.z - other[2])
+
+    def distanceTo(self, other) -> float:
+        return math3d.length(math3d.sub(tuple(self), tuple(other)[:3]))
+
+    def __repr__(self):
+        return f"MPoint({self.x}, {self.y}, {self.z})"
+
+
+class MMatrix:
+    def __init__(self, values=None):
+        if isinstance(values, MMatrix):
+            values = values._m
+        elif values is not None and len(values) == 4:
+            values = [v for row in values for v in row]
+        self._m = tuple(float(v) for v in values) if values is not None else math3d.IDENTITY
+
+    def __getitem__(self, i):
+        return self._m[i]
+
+    def __iter__(self):
+        return iter(self._m)
+
+    def __len__(self):
+        return 16
+
+    def __mul__(self, other):
+        return MMatrix(math3d.multiply(self._m, other._m))
+
+    def __eq__(self, other):
+        return isinstance(other, MMatrix) and self._m == other._m
+
+    def getElement(self, row, column) -> float:
+        return self._m[row * 4 + column]
+
+    def inverse(self):
+        return MMatrix(math3d.inverse(self._m))
+
+    def transpose(self):
+        return MMatrix([self._m[c * 4 + r] for r in range(4) for c in range(4)])
+
+    def isEquivalent(self, other, tolerance=1e-10) -> bool:
+        return all(abs(a - b) <= tolerance for a, b in zip(self._m, other._m))
+
+    def __repr__(self):
+        return f"MMatrix({list(self._m)})"
+
+
+MMatrix.kIdentity = MMatrix()
+
+
+class _Array(list):
+    def __init__(self, values=(), *args):
+        if isinstance(values, int):
+            values = [args[0] if args else self._default()] * values
+        super().__init__(values)
+
+    @staticmethod
+    def _default():
+        return None
+
+    def length(self) -> int:
+        return len(self)
+
+    def clear(self):
+        del self[:]
+
+
+class MTimeArray(_Array):
+    @staticmethod
+    def _default():
+        return MTime()
+
+
+class MDoubleArray(_Array):
+    @staticmethod
+    def _default():
+        return 0.0
+
+
+class MIntArray(_Array):
+    @staticmethod
+    def _default():
+        return 0
+
+
+class MObjectArray(_Array):
+    @staticmethod
+    def _default():
+        return MObject()
+
+
+class MPlugArray(_Array):
+    pass
+
+
+class MStringArray(_Array):
+    pass
+
+
+class MSpace:
+    kInvalid, kTransform, kPreTransform, kPostTransform, kWorld = 0, 1, 2, 3, 4
+    kObject = kPreTransform
+
+
+# ---- plugs
+
+def _short_path(node, path) -> str:
+    parts = []
+    for part in path.split("."):
+        name, bracket, index = part.partition("[")
+        attr = node.attr(name)
+        parts.append((attr.short if attr is not None else name) + bracket + index)
+    return ".".join(parts)
+
+
+class MPlug:
+    """A plug: a node and a path of long attribute names, "target[0].targetWeight"."""
+
+    __slots__ = ("_node", "_path")
+
+    def __init__(self, node=None, attribute=None):
+        self._node = None
+        self._path = None
+        if isinstance(node, MPlug):
+            self._node, self._path = node._node, node._path
+        elif isinstance(node, MObject) and isinstance(attribute, MObject):
+            self._node, self._path = _node(node), attribute._attr.name
+
+    @classmethod
+    def _of(cls, node, path):
+        plug = cls.__new__(cls)
+        plug._node, plug._path = node, path
+        return plug
+
+    def _attr(self):
+        return SCENE.plug_attr(self._node, self._path)
+
+    @property
+    def isNull(self) -> bool:
+        return self._node is None
+
+    def node(self) -> MObject:
+        return wrap(self._node)
+
+    def attribute(self) -> MObject:
+        return MObject._of(None, self._attr())
+
+    def name(self) -> str:
+        return f"{SCENE.partial_path(self._node)}.{self._path}"
+
+    def partialName(self, includeNodeName=False, includeNonMandatoryIndices=False, includeInstancedIndices=False,
+                    useAlias=False, useFullAttributePath=False, useLongNames=False) -> str:
+        path = self._path if useLongNames else _short_path(self._node, self._path)
+        return f"{SCENE.partial_path(self._node)}.{path}" if includeNodeName else path
+
+    def info(self) -> str:
+        return self.name()
+
+    @property
+    def isLocked(self) -> bool:
+        attr = self._attr()
+        if self._path in self._node.locked:
+            return True
+        return attr.parent is not None and _scene._parent_path(self._path, attr) in self._node.locked
+
+    @property
+    def isKeyable(self) -> bool:
+        return self._attr().keyable
+
+    @property
+    def isDestination(self) -> bool:
+        return self._path in self._node.inputs
+
+    @property
+    def isSource(self) -> bool:
+        return self._path in self._node.outputs
+
+    @property
+    def isConnected(self) -> bool:
+        return self.isDestination or self.isSource
+
+    @property
+    def isCompound(self) -> bool:
+        return bool(self._attr().children)
+
+    @property
+    def isArray(self) -> bool:
+        return self._attr().multi and not self._path.endswith("]")
+
+    @property
+    def isElement(self) -> bool:
+        return self._path.endswith("]")
+
+    @property
+    def isChild(self) -> bool:
+        return self._attr().parent is not None
+
+    @property
+    def isDynamic(self) -> bool:
+        return self._attr().dynamic
+
+    def source(self):
+        source = SCENE.source(self._node, self._path)
+        return MPlug._of(*source) if source is not None else MPlug()
+
+    def sourceWithConversion(self):
+        return self.source()
+
+    def destinations(self) -> MPlugArray:
+        return MPlugArray(MPlug._of(node, path) for node, path in self._node.outputs.get(self._path, ()))
+
+    def destinationsWithConversions(self) -> MPlugArray:
+        return self.destinations()
+
+    def connectedTo(self, asDst, asSrc) -> MPlugArray:
+        plugs = MPlugArray()
+        if asDst and self.isDestination:
+            plugs.append(self.source())
+        if asSrc:
+            plugs.extend(self.destinations())
+        return plugs
+
+    def numElements(self) -> int:
+        return len(self._node.element_indices(self._path))
+
+    def evaluateNumElements(self) -> int:
+        return self.numElements()
+
+    def getExistingArrayAttributeIndices(self) -> list:
+        return self._node.element_indices(self._path)
+
+    def elementByPhysicalIndex(self, index):
+        return MPlug._of(self._node, f"{self._path}[{self._node.element_indices(self._path)[index]}]")
+
+    def elementByLogicalIndex(self, index):
+        return MPlug._of(self._node, f"{self._path}[{index}]")
+
+    def logicalIndex(self) -> int:
+        return int(self._path.rpartition("[")[2].rstrip("]"))
+
+    def array(self):
+        return MPlug._of(self._node, self._path.rpartition("[")[0])
+
+    def numChildren(self) -> int:
+        return len(self._attr().children)
+
+    def child(self, index):
+        attr = self._attr()
+        if isinstance(index, MObject):
+            child = index._attr
+        else:
+            child = attr.children[index]
+        return MPlug._of(self._node, _scene._child_path(self._path, child.name))
+
+    def parent(self):
+        attr = self._attr()
+        return MPlug._of(self._node, _scene._parent_path(self._path, attr))
+
+    # values, internal units, read at the current MDGContext
+    def _value(self, context=None):
+        if context is not None and not context.isNormal():
+            previous = SCENE.context_time
+            SCENE.context_time = context._frames
+            try:
+                return SCENE.plug_value(self._node, self._path)
+            finally:
+                SCENE.context_time = previous
+        return SCENE.plug_value(self._node, self._path)
+
+    def asDouble(self, context=None) -> float:
+        return float(self._value(context))
+
+    def asFloat(self, context=None) -> float:
+        return float(self._value(context))
+
+    def asInt(self, context=None) -> int:
+        return int(self._value(context))
+
+    def asShort(self, context=None) -> int:
+        return int(self._value(context))
+
+    def asBool(self, context=None) -> bool:
+        return bool(self._value(context))
+
+    def asString(self, context=None) -> str:
+        return str(self._value(context))
+
+    def asMAngle(self, context=None) -> MAngle:
+        return MAngle(self._value(context), MAngle.kRadians)
+
+    def asMDistance(self, context=None) -> MDistance:
+        return MDistance(self._value(context), MDistance.kCentimeters)
+
+    def asMTime(self, context=None) -> MTime:
+        return MTime(self._value(context))
+
+    def asMObject(self, context=None) -> MObject:
+        """Matrix plugs only, read with MFnMatrixData."""
+        if self._attr().kind != "matrix":
+            raise RuntimeError(f"(kFailure): {self.name()} holds no data object")
+        return _DataObject._with(self._value(context), MFn.kMatrixData)
+
+    def setDouble(self, value):
+        SCENE.set_plug(self._node, self._path, float(value))
+
+    setFloat = setDouble
+
+    def setInt(self, value):
+        SCENE.set_plug(self._node, self._path, int(value))
+
+    def setBool(self, value):
+        SCENE.set_plug(self._node, self._path, bool(value))
+
+    def setMAngle(self, angle):
+        SCENE.set_plug(self._node, self._path, angle.asRadians())
+
+    def setMDistance(self, distance):
+        SCENE.set_plug(self._node, self._path, distance.asCentimeters())
+
+    def setMTime(self, time):
+        SCENE.set_plug(self._node, self._path, time._frames())
+
+    def __eq__(self, other):
+        return isinstance(other, MPlug) and self._node is other._node and self._path == other._path
+
+    def __hash__(self):
+        return hash((id(self._node), self._path))
+
+    def __repr__(self):
+        return f"<MPlug {self.name() if self._node else 'null'}>"
+
+
+# ---- selection and paths
+
+@_counted
+class MSelectionList:
+    def __init__(self, other=None):
+        self._items = list(other._items) if isinstance(other, MSelectionList) else []
+
+    def add(self, item, mergeWithExisting=True):
+        if isinstance(item, MPlug):
+            entry = (item._node, item._path)
+        elif isinstance(item, MDagPath):
+            entry = (item._nodes[-1], None)
+        elif isinstance(item, MObject):
+            entry = (_node(item), None)
+        else:
+            name = str(item)
+            node_name, _, path = name.partition(".")
+            try:
+                nodes = SCENE.match(node_name) if not path else [SCENE.find(node_name)]
+            except ValueError:
+                nodes = []
+            if not nodes:
+                raise RuntimeError("(kInvalidParameter): Object does not exist")
+            if path:
+                canonical = SCENE.canonical_path(nodes[0], path)
+                if canonical is None:
+                    raise RuntimeError("(kInvalidParameter): Object does not exist")
+                entries = [(nodes[0], canonical)]
+            else:
+                entries = [(n, None) for n in nodes]
+            for entry in entries:
+                if not mergeWithExisting or entry not in self._items:
+                    self._items.append(entry)
+            return self
+        if not mergeWithExisting or entry not in self._items:
+            self._items.append(entry)
+        return self
+
+    def length(self) -> int:
+        return len(self._items)
+
+    def isEmpty(self) -> bool:
+        return not self._items
+
+    def clear(self):
+        self._items.clear()
+        return self
+
+    def remove(self, index):
+        del self._items[index]
+        return self
+
+    def getDependNode(self, index) -> MObject:
+        return wrap(self._items[index][0])
+
+    def getDagPath(self, index):
+        node = self._items[index][0]
+        if not node.dag:
+            raise TypeError("(kInvalidParameter): Object is not a DAG node")
+        return MDagPath._of(node)
+
+    def getPlug(self, index) -> MPlug:
+        node, path = self._items[index]
+        if path is None:
+            raise TypeError("(kInvalidParameter): Object is not a plug")
+        return MPlug._of(node, path)
+
+    def getSelectionStrings(self, index=None) -> list:
+        items = self._items if index is None else [self._items[index]]
+        return [SCENE.partial_path(n) + (f".{p}" if p else "") for n, p in items]
+
+    def hasItem(self, item) -> bool:
+        node = _node(item) if not isinstance(item, MPlug) else item._node
+        return any(n is node for n, _ in self._items)
+
+
+@_counted
+class MDagPath:
+    def __init__(self, other=None):
+        self._nodes = list(other._nodes) if isinstance(other, MDagPath) else []
+
+    @classmethod
+    def _of(cls, node):
+        path = cls.__new__(cls)
+        path._nodes = list(reversed([node] + list(node.ancestors())))
+        CALLS["om2.MDagPath"] += 1
+        return path
+
+    @staticmethod
+    def getAPathTo(obj):
+        return MDagPath._of(_node(obj))
+
+    def node(self) -> MObject:
+        return wrap(self._nodes[-1])
+
+    def transform(self) -> MObject:
+        node = self._nodes[-1]
+        if node.type.shape and node.parent is not None:
+            node = node.parent
+        return wrap(node)
+
+    def fullPathName(self) -> str:
+        return self._nodes[-1].full_path()
+
+    def partialPathName(self) -> str:
+        return SCENE.partial_path(self._nodes[-1])
+
+    def length(self) -> int:
+        return len(self._nodes) - 1
+
+    def isValid(self) -> bool:
+        return bool(self._nodes) and self._nodes[-1].alive
+
+    def hasFn(self, fn) -> bool:
+        return self.node().hasFn(fn)
+
+    def apiType(self) -> int:
+        return self.node().apiType()
+
+    def instanceNumber(self) -> int:
+        return 0
+
+    def inclusiveMatrix(self) -> MMatrix:
+        return MMatrix(SCENE.world_matrix(self._nodes[-1]))
+
+    def exclusiveMatrix(self) -> MMatrix:
+        return MMatrix(SCENE.parent_world_matrix(self._nodes[-1]))
+
+    def inclusiveMatrixInverse(self) -> MMatrix:
+        return self.inclusiveMatrix().inverse()
+
+    def pop(self, num=1):
+        del self._nodes[-num:]
+        return self
+
+    def __eq__(self, other):
+        return isinstance(other, MDagPath) and self._nodes == other._nodes
+
+    def __repr__(self):
+        return f"<MDagPath {self.fullPathName() if self._nodes else ''}>"
+
+
+# ---- function sets
+
+@_counted
+class MFnBase:
+    def __init__(self, obj=None):
+        self._obj = MObject()
+        if obj is not None:
+            self.setObject(obj)
+
+    def setObject(self, obj):
+        if isinstance(obj, MDagPath):
+            obj = obj.node()
+        self._obj = obj
+        return self
+
+    def object(self) -> MObject:
+        return self._obj
+
+    def hasObj(self, obj) -> bool:
+        return not obj.isNull()
+
+
+class MFnDependencyNode(MFnBase):
+    kLocalDynamicAttr = 1
+    kNormalAttr = 2
+    kExtensionAttr = 3
+    kInvalidAttr = 4
+
+    def __init__(self, obj=None):
+        self._attributes = None
+        super().__init__(obj)
+
+    def _n(self):
+        return _node(self._obj)
+
+    def setObject(self, obj):
+        self._attributes = None
+        return super().setObject(obj)
+
+    def create(self, type_name, name=None) -> MObject:
+        self._obj = wrap(SCENE.create_node(type_name, name, shape_parent=False))
+        return self._obj
+
+    def name(self) -> str:
+        return self._n().name
+
+    def absoluteName(self) -> str:
+        return ":" + self._n().name
+
+    def setName(self, name) -> str:
+        return SCENE.rename(self._n(), name)
+
+    @property
+    def typeName(self) -> str:
+        return self._n().type.name
+
+    @property
+    def namespace(self) -> str:
+        return self._n().name.rpartition(":")[0]
+
+    @property
+    def isFromReferencedFile(self) -> bool:
+        return self._n().referenced
+
+    @property
+    def isLocked(self) -> bool:
+        return False
+
+    def _attribute_list(self):
+        if self._attributes is None:
+            self._attributes = self._n().attributes()
+        return self._attributes
+
+    def attributeCount(self) -> int:
+        return len(self._attribute_list())
+
+    def attribute(self, index) -> MObject:
+        if isinstance(index, str):
+            attr = self._n().attr(index)
+            if attr is None:
+                raise RuntimeError(f"(kInvalidParameter): no attribute {index}")
+            return MObject._of(None, attr)
+        return MObject._of(None, self._attribute_list()[index])
+
+    def hasAttribute(self, name) -> bool:
+        return self._n().attr(name) is not None
+
+    def findPlug(self, attribute, wantNetworkedPlug=False) -> MPlug:
+        node = self._n()
+        if isinstance(attribute, MObject):
+            return MPlug._of(node, attribute._attr.name)
+        path = SCENE.canonical_path(node, attribute)
+        if path is None:
+            raise RuntimeError("(kInvalidParameter): Cannot find the plug")
+        return MPlug._of(node, path)
+
+    def getConnections(self) -> MPlugArray:
+        node = self._n()
+        paths = list(dict.fromkeys(list(node.inputs) + list(node.outputs)))
+        return MPlugArray(MPlug._of(node, path) for path in paths)
+
+    def userNode(self):
+        return None
+
+
+class MFnDagNode(MFnDependencyNode):
+    def fullPathName(self) -> str:
+        return self._n().full_path()
+
+    def partialPathName(self) -> str:
+        return SCENE.partial_path(self._n())
+
+    def getPath(self) -> MDagPath:
+        return MDagPath._of(self._n())
+
+    @property
+    def dagPath(self):
+        return self.getPath()
+
+    def childCount(self) -> int:
+        return len(self._n().children)
+
+    def child(self, index) -> MObject:
+        return wrap(self._n().children[index])
+
+    def parentCount(self) -> int:
+        return 1  # the world is the parent of the top level nodes
+
+    def parent(self, index=0) -> MObject:
+        parent = self._n().parent
+        return wrap(parent) if parent is not None else MObject()
+
+    def transformationMatrix(self) -> MMatrix:
+        return MMatrix(SCENE.local_matrix(self._n()))
+
+    def isChildOf(self, obj) -> bool:
+        return self._n().parent is _node(obj)
+
+    def isParentOf(self, obj) -> bool:
+        return _node(obj).parent is self._n()
+
+
+class MFnAttribute(MFnBase):
+    def _a(self):
+        if self._obj._attr is None:
+            raise RuntimeError("(kInvalidParameter): Object is not an attribute")
+        return self._obj._attr
+
+    @property
+    def name(self) -> str:
+        return self._a().name
+
+    @property
+    def shortName(self) -> str:
+        return self._a().short
+
+    @property
+    def dynamic(self) -> bool:
+        return self._a().dynamic
+
+    @property
+    def keyable(self) -> bool:
+        return self._a().keyable
+
+    @property
+    def readable(self) -> bool:
+        return self._a().readable
+
+    @property
+    def writable(self) -> bool:
+        return self._a().writable
+
+    @property
+    def array(self) -> bool:
+        return self._a().multi
+
+    @property
+    def hidden(self) -> bool:
+        return False
+
+    @property
+    def channelBox(self) -> bool:
+        return False
+
+    @property
+    def parent(self) -> MObject:
+        attr = self._a()
+        return MObject._of(None, attr.parent) if attr.parent is not None else MObject()
+
+
+class MFnMatrixData:
+    def __init__(self, obj=None):
+        if obj is not None and not obj.hasFn(MFn.kMatrixData):
+            raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+        self._obj = obj
+
+    def matrix(self) -> MMatrix:
+        return MMatrix(self._obj._data)
+
+
+class MFnNumericData:
+    kInvalid, kBoolean, kByte, kChar, kShort, k2Short, k3Short, kLong, kInt = range(9)
+    kFloat, kDouble, k3Double = 11, 14, 20
+
+
+class MFnNumericAttribute(MFnAttribute):
+    @property
+    def default(self):
+        attr = self._a()
+        if attr.children:
+            return tuple(c.default for c in attr.children)
+        return attr.default
+
+    def numericType(self) -> int:
+        return {"bool": MFnNumericData.kBoolean, "long": MFnNumericData.kLong, "double3": MFnNumericData.k3Double}.get(
+            self._a().kind, MFnNumericData.kDouble
+        )
+
+    def hasMin(self) -> bool:
+        return self._a().minimum is not None
+
+    def hasMax(self) -> bool:
+        return self._a().maximum is not None
+
+    def getMin(self):
+        return self._a().minimum
+
+    def getMax(self):
+        return self._a().maximum
+
+
+class MFnUnitAttribute(MFnAttribute):
+    kInvalid, kAngle, kDistance, kTime = range(4)
+
+    def unitType(self) -> int:
+        return {"angle": self.kAngle, "distance": self.kDistance, "time": self.kTime}[self._a().kind]
+
+    @property
+    def default(self):
+        attr = self._a()
+        if attr.kind == "angle":
+            return MAngle(attr.default, MAngle.kRadians)
+        if attr.kind == "distance":
+            return MDistance(attr.default, MDistance.kCentimeters)
+        return MTime(attr.default)
+
+
+class MFnEnumAttribute(MFnAttribute):
+    @property
+    def default(self) -> int:
+        return int(self._a().default)
+
+    def fieldName(self, index) -> str:
+        return self._a().enum_names[index]
+
+    def fieldValue(self, name) -> int:
+        return self._a().enum_names.index(name)
+
+    def getMin(self) -> int:
+        return 0
+
+    def getMax(self) -> int:
+        return len(self._a().enum_names or ()) - 1
+
+
+class MFnCompoundAttribute(MFnAttribute):
+    def numChildren(self) -> int:
+        return len(self._a().children)
+
+    def child(self, index) -> MObject:
+        return MObject._of(None, self._a().children[index])
+
+
+# ---- iterators and namespaces
+
+@_counted
+class MItDependencyNodes:
+    def __init__(self, filter=MFn.kInvalid):
+        name = _FN_NAMES.get(filter)
+        self._nodes = [
+            n for n in SCENE.ls()
+            if filter == MFn.kInvalid or name in _COMMON_FNS or name in n.type.fns
+        ]
+        self._index = 0
+
+    def isDone(self) -> bool:
+        return self._index >= len(self._nodes)
+
+    def next(self):
+        self._index += 1
+        return self
+
+    def thisNode(self) -> MObject:
+        return wrap(self._nodes[self._index])
+
+    def reset(self):
+        self._index = 0
+        return self
+
+
+class MNamespace:
+    @staticmethod
+    def namespaceExists(namespace) -> bool:
+        name = namespace.strip(":")
+        return name in SCENE.namespaces or any(n.startswith(name + ":") for n in SCENE.by_name)
+
+    @staticmethod
+    def getNamespaceObjects(namespace, recurse=False) -> MObjectArray:
+        prefix = namespace.strip(":") + ":"
+        objects = MObjectArray()
+        for node in SCENE.ls():
+            if not node.name.startswith(prefix):
+                continue
+            if not recurse and ":" in node.name[len(prefix):]:
+                continue
+            objects.append(wrap(node))
+        return objects
+
+    @staticmethod
+    def getNamespaces(parentNamespace=":", recurse=False) -> list:
+        found = set(SCENE.namespaces)
+        for name in SCENE.by_name:
+            if ":" in name:
+                found.add(name.rpartition(":")[0])
+        return sorted(found)
+
+    @staticmethod
+    def currentNamespace() -> str:
+        return ":"
+
+
+@_counted
+class MDGContext:
+    """An evaluation time. makeCurrent() returns the previous context, plugs are then read at that time."""
+
+    _current = None
+
+    def __init__(self, time=None):
+        self._frames = time._frames() if isinstance(time, MTime) else None
+
+    def isNormal(self) -> bool:
+        return self._frames is None
+
+    def getTime(self) -> MTime:
+        return MTime(SCENE.time if self._frames is None else self._frames)
+
+    def makeCurrent(self):
+        previous = MDGContext._current or MDGContext.kNormal
+        MDGContext._current = self
+        SCENE.context_time = self._frames
+        return previous
+
+    @staticmethod
+    def current():
+        return MDGContext._current or MDGContext.kNormal
+
+
+MDGContext.kNormal = MDGContext()
+
+
+# ---- modifiers
+
+_MISSING = object()
+
+
+@_counted
+class MDGModifier:
+    """Queues edits, doIt applies the ones queued since the last doIt, undoIt reverts everything applied."""
+
+    def __init__(self):
+        self._ops = []
+        self._undo = []  # per applied op, what reverts it
+        self._applied = 0
+        self._undone = False
+
+    def _queue(self, *op):
+        self._ops.append(op)
+        return self
+
+    def createNode(self, type_name) -> MObject:
+        node = SCENE.new_node(type_name if isinstance(type_name, str) else "transform")
+        self._queue("create", node, None)
+        return wrap(node)
+
+    def renameNode(self, obj, name):
+        return self._queue("rename", _node(obj), name)
+
+    def deleteNode(self, obj, includeParents=False):
+        return self._queue("delete", _node(obj))
+
+    def connect(self, *args):
+        source, destination = _plugs_of(args)
+        return self._queue("connect", source, destination)
+
+    def disconnect(self, *args):
+        source, destination = _plugs_of(args)
+        return self._queue("disconnect", source, destination)
+
+    def newPlugValue(self, plug, value):
+        return self._queue("value", plug, value)
+
+    def newPlugValueDouble(self, plug, value):
+        return self._queue("value", plug, float(value))
+
+    newPlugValueFloat = newPlugValueDouble
+
+    def newPlugValueInt(self, plug, value):
+        return self._queue("value", plug, int(value))
+
+    newPlugValueShort = newPlugValueInt
+
+    def newPlugValueBool(self, plug, value):
+        return self._queue("value", plug, bool(value))
+
+    def newPlugValueString(self, plug, value):
+        return self._queue("string", plug, str(value))
+
+    def newPlugValueMAngle(self, plug, angle):
+        return self._queue("value", plug, angle.asRadians())
+
+    def newPlugValueMDistance(self, plug, distance):
+        return self._queue("value", plug, distance.asCentimeters())
+
+    def newPlugValueMTime(self, plug, time):
+        return self._queue("value", plug, time._frames())
+
+    def commandToExecute(self, command):
+        return self._queue("mel", command)
+
+    def pythonCommandToExecute(self, command):
+        return self._queue("python", command)
+
+    def addAttribute(self, obj, attribute):
+        return self._queue("add_attr", _node(obj), attribute._attr)
+
+    def doIt(self):
+        if self._undone:  # redo
+            self._undone = False
+            self._undo = []
+            start = 0
+        else:
+            start = self._applied
+        for op in self._ops[start:]:
+            self._undo.append(self._apply(op))
+        self._applied = len(self._ops)
+
+    def undoIt(self):
+        for revert in reversed(self._undo):
+            if revert is not None:
+                revert()
+        self._undo = []
+        self._undone = True
+
+    def _apply(self, op):
+        kind = op[0]
+        if kind == "create":
+            node, parent = op[1], op[2]
+            if node.alive and node.uid in SCENE.nodes:
+                return None
+            SCENE.insert(node, parent)
+            return lambda: SCENE.delete(node)
+        if kind == "rename":
+            node, name = op[1], op[2]
+            previous = node.name
+            SCENE.rename(node, name)
+            return lambda: SCENE.rename(node, previous)
+        if kind == "delete":
+            records = SCENE.delete(op[1])
+            return lambda: SCENE.undelete(records)
+        if kind == "connect":
+            (src, src_path), (dst, dst_path) = op[1], op[2]
+            previous = dst.inputs.get(dst_path)
+            SCENE.connect(src, src_path, dst, dst_path)
+
+            def revert():
+                SCENE.disconnect(src, src_path, dst, dst_path)
+                if previous is not None:
+                    SCENE.connect(previous[0], previous[1], dst, dst_path)
+            return revert
+        if kind == "disconnect":
+            (src, src_path), (dst, dst_path) = op[1], op[2]
+            SCENE.disconnect(src, src_path, dst, dst_path)
+            return lambda: SCENE.connect(src, src_path, dst, dst_path)
+        if kind in ("value", "string"):
+            plug, value = op[1], op[2]
+            node, path = plug._node, plug._path
+            previous = node.values.get(path, _MISSING)
+            previous_override = SCENE.overrides.get((node.uid, path))
+            if kind == "string":
+                node.values[path] = value
+            else:
+                SCENE.set_plug(node, path, value)
+
+            def revert():
+                if previous is _MISSING:
+                    node.values.pop(path, None)
+                else:
+                    node.values[path] = previous
+                if previous_override is None:
+                    SCENE.overrides.pop((node.uid, path), None)
+                else:
+                    SCENE.overrides[(node.uid, path)] = previous_override
+            return revert
+        if kind in ("mel", "python"):
+            before = set(SCENE.nodes)
+            if kind == "mel":
+                from . import mel
+                mel.eval(op[1])
+            else:
+                exec(op[1], {})
+            created = [SCENE.nodes[uid] for uid in SCENE.nodes if uid not in before]
+
+            def revert():
+                # commands are undone by deleting what they created, edits of existing nodes are kept
+                for node in reversed(created):
+                    if node.alive:
+                        SCENE.delete(node)
+            return revert
+        if kind == "reparent":
+            node, parent = op[1], op[2]
+            previous = node.parent
+            SCENE.set_parent(node, parent)
+            return lambda: SCENE.set_parent(node, previous)
+        if kind == "add_attr":
+            node, attr = op[1], op[2]
+            SCENE.add_attr(node, attr)
+            return lambda: SCENE.delete_attr(node, attr.name)
+        raise RuntimeError(f"Unknown modifier operation {kind}")
+
+
+class MDagModifier(MDGModifier):
+    def createNode(self, type_name, parent=MObject.kNullObj) -> MObject:
+        parent_node = _node(parent) if parent is not None and not parent.isNull() else None
+        node = SCENE.new_node(type_name)
+        if node.type.shape and parent_node is None:
+            transform = SCENE.new_node("transform")
+            self._queue("create", transform, None)
+            self._queue("create", node, transform)
+            return wrap(transform)
+        self._queue("create", node, parent_node)
+        return wrap(node)
+
+    def reparentNode(self, obj, newParent=MObject.kNullObj):
+        node = _node(obj)
+        parent = _node(newParent) if newParent is not None and not newParent.isNull() else None
+        return self._queue("reparent", node, parent)
+
+
+def _plugs_of(args) -> tuple:
+    if len(args) == 2:
+        return (args[0]._node, args[0]._path), (args[1]._node, args[1]._path)
+    source_node, source_attr, destination_node, destination_attr = args
+    return (_node(source_node), source_attr._attr.name), (_node(destination_node), destination_attr._attr.name)
+
+
+# ---- commands and plugins
+
+class MArgList:
+    def __init__(self, args=()):
+        self._args = list(args)
+
+    def length(self) -> int:
+        return len(self._args)
+
+    def asString(self, index) -> str:
+        return str(self._args[index])
+
+    def asDouble(self, index) -> float:
+        return float(self._args[index])
+
+    def asInt(self, index) -> int:
+        return int(self._args[index])
+
+    def asBool(self, index) -> bool:
+        return bool(self._args[index])
+
+
+class MPxCommand:
+    def __init__(self):
+        self._result = None
+
+    def isUndoable(self) -> bool:
+        return False
+
+    def hasSyntax(self) -> bool:
+        return False
+
+    def setResult(self, value):
+        self._result = value
+
+    def appendToResult(self, value):
+        if not isinstance(self._result, list):
+            self._result = [] if self._result is None else [self._result]
+        self._result.append(value)
+
+    def clearResult(self):
+        self._result = None
+
+    def displayWarning(self, message):
+        MGlobal.displayWarning(message)
+
+    def displayError(self, message):
+        MGlobal.displayError(message)
+
+
+class _CommandUndo:
+    """An undoable plugin command in the undo queue."""
+
+    def __init__(self, command):
+        self.command = command
+
+    def undoIt(self):
+        self.command.undoIt()
+
+    def redoIt(self):
+        self.command.redoIt()
+
+
+class MFnPlugin(MFnBase):
+    """Registers the plugin commands as fake cmds functions, counted as "cmds.<command>"."""
+
+    def __init__(self, obj=None, vendor="Unknown", version="Unknown", requiredApiVersion="Any"):
+        super().__init__(obj)
+        self.vendor = vendor
+        self.version = version
+
+    def registerCommand(self, name, creator, createSyntax=None):
+        from . import cmds
+
+        key = "cmds." + name
+
+        def plugin_command(*args, **kwargs):
+            CALLS[key] += 1
+            instance = creator()
+            instance.doIt(MArgList(args))
+            if instance.isUndoable():
+                SCENE.push_undo(_CommandUndo(instance))
+            return instance._result if hasattr(instance, "_result") else None
+
+        plugin_command.__name__ = name
+        setattr(cmds, name, plugin_command)
+
+    def deregisterCommand(self, name):
+        from . import cmds
+
+        if hasattr(cmds, name):
+            delattr(cmds, name)
+
+
+# ---- messages
+
+class MMessage:
+    @staticmethod
+    def removeCallback(callback_id):
+        SCENE.remove_callback(callback_id)
+
+    @staticmethod
+    def removeCallbacks(callback_ids):
+        for callback_id in list(callback_ids):
+            SCENE.remove_callback(callback_id)
+
+    @staticmethod
+    def currentCallbackId():
+        return 0
+
+
+class MSceneMessage(MMessage):
+    kSceneUpdate, kBeforeNew, kAfterNew, kBeforeImport, kAfterImport, kBeforeOpen, kAfterOpen = range(7)
+    _EVENTS = {kBeforeNew: "before_new", kAfterNew: "after_new", kBeforeOpen: "before_open", kAfterOpen: "after_open"}
+
+    @staticmethod
+    def addCallback(message, function, clientData=None) -> int:
+        return SCENE.add_callback("scene", MSceneMessage._EVENTS.get(message, message), function, clientData)
+
+
+class MDGMessage(MMessage):
+    @staticmethod
+    def addNodeAddedCallback(function, nodeType="dependNode", clientData=None) -> int:
+        def adapter(node, client_data):
+            function(wrap(node), client_data)
+        return SCENE.add_callback("node_added", None if nodeType == "dependNode" else nodeType, adapter, clientData)
+
+    @staticmethod
+    def addNodeRemovedCallback(function, nodeType="dependNode", clientData=None) -> int:
+        def adapter(node, client_data):
+            function(wrap(node), client_data)
+        return SCENE.add_callback("node_removed", None if nodeType == "dependNode" else nodeType, adapter, clientData)
+
+    @staticmethod
+    def addConnectionCallback(function, clientData=None) -> int:
+        def adapter(src, src_path, dst, dst_path, made, client_data):
+            function(MPlug._of(src, src_path), MPlug._of(dst, dst_path), made, client_data)
+        return SCENE.add_callback("connection", None, adapter, clientData)
+
+
+class MEventMessage(MMessage):
+    """Only the "Undo" and "Redo" events are sent."""
+
+    @staticmethod
+    def addEventCallback(event, function, clientData=None) -> int:
+        def adapter(client_data):
+            function(client_data)
+        return SCENE.add_callback("event", event, adapter, clientData)
+
+
+class MNodeMessage(MMessage):
+    kConnectionMade = 0x01
+    kConnectionBroken = 0x02
+    kAttributeEval = 0x04
+    kAttributeSet = 0x08
+    kAttributeLocked = 0x10
+    kAttributeUnlocked = 0x20
+    kAttributeAdded = 0x40
+    kAttributeRemoved = 0x80
+    kAttributeRenamed = 0x100
+
+    @staticmethod
+    def addNameChangedCallback(node, function, clientData=None) -> int:
+        key = None if node is None or node.isNull() else _node(node)
+
+        def adapter(changed, previous, client_data):
+            function(wrap(changed), previous, client_data)
+        return SCENE.add_callback("name_changed", key, adapter, clientData)
+
+    @staticmethod
+    def addAttributeAddedOrRemovedCallback(node, function, clientData=None) -> int:
+        def adapter(change, changed, attribute, client_data):
+            message = MNodeMessage.kAttributeAdded if change == "added" else MNodeMessage.kAttributeRemoved
+            function(message, MPlug._of(changed, attribute), client_data)
+        return SCENE.add_callback("attribute_changed", _node(node), adapter, clientData)
+
+    @staticmethod
+    def addAttributeChangedCallback(node, function, clientData=None) -> int:
+        """Only the plug sets are sent, kAttributeSet."""
+        def adapter(changed, path, client_data):
+            function(MNodeMessage.kAttributeSet, MPlug._of(changed, path), MPlug(), client_data)
+        return SCENE.add_callback("attribute_set", _node(node), adapter, clientData)
+
+    @staticmethod
+    def addNodePreRemovalCallback(node, function, clientData=None) -> int:
+        target = _node(node)
+
+        def adapter(removed, client_data):
+            if removed is target:
+                function(wrap(removed), client_data)
+        return SCENE.add_callback("node_removed", None, adapter, clientData)
+
+
+class MGlobal:
+    kInteractive, kBatch, kLibraryApp, kBaseUIMode = range(4)
+    kReplaceList, kXORWithList, kRemoveFromList, kAddToList = range(4)
+
+    @staticmethod
+    def mayaState() -> int:
+        return MGlobal.kBatch if SCENE.batch else MGlobal.kInteractive
+
+    @staticmethod
+    def displayWarning(message):
+        SCENE.warnings.append(str(message))
+
+    @staticmethod
+    def displayError(message):
+        SCENE.warnings.append("Error: " + str(message))
+
+    @staticmethod
+    def displayInfo(message):
+        SCENE.messages.append(str(message))
+
+    @staticmethod
+    def getActiveSelectionList(orderedSelectionIfAvailable=False) -> MSelectionList:
+        selection = MSelectionList()
+        for node in SCENE.selection:
+            selection._items.append((node, None))
+        return selection
+
+    @staticmethod
+    def setActiveSelectionList(selection, listAdjustment=0):
+        nodes = [node for node, _ in selection._items]
+        if listAdjustment == MGlobal.kAddToList:
+            SCENE.selection.extend(n for n in nodes if n not in SCENE.selection)
+        else:
+            SCENE.selection[:] = nodes
+
+    @staticmethod
+    def executeCommand(command, displayEnabled=False, undoEnabled=False):
+        from . import mel
+        return mel.eval(command)
+
+    @staticmethod
+    def executeCommandStringResult(command, displayEnabled=False, undoEnabled=False):
+        return str(MGlobal.executeCommand(command))
+
+
+def maya_useNewAPI():
+    pass
+
+
+__all__ = [name for name in dir() if name.startswith("M") or name == "maya_useNewAPI"]
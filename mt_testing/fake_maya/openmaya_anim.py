@@ -0,0 +1,245 @@
+"""
+Fake maya.api.OpenMayaAnim: MFnAnimCurve on the keys of the fake anim curves, MAnimCurveChange, MAnimMessage,
+MAnimControl, MAnimUtil.
+Tangents are always linear, the tangent arguments are accepted and ignored.
+"""
+
+from . import openmaya as om2
+from .scene import CALLS, SCENE
+
+
+class MAnimCurveChange:
+    """Undo/redo of the key edits made through MFnAnimCurve, a snapshot of every curve before its first edit."""
+
+    def __init__(self):
+        CALLS["oma2.MAnimCurveChange"] += 1
+        self._before = {}  # curve node -> snapshot
+        self._after = {}
+
+    def _note(self, node):
+        if node not in self._before:
+            self._before[node] = node.data["curve"].snapshot()
+
+    def isInteractive(self) -> bool:
+        return False
+
+    def undoIt(self):
+        for node, snapshot in self._before.items():
+            self._after[node] = node.data["curve"].snapshot()
+            node.data["curve"].restore(snapshot)
+            SCENE.curve_edited(node)
+
+    def redoIt(self):
+        for node, snapshot in self._after.items():
+            node.data["curve"].restore(snapshot)
+            SCENE.curve_edited(node)
+
+
+class MFnAnimCurve(om2.MFnDependencyNode):
+    kAnimCurveTA, kAnimCurveTL, kAnimCurveTT, kAnimCurveTU = 0, 1, 2, 3
+    kTangentGlobal, kTangentFixed, kTangentLinear, kTangentFlat, kTangentSmooth, kTangentStep = 0, 1, 2, 3, 4, 5
+    kTangentSlow, kTangentFast, kTangentClamped, kTangentPlateau, kTangentStepNext = 6, 7, 8, 9, 10
+    kTangentAuto = 18
+    kConstant, kLinear, kCycle, kCycleRelative, kOscillate = 0, 1, 3, 4, 5
+
+    _TYPES = {0: "animCurveTA", 1: "animCurveTL", 2: "animCurveTT", 3: "animCurveTU"}
+
+    def __init__(self, obj=None):
+        if isinstance(obj, om2.MPlug):
+            source = obj.source()
+            if source.isNull or not source._node.has_fn("kAnimCurve"):
+                raise RuntimeError("(kInvalidParameter): the plug isn't driven by an anim curve")
+            obj = source.node()
+        super().__init__(obj)
+
+    def _curve(self):
+        return self._n().data["curve"]
+
+    def _edit(self, change):
+        """The curve, about to be edited: noted in change for the undo, the edited callbacks told."""
+        if change is not None:
+            change._note(self._n())
+        SCENE.curve_edited(self._n())
+        return self._curve()
+
+    def create(self, target, animCurveType=None, modifier=None) -> om2.MObject:
+        """A new anim curve, connected to the plug target when it is one, made by modifier when given."""
+        if animCurveType is None:
+            if not isinstance(target, om2.MPlug):
+                raise RuntimeError("(kInvalidParameter): an anim curve type is needed without a plug")
+            kind = target._attr().kind
+            animCurveType = {"angle": self.kAnimCurveTA, "distance": self.kAnimCurveTL, "time": self.kAnimCurveTT}.get(
+                kind, self.kAnimCurveTU
+            )
+        type_name = self._TYPES[animCurveType]
+        # named after the plug like Maya does, pCube1_translateX
+        name = f"{target._node.name.rpartition(':')[2]}_{target._attr().name}" if isinstance(target, om2.MPlug) else None
+        if modifier is None:
+            node = SCENE.create_node(type_name, name)
+            if isinstance(target, om2.MPlug):
+                SCENE.connect(node, "output", target._node, target._path)
+            obj = om2.wrap(node)
+        else:
+            obj = modifier.createNode(type_name)
+            if name:
+                obj._node.name = name  # not in the scene yet, made unique when the modifier inserts it
+            if isinstance(target, om2.MPlug):
+                modifier.connect(om2.MPlug._of(obj._node, "output"), target)
+        self.setObject(obj)
+        return obj
+
+    @property
+    def animCurveType(self) -> int:
+        return {name: value for value, name in self._TYPES.items()}[self.typeName]
+
+    @property
+    def numKeys(self) -> int:
+        return len(self._curve())
+
+    @property
+    def numKeyframes(self) -> int:
+        return self.numKeys
+
+    @property
+    def isTimeInput(self) -> bool:
+        return "input" not in self._n().inputs
+
+    @property
+    def isWeighted(self) -> bool:
+        return False
+
+    @property
+    def preInfinityType(self) -> int:
+        return self.kConstant
+
+    @property
+    def postInfinityType(self) -> int:
+        return self.kConstant
+
+    # tangents are always linear: read as such, their edits are ignored
+    def inTangentType(self, index) -> int:
+        return self.kTangentLinear
+
+    def outTangentType(self, index) -> int:
+        return self.kTangentLinear
+
+    def setInTangentType(self, index, tangentType, change=None):
+        pass
+
+    def setOutTangentType(self, index, tangentType, change=None):
+        pass
+
+    def setAngle(self, index, angle, isInTangent, change=None):
+        pass
+
+    def setWeight(self, index, weight, isInTangent, change=None):
+        pass
+
+    def setIsWeighted(self, isWeighted, change=None):
+        pass
+
+    def setPreInfinityType(self, infinityType, change=None):
+        pass
+
+    def setPostInfinityType(self, infinityType, change=None):
+        pass
+
+    def input(self, index) -> om2.MTime:
+        return om2.MTime(self._curve().times[index])
+
+    def value(self, index) -> float:
+        return self._curve().values[index]
+
+    def find(self, time):
+        """Index of the key at time, None when there is none."""
+        return self._curve().index(time._frames())
+
+    def findClosest(self, time) -> int:
+        times = self._curve().times
+        frame = time._frames()
+        return min(range(len(times)), key=lambda i: abs(times[i] - frame)) if times else 0
+
+    def evaluate(self, time) -> float:
+        return self._curve().evaluate(time._frames())
+
+    def addKey(self, time, value, tangentInType=kTangentGlobal, tangentOutType=kTangentGlobal, change=None) -> int:
+        curve = self._edit(change)
+        curve.set_key(time._frames(), float(value))
+        return curve.index(time._frames())
+
+    def addKeys(self, times, values, tangentInType=kTangentGlobal, tangentOutType=kTangentGlobal,
+                keepExistingKeys=False, change=None):
+        if len(times) != len(values):
+            raise ValueError("times and values must have the same length")
+        curve = self._edit(change)
+        if not keepExistingKeys:
+            curve.remove(range(len(curve)))
+        for time, value in zip(times, values):
+            curve.set_key(time._frames(), float(value))
+
+    def remove(self, index, change=None):
+        self._edit(change).remove([index])
+
+    def setValue(self, index, value, change=None):
+        self._edit(change).values[index] = float(value)
+
+    def setInput(self, index, time, change=None):
+        curve = self._edit(change)
+        value = curve.values[index]
+        curve.remove([index])
+        curve.set_key(time._frames(), value)
+
+
+class MAnimMessage(om2.MMessage):
+    @staticmethod
+    def addAnimCurveEditedCallback(function, clientData=None) -> int:
+        """Called once per edit, with the edited curve: Maya batches them."""
+        def adapter(curve_node, client_data):
+            function(om2.MObjectArray([om2.wrap(curve_node)]), client_data)
+        return SCENE.add_callback("anim_curve_edited", None, adapter, clientData)
+
+
+class MAnimControl:
+    @staticmethod
+    def currentTime() -> om2.MTime:
+        return om2.MTime(SCENE.time)
+
+    @staticmethod
+    def setCurrentTime(time):
+        SCENE.time = time._frames()
+        SCENE.overrides.clear()
+
+    @staticmethod
+    def minTime() -> om2.MTime:
+        return om2.MTime(SCENE.playback["min"])
+
+    @staticmethod
+    def maxTime() -> om2.MTime:
+        return om2.MTime(SCENE.playback["max"])
+
+    @staticmethod
+    def animationStartTime() -> om2.MTime:
+        return om2.MTime(SCENE.playback["animationStartTime"])
+
+    @staticmethod
+    def animationEndTime() -> om2.MTime:
+        return om2.MTime(SCENE.playback["animationEndTime"])
+
+
+class MAnimUtil:
+    @staticmethod
+    def isAnimated(obj, checkParent=False) -> bool:
+        node = obj._nodes[-1] if isinstance(obj, om2.MDagPath) else om2._node(obj)
+        return any(src.has_fn("kAnimCurve") for src, _ in node.inputs.values())
+
+    @staticmethod
+    def findAnimation(obj) -> om2.MObjectArray:
+        node = obj._nodes[-1] if isinstance(obj, om2.MDagPath) else om2._node(obj)
+        return om2.MObjectArray(om2.wrap(src) for src, _ in node.inputs.values() if src.has_fn("kAnimCurve"))
+
+    @staticmethod
+    def findAnimatedPlugs(obj, checkParent=False) -> om2.MPlugArray:
+        node = obj._nodes[-1] if isinstance(obj, om2.MDagPath) else om2._node(obj)
+        return om2.MPlugArray(
+            om2.MPlug._of(node, path) for path, (src, _) in node.inputs.items() if src.has_fn("kAnimCurve")
+        )
@@ -0,0 +1,567 @@
+"""
+Fake pymel.core: PyNode and the node classes, attributes, the datatypes (dt) the snapper uses, and UI wrappers.
+Anything else is forwarded to the fake cmds, wrapping the node names it returns in PyNodes.
+
+Like PyMEL, rotations are in degrees (EulerRotation), positions in cm, and setMatrix / getMatrix work in object space.
+"""
+
+import math
+import types
+
+from . import cmds as _cmds
+from . import geometry
+from . import math3d
+from .scene import CALLS, SCENE, Node
+
+
+class MayaNodeError(ValueError):
+    pass
+
+
+# ---- datatypes
+
+class Vector:
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        if not isinstance(x, (int, float)):
+            x, y, z = tuple(x)[:3]
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __getitem__(self, i):
+        return (self.x, self.y, self.z)[i]
+
+    def __len__(self):
+        return 3
+
+    def __add__(self, other):
+        return type(self)(self.x + other[0], self.y + other[1], self.z + other[2])
+
+    def __iadd__(self, other):
+        self.x, self.y, self.z = self.x + other[0], self.y + other[1], self.z + other[2]
+        return self
+
+    def __sub__(self, other):
+        return Vector(self.x - other[0], self.y - other[1], self.z - other[2])
+
+    def __neg__(self):
+        return type(self)(-self.x, -self.y, -self.z)
+
+    def __mul__(self, other):
+        if isinstance(other, Matrix):
+            return type(self)(math3d.transform_vector(tuple(self), other.values))
+        return type(self)(self.x * other, self.y * other, self.z * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return type(self)(self.x / other, self.y / other, self.z / other)
+
+    def __eq__(self, other):
+        try:
+            return tuple(self) == tuple(other)[:3]
+        except TypeError:
+            return False
+
+    def length(self) -> float:
+        return math3d.length(tuple(self))
+
+    def normal(self):
+        return type(self)(math3d.normalize(tuple(self)))
+
+    def dot(self, other) -> float:
+        return math3d.dot(tuple(self), tuple(other))
+
+    def cross(self, other):
+        return Vector(math3d.cross(tuple(self), tuple(other)))
+
+    def isEquivalent(self, other, tol=1e-10) -> bool:
+        return all(abs(a - b) <= tol for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"dt.{type(self).__name__}([{self.x}, {self.y}, {self.z}])"
+
+
+class Point(Vector):
+    def __mul__(self, other):
+        if isinstance(other, Matrix):
+            return Point(math3d.transform_point(tuple(self), other.values))
+        return Point(self.x * other, self.y * other, self.z * other)
+
+    def distanceTo(self, other) -> float:
+        return math3d.length(math3d.sub(tuple(self), tuple(other)))
+
+
+class Quaternion:
+    """(x, y, z, w). Quaternion(a, b) is the rotation from the direction a to b, q1 * q2 rotates by q1 then q2."""
+
+    def __init__(self, *args):
+        if not args:
+            self.values = (0.0, 0.0, 0.0, 1.0)
+        elif len(args) == 2:
+            self.values = math3d.quaternion_between(tuple(args[0]), tuple(args[1]))
+        elif len(args) == 4:
+            self.values = tuple(float(v) for v in args)
+        else:
+            self.values = tuple(float(v) for v in args[0])
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __mul__(self, other):
+        return Quaternion(math3d.quaternion_multiply(self.values, other.values))
+
+    def asMatrix(self):
+        return Matrix(math3d.quaternion_matrix(self.values))
+
+    def asEulerRotation(self):
+        return EulerRotation(*(math.degrees(a) for a in math3d.matrix_euler(math3d.quaternion_matrix(self.values))))
+
+    def __repr__(self):
+        return f"dt.Quaternion({list(self.values)})"
+
+
+class EulerRotation:
+    """Rotation in degrees, xyz order."""
+
+    def __init__(self, x=0.0, y=0.0, z=0.0, unit="degrees"):
+        if not isinstance(x, (int, float)):
+            x, y, z = tuple(x)[:3]
+        factor = math.degrees(1.0) if unit == "radians" else 1.0
+        self.x, self.y, self.z = float(x) * factor, float(y) * factor, float(z) * factor
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __getitem__(self, i):
+        return (self.x, self.y, self.z)[i]
+
+    def radians(self) -> tuple:
+        return tuple(math.radians(a) for a in self)
+
+    def asMatrix(self):
+        return Matrix(math3d.euler_matrix(self.radians()))
+
+    def asQuaternion(self):
+        return Quaternion(math3d.matrix_quaternion(math3d.euler_matrix(self.radians())))
+
+    def __repr__(self):
+        return f"dt.EulerRotation([{self.x}, {self.y}, {self.z}])"
+
+
+class Matrix:
+    def __init__(self, values=None):
+        if isinstance(values, Matrix):
+            values = values.values
+        self.values = tuple(float(v) for v in values) if values is not None else math3d.IDENTITY
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __mul__(self, other):
+        return Matrix(math3d.multiply(self.values, Matrix(other).values))
+
+    def inverse(self):
+        return Matrix(math3d.inverse(self.values))
+
+    @property
+    def translate(self):
+        return Vector(math3d.translation(self.values))
+
+    def __repr__(self):
+        return f"dt.Matrix({list(self.values)})"
+
+
+class TransformationMatrix(Matrix):
+    """A matrix edited by components: setTranslation, setRotation (degrees or a Quaternion), setScale."""
+
+    def __init__(self, values=None):
+        super().__init__(values)
+        t, r, s = math3d.decompose(self.values)
+        self._t, self._r, self._s = t, r, s
+
+    def _update(self):
+        self.values = math3d.compose(self._t, self._r, self._s)
+
+    def setTranslation(self, vector, space="transform"):
+        self._t = tuple(vector)[:3]
+        self._update()
+
+    def getTranslation(self, space="transform"):
+        return Vector(self._t)
+
+    def setRotation(self, rotation, *args):
+        if isinstance(rotation, Quaternion):
+            self._r = math3d.matrix_euler(math3d.quaternion_matrix(rotation.values))
+        else:
+            self._r = EulerRotation(rotation).radians()
+        self._update()
+
+    def getRotation(self):
+        return EulerRotation(*self._r, unit="radians")
+
+    def setScale(self, scale, space="transform"):
+        self._s = tuple(scale)[:3]
+        self._update()
+
+    def getScale(self, space="transform"):
+        return list(self._s)
+
+
+dt = types.SimpleNamespace(
+    Vector=Vector, Point=Point, Quaternion=Quaternion, EulerRotation=EulerRotation, Matrix=Matrix,
+    TransformationMatrix=TransformationMatrix,
+)
+datatypes = dt
+
+
+# ---- nodes and attributes
+
+class Attribute:
+    def __init__(self, node, path):
+        self.node = node
+        self.path = path
+
+    def name(self) -> str:
+        return f"{self.node.name()}.{self.path}"
+
+    def __str__(self):
+        return self.name()
+
+    def get(self):
+        return _cmds.getAttr(self.name())
+
+    def set(self, *values, **kwargs):
+        return _cmds.setAttr(self.name(), *values, **kwargs)
+
+    def isLocked(self) -> bool:
+        return _cmds.getAttr(self.name(), lock=True)
+
+    def isConnected(self) -> bool:
+        node, path = SCENE.parse_plug(self.name())
+        return path in node.inputs or path in node.outputs
+
+    def inputs(self) -> list:
+        return [PyNode(n) for n in _cmds.listConnections(self.name(), source=True, destination=False) or ()]
+
+    def __repr__(self):
+        return f"Attribute('{self.name()}')"
+
+
+class PyNode:
+    """A node, by its scene node so renames follow. PyNode(name) returns the class of the node type."""
+
+    def __new__(cls, name, *args):
+        if isinstance(name, PyNode):
+            node = name._node
+        elif isinstance(name, Node):
+            node = name
+        else:
+            CALLS["pm.PyNode"] += 1
+            try:
+                node = SCENE.find(str(name))
+            except ValueError:
+                raise MayaNodeError(f"No object matches name: {name}") from None
+        if cls is PyNode:
+            cls = _node_class(node)
+        instance = super().__new__(cls)
+        instance._node = node
+        return instance
+
+    def name(self) -> str:
+        return SCENE.partial_path(self._node)
+
+    def longName(self) -> str:
+        return self._node.full_path()
+
+    def nodeName(self) -> str:
+        return self._node.name
+
+    def nodeType(self) -> str:
+        return self._node.type.name
+
+    def exists(self) -> bool:
+        return self._node.alive
+
+    def __str__(self):
+        return self.name()
+
+    def __repr__(self):
+        return f"nt.{type(self).__name__}('{self.name()}')"
+
+    def __eq__(self, other):
+        return isinstance(other, PyNode) and other._node is self._node
+
+    def __hash__(self):
+        return hash(self._node.uid)
+
+    def hasAttr(self, attr) -> bool:
+        return self._node.attr(attr) is not None
+
+    def attr(self, attr) -> Attribute:
+        path = SCENE.canonical_path(self._node, attr)
+        if path is None:
+            raise AttributeError(f"{self.name()} has no attribute or method named '{attr}'")
+        return Attribute(self, path)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return self.attr(attr)
+
+    def getAttr(self, attr):
+        return self.attr(attr).get()
+
+    def setAttr(self, attr, *values, **kwargs):
+        return self.attr(attr).set(*values, **kwargs)
+
+    def rename(self, name):
+        SCENE.rename(self._node, name)
+        return self
+
+
+class DagNode(PyNode):
+    def getParent(self):
+        parent = self._node.parent
+        return PyNode(parent) if parent is not None else None
+
+    def getChildren(self) -> list:
+        return [PyNode(c) for c in self._node.children]
+
+    def getShapes(self) -> list:
+        return [PyNode(c) for c in self._node.children if c.type.shape]
+
+    def getShape(self):
+        shapes = self.getShapes()
+        return shapes[0] if shapes else None
+
+    def fullPath(self) -> str:
+        return self._node.full_path()
+
+
+def _counted(function):
+    key = "pm." + function.__name__
+
+    def wrapper(*args, **kwargs):
+        CALLS[key] += 1
+        return function(*args, **kwargs)
+
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    return wrapper
+
+
+class Transform(DagNode):
+    @_counted
+    def getTranslation(self, space="transform"):
+        if space == "world":
+            return Vector(math3d.translation(SCENE.world_matrix(self._node)))
+        return Vector(SCENE.plug_value(self._node, "translate"))
+
+    @_counted
+    def setTranslation(self, vector, space="transform"):
+        if space == "world":
+            matrix = list(SCENE.world_matrix(self._node))
+            matrix[12:15] = tuple(vector)[:3]
+            SCENE.set_world_matrix(self._node, tuple(matrix), rotate=False, scale=False)
+        else:
+            SCENE.set_plug(self._node, "translate", tuple(vector)[:3])
+
+    @_counted
+    def getRotation(self, space="transform", quaternion=False):
+        if space == "world":
+            rotation = math3d.matrix_euler(SCENE.world_matrix(self._node))
+        else:
+            rotation = SCENE.plug_value(self._node, "rotate")
+        euler = EulerRotation(*rotation, unit="radians")
+        return euler.asQuaternion() if quaternion else euler
+
+    @_counted
+    def setRotation(self, rotation, space="transform"):
+        if isinstance(rotation, Quaternion):
+            rotation_matrix = math3d.quaternion_matrix(rotation.values)
+        else:
+            rotation_matrix = math3d.euler_matrix(EulerRotation(rotation).radians())
+        if space == "world":
+            world = SCENE.world_matrix(self._node)
+            _, _, s = math3d.decompose(world)
+            scale = (s[0], 0.0, 0.0, 0.0, 0.0, s[1], 0.0, 0.0, 0.0, 0.0, s[2], 0.0, 0.0, 0.0, 0.0, 1.0)
+            matrix = math3d.multiply(scale, rotation_matrix)
+            SCENE.set_world_matrix(self._node, matrix[:12] + world[12:], translate=False, scale=False)
+        else:
+            SCENE.set_plug(self._node, "rotate", math3d.matrix_euler(rotation_matrix))
+
+    @_counted
+    def getScale(self):
+        return list(SCENE.plug_value(self._node, "scale"))
+
+    @_counted
+    def setScale(self, scale):
+        SCENE.set_plug(self._node, "scale", tuple(scale)[:3])
+
+    @_counted
+    def getMatrix(self, worldSpace=False):
+        if worldSpace:
+            return Matrix(SCENE.world_matrix(self._node))
+        return Matrix(SCENE.local_matrix(self._node))
+
+    @_counted
+    def setMatrix(self, matrix, worldSpace=False):
+        values = Matrix(matrix).values
+        if not worldSpace:
+            values = math3d.multiply(values, SCENE.parent_world_matrix(self._node))
+        SCENE.set_world_matrix(self._node, values)
+
+
+class Joint(Transform):
+    pass
+
+
+class Shape(DagNode):
+    pass
+
+
+class Mesh(Shape):
+    @_counted
+    def intersect(self, raySource, rayDirection, tolerance=1e-10, space="object"):
+        """(hit, points, face ids), world space only."""
+        hits = geometry.intersect(SCENE, self._node, tuple(raySource)[:3], tuple(rayDirection)[:3])
+        return bool(hits), [Point(point) for _, point, _ in hits], [face for _, _, face in hits]
+
+    @_counted
+    def getPolygonNormal(self, polygonId, space="preTransform"):
+        return Vector(geometry.face_normal(SCENE, self._node, polygonId, world=space == "world"))
+
+    def numFaces(self) -> int:
+        return len(self._node.data.get("faces", ()))
+
+    def numVertices(self) -> int:
+        return len(self._node.data.get("points", ()))
+
+
+class NurbsCurve(Shape):
+    pass
+
+
+class Locator(Shape):
+    pass
+
+
+class Camera(Shape):
+    pass
+
+
+class DependNode(PyNode):
+    pass
+
+
+_NODE_CLASSES = {
+    "joint": Joint, "transform": Transform, "mesh": Mesh, "nurbsCurve": NurbsCurve, "locator": Locator,
+    "camera": Camera, "shape": Shape, "dagNode": DagNode,
+}
+
+
+def _node_class(node):
+    for type_name in reversed(node.type.inherited):
+        cls = _NODE_CLASSES.get(type_name)
+        if cls is not None:
+            return cls
+    return DependNode
+
+
+nt = types.SimpleNamespace(
+    DependNode=DependNode, DagNode=DagNode, Transform=Transform, Joint=Joint, Shape=Shape, Mesh=Mesh,
+    NurbsCurve=NurbsCurve, Locator=Locator, Camera=Camera,
+)
+nodetypes = nt
+
+
+# ---- commands
+
+def selected(**kwargs) -> list:
+    CALLS["pm.selected"] += 1
+    return [PyNode(n) for n in SCENE.selection]
+
+
+def ls(*args, **kwargs) -> list:
+    return [PyNode(n) for n in _cmds.ls(*[str(a) for a in args], **kwargs) or ()]
+
+
+def select(*args, **kwargs):
+    return _cmds.select(*[_names(a) for a in args], **kwargs)
+
+
+def error(message):
+    CALLS["pm.error"] += 1
+    raise RuntimeError(message)
+
+
+def warning(message):
+    CALLS["pm.warning"] += 1
+    SCENE.warnings.append(str(message))
+
+
+def _names(value):
+    if isinstance(value, (list, tuple)):
+        return [_names(v) for v in value]
+    return str(value) if isinstance(value, (PyNode, Attribute)) else value
+
+
+# ---- UI, the fake cmds controls wrapped in objects with get / set methods
+
+class UI(str):
+    """A control name, with getX() / setX(value) as the query / edit of the flag x, and a context for layouts."""
+
+    kind = None
+
+    def __getattr__(self, attr):
+        if attr[:3] in ("get", "set") and len(attr) > 3:
+            flag = attr[3].lower() + attr[4:]
+            function = getattr(_cmds, self.kind)
+            if attr.startswith("get"):
+                return lambda: function(str(self), q=True, **{flag: True})
+            return lambda value=True: function(str(self), e=True, **{flag: value})
+        raise AttributeError(attr)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        _cmds.setParent("..")
+
+    def show(self):
+        _cmds.showWindow(str(self))
+
+    def delete(self):
+        _cmds.deleteUI(str(self))
+
+
+def _ui_command(kind):
+    cls = type(kind[0].upper() + kind[1:], (UI,), {"kind": kind})
+
+    def ui_command(*args, **kwargs):
+        result = getattr(_cmds, kind)(*args, **kwargs)
+        if not isinstance(result, str) or any(kwargs.get(flag) for flag in ("q", "query", "e", "edit")):
+            return result
+        return cls(result)
+
+    ui_command.__name__ = kind
+    return ui_command
+
+
+for _kind in (
+    "window", "columnLayout", "rowLayout", "rowColumnLayout", "frameLayout", "formLayout", "button", "separator",
+    "text", "textField", "textFieldButtonGrp", "intSliderGrp", "floatSliderGrp", "floatFieldGrp", "floatField",
+    "intField", "checkBox", "optionMenu", "menuItem",
+):
+    globals()[_kind] = _ui_command(_kind)
+del _kind
+
+
+def __getattr__(name):
+    # the commands without a PyMEL wrapper here are the fake cmds ones
+    function = getattr(_cmds, name, None)
+    if function is None or name.startswith("_"):
+        raise AttributeError(f"module 'pymel.core' has no attribute '{name}'")
+    return function
@@ -0,0 +1,1125 @@
+"""
+The in-memory scene behind the fake cmds, OpenMaya and pymel modules.
+
+Nodes have a type, attributes with defaults, values in internal units (cm, radians, frames), connections and,
+for the dag nodes, a parent. Plugs are (node, path) pairs, the path using long names: "translateX",
+"target[0].targetWeight". A plug value is evaluated on read: a connected plug reads its source, an anim curve
+interpolates its keys at the evaluation time, the world space outputs (worldMatrix, worldPosition, constraints,
+motion paths) are computed from their inputs. Nothing is cached.
+
+It is a stand-in for benchmarks and tests, not a DG: anim curves interpolate linearly, only the xyz rotate order is
+supported, constraints ignore their offsets, pivots and shear don't exist.
+"""
+
+import bisect
+import collections
+import fnmatch
+import itertools
+import math
+import re
+import sys
+import traceback
+
+from . import math3d
+
+# calls of the fake commands, by "module.command", see fake_maya.counters()
+CALLS = collections.Counter()
+
+FPS = {"film": 24.0, "game": 15.0, "pal": 25.0, "ntsc": 30.0, "show": 48.0, "palf": 50.0, "ntscf": 60.0}
+
+_PATH_ELEMENT = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)(?:\[(\d+)\])?$")
+_VALID_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_:]*$")
+_TRAILING_DIGITS = re.compile(r"\d+$")
+
+
+def count(name):
+    CALLS[name] += 1
+
+
+# ---- attributes
+
+class Attr:
+    """
+    An attribute definition, static (shared by a node type) or dynamic (added to one node).
+
+    kind: double, float, bool, long, enum, distance, angle, time, double3 (numeric compound), compound, matrix,
+    message, string, or a geometry type (mesh, nurbsCurve). multi attributes hold elements, attr[0].
+    """
+
+    __slots__ = ("name", "short", "kind", "default", "keyable", "children", "parent", "multi", "dynamic",
+                 "enum_names", "minimum", "maximum", "readable", "writable")
+
+    NUMERIC = frozenset({"double", "float", "bool", "long", "short", "byte"})
+    UNIT = frozenset({"distance", "angle", "time"})
+
+    def __init__(self, name, short=None, kind="double", default=0.0, keyable=False, children=(), multi=False,
+                 dynamic=False, enum_names=None, minimum=None, maximum=None, readable=True, writable=True):
+        self.name = name
+        self.short = short or name
+        self.kind = kind
+        self.default = default
+        self.keyable = keyable
+        self.children = list(children)
+        self.parent = None
+        self.multi = multi
+        self.dynamic = dynamic
+        self.enum_names = enum_names
+        self.minimum = minimum
+        self.maximum = maximum
+        self.readable = readable
+        self.writable = writable
+        for child in self.children:
+            child.parent = self
+
+    @property
+    def compound(self) -> bool:
+        return bool(self.children)
+
+    def walk(self):
+        """self then its children, depth first."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def __repr__(self):
+        return f"<Attr {self.name}>"
+
+
+def vector_attr(name, short, kind, default=0.0, keyable=True, suffix="XYZ", dynamic=False):
+    """A numeric compound of three children, translate -> translateX, translateY, translateZ."""
+    children = [
+        Attr(name + axis, short + axis.lower(), kind, default, keyable, dynamic=dynamic)
+        for axis in suffix
+    ]
+    defaults = (default,) * 3
+    return Attr(name, short, "double3", defaults, keyable, children, dynamic=dynamic)
+
+
+def to_ui(attr, value):
+    """Internal to UI units (degrees for angles), what cmds show."""
+    if attr is not None and attr.kind == "angle":
+        return math.degrees(value)
+    return value
+
+
+def from_ui(attr, value):
+    if attr is not None and attr.kind == "angle":
+        return math.radians(value)
+    return value
+
+
+# ---- node types
+
+class NodeType:
+    """A node type: its MFn function sets, attributes, and computed outputs {attr name: compute(scene, node, path)}."""
+
+    def __init__(self, name, parent=None, fns=(), attrs=(), computes=None, shape=False):
+        self.name = name
+        self.parent = parent
+        self.fns = set(parent.fns if parent else ()) | set(fns)
+        self.attrs = list(parent.attrs if parent else ()) + list(attrs)
+        self.computes = dict(parent.computes if parent else {})
+        self.computes.update(computes or {})
+        self.inherited = (parent.inherited if parent else ()) + (name,)
+        self.shape = shape or bool(parent and parent.shape)
+        self.by_name = {}
+        self.flat = []
+        for attr in self.attrs:
+            for a in attr.walk():
+                self.flat.append(a)
+                self.by_name[a.name] = a
+                self.by_name.setdefault(a.short, a)
+
+    def isa(self, type_name) -> bool:
+        return type_name in self.inherited
+
+    @property
+    def dag(self) -> bool:
+        return self.isa("dagNode")
+
+
+TYPES = {}
+
+
+def register_type(name, parent=None, **kwargs) -> NodeType:
+    node_type = NodeType(name, TYPES[parent] if parent else None, **kwargs)
+    TYPES[name] = node_type
+    return node_type
+
+
+def _world_matrix(scene, node, path):
+    return scene.world_matrix(node)
+
+
+def _world_inverse_matrix(scene, node, path):
+    return math3d.inverse(scene.world_matrix(node))
+
+
+def _parent_matrix(scene, node, path):
+    return scene.world_matrix(node.parent) if node.parent is not None else math3d.IDENTITY
+
+
+def _parent_inverse_matrix(scene, node, path):
+    return math3d.inverse(_parent_matrix(scene, node, path))
+
+
+def _locator_world_position(scene, node, path):
+    return math3d.translation(scene.world_matrix(node))
+
+
+def _anim_curve_output(scene, node, path):
+    return node.data["curve"].evaluate(scene.evaluation_time())
+
+
+def _curve_world_space(scene, node, path):
+    return node  # the geometry itself, read by the motion path
+
+
+def _motion_path_coordinates(scene, node, path):
+    u = scene.plug_value(node, "uValue")
+    source = node.inputs.get("geometryPath")
+    if source is None:
+        return (0.0, 0.0, 0.0)
+    curve = source[0]
+    matrix = scene.world_matrix(curve)
+    points = [math3d.transform_point(p, matrix) for p in curve.data.get("points", [(0.0, 0.0, 0.0)])]
+    if scene.plug_value(node, "fractionMode"):
+        return polyline_point(points, u)
+    return polyline_point(points, u / max(len(points) - 1, 1))
+
+
+def polyline_point(points, fraction):
+    """Point at fraction (0-1) of the length of the polyline through points."""
+    if len(points) == 1:
+        return points[0]
+    lengths = [math3d.length(math3d.sub(b, a)) for a, b in zip(points, points[1:])]
+    total = sum(lengths)
+    if total < math3d.EPSILON:
+        return points[0]
+    remaining = max(0.0, min(1.0, fraction)) * total
+    for (a, b), size in zip(zip(points, points[1:]), lengths):
+        if remaining <= size and size > 0.0:
+            return math3d.add(a, math3d.scale(math3d.sub(b, a), remaining / size))
+        remaining -= size
+    return points[-1]
+
+
+def _constraint_targets(scene, node):
+    """(world matrix, weight) of every connected target."""
+    targets = []
+    for index in node.element_indices("target"):
+        source = node.inputs.get(f"target[{index}].targetParentMatrix")
+        if source is None:
+            source = node.inputs.get(f"target[{index}].targetGeometry")
+        if source is None:
+            continue
+        weight = scene.plug_value(node, f"target[{index}].targetWeight")
+        targets.append((scene.world_matrix(source[0]), weight))
+    return targets
+
+
+def _driven_parent_inverse(scene, node):
+    driven = scene.constraint_driven(node)
+    if driven is None or driven.parent is None:
+        return math3d.IDENTITY
+    return math3d.inverse(scene.world_matrix(driven.parent))
+
+
+def _constraint_translate(scene, node, path):
+    targets = _constraint_targets(scene, node)
+    total = sum(w for _, w in targets)
+    if not targets or total <= 0.0:
+        return (0.0, 0.0, 0.0)
+    world = (0.0, 0.0, 0.0)
+    for matrix, weight in targets:
+        world = math3d.add(world, math3d.scale(math3d.translation(matrix), weight / total))
+    return math3d.transform_point(world, _driven_parent_inverse(scene, node))
+
+
+def _constraint_rotate(scene, node, path):
+    targets = _constraint_targets(scene, node)
+    if not targets:
+        return (0.0, 0.0, 0.0)
+    matrix = max(targets, key=lambda t: t[1])[0]  # no blending, the heaviest target wins
+    local = math3d.multiply(matrix, _driven_parent_inverse(scene, node))
+    return math3d.matrix_euler(local)
+
+
+def _constraint_scale(scene, node, path):
+    targets = _constraint_targets(scene, node)
+    total = sum(w for _, w in targets)
+    if not targets or total <= 0.0:
+        return (1.0, 1.0, 1.0)
+    result = (0.0, 0.0, 0.0)
+    for matrix, weight in targets:
+        result = math3d.add(result, math3d.scale(math3d.decompose(matrix)[2], weight / total))
+    return result
+
+
+def _register_types():
+    register_type("dependNode", attrs=[
+        Attr("message", "msg", "message"),
+        Attr("nodeState", "nds", "enum", 0, enum_names=["Normal", "HasNoEffect", "Blocking"]),
+    ])
+    register_type("dagNode", "dependNode", fns=("kDagNode",), attrs=[
+        Attr("visibility", "v", "bool", True, keyable=True),
+        Attr("worldMatrix", "wm", "matrix", math3d.IDENTITY, multi=True, writable=False),
+        Attr("worldInverseMatrix", "wim", "matrix", math3d.IDENTITY, multi=True, writable=False),
+        Attr("parentMatrix", "pm", "matrix", math3d.IDENTITY, multi=True, writable=False),
+        Attr("parentInverseMatrix", "pim", "matrix", math3d.IDENTITY, multi=True, writable=False),
+    ], computes={
+        "worldMatrix": _world_matrix, "worldInverseMatrix": _world_inverse_matrix,
+        "parentMatrix": _parent_matrix, "parentInverseMatrix": _parent_inverse_matrix,
+    })
+    register_type("transform", "dagNode", fns=("kTransform",), attrs=[
+        vector_attr("translate", "t", "distance"),
+        vector_attr("rotate", "r", "angle"),
+        vector_attr("scale", "s", "double", 1.0),
+        Attr("rotateOrder", "ro", "enum", 0, enum_names=["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]),
+        Attr("offsetParentMatrix", "opm", "matrix", math3d.IDENTITY),
+        Attr("inheritsTransform", "it", "bool", True),
+    ])
+    register_type("joint", "transform", fns=("kJoint",), attrs=[
+        vector_attr("jointOrient", "jo", "angle", keyable=False),
+        Attr("radius", "radi", "double", 1.0),
+    ])
+    register_type("shape", "dagNode", fns=("kShape",), shape=True)
+    register_type("locator", "shape", fns=("kLocator",), attrs=[
+        vector_attr("localPosition", "lp", "distance", keyable=False),
+        vector_attr("worldPosition", "wp", "distance", keyable=False),
+    ], computes={"worldPosition": _locator_world_position})
+    register_type("mesh", "shape", fns=("kMesh",), attrs=[
+        Attr("inMesh", "i", "mesh"),
+        Attr("outMesh", "o", "mesh", writable=False),
+        Attr("worldMesh", "w", "mesh", multi=True, writable=False),
+    ])
+    register_type("nurbsCurve", "shape", fns=("kNurbsCurve",), attrs=[
+        Attr("create", "cr", "nurbsCurve"),
+        Attr("local", "l", "nurbsCurve", writable=False),
+        Attr("worldSpace", "ws", "nurbsCurve", multi=True, writable=False),
+    ], computes={"worldSpace": _curve_world_space})
+    register_type("camera", "shape", fns=("kCamera",), attrs=[
+        Attr("focalLength", "fl", "double", 35.0, keyable=True),
+        Attr("horizontalFilmAperture", "hfa", "double", 1.417),
+        Attr("verticalFilmAperture", "vfa", "double", 0.945),
+    ])
+
+    register_type("animCurve", "dependNode", fns=("kAnimCurve",), attrs=[Attr("input", "i", "time")])
+    for suffix, kind in (("TL", "distance"), ("TA", "angle"), ("TU", "double"), ("TT", "time")):
+        register_type(f"animCurve{suffix}", "animCurve", attrs=[
+            Attr("output", "o", kind, writable=False),
+        ], computes={"output": _anim_curve_output})
+
+    register_type("motionPath", "dependNode", fns=("kMotionPath",), attrs=[
+        Attr("uValue", "u", "double", 0.0, keyable=True),
+        Attr("fractionMode", "fm", "bool", False),
+        Attr("follow", "f", "bool", False),
+        Attr("geometryPath", "gp", "nurbsCurve"),
+        vector_attr("allCoordinates", "ac", "distance", keyable=False, suffix=("X", "Y", "Z")),
+    ], computes={"allCoordinates": _motion_path_coordinates})
+    # allCoordinates children are xCoordinate... in Maya
+    motion_path = TYPES["motionPath"]
+    for child, name, short in zip(motion_path.by_name["allCoordinates"].children,
+                                  ("xCoordinate", "yCoordinate", "zCoordinate"), ("xc", "yc", "zc")):
+        del motion_path.by_name[child.name]
+        del motion_path.by_name[child.short]
+        child.name, child.short = name, short
+        motion_path.by_name[name] = motion_path.by_name[short] = child
+
+    register_type("objectSet", "dependNode", fns=("kSet",), attrs=[Attr("dagSetMembers", "dsm", "message", multi=True)])
+    register_type("character", "objectSet", fns=("kCharacter",))
+    register_type("polyCreator", "dependNode", fns=("kPolyCreator",), attrs=[Attr("output", "out", "mesh")])
+    register_type("polyPlane", "polyCreator", attrs=[
+        Attr("width", "w", "distance", 1.0), Attr("height", "h", "distance", 1.0),
+        Attr("subdivisionsWidth", "sw", "long", 10), Attr("subdivisionsHeight", "sh", "long", 10),
+    ])
+    register_type("polyCube", "polyCreator", attrs=[
+        Attr("width", "w", "distance", 1.0), Attr("height", "h", "distance", 1.0), Attr("depth", "d", "distance", 1.0),
+    ])
+
+    def target(*extra):
+        return Attr("target", "tg", "compound", None, children=[
+            Attr("targetParentMatrix", "tpm", "matrix", math3d.IDENTITY),
+            Attr("targetWeight", "tw", "double", 1.0, keyable=True),
+            vector_attr("targetTranslate", "tt", "distance", keyable=False),
+            vector_attr("targetRotate", "tr", "angle", keyable=False),
+            vector_attr("targetScale", "ts", "double", 1.0, keyable=False),
+            *extra,
+        ], multi=True)
+
+    def outputs(*names):
+        built = {
+            "translate": vector_attr("constraintTranslate", "ct", "distance", keyable=False),
+            "rotate": vector_attr("constraintRotate", "cr", "angle", keyable=False),
+            "scale": vector_attr("constraintScale", "cs", "double", 1.0, keyable=False),
+        }
+        return [built[n] for n in names] + [Attr("constraintParentInverseMatrix", "cpim", "matrix", math3d.IDENTITY)]
+
+    computes = {
+        "constraintTranslate": _constraint_translate,
+        "constraintRotate": _constraint_rotate,
+        "constraintScale": _constraint_scale,
+    }
+    register_type("constraint", "transform", fns=("kConstraint",), computes=computes)
+
+    def offset():
+        return vector_attr("offset", "o", "double", keyable=False)
+
+    def interp():
+        return Attr("interpType", "int", "enum", 1, enum_names=["No Flip", "Average", "Shortest", "Longest", "Cache"])
+
+    def aim_settings():
+        return [
+            vector_attr("aimVector", "a", "double", keyable=False),
+            vector_attr("upVector", "u", "double", keyable=False),
+            vector_attr("worldUpVector", "wu", "double", keyable=False),
+            Attr("worldUpType", "wut", "enum", 3, enum_names=["scene", "object", "objectrotation", "vector", "none"]),
+            Attr("worldUpMatrix", "wum", "matrix", math3d.IDENTITY),
+        ]
+
+    register_type("parentConstraint", "constraint", fns=("kParentConstraint",), attrs=[
+        target(vector_attr("targetOffsetTranslate", "tot", "distance", keyable=False),
+               vector_attr("targetOffsetRotate", "tor", "angle", keyable=False)),
+        interp(), *outputs("translate", "rotate"),
+    ])
+    register_type("pointConstraint", "constraint", fns=("kPointConstraint",), attrs=[
+        target(), offset(), *outputs("translate"),
+    ])
+    register_type("orientConstraint", "constraint", fns=("kOrientConstraint",), attrs=[
+        target(), offset(), interp(), *outputs("rotate"),
+    ])
+    register_type("scaleConstraint", "constraint", fns=("kScaleConstraint",), attrs=[
+        target(), offset(), *outputs("scale"),
+    ])
+    register_type("aimConstraint", "constraint", fns=("kAimConstraint",), attrs=[
+        target(), offset(), *aim_settings(), *outputs("rotate"),
+    ])
+    register_type("poleVectorConstraint", "constraint", fns=("kPoleVectorConstraint",), attrs=[
+        target(), *outputs("translate"),
+    ])
+    for name in ("geometryConstraint", "normalConstraint", "tangentConstraint"):
+        register_type(name, "constraint", attrs=[
+            Attr("target", "tg", "compound", None, children=[
+                Attr("targetGeometry", "tgm", "mesh"),
+                Attr("targetWeight", "tw", "double", 1.0, keyable=True),
+            ], multi=True),
+            *outputs("translate" if name == "geometryConstraint" else "rotate"),
+        ])
+    for aim_like in ("normalConstraint", "tangentConstraint"):
+        node_type = TYPES[aim_like]
+        for attr in aim_settings():
+            node_type.attrs.append(attr)
+            for a in attr.walk():
+                node_type.flat.append(a)
+                node_type.by_name[a.name] = a
+                node_type.by_name.setdefault(a.short, a)
+    TYPES["aimConstraint"].by_name["aimVector"].default = (1.0, 0.0, 0.0)
+    for child, value in zip(TYPES["aimConstraint"].by_name["aimVector"].children, (1.0, 0.0, 0.0)):
+        child.default = value
+    for type_name in ("aimConstraint", "normalConstraint", "tangentConstraint"):
+        for name, values in (("upVector", (0.0, 1.0, 0.0)), ("worldUpVector", (0.0, 1.0, 0.0))):
+            attr = TYPES[type_name].by_name[name]
+            attr.default = values
+            for child, value in zip(attr.children, values):
+                child.default = value
+
+
+_register_types()
+
+
+# ---- anim curves
+
+class AnimCurve:
+    """Keys of an anim curve, (time, value) sorted by time, values in internal units. Linear interpolation."""
+
+    __slots__ = ("times", "values", "selected")
+
+    def __init__(self):
+        self.times = []
+        self.values = []
+        self.selected = set()  # selected key times
+
+    def __len__(self):
+        return len(self.times)
+
+    def index(self, time):
+        i = bisect.bisect_left(self.times, time - 1e-6)
+        if i < len(self.times) and abs(self.times[i] - time) <= 1e-6:
+            return i
+        return None
+
+    def set_key(self, time, value):
+        i = self.index(time)
+        if i is not None:
+            self.values[i] = value
+            return
+        i = bisect.bisect_left(self.times, time)
+        self.times.insert(i, time)
+        self.values.insert(i, value)
+
+    def remove(self, indices):
+        for i in sorted(indices, reverse=True):
+            self.selected.discard(self.times[i])
+            del self.times[i]
+            del self.values[i]
+
+    def in_range(self, start=None, end=None) -> list:
+        """Key indices with start <= time <= end."""
+        return [
+            i for i, t in enumerate(self.times)
+            if (start is None or t >= start - 1e-6) and (end is None or t <= end + 1e-6)
+        ]
+
+    def evaluate(self, time):
+        times = self.times
+        if not times:
+            return 0.0
+        if time <= times[0]:
+            return self.values[0]
+        if time >= times[-1]:
+            return self.values[-1]
+        i = bisect.bisect_right(times, time)
+        t0, t1 = times[i - 1], times[i]
+        v0, v1 = self.values[i - 1], self.values[i]
+        return v0 + (v1 - v0) * (time - t0) / (t1 - t0)
+
+    def snapshot(self):
+        return list(self.times), list(self.values), set(self.selected)
+
+    def restore(self, snapshot):
+        self.times, self.values, self.selected = list(snapshot[0]), list(snapshot[1]), set(snapshot[2])
+
+
+# ---- nodes
+
+class Node:
+    """One node. values, inputs and outputs are keyed by plug path, with long names."""
+
+    _uids = itertools.count(1)
+
+    def __init__(self, node_type, name):
+        self.type = node_type
+        self.name = name
+        self.uid = next(Node._uids)
+        self.parent = None
+        self.children = []
+        self.values = {}
+        self.inputs = {}   # path -> (source node, source path)
+        self.outputs = {}  # path -> [(destination node, destination path)]
+        self.locked = set()
+        self.dynamic = {}  # name and short name -> Attr
+        self.dynamic_order = []
+        self.elements = {}  # multi attribute path -> set of indices
+        self.data = {}  # geometry, anim curve keys...
+        self.referenced = False
+        self.alive = True
+        self.scene = None
+
+    def __repr__(self):
+        return f"<Node {self.type.name} {self.name}>"
+
+    # attribute lookup
+    def attr(self, name):
+        """The Attr of name (long or short), None if the node has no such attribute."""
+        attr = self.dynamic.get(name)
+        if attr is None:
+            attr = self.type.by_name.get(name)
+        return attr
+
+    def attributes(self) -> list:
+        """Every attribute, children included, static first."""
+        return self.type.flat + [a for attr in self.dynamic_order for a in attr.walk()]
+
+    def element_indices(self, path) -> list:
+        return sorted(self.elements.get(path, ()))
+
+    def _note_elements(self, path):
+        # records the indices of the multi attributes along path
+        prefix = []
+        for part in path.split("."):
+            match = _PATH_ELEMENT.match(part)
+            if match and match.group(2) is not None:
+                self.elements.setdefault(".".join(prefix + [match.group(1)]), set()).add(int(match.group(2)))
+            prefix.append(part)
+
+    def has_fn(self, fn) -> bool:
+        return fn in self.type.fns
+
+    @property
+    def dag(self) -> bool:
+        return self.type.dag
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def full_path(self) -> str:
+        if not self.dag:
+            return self.name
+        names = [self.name] + [a.name for a in self.ancestors()]
+        return "|" + "|".join(reversed(names))
+
+    def descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.descendants()
+
+
+class Scene:
+    """Nodes, selection, time, undo chunks, callbacks and the deferred queue of a fake Maya session."""
+
+    def __init__(self):
+        self.nodes = {}  # uid -> Node, creation order
+        self.by_name = {}  # short name -> [Node]
+        self.selection = []
+        self.time = 1.0
+        self.context_time = None  # MDGContext evaluation time, None for the current time
+        self.playback = {"min": 1.0, "max": 120.0, "animationStartTime": 1.0, "animationEndTime": 120.0}
+        self.time_unit = "film"
+        self.overrides = {}  # (uid, path) -> (value, time): setAttr on a keyed plug, until the time changes
+        self.undo_queue = []
+        self.redo_queue = []
+        self.chunk_depth = 0
+        self.chunk_names = []
+        self.autokey = False
+        self.idle_build = True
+        self.refresh_suspended = False
+        self.deferred = []
+        self.warnings = []
+        self.messages = []
+        self.ui = {}  # control name -> {flag: value}
+        self.ui_counter = itertools.count(1)
+        self.channel_box_selection = None
+        self.prompt_text = ""
+        self.callbacks = {}  # id -> (event, key, function, client data)
+        self.callback_ids = itertools.count(1)
+        self.mel_globals = {"$gChannelBoxName": "mainChannelBox", "$gMainWindow": "MayaWindow"}
+        self.plugins = {}
+        self.namespaces = set()
+        self.batch = False  # cm.about(batch=True), a GUI session by default so the refresh calls are made
+        self.prompt_button = "OK"
+        self.file_name = ""
+
+    def clear(self):
+        """Empty the scene, what File > New does. Callbacks, UI, plugins and session settings are kept."""
+        self.emit("scene", "before_new")
+        for node in list(self.nodes.values()):
+            node.alive = False
+        self.nodes.clear()
+        self.by_name.clear()
+        self.selection.clear()
+        self.overrides.clear()
+        self.namespaces.clear()
+        self.undo_queue.clear()
+        self.redo_queue.clear()
+        self.deferred.clear()
+        self.warnings.clear()
+        self.messages.clear()
+        self.time = 1.0
+        self.context_time = None
+        self.playback = {"min": 1.0, "max": 120.0, "animationStartTime": 1.0, "animationEndTime": 120.0}
+        self.channel_box_selection = None
+        self.file_name = ""
+        self.emit("scene", "after_new")
+
+    # ---- names
+
+    def _index(self, node):
+        self.by_name.setdefault(node.name, []).append(node)
+
+    def _unindex(self, node):
+        nodes = self.by_name.get(node.name)
+        if nodes:
+            nodes.remove(node)
+            if not nodes:
+                del self.by_name[node.name]
+
+    def name_free(self, name, parent=None, dag=True, ignore=None) -> bool:
+        """A dag node name is unique among its siblings and against the dg nodes, a dg node name is unique."""
+        for other in self.by_name.get(name, ()):
+            if other is ignore:
+                continue
+            if not dag or not other.dag or other.parent is parent:
+                return False
+        return True
+
+    def unique_name(self, name, parent=None, dag=True, ignore=None) -> str:
+        """name, or name with the next free number when it is taken, like Maya."""
+        if not _VALID_NAME.match(name.replace("#", "1")):
+            raise RuntimeError(f"New name has no legal characters: {name}")
+        if "#" in name:
+            base = name
+            number = 1
+            while True:
+                candidate = re.sub(r"#+", lambda m: str(number).zfill(len(m.group())), base, count=1)
+                if self.name_free(candidate, parent, dag, ignore):
+                    return candidate
+                number += 1
+        if self.name_free(name, parent, dag, ignore):
+            return name
+        base = _TRAILING_DIGITS.sub("", name)
+        match = _TRAILING_DIGITS.search(name)
+        number = int(match.group()) + 1 if match else 1
+        while not self.name_free(f"{base}{number}", parent, dag, ignore):
+            number += 1
+        return f"{base}{number}"
+
+    def partial_path(self, node) -> str:
+        """Shortest unique name of node."""
+        if not node.dag or len(self.by_name.get(node.name, ())) <= 1:
+            return node.name
+        parts = node.full_path().split("|")[1:]
+        for size in range(2, len(parts) + 1):
+            suffix = "|".join(parts[-size:])
+            matches = [n for n in self.by_name[node.name] if n.full_path().endswith("|" + suffix)]
+            if len(matches) == 1:
+                return suffix if size < len(parts) else "|" + suffix
+        return node.full_path()
+
+    def find(self, name, required=True):
+        """The node of a name, short, partial or full path. Raises ValueError (or returns None) when missing."""
+        node = None
+        if isinstance(name, Node):
+            node = name if name.alive else None
+        elif "|" in name:
+            parts = [p for p in name.split("|") if p]
+            if name.startswith("|"):  # walked down from the root, not searched among the nodes of the same name
+                matches = [n for n in self.by_name.get(parts[0], ()) if n.dag and n.parent is None]
+                for part in parts[1:]:
+                    matches = [child for n in matches for child in n.children if child.name == part]
+            else:
+                candidates = [n for n in self.by_name.get(parts[-1], ()) if n.dag]
+                matches = [n for n in candidates if n.full_path().split("|")[1:][-len(parts):] == parts]
+            if len(matches) > 1:
+                raise ValueError(f"More than one object matches name: {name}")
+            node = matches[0] if matches else None
+        else:
+            matches = self.by_name.get(name, ())
+            if len(matches) > 1:
+                raise ValueError(f"More than one object matches name: {name}")
+            node = matches[0] if matches else None
+        if node is None and required:
+            raise ValueError(f"No object matches name: {name}")
+        return node
+
+    def match(self, pattern) -> list:
+        """Nodes matching a name or a wildcard pattern."""
+        if isinstance(pattern, Node):
+            return [pattern] if pattern.alive else []
+        if not any(c in pattern for c in "*?["):
+            try:
+                node = self.find(pattern, required=False)
+            except ValueError:
+                return [n for n in self.by_name.get(pattern.rpartition("|")[2], ())]
+            return [node] if node is not None else []
+        short = pattern.rpartition("|")[2]
+        return [n for n in self.nodes.values() if fnmatch.fnmatchcase(n.name, short)]
+
+    # ---- nodes
+
+    def create_node(self, type_name, name=None, parent=None, shape_parent=True, referenced=False) -> Node:
+        node_type = TYPES.get(type_name)
+        if node_type is None:
+            raise RuntimeError(f"Unknown object type: {type_name}")
+        if node_type.shape and parent is None and shape_parent:
+            parent = self.create_node("transform", self.unique_name(_transform_name(type_name, name)))
+            name = name or parent.name + "Shape"
+        node = self.new_node(type_name, name)
+        node.referenced = referenced
+        return self.insert(node, parent)
+
+    def new_node(self, type_name, name=None) -> Node:
+        """A node not in the scene yet, see insert(). What a modifier holds between createNode and doIt."""
+        node_type = TYPES.get(type_name)
+        if node_type is None:
+            raise RuntimeError(f"Unknown object type: {type_name}")
+        node = Node(node_type, name or type_name[0].lower() + type_name[1:] + "#")
+        node.scene = self
+        if node_type.isa("animCurve"):
+            node.data["curve"] = AnimCurve()
+        return node
+
+    def insert(self, node, parent=None) -> Node:
+        node.name = self.unique_name(node.name, parent, node.dag)
+        node.alive = True
+        self.nodes[node.uid] = node
+        self._index(node)
+        if parent is not None:
+            self.set_parent(node, parent)
+        self.emit("node_added", node.type, node)
+        return node
+
+    def set_parent(self, node, parent):
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        node.parent = parent
+        if parent is not None:
+            parent.children.append(node)
+
+    def rename(self, node, new_name) -> str:
+        previous = node.name
+        new_name = self.unique_name(new_name, node.parent, node.dag, ignore=node)
+        if new_name == previous:
+            return new_name
+        self._unindex(node)
+        node.name = new_name
+        self._index(node)
+        self.emit("name_changed", node, node, previous)
+        return new_name
+
+    def delete(self, node) -> list:
+        """
+        Delete node, its dag children, and the anim curves only driving it.
+        Returns the records to undo it with undelete(): (node, parent, inputs, outputs), in deletion order.
+        """
+        if not node.alive:
+            return []
+        records = []
+        for child in list(node.children):
+            records += self.delete(child)
+        curves = [
+            src for src, _ in node.inputs.values()
+            if src.has_fn("kAnimCurve") and all(dst is node for dsts in src.outputs.values() for dst, _ in dsts)
+        ]
+        records.append((
+            node, node.parent, list(node.inputs.items()),
+            [(path, dst, dst_path) for path, dsts in node.outputs.items() for dst, dst_path in dsts],
+        ))
+        self.emit("node_removed", node.type, node)
+        for path in list(node.inputs):
+            self.disconnect(node.inputs[path][0], node.inputs[path][1], node, path)
+        for path, destinations in list(node.outputs.items()):
+            for dst, dst_path in list(destinations):
+                self.disconnect(node, path, dst, dst_path)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+            node.parent = None
+        if node in self.selection:
+            self.selection.remove(node)
+        self._unindex(node)
+        del self.nodes[node.uid]
+        node.alive = False
+        for curve in curves:
+            records += self.delete(curve)
+        return records
+
+    def undelete(self, records):
+        """Put deleted nodes back with their connections, the records of delete()."""
+        for node, parent, _, _ in reversed(records):
+            node.alive = True
+            self.nodes[node.uid] = node
+            self._index(node)
+            if parent is not None:
+                self.set_parent(node, parent)
+            self.emit("node_added", node.type, node)
+        for node, _, inputs, outputs in records:
+            for path, (src, src_path) in inputs:
+                if src.alive:
+                    self.connect(src, src_path, node, path)
+            for path, dst, dst_path in outputs:
+                if dst.alive:
+                    self.connect(node, path, dst, dst_path)
+
+    def ls(self, type_name=None) -> list:
+        nodes = list(self.nodes.values())
+        if type_name:
+            nodes = [n for n in nodes if n.type.isa(type_name)]
+        return nodes
+
+    # ---- plugs
+
+    def parse_plug(self, plug_name, required=True):
+        """'node.attr' -> (node, canonical path). Raises ValueError when the node or the attribute is missing."""
+        node_name, _, path = plug_name.partition(".")
+        node = self.find(node_name, required)
+        if node is None:
+            return None
+        canonical = self.canonical_path(node, path)
+        if canonical is None:
+            if required:
+                raise ValueError(f"No object matches name: {plug_name}")
+            return None
+        return node, canonical
+
+    def canonical_path(self, node, path):
+        """path with long names, 'tg[0].tw' -> 'target[0].targetWeight'. None when an attribute is missing."""
+        parts = []
+        for part in path.split("."):
+            match = _PATH_ELEMENT.match(part)
+            if not match:
+                return None
+            attr = node.attr(match.group(1))
+            if attr is None:
+                return None
+            if parts and attr.parent is not None and not attr.parent.multi and parts[-1] == attr.parent.name:
+                parts.pop()  # translate.translateX -> translateX
+            parts.append(attr.name if match.group(2) is None else f"{attr.name}[{match.group(2)}]")
+        return ".".join(parts)
+
+    def plug_attr(self, node, path):
+        return node.attr(_leaf_name(path))
+
+    def plug_name(self, node, path) -> str:
+        return f"{self.partial_path(node)}.{path}"
+
+    def connect(self, src, src_path, dst, dst_path, force=True):
+        """Connect two plugs, a compound to a compound is connected child by child, like translate -> translate."""
+        src_attr = self.plug_attr(src, src_path)
+        dst_attr = self.plug_attr(dst, dst_path)
+        if (src_attr is not None and dst_attr is not None and src_attr.kind == "double3"
+                and len(src_attr.children) == len(dst_attr.children) == 3):
+            for src_child, dst_child in zip(src_attr.children, dst_attr.children):
+                self.connect(src, _child_path(src_path, src_child.name), dst, _child_path(dst_path, dst_child.name), force)
+            return
+        existing = dst.inputs.get(dst_path)
+        if existing is not None:
+            if existing == (src, src_path):
+                return
+            if not force:
+                raise RuntimeError(f"{dst.name}.{dst_path} already has an incoming connection.")
+            self.disconnect(existing[0], existing[1], dst, dst_path)
+        dst.inputs[dst_path] = (src, src_path)
+        src.outputs.setdefault(src_path, []).append((dst, dst_path))
+        src._note_elements(src_path)
+        dst._note_elements(dst_path)
+        self.emit("connection", None, src, src_path, dst, dst_path, True)
+
+    def disconnect(self, src, src_path, dst, dst_path):
+        if dst.inputs.get(dst_path) == (src, src_path):
+            del dst.inputs[dst_path]
+        destinations = src.outputs.get(src_path)
+        if destinations and (dst, dst_path) in destinations:
+            destinations.remove((dst, dst_path))
+            if not destinations:
+                del src.outputs[src_path]
+            self.emit("connection", None, src, src_path, dst, dst_path, False)
+
+    def source(self, node, path):
+        """(node, path) driving the plug, None when it is free."""
+        return node.inputs.get(path)
+
+    def evaluation_time(self) -> float:
+        return self.time if self.context_time is None else self.context_time
+
+    def plug_value(self, node, path, depth=0):
+        """Value of a plug in internal units, a tuple for compounds."""
+        if depth > 100:
+            raise RuntimeError(f"Cycle while evaluating {node.name}.{path}")
+        source = self.source(node, path)
+        if source is not None:
+            override = self.overrides.get((node.uid, path))
+            if override is not None and override[1] == self.time and self.context_time is None:
+                return override[0]
+            return self.plug_value(source[0], source[1], depth + 1)
+        attr = self.plug_attr(node, path)
+        if attr is None:
+            raise RuntimeError(f"Unknown attribute {node.name}.{path}")
+        compute = node.type.computes.get(attr.name)
+        if compute is not None:
+            return compute(self, node, path)
+        if attr.parent is not None and attr.parent.name in node.type.computes and not attr.parent.multi:
+            parent_value = node.type.computes[attr.parent.name](self, node, path)
+            return parent_value[attr.parent.children.index(attr)]
+        if attr.children:
+            return tuple(self.plug_value(node, _child_path(path, child.name), depth + 1) for child in attr.children)
+        value = node.values.get(path)
+        return attr.default if value is None else value
+
+    def set_plug(self, node, path, value):
+        """Set a plug, internal units, a tuple for compounds. Raises RuntimeError when locked or connected."""
+        attr = self.plug_attr(node, path)
+        if attr is None:
+            raise RuntimeError(f"Unknown attribute {node.name}.{path}")
+        if path in node.locked or (attr.parent is not None and _parent_path(path, attr) in node.locked):
+            raise RuntimeError(f"setAttr: The attribute '{node.name}.{path}' is locked or connected and cannot be modified.")
+        if attr.children:
+            for child, child_value in zip(attr.children, value):
+                self.set_plug(node, _child_path(path, child.name), child_value)
+            return
+        source = self.source(node, path)
+        if source is not None:
+            if source[0].has_fn("kAnimCurve"):
+                self.overrides[(node.uid, path)] = (value, self.time)
+                self.emit("attribute_set", node, node, path)
+                return
+            raise RuntimeError(f"setAttr: The attribute '{node.name}.{path}' is locked or connected and cannot be modified.")
+        if attr.kind in ("bool",):
+            value = bool(value)
+        elif attr.kind in ("long", "short", "byte", "enum"):
+            value = int(value)
+        elif attr.kind in Attr.NUMERIC or attr.kind in Attr.UNIT:
+            value = float(value)
+            if attr.minimum is not None:
+                value = max(attr.minimum, value)
+            if attr.maximum is not None:
+                value = min(attr.maximum, value)
+        node.values[path] = value
+        node._note_elements(path)
+        self.emit("attribute_set", node, node, path)
+
+    def add_attr(self, node, attr):
+        if node.attr(attr.name) is not None:
+            raise RuntimeError(f"Found more than one attribute named {attr.name} on {node.name}.")
+        for a in attr.walk():
+            a.dynamic = True
+            node.dynamic[a.name] = a
+            node.dynamic.setdefault(a.short, a)
+        node.dynamic_order.append(attr)
+        self.emit("attribute_changed", node, "added", node, attr.name)
+
+    def delete_attr(self, node, name):
+        attr = node.dynamic.get(name)
+        if attr is None:
+            raise RuntimeError(f"{node.name}.{name} is not a dynamic attribute.")
+        for a in attr.walk():
+            node.dynamic.pop(a.name, None)
+            node.dynamic.pop(a.short, None)
+            node.values.pop(a.name, None)
+        node.dynamic_order.remove(attr)
+        self.emit("attribute_changed", node, "removed", node, attr.name)
+
+    # ---- transforms
+
+    def local_matrix(self, node):
+        if not node.type.isa("transform"):
+            return math3d.IDENTITY
+        t = self.plug_value(node, "translate")
+        r = self.plug_value(node, "rotate")
+        s = self.plug_value(node, "scale")
+        joint_orient = self.plug_value(node, "jointOrient") if node.type.isa("joint") else None
+        matrix = math3d.compose(t, r, s, joint_orient)
+        offset = self.plug_value(node, "offsetParentMatrix")
+        if offset != math3d.IDENTITY:
+            matrix = math3d.multiply(matrix, offset)
+        return matrix
+
+    def world_matrix(self, node):
+        if node is None:
+            return math3d.IDENTITY
+        matrix = self.local_matrix(node)
+        for ancestor in node.ancestors():
+            if ancestor.type.isa("transform"):
+                matrix = math3d.multiply(matrix, self.local_matrix(ancestor))
+        return matrix
+
+    def parent_world_matrix(self, node):
+        return self.world_matrix(node.parent) if node.parent is not None else math3d.IDENTITY
+
+    def set_world_matrix(self, node, matrix, translate=True, rotate=True, scale=True):
+        """Set the local channels of a transform so its world matrix is matrix, on the free channels."""
+        local = math3d.multiply(matrix, math3d.inverse(self.parent_world_matrix(node)))
+        offset = self.plug_value(node, "offsetParentMatrix")
+        if offset != math3d.IDENTITY:
+            local = math3d.multiply(local, math3d.inverse(offset))
+        t, r, s = math3d.decompose(local)
+        if node.type.isa("joint"):
+            joint_orient = self.plug_value(node, "jointOrient")
+            if any(joint_orient):
+                rotation = math3d.multiply(math3d.euler_matrix(r), math3d.inverse(math3d.euler_matrix(joint_orient)))
+                r = math3d.matrix_euler(rotation)
+        if translate:
+            self._set_free(node, "translate", t)
+        if rotate:
+            self._set_free(node, "rotate", r)
+        if scale:
+            self._set_free(node, "scale", s)
+
+    def _set_free(self, node, compound, values):
+        for child, value in zip(node.attr(compound).children, values):
+            try:
+                self.set_plug(node, child.name, value)
+            except RuntimeError:
+                continue  # locked or connected channels keep their value, like xform
+
+    def constraint_driven(self, constraint):
+        for path, destinations in constraint.outputs.items():
+            if path.startswith("constraint"):
+                for dst, _ in destinations:
+                    return dst
+        return None
+
+    # ---- undo, callbacks, idle queue
+
+    def curve_edited(self, curve_node):
+        """The keys of an anim curve changed, for the anim curve edited callbacks."""
+        self.emit("anim_curve_edited", None, curve_node)
+
+    def push_undo(self, entry):
+        """entry has undoIt() and redoIt()."""
+        self.undo_queue.append(entry)
+        self.redo_queue.clear()
+
+    def add_callback(self, event, key, function, client_data=None) -> int:
+        callback_id = next(self.callback_ids)
+        self.callbacks[callback_id] = (event, key, function, client_data)
+        return callback_id
+
+    def remove_callback(self, callback_id):
+        if self.callbacks.pop(callback_id, None) is None:
+            raise RuntimeError(f"Invalid callback id {callback_id}")
+
+    def emit(self, event, key, *args):
+        """
+        Call the callbacks of event whose key matches: a node, a node type (its name or a parent type), None for any.
+        The callbacks are adapters made by the fake OpenMaya, converting the arguments to MObjects, MPlugs...
+        """
+        if not self.callbacks:
+            return
+        for event_name, callback_key, function, client_data in list(self.callbacks.values()):
+            if event_name != event:
+                continue
+            if callback_key is not None:
+                if isinstance(key, NodeType):
+                    if not key.isa(callback_key):
+                        continue
+                elif callback_key != key:
+                    continue
+            try:
+                function(*args, client_data)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)  # Maya prints the error and carries on
+
+    def flush_deferred(self) -> int:
+        """Run the evalDeferred queue, what Maya does at idle. Returns how many were run."""
+        ran = 0
+        while self.deferred:
+            function = self.deferred.pop(0)
+            if callable(function):
+                function()
+            else:
+                exec(function, {})
+            ran += 1
+        return ran
+
+
+def _leaf_name(path) -> str:
+    leaf = path.rpartition(".")[2]
+    return leaf.partition("[")[0]
+
+
+def _child_path(path, child_name) -> str:
+    if path.endswith("]"):
+        return f"{path}.{child_name}"
+    prefix = path.rpartition(".")[0]
+    return (prefix + "." if prefix else "") + child_name
+
+
+def _parent_path(path, attr) -> str:
+    prefix = path.rpartition(".")[0]
+    if attr.parent.multi:
+        return prefix
+    return (prefix + "." if prefix else "") + attr.parent.name
+
+
+def _transform_name(type_name, shape_name) -> str:
+    if shape_name:
+        return shape_name[:-5] if shape_name.endswith("Shape") and len(shape_name) > 5 else shape_name + "#"
+    return {"locator": "locator#", "mesh": "polySurface#", "nurbsCurve": "curve#", "camera": "camera#"}.get(
+        type_name, "transform#"
+    )
+
+
+# the scene of the session, there is only one like in Maya
+SCENE = Scene()